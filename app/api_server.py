@@ -0,0 +1,342 @@
+"""API HTTP/JSON local para terminales livianas y escáneres.
+
+Un solo proceso atiende a todas las terminales: comparte el catálogo en
+memoria, usa un pool de conexiones a MySQL y agrupa las ventas en
+transacciones, así los clientes no necesitan credenciales de la base.
+
+Ejemplos:
+    python -m app.api_server --port 8765
+    curl http://127.0.0.1:8765/products/7790001000011
+    curl -X POST http://127.0.0.1:8765/sales \\
+         -d '{"items": [{"barcode": "7790001000011", "quantity": 2}], "paid": 10}'
+    curl "http://127.0.0.1:8765/reports/summary?period=dia"
+
+Endpoints:
+    GET  /health                      Estado y versión del catálogo
+    GET  /products/<código>           Producto por código de barras
+    POST /sales                       Registrar una venta
+    GET  /reports/summary             Resumen de un período
+    GET  /reports/period              Reporte completo de un período
+    GET  /reports/top-products        Productos más vendidos
+    GET  /metrics                     Métricas en formato de Prometheus
+    (los reportes aceptan ?period=dia|semana|mes o ?from=AAAA-MM-DD&to=AAAA-MM-DD)
+
+No importa ttkbootstrap ni las vistas.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional, Sequence
+from urllib.parse import parse_qs, unquote, urlsplit
+import argparse
+import hmac
+import json
+import sys
+
+from config import API_CONFIG
+from .models.connection_pool import ConnectionPool
+from .models.money import Money
+from .services.catalog_cache import CatalogCache
+from .services.metrics import CONTENT_TYPE, REGISTRY, SALES, SCANS
+from .services.report_service import ReportService
+from .services.sale_writer import InsufficientStockError, SaleItem, SaleWriter
+
+# Segundos máximos de espera por la confirmación de una venta
+SALE_TIMEOUT = 30.0
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class ApiError(Exception):
+    """Error que se devuelve al cliente con un código HTTP."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _json_default(value: Any) -> Any:
+    """Convierte a JSON los tipos que devuelve pymysql."""
+    if isinstance(value, (Decimal, Money)):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+class ApiServer(ThreadingHTTPServer):
+    """Servidor HTTP con los servicios compartidos por todos los hilos."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        pool: Any,
+        token: Optional[str] = None,
+        catalog: Any = None,
+        writer: Any = None,
+        reports: Any = None,
+        batch_window: float = 0.02
+    ) -> None:
+        """
+        Inicializa el servidor.
+
+        Args:
+            address: (host, puerto)
+            pool: ConnectionPool compartido
+            token: Token requerido en "Authorization: Bearer" (None = sin token)
+            catalog: Catálogo en memoria (por defecto CatalogCache(pool))
+            writer: Escritor de ventas (por defecto SaleWriter(pool))
+            reports: Servicio de reportes (por defecto ReportService(pool))
+            batch_window: Segundos que se esperan otras ventas para el lote
+        """
+        super().__init__(address, ApiHandler)
+        self.pool = pool
+        self.token = token
+        self.catalog = catalog if catalog is not None else CatalogCache(pool)
+        self.writer = writer if writer is not None else SaleWriter(
+            pool, batch_window=batch_window,
+            on_commit=lambda sales: self.catalog.invalidate())
+        self.reports = reports if reports is not None else ReportService(pool)
+
+    def close(self) -> None:
+        """Detiene el escritor de ventas y cierra las conexiones."""
+        self.server_close()
+        self.writer.close()
+        self.pool.close()
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """Atiende una petición HTTP."""
+
+    server: ApiServer
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self._dispatch('GET')
+
+    def do_POST(self) -> None:
+        self._dispatch('POST')
+
+    def _dispatch(self, method: str) -> None:
+        """Busca la ruta pedida y envía la respuesta."""
+        url = urlsplit(self.path)
+        parts = [unquote(p) for p in url.path.strip('/').split('/') if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            self._check_token()
+            if method == 'GET' and parts == ['metrics']:
+                self._send_text(REGISTRY.render(), CONTENT_TYPE)
+                return
+            if method == 'GET' and parts == ['health']:
+                status, payload = 200, self.health()
+            elif method == 'GET' and len(parts) == 2 and parts[0] == 'products':
+                status, payload = 200, self.get_product(parts[1])
+            elif method == 'POST' and parts == ['sales']:
+                status, payload = 201, self.post_sale(self._read_json())
+            elif method == 'GET' and len(parts) == 2 and parts[0] == 'reports':
+                status, payload = 200, self.get_report(parts[1], query)
+            else:
+                raise ApiError(404, "Ruta inexistente")
+        except ApiError as e:
+            status, payload = e.status, {'error': str(e)}
+        except TimeoutError as e:
+            status, payload = 503, {'error': str(e) or "Servicio ocupado"}
+        except Exception as e:
+            print(f"Error en la API ({method} {self.path}): {e}")
+            status, payload = 500, {'error': "Error interno"}
+        self._send_json(status, payload)
+
+    def _check_token(self) -> None:
+        """Verifica el token si el servidor tiene uno configurado."""
+        if not self.server.token:
+            return
+        expected = f"Bearer {self.server.token}"
+        received = self.headers.get('Authorization', '')
+        if not hmac.compare_digest(received.encode(), expected.encode()):
+            raise ApiError(401, "Token inválido")
+
+    def _read_json(self) -> Any:
+        """Lee el cuerpo JSON de la petición."""
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            raise ApiError(413, "Cuerpo demasiado grande")
+        try:
+            return json.loads(self.rfile.read(length) or b'null')
+        except ValueError:
+            raise ApiError(400, "JSON inválido") from None
+
+    def _send_json(self, status: int, payload: Any) -> None:
+        """Envía una respuesta JSON."""
+        body = json.dumps(payload, default=_json_default,
+                          ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_text(self, body: str, content_type: str) -> None:
+        """Envía una respuesta de texto."""
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Registra solo las respuestas con error."""
+        if len(args) >= 2 and str(args[1]).startswith(('4', '5')):
+            super().log_message(format, *args)
+
+    # --- Endpoints ---
+
+    def health(self) -> dict[str, Any]:
+        """Estado del servicio."""
+        return {
+            'status': 'ok',
+            'catalog_version': self.server.catalog.version,
+            'products': len(self.server.catalog)
+        }
+
+    def get_product(self, barcode: str) -> dict[str, Any]:
+        """Producto por código de barras desde el catálogo en memoria."""
+        product = self.server.catalog.get(barcode)
+        if product is None:
+            raise ApiError(404, f"Producto {barcode} no encontrado")
+        SCANS.inc()
+        return {
+            'id': product.id,
+            'barcode': product.barcode,
+            'name': product.name,
+            'price': product.price,
+            'stock': product.stock
+        }
+
+    def post_sale(self, data: Any) -> dict[str, Any]:
+        """
+        Registra una venta.
+
+        Cuerpo: {"items": [{"barcode": "...", "quantity": 1}], "paid": 100.0}
+        Los precios se toman del catálogo; "paid" es opcional.
+        """
+        if not isinstance(data, dict) or not isinstance(data.get('items'), list):
+            raise ApiError(400, "Se espera {\"items\": [...]}")
+
+        items = []
+        for raw in data['items']:
+            if not isinstance(raw, dict):
+                raise ApiError(400, "Cada renglón debe ser un objeto")
+            barcode = str(raw.get('barcode', '')).strip()
+            try:
+                quantity = int(raw.get('quantity', 1))
+            except (TypeError, ValueError):
+                raise ApiError(400, f"Cantidad inválida para {barcode}") from None
+            if quantity <= 0:
+                raise ApiError(400, f"Cantidad inválida para {barcode}")
+            product = self.server.catalog.get(barcode)
+            if product is None or product.barcode.startswith('VAR'):
+                raise ApiError(404, f"Producto {barcode} no encontrado")
+            items.append(SaleItem(product.id, product.barcode, quantity,
+                                  Money.of(product.price)))
+
+        try:
+            paid = None if data.get('paid') is None else Money.of(data['paid'])
+            future = self.server.writer.submit(items, paid)
+        except (TypeError, ValueError) as e:
+            raise ApiError(400, str(e)) from None
+
+        try:
+            sale_id = future.result(timeout=SALE_TIMEOUT)
+        except InsufficientStockError as e:
+            raise ApiError(409, str(e)) from None
+        SALES.inc()
+        total = sum((i.unit_price * i.quantity for i in items), Money())
+        paid = total if paid is None else paid
+        return {'sale_id': sale_id, 'total': total,
+                'paid': paid, 'change': paid - total}
+
+    def get_report(self, name: str, query: dict[str, str]) -> Any:
+        """Reportes por período (cacheados por ReportService)."""
+        start, end = self._report_range(query)
+        reports = self.server.reports
+        if name == 'summary':
+            return reports.get_period_summary(start, end)
+        if name == 'period':
+            return reports.get_period_report(start, end)
+        if name == 'top-products':
+            try:
+                limit = int(query.get('limit', 10))
+            except ValueError:
+                raise ApiError(400, "Límite inválido") from None
+            return reports.get_top_products(start, end, limit)
+        raise ApiError(404, f"Reporte '{name}' inexistente")
+
+    @staticmethod
+    def _report_range(query: dict[str, str]) -> tuple[datetime, datetime]:
+        """Rango [desde, hasta) de los parámetros period o from/to."""
+        try:
+            if 'from' in query or 'to' in query:
+                desde = date.fromisoformat(query.get('from') or query['to'])
+                hasta = date.fromisoformat(query.get('to') or query['from'])
+                return ReportService.custom_range(desde, hasta)
+            period = query.get('period', 'dia')
+            if period not in ('dia', 'semana', 'mes'):
+                raise ValueError(f"Período inválido: '{period}'")
+            return ReportService.period_range(period)
+        except ValueError as e:
+            raise ApiError(400, str(e)) from None
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Construye el parser de argumentos."""
+    parser = argparse.ArgumentParser(
+        prog="python -m app.api_server",
+        description="API HTTP/JSON local de App-Stock."
+    )
+    parser.add_argument('--host', default=API_CONFIG['host'])
+    parser.add_argument('--port', type=int, default=API_CONFIG['port'])
+    parser.add_argument('--pool-size', type=int, default=API_CONFIG['pool_size'],
+                        help="Conexiones máximas a MySQL")
+    parser.add_argument('--batch-window-ms', type=int,
+                        default=API_CONFIG['batch_window_ms'],
+                        help="Espera para agrupar ventas en una transacción")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Arranca el servidor hasta que se interrumpa con Ctrl+C.
+
+    Args:
+        argv: Argumentos (por defecto sys.argv)
+
+    Returns:
+        int: Código de salida
+    """
+    args = build_parser().parse_args(argv)
+    pool = ConnectionPool(args.pool_size)
+    try:
+        server = ApiServer((args.host, args.port), pool, API_CONFIG['token'],
+                           batch_window=args.batch_window_ms / 1000)
+        server.catalog.refresh(force=True)
+    except Exception as e:
+        print(f"Error al iniciar la API: {e}", file=sys.stderr)
+        pool.close()
+        return 1
+
+    print(f"API escuchando en http://{args.host}:{server.server_port} "
+          f"({len(server.catalog)} productos)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
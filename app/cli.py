@@ -0,0 +1,469 @@
+"""Línea de comandos para generar reportes y exportaciones sin interfaz gráfica.
+
+Ejemplos:
+    python -m app.cli export-sales --from 2024-01-01 --to 2024-01-31 --format xlsx
+    python -m app.cli export-inventory --format csv
+    python -m app.cli period-report --period mes
+    python -m app.cli export-data --table all --format npz --incremental
+    python -m app.cli import-products catalogo.xlsx
+    python -m app.cli change-prices --percent 8.5 --name galletitas
+    python -m app.cli stock-count conteo.csv
+    python -m app.cli stock-at --date 2024-01-31
+    python -m app.cli shrinkage --period mes
+    python -m app.cli low-stock --format csv
+    python -m app.cli forecast --lead-time 5 --format csv
+    python -m app.cli abc --period mes
+    python -m app.cli archive --keep-months 12
+
+Pensado para programarse con cron en una PC de oficina: no importa
+ttkbootstrap ni las vistas.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Optional, Sequence
+import argparse
+import sys
+
+from config import ARCHIVE_CONFIG
+from .services.archive_service import ArchiveService
+from .services.bulk_update_service import BulkUpdateService
+from .services.data_export_service import TABLES, DataExportService
+from .services.export_service import ExportService
+from .services.forecast_service import ForecastService
+from .services.import_service import ProductImportService
+from .services.inventory_service import InventoryService
+from .services.report_service import ReportService
+from .services.stock_alerts import LowStockMonitor
+
+
+def _parse_date(text: str) -> date:
+    """Convierte AAAA-MM-DD o DD/MM/AAAA en fecha (para argparse)."""
+    for fmt in ("%Y-%m-%d", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise argparse.ArgumentTypeError(
+        f"Fecha inválida: '{text}'. Use AAAA-MM-DD")
+
+
+def _parse_percent(text: str) -> Decimal:
+    """Convierte un porcentaje (acepta coma decimal) para argparse."""
+    try:
+        return Decimal(text.replace(',', '.').rstrip('%'))
+    except InvalidOperation:
+        raise argparse.ArgumentTypeError(
+            f"Porcentaje inválido: '{text}'") from None
+
+
+def _resolve_range(
+    args: argparse.Namespace
+) -> tuple[Optional[datetime], Optional[datetime]]:
+    """Obtiene el rango [desde, hasta) pedido en los argumentos."""
+    if getattr(args, 'period', None):
+        return ReportService.period_range(args.period)
+
+    desde, hasta = args.desde, args.hasta
+    if desde and hasta:
+        return ReportService.custom_range(desde, hasta)
+    if desde:
+        return ReportService.custom_range(desde, date.today())
+    if hasta:
+        return None, ReportService.custom_range(hasta, hasta)[1]
+    return None, None
+
+
+def _export_service(args: argparse.Namespace) -> ExportService:
+    """Crea el servicio de exportación con la carpeta de salida elegida."""
+    service = ExportService()
+    if args.output_dir:
+        service.output_dir = Path(args.output_dir)
+        service.output_dir.mkdir(parents=True, exist_ok=True)
+    return service
+
+
+def cmd_export_sales(args: argparse.Namespace, reports: ReportService) -> int:
+    """Exporta las ventas del rango en el formato pedido."""
+    start, end = _resolve_range(args)
+    ventas = reports.get_sales(start, end)
+    if not ventas:
+        print("No hay ventas para exportar.", file=sys.stderr)
+        return 1
+
+    service = _export_service(args)
+    if args.format == 'csv':
+        filename = service.export_sales_to_csv(ventas)
+    else:
+        productos_vendidos = reports.get_top_products(start, end)
+        if args.format == 'pdf':
+            activas = [v for v in ventas if v.get('status', 'active') == 'active']
+            filename = service.export_sales_report_to_pdf(
+                sum(float(v['total']) for v in activas),
+                float(activas[0]['total']) if activas else 0.0,
+                ventas,
+                productos_vendidos
+            )
+        else:
+            filename = service.export_sales_to_excel(ventas, productos_vendidos)
+
+    print(filename)
+    return 0
+
+
+def cmd_export_inventory(args: argparse.Namespace, reports: ReportService) -> int:
+    """Exporta el inventario de productos."""
+    productos = reports.get_inventory()
+    if not productos:
+        print("No hay productos para exportar.", file=sys.stderr)
+        return 1
+
+    service = _export_service(args)
+    if args.format == 'csv':
+        filename = service.export_inventory_to_csv(productos)
+    else:
+        filename = service.export_inventory_to_excel(productos)
+
+    print(filename)
+    return 0
+
+
+def cmd_period_report(args: argparse.Namespace, reports: ReportService) -> int:
+    """Imprime el resumen de un período."""
+    start, end = _resolve_range(args)
+    if start is None or end is None:
+        print("Indique --period o --from/--to.", file=sys.stderr)
+        return 2
+
+    report = reports.get_period_report(start, end)
+    resumen = report['resumen']
+    print(f"Período: {start:%d/%m/%Y} - {end:%d/%m/%Y} (exclusivo)")
+    print(f"Total: ${resumen['total']:,.2f}")
+    print(f"Ventas: {resumen['cantidad_ventas']}")
+    print(f"Ticket promedio: ${resumen['ticket_promedio']:,.2f}")
+    for fila in report['por_dia']:
+        print(f"  {fila['dia']}  {fila['cantidad_ventas']:>5}  "
+              f"${float(fila['total']):>12,.2f}")
+    return 0
+
+
+def cmd_export_data(args: argparse.Namespace, reports: ReportService) -> int:
+    """Exporta tablas crudas en CSV o NPZ (completas o incrementales)."""
+    tables = list(TABLES) if args.table == 'all' else [args.table]
+    service = DataExportService(reports.db, args.output_dir)
+    for filename in service.export(tables, args.format, args.incremental):
+        print(filename)
+    return 0
+
+
+def cmd_import_products(args: argparse.Namespace, reports: ReportService) -> int:
+    """Importa productos desde un CSV o Excel."""
+    service = ProductImportService(
+        reports.db.connection, args.batch_size, args.errors_dir)
+    result = service.import_file(
+        args.file,
+        progress=lambda count: print(f"{count} filas leídas", file=sys.stderr)
+    )
+    print(f"Importados: {result.imported}")
+    print(f"Rechazados: {result.rejected}")
+    if result.error_file:
+        print(f"Errores: {result.error_file}")
+    return 0 if not result.errors else 3
+
+
+def cmd_change_prices(args: argparse.Namespace, reports: ReportService) -> int:
+    """Aplica un cambio porcentual de precios a los productos filtrados."""
+    service = BulkUpdateService(reports.db.connection)
+    if args.dry_run:
+        count = service.count_products(args.name, args.barcode_prefix)
+        print(f"Productos afectados: {count}")
+        return 0
+
+    updated = service.change_prices(args.percent, args.name, args.barcode_prefix)
+    print(f"Productos actualizados: {updated}")
+    return 0
+
+
+def cmd_stock_count(args: argparse.Namespace, reports: ReportService) -> int:
+    """Reemplaza el stock con un conteo (código, stock) desde archivo."""
+    service = BulkUpdateService(reports.db.connection, args.errors_dir)
+    result = service.import_stock_count(args.file)
+    print(f"Actualizados: {result.updated}")
+    print(f"Rechazados: {len(result.errors)}")
+    if result.unknown:
+        print("Códigos inexistentes: " + ", ".join(result.unknown))
+    if result.error_file:
+        print(f"Errores: {result.error_file}")
+    return 0 if not (result.errors or result.unknown) else 3
+
+
+def cmd_snapshot(args: argparse.Namespace, reports: ReportService) -> int:
+    """Guarda una foto del stock (solo si corresponde, salvo --force)."""
+    inventory = InventoryService(reports.db)
+    if args.force:
+        taken = inventory.take_snapshot()
+    else:
+        taken = inventory.ensure_snapshot(args.interval_days)
+    print(f"Foto de stock: {taken:%d/%m/%Y %H:%M}" if taken
+          else "No hace falta una foto nueva.")
+    return 0
+
+
+def cmd_stock_at(args: argparse.Namespace, reports: ReportService) -> int:
+    """Imprime el stock de cada producto al final del día indicado."""
+    when = datetime.combine(args.date, datetime.max.time())
+    for row in InventoryService(reports.db).get_stock_at(when):
+        print(f"{row['barcode']:<13}  {int(row['stock']):>7}  {row['name']}")
+    return 0
+
+
+def cmd_shrinkage(args: argparse.Namespace, reports: ReportService) -> int:
+    """Imprime las mermas (faltantes de conteos y ajustes) del período."""
+    start, end = _resolve_range(args)
+    if start is None or end is None:
+        print("Indique --period o --from/--to.", file=sys.stderr)
+        return 2
+
+    rows = InventoryService(reports.db).get_shrinkage(start, end)
+    total = sum(float(row['valor_faltante'] or 0) for row in rows)
+    for row in rows:
+        print(f"{row['barcode']:<13}  {int(row['unidades_faltantes']):>6}  "
+              f"${float(row['valor_faltante'] or 0):>10,.2f}  {row['producto']}")
+    print(f"Total faltante: ${total:,.2f}")
+    return 0
+
+
+def cmd_low_stock(args: argparse.Namespace, reports: ReportService) -> int:
+    """Exporta los productos en o por debajo de su stock mínimo."""
+    monitor = LowStockMonitor()
+    monitor.load(reports.db)
+    productos = monitor.alerts()
+    if not productos:
+        print("No hay productos con stock bajo.", file=sys.stderr)
+        return 0
+
+    service = _export_service(args)
+    if args.format == 'csv':
+        filename = service.export_low_stock_to_csv(productos)
+    else:
+        filename = service.export_low_stock_to_excel(productos)
+    print(filename)
+    return 0
+
+
+def cmd_forecast(args: argparse.Namespace, reports: ReportService) -> int:
+    """Exporta el pronóstico de demanda y la reposición sugerida."""
+    service = ForecastService(
+        reports.db,
+        history_days=args.history_days,
+        lead_time_days=args.lead_time,
+        review_days=args.review_days
+    )
+    filas = service.forecast()
+    if not filas:
+        print("No hay productos para pronosticar.", file=sys.stderr)
+        return 1
+
+    export = _export_service(args)
+    if args.format == 'csv':
+        filename = export.export_forecast_to_csv(filas)
+    else:
+        filename = export.export_forecast_to_excel(filas)
+    print(filename)
+    return 0
+
+
+def cmd_abc(args: argparse.Namespace, reports: ReportService) -> int:
+    """Exporta el análisis ABC del catálogo en un período."""
+    start, end = _resolve_range(args)
+    if start is None or end is None:
+        print("Indique --period o --from/--to.", file=sys.stderr)
+        return 2
+
+    filas = reports.get_abc_analysis(start, end)
+    if not any(fila['monto_total'] for fila in filas):
+        print("No hay ventas en el período.", file=sys.stderr)
+        return 1
+
+    for clase, datos in ReportService.abc_summary(filas).items():
+        print(f"Clase {clase}: {datos['productos']:>6} productos  "
+              f"${datos['monto_total']:>14,.2f}  {datos['participacion']:6.2f} %",
+              file=sys.stderr)
+
+    export = _export_service(args)
+    if args.format == 'csv':
+        filename = export.export_abc_to_csv(filas)
+    else:
+        filename = export.export_abc_to_excel(filas, start, end)
+    print(filename)
+    return 0
+
+
+def cmd_archive(args: argparse.Namespace, reports: ReportService) -> int:
+    """Mueve los meses cerrados de ventas al archivo."""
+    service = ArchiveService(reports.db.connection, args.keep_months)
+    if args.dry_run:
+        months = service.pending_months()
+        print("Meses a archivar: "
+              + (", ".join(f"{month:%m/%Y}" for month in months) or "ninguno"))
+        return 0
+
+    for result in service.archive_closed_months():
+        print(f"{result.month:%m/%Y}: {result.ventas} ventas, "
+              f"{result.detalles} detalles archivados")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Construye el parser de argumentos."""
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli",
+        description="Reportes y exportaciones de App-Stock sin interfaz gráfica."
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_range(sub: argparse.ArgumentParser) -> None:
+        sub.add_argument('--from', dest='desde', type=_parse_date,
+                         help="Fecha inicial (AAAA-MM-DD)")
+        sub.add_argument('--to', dest='hasta', type=_parse_date,
+                         help="Fecha final inclusive (AAAA-MM-DD)")
+        sub.add_argument('--period', choices=['dia', 'semana', 'mes'],
+                         help="Período predefinido (reemplaza --from/--to)")
+
+    sales = subparsers.add_parser('export-sales', help="Exportar ventas")
+    add_range(sales)
+    sales.add_argument('--format', choices=['xlsx', 'csv', 'pdf'],
+                       default='xlsx')
+    sales.add_argument('--output-dir', help="Carpeta de salida")
+    sales.set_defaults(handler=cmd_export_sales)
+
+    inventory = subparsers.add_parser(
+        'export-inventory', help="Exportar inventario")
+    inventory.add_argument('--format', choices=['xlsx', 'csv'],
+                           default='xlsx')
+    inventory.add_argument('--output-dir', help="Carpeta de salida")
+    inventory.set_defaults(handler=cmd_export_inventory)
+
+    period = subparsers.add_parser(
+        'period-report', help="Resumen de ventas de un período")
+    add_range(period)
+    period.set_defaults(handler=cmd_period_report)
+
+    data = subparsers.add_parser(
+        'export-data', help="Exportar tablas crudas para contabilidad")
+    data.add_argument('--table', choices=list(TABLES) + ['all'],
+                      default='all')
+    data.add_argument('--format', choices=['csv', 'npz'], default='csv')
+    data.add_argument('--incremental', action='store_true',
+                      help="Solo ventas nuevas desde la última exportación")
+    data.add_argument('--output-dir', help="Carpeta de salida")
+    data.set_defaults(handler=cmd_export_data)
+
+    importer = subparsers.add_parser(
+        'import-products', help="Importar productos desde CSV o Excel")
+    importer.add_argument('file', help="Archivo .csv o .xlsx")
+    importer.add_argument('--batch-size', type=int, default=500,
+                          help="Filas por lote de inserción")
+    importer.add_argument('--errors-dir', help="Carpeta del CSV de errores")
+    importer.set_defaults(handler=cmd_import_products)
+
+    prices = subparsers.add_parser(
+        'change-prices', help="Aumentar o bajar precios por porcentaje")
+    prices.add_argument('--percent', type=_parse_percent, required=True,
+                        help="Porcentaje (10 aumenta, -5 baja)")
+    prices.add_argument('--name', help="Solo nombres que contengan este texto")
+    prices.add_argument('--barcode-prefix',
+                        help="Solo códigos que empiecen con este prefijo")
+    prices.add_argument('--dry-run', action='store_true',
+                        help="Mostrar cuántos productos cambiarían")
+    prices.set_defaults(handler=cmd_change_prices)
+
+    count = subparsers.add_parser(
+        'stock-count', help="Cargar un conteo de stock (código, stock)")
+    count.add_argument('file', help="Archivo .csv o .xlsx")
+    count.add_argument('--errors-dir', help="Carpeta del CSV de errores")
+    count.set_defaults(handler=cmd_stock_count)
+
+    snapshot = subparsers.add_parser(
+        'snapshot', help="Guardar una foto del stock actual")
+    snapshot.add_argument('--interval-days', type=int, default=7,
+                          help="Solo si la última foto es más vieja")
+    snapshot.add_argument('--force', action='store_true',
+                          help="Tomar la foto aunque no corresponda")
+    snapshot.set_defaults(handler=cmd_snapshot)
+
+    stock_at = subparsers.add_parser(
+        'stock-at', help="Stock de cada producto en una fecha pasada")
+    stock_at.add_argument('--date', type=_parse_date, required=True,
+                          help="Fecha (AAAA-MM-DD), al cierre del día")
+    stock_at.set_defaults(handler=cmd_stock_at)
+
+    shrinkage = subparsers.add_parser(
+        'shrinkage', help="Reporte de mermas de un período")
+    add_range(shrinkage)
+    shrinkage.set_defaults(handler=cmd_shrinkage)
+
+    low_stock = subparsers.add_parser(
+        'low-stock', help="Exportar productos con stock bajo")
+    low_stock.add_argument('--format', choices=['xlsx', 'csv'],
+                           default='xlsx')
+    low_stock.add_argument('--output-dir', help="Carpeta de salida")
+    low_stock.set_defaults(handler=cmd_low_stock)
+
+    forecast = subparsers.add_parser(
+        'forecast', help="Pronóstico de demanda y reposición sugerida")
+    forecast.add_argument('--history-days', type=int, default=56,
+                          help="Días de historia a analizar")
+    forecast.add_argument('--lead-time', type=int, default=7,
+                          help="Días que tarda en llegar un pedido")
+    forecast.add_argument('--review-days', type=int, default=7,
+                          help="Días hasta el próximo pedido")
+    forecast.add_argument('--format', choices=['xlsx', 'csv'],
+                          default='xlsx')
+    forecast.add_argument('--output-dir', help="Carpeta de salida")
+    forecast.set_defaults(handler=cmd_forecast)
+
+    abc = subparsers.add_parser(
+        'abc', help="Análisis ABC (Pareto) del catálogo en un período")
+    add_range(abc)
+    abc.add_argument('--format', choices=['xlsx', 'csv'], default='xlsx')
+    abc.add_argument('--output-dir', help="Carpeta de salida")
+    abc.set_defaults(handler=cmd_abc)
+
+    archive = subparsers.add_parser(
+        'archive', help="Archivar los meses cerrados de ventas")
+    archive.add_argument('--keep-months', type=int,
+                         default=ARCHIVE_CONFIG['keep_months'],
+                         help="Meses cerrados que quedan sin archivar")
+    archive.add_argument('--dry-run', action='store_true',
+                         help="Mostrar qué meses se archivarían")
+    archive.set_defaults(handler=cmd_archive)
+
+    return parser
+
+
+def main(
+    argv: Optional[Sequence[str]] = None,
+    reports: Optional[ReportService] = None
+) -> int:
+    """
+    Punto de entrada de la línea de comandos.
+
+    Args:
+        argv: Argumentos (por defecto sys.argv)
+        reports: Servicio de reportes (por defecto uno sobre Database())
+
+    Returns:
+        int: Código de salida
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args, reports or ReportService())
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
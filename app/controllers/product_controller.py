@@ -1,25 +1,73 @@
 from ..models.product import Product
 from ..models.database import Database
-from tkinter import messagebox
+from ..services.bulk_update_service import BulkUpdateService
+from ..services.catalog_snapshot import CatalogSnapshot
+from ..services.import_service import ProductImportService
+from ..services.stock_alerts import LowStockMonitor
+from config import CATALOG_SNAPSHOT_CONFIG, SYNC_CONFIG
+from decimal import Decimal, InvalidOperation
+from tkinter import messagebox, filedialog, simpledialog
+import queue
+import threading
+
+IMPORT_POLL_INTERVAL_MS = 200
+RECONCILE_POLL_INTERVAL_MS = 50
 
 
 class ProductController:
-    def __init__(self, product_form, product_list):
+    def __init__(self, product_form, product_list, catalog=None):
+        """
+        Inicializa el controlador de productos.
+
+        Args:
+            product_form: Formulario de productos (vista)
+            product_list: Lista de productos (vista)
+            catalog: (versión, productos) ya mostrados en la lista por el
+                inicio escalonado; solo se traen los cambios posteriores
+        """
         self.product_form = product_form
         self.product_list = product_list
         self.db = Database()
         self.selected_product = None
+        self._import_events = queue.Queue()
+        # Versión de `products` de la última carga (aviso de cambios)
+        self._data_version = 0
+        self._reconcile_events = queue.Queue()
+        # Copia local del catálogo para no esperar la carga completa al iniciar
+        self.snapshot = (CatalogSnapshot() if CATALOG_SNAPSHOT_CONFIG['path']
+                         else None)
+        self.product_list.product_controller = self
+
+        # Alertas de stock bajo: la base avisa cada cambio de stock
+        self.stock_monitor = LowStockMonitor.instance()
+        Database.stock_monitor = self.stock_monitor
+        self.stock_monitor.add_listener(self._on_low_stock_changed)
+        self.stock_monitor.load(self.db)
 
         # Configurar eventos
         self.product_form.save_button.configure(command=self.save_product)
         self.product_form.edit_button.configure(command=self.start_edit)
         self.product_form.delete_button.configure(command=self.delete_product)
+        self.product_form.import_button.configure(command=self.import_products)
+        self.product_form.stock_count_button.configure(
+            command=self.import_stock_count)
+        self.product_form.price_change_button.configure(
+            command=self.change_prices)
         self.product_list.tabla.bind(
             '<<TreeviewSelect>>', self.on_select_product)
 
-        # Cargar productos
-        self.load_products()
-        self.product_form.set_action_buttons_state("disabled")
+        # Cargar productos y seguir los cambios de las otras terminales
+        if catalog is not None:
+            self._data_version = catalog[0]
+            self.product_form.set_action_buttons_state("disabled")
+            self._start_reconcile()
+        elif self._load_snapshot():
+            self.product_form.set_action_buttons_state("disabled")
+            self._start_reconcile()
+        else:
+            self.load_products()
+            self.product_form.set_action_buttons_state("disabled")
+            self._schedule_sync()
 
     def save_product(self):
         try:
@@ -41,13 +89,31 @@ class ProductController:
                             "Error", "Ya existe un producto con ese código de barras")
                         return
 
+            # Stock mínimo opcional (vacío = sin alerta)
+            reorder_level = int(data.get('reorder_level') or 0)
+            if reorder_level < 0:
+                messagebox.showerror(
+                    "Error", "El stock mínimo no puede ser negativo")
+                return
+
+            # Precio exacto: no pasar por float
+            try:
+                price = Decimal(data['price'].strip().replace(',', '.'))
+            except InvalidOperation:
+                price = None
+            if price is None or not price.is_finite() or price < 0:
+                messagebox.showerror(
+                    "Error", "El precio debe ser un número válido")
+                return
+
             # Crear producto
             product = Product(
                 barcode=data['barcode'],
                 name=data['name'],
-                price=float(data['price']),
+                price=price.quantize(Decimal('0.01')),
                 stock=int(data['stock']),
-                id=self.selected_product.id if self.selected_product and self.product_form.editing_mode else None
+                id=self.selected_product.id if self.selected_product and self.product_form.editing_mode else None,
+                reorder_level=reorder_level
             )
 
             # Guardar o actualizar
@@ -59,10 +125,10 @@ class ProductController:
                 self.db.add_product(product)
                 messagebox.showinfo("Éxito", "Producto agregado correctamente")
 
-            # Limpiar y recargar
+            # Limpiar y traer solo lo que cambió
             self.product_form.clear_fields()
             self.selected_product = None
-            self.load_products()
+            self.sync_products()
             self.product_form.set_action_buttons_state("disabled")
 
         except ValueError as e:
@@ -77,11 +143,109 @@ class ProductController:
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
+    def _on_low_stock_changed(self, monitor):
+        """Actualiza el contador de stock bajo de la lista."""
+        self.product_list.set_low_stock_count(monitor.count())
+
     def load_products(self):
+        # Leer la versión antes que los productos: lo que cambie en el medio
+        # se vuelve a traer en la próxima sincronización
+        self._data_version = self.db.get_data_version()
         products = self.db.get_all_products()
         self.product_list.load_products(products)
         self.product_form.set_action_buttons_state("disabled")
 
+    def _load_snapshot(self):
+        """Muestra el catálogo de la copia local, si hay una válida."""
+        cached = self.snapshot.load() if self.snapshot is not None else None
+        if cached is None:
+            return False
+        self._data_version, products = cached
+        self.product_list.load_products(products)
+        return True
+
+    def save_snapshot(self):
+        """Guarda el catálogo en memoria para el próximo inicio."""
+        if self.snapshot is not None:
+            self.snapshot.save(self._data_version, self.product_list.all_products)
+
+    def _start_reconcile(self):
+        """Pide en segundo plano los cambios posteriores a la copia local."""
+        threading.Thread(
+            target=self._run_reconcile, args=(self._data_version,),
+            name="catalog-reconcile", daemon=True
+        ).start()
+        self.product_list.after(RECONCILE_POLL_INTERVAL_MS, self._poll_reconcile)
+
+    def _run_reconcile(self, version):
+        """Consulta los cambios con una conexión propia (hilo trabajador)."""
+        connection = None
+        try:
+            connection = Database.create_connection()
+            changes = Database.with_connection(
+                connection).get_products_changed_since(version)
+            self._reconcile_events.put((version, changes))
+        except Exception as e:
+            self._reconcile_events.put((version, e))
+        finally:
+            if connection is not None:
+                connection.close()
+
+    def _poll_reconcile(self):
+        """Aplica en el hilo de Tk los cambios traídos por el hilo trabajador."""
+        try:
+            version, changes = self._reconcile_events.get_nowait()
+        except queue.Empty:
+            self.product_list.after(
+                RECONCILE_POLL_INTERVAL_MS, self._poll_reconcile)
+            return
+
+        if isinstance(changes, Exception):
+            # Se sigue con la copia local; el sondeo periódico reintenta
+            print(f"Error al actualizar la copia local del catálogo: {changes}")
+        elif version == self._data_version:
+            # Si en el medio hubo una recarga completa el resultado ya no sirve
+            self._apply_changes(*changes)
+        self._schedule_sync()
+
+    def sync_products(self):
+        """Trae solo los productos que cambiaron desde la última carga."""
+        try:
+            version, changed, deleted = self.db.get_products_changed_since(
+                self._data_version)
+        except Exception as e:
+            print(f"Error al sincronizar productos: {e}")
+            return
+        self._apply_changes(version, changed, deleted)
+
+    def _apply_changes(self, version, changed, deleted):
+        """Aplica a la lista los cambios hasta `version`."""
+        if version == self._data_version:
+            return
+        if version < self._data_version:
+            # La base se restauró o se recreó: las versiones volvieron atrás y
+            # deleted_products no lista lo que ya no existe, así que es el
+            # único caso en que se recarga todo
+            self.load_products()
+            return
+
+        self._data_version = version
+        self.product_list.apply_changes(changed, deleted)
+        # Mantener las alertas de stock bajo al día con las otras terminales
+        for product in changed:
+            self.stock_monitor.track(product)
+        for product_id in deleted:
+            self.stock_monitor.untrack(product_id)
+
+    def _schedule_sync(self):
+        """Programa la próxima consulta de cambios."""
+        self.product_list.after(SYNC_CONFIG['poll_interval_ms'], self._poll_changes)
+
+    def _poll_changes(self):
+        """Consulta periódica de cambios hechos en otras terminales."""
+        self.sync_products()
+        self._schedule_sync()
+
     def on_select_product(self, event):
         selected_items = self.product_list.tabla.selection()
         if not selected_items:
@@ -121,6 +285,9 @@ class ProductController:
                 0, f"{self.selected_product.price:.2f}")
             self.product_form.stock_entry.insert(
                 0, str(self.selected_product.stock))
+            if self.selected_product.reorder_level:
+                self.product_form.reorder_entry.insert(
+                    0, str(self.selected_product.reorder_level))
 
             # Cambiar a modo edición
             self.product_form.set_editing_mode(True)
@@ -140,7 +307,7 @@ class ProductController:
                 self.db.delete_product(self.selected_product.id)
                 self.selected_product = None
                 self.product_form.clear_fields()
-                self.load_products()
+                self.sync_products()
                 self.product_form.set_action_buttons_state("disabled")
                 messagebox.showinfo(
                     "Éxito", "Producto eliminado correctamente")
@@ -151,3 +318,150 @@ class ProductController:
     def cancel_edit(self):
         self.product_form.clear_fields()
         self.product_form.set_action_buttons_state("disabled")
+
+    def import_products(self):
+        """Importa productos desde un archivo CSV o Excel en segundo plano."""
+        filename = filedialog.askopenfilename(
+            title="Importar productos",
+            filetypes=[("Planillas", "*.csv *.xlsx"),
+                       ("CSV", "*.csv"), ("Excel", "*.xlsx")]
+        )
+        if not filename:
+            return
+
+        self._start_import(filename, 'products')
+
+    def import_stock_count(self):
+        """Carga un conteo de stock (código y cantidad) desde un archivo."""
+        filename = filedialog.askopenfilename(
+            title="Cargar conteo de stock",
+            filetypes=[("Planillas", "*.csv *.xlsx"),
+                       ("CSV", "*.csv"), ("Excel", "*.xlsx")]
+        )
+        if not filename:
+            return
+
+        if messagebox.askyesno(
+                "Confirmar",
+                "El stock de los productos del archivo se reemplazará por "
+                "la cantidad contada. ¿Desea continuar?"):
+            self._start_import(filename, 'stock_count')
+
+    def _start_import(self, filename, kind):
+        """Lanza una importación en un hilo trabajador."""
+        self.product_form.set_import_status("Importando...", running=True)
+        threading.Thread(
+            target=self._run_import, args=(filename, kind),
+            name="product-import", daemon=True
+        ).start()
+        self.product_form.after(IMPORT_POLL_INTERVAL_MS, self._poll_import)
+
+    def _run_import(self, filename, kind):
+        """Ejecuta la importación con una conexión propia (hilo trabajador)."""
+        def progress(count):
+            self._import_events.put(('progress', count))
+
+        connection = None
+        try:
+            connection = Database.create_connection()
+            if kind == 'stock_count':
+                result = BulkUpdateService(connection).import_stock_count(
+                    filename, progress=progress)
+            else:
+                result = ProductImportService(connection).import_file(
+                    filename, progress=progress)
+            self._import_events.put((kind, result))
+        except Exception as e:
+            self._import_events.put(('error', e))
+        finally:
+            if connection is not None:
+                connection.close()
+
+    def _poll_import(self):
+        """Procesa los avisos del hilo de importación en el hilo de Tk."""
+        while True:
+            try:
+                kind, value = self._import_events.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == 'progress':
+                self.product_form.set_import_status(
+                    f"Importando... {value:,} filas leídas", running=True)
+                continue
+
+            self.product_form.set_import_status("")
+            if kind == 'error':
+                messagebox.showerror(
+                    "Error", f"No se pudo importar el archivo: {str(value)}")
+                return
+
+            # Cerrar la transacción de lectura para ver lo que escribió
+            # la conexión del hilo trabajador
+            self.db.connection.commit()
+            self.stock_monitor.load(self.db)
+            self.sync_products()
+            if kind == 'stock_count':
+                message = (f"Filas leídas: {value.total}\n"
+                           f"Productos actualizados: {value.updated}\n"
+                           f"Filas rechazadas: {len(value.errors)}")
+                if value.unknown:
+                    message += ("\nCódigos inexistentes: "
+                                + ", ".join(value.unknown[:10]))
+                    if len(value.unknown) > 10:
+                        message += f" y {len(value.unknown) - 10} más"
+            else:
+                message = (f"Filas leídas: {value.total}\n"
+                           f"Productos importados: {value.imported}\n"
+                           f"Filas rechazadas: {value.rejected}")
+            if value.error_file:
+                message += f"\n\nDetalle de errores en:\n{value.error_file}"
+                messagebox.showwarning("Importación", message)
+            else:
+                messagebox.showinfo("Importación", message)
+            return
+
+        self.product_form.after(IMPORT_POLL_INTERVAL_MS, self._poll_import)
+
+    def change_prices(self):
+        """Aplica un aumento o descuento porcentual a varios productos."""
+        text = simpledialog.askstring(
+            "Ajustar precios",
+            "Porcentaje a aplicar (ej: 10 para aumentar, -5 para bajar):",
+            parent=self.product_form
+        )
+        if not text:
+            return
+        try:
+            percentage = Decimal(text.strip().replace(',', '.').rstrip('%'))
+        except InvalidOperation:
+            messagebox.showerror("Error", "El porcentaje debe ser un número válido")
+            return
+
+        name_filter = simpledialog.askstring(
+            "Ajustar precios",
+            "Aplicar solo a productos cuyo nombre contenga\n"
+            "(dejar vacío para todos):",
+            parent=self.product_form
+        )
+        if name_filter is None:
+            return
+
+        try:
+            service = BulkUpdateService(self.db.connection)
+            count = service.count_products(name_filter.strip() or None)
+            if not count:
+                messagebox.showinfo("Ajustar precios", "No hay productos que coincidan")
+                return
+            if not messagebox.askyesno(
+                    "Confirmar",
+                    f"Se aplicará {percentage:+}% a {count} producto(s). "
+                    "¿Desea continuar?"):
+                return
+            updated = service.change_prices(percentage, name_filter.strip() or None)
+            self.sync_products()
+            messagebox.showinfo(
+                "Éxito", f"Precios actualizados: {updated} producto(s)")
+        except Exception as e:
+            messagebox.showerror(
+                "Error", f"Error al actualizar los precios: {str(e)}")
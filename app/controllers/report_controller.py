@@ -1,5 +1,6 @@
 """Controlador para el módulo de reportes."""
 
+from datetime import date, datetime
 from typing import Any
 from tkinter import messagebox
 import tkinter.filedialog as filedialog
@@ -7,11 +8,17 @@ import os
 
 from ..models.database import Database
 from ..services.export_service import ExportService
+from ..services.export_jobs import DONE, FAILED, ExportJob, ExportJobQueue
+from ..services.forecast_service import ForecastService
+from ..services.report_service import PERIODO_PERSONALIZADO, ReportService
+from ..services.stock_alerts import LowStockMonitor
 
 
 class ReportController:
     """Controlador para gestionar reportes y exportaciones."""
 
+    EXPORT_POLL_INTERVAL_MS = 200
+
     def __init__(self, report_form: Any, product_list: Any = None) -> None:
         """
         Inicializa el controlador de reportes.
@@ -24,6 +31,13 @@ class ReportController:
         self.product_list = product_list
         self.db = Database()
         self.export_service = ExportService()
+        self.export_jobs = ExportJobQueue()
+        self.report_service = ReportService(self.db)
+        self.forecast_service = ForecastService(self.db)
+        self._forecast: list[dict[str, Any]] = []
+        # Último período consultado (período, desde, hasta)
+        self._period: tuple[str, str, str] = ('dia', '', '')
+        self._export_poll_scheduled = False
         # Establecer la referencia del controlador en la vista
         self.report_form.report_controller = self
         self.refresh()
@@ -36,6 +50,8 @@ class ReportController:
 
     def refresh(self) -> None:
         """Actualiza todos los datos de los reportes."""
+        # Hubo ventas o anulaciones: descartar los períodos cacheados
+        self.report_service.invalidate()
         total = self._get_total_ventas()
         ultima = self._get_ultima_venta()
         ultimas = self._get_ultimas_ventas()
@@ -56,9 +72,7 @@ class ReportController:
         Returns:
             float: Total acumulado de ventas activas
         """
-        query = "SELECT COALESCE(SUM(total), 0) as total FROM sales WHERE status = 'active'"
-        result = self.db.execute_query(query)
-        return float(result[0]['total']) if result else 0.0
+        return self.report_service.get_total_sales()
 
     def _get_ultima_venta(self) -> float:
         """
@@ -67,9 +81,7 @@ class ReportController:
         Returns:
             float: Monto de la última venta activa
         """
-        query = "SELECT total FROM sales WHERE status = 'active' ORDER BY date DESC LIMIT 1"
-        result = self.db.execute_query(query)
-        return float(result[0]['total']) if result else 0.0
+        return self.report_service.get_last_sale_total()
 
     def _get_ultimas_ventas(self) -> list[dict[str, Any]]:
         """
@@ -78,13 +90,7 @@ class ReportController:
         Returns:
             list: Lista de ventas con sus datos
         """
-        query = """
-            SELECT id, date, total, paid, `change`, status
-            FROM sales
-            ORDER BY date DESC
-        """
-        result = self.db.execute_query(query)
-        return result if result else []
+        return self.report_service.get_sales()
 
     def _get_productos_mas_vendidos(self) -> list[dict[str, Any]]:
         """
@@ -93,18 +99,135 @@ class ReportController:
         Returns:
             list: Lista de productos con estadísticas de ventas
         """
-        query = """
-            SELECT p.name as producto, 
-                   SUM(sd.quantity) as cantidad_vendida,
-                   SUM(sd.quantity * sd.unit_price) as monto_total
-            FROM sale_details sd
-            JOIN products p ON sd.product_id = p.id
-            GROUP BY p.id, p.name
-            ORDER BY cantidad_vendida DESC
-            LIMIT 10
+        return self.report_service.get_top_products()
+
+    def get_period_report(
+        self, period: str, desde: str = "", hasta: str = ""
+    ) -> dict[str, Any]:
         """
-        result = self.db.execute_query(query)
-        return result if result else []
+        Obtiene el reporte de un período.
+
+        Args:
+            period: 'dia', 'semana', 'mes' o 'personalizado'
+            desde: Fecha inicial (solo para 'personalizado')
+            hasta: Fecha final inclusive (solo para 'personalizado')
+
+        Returns:
+            dict: Reporte con resumen y desgloses por hora, día y producto
+        """
+        start, end = self._period_range(period, desde, hasta)
+        return self.report_service.get_period_report(start, end)
+
+    def _period_range(
+        self, period: str, desde: str = "", hasta: str = ""
+    ) -> tuple[datetime, datetime]:
+        """Rango [inicio, fin) del período elegido en la vista."""
+        if period == PERIODO_PERSONALIZADO:
+            return ReportService.custom_range(
+                self._parse_date(desde), self._parse_date(hasta))
+        return ReportService.period_range(period)
+
+    def show_period_report(
+        self, period: str, desde: str = "", hasta: str = ""
+    ) -> None:
+        """
+        Consulta un período y lo muestra en la vista.
+
+        Args:
+            period: 'dia', 'semana', 'mes' o 'personalizado'
+            desde: Fecha inicial (solo para 'personalizado')
+            hasta: Fecha final inclusive (solo para 'personalizado')
+        """
+        try:
+            report = self.get_period_report(period, desde, hasta)
+        except ValueError as e:
+            messagebox.showerror("Período inválido", str(e))
+            return
+        self._period = (period, desde, hasta)
+        self.report_form.update_period_data(report)
+
+    def export_abc_to_excel(self) -> None:
+        """Exporta el análisis ABC del último período consultado a Excel."""
+        try:
+            start, end = self._period_range(*self._period)
+            filas = self.report_service.get_abc_analysis(start, end)
+
+            if not any(fila['monto_total'] for fila in filas):
+                messagebox.showwarning(
+                    "Sin datos", "No hay ventas en el período para clasificar.")
+                return
+
+            self._submit_export(
+                'export_abc_to_excel',
+                "Análisis ABC Excel",
+                "Exportación exitosa",
+                "No se pudo exportar a Excel",
+                filas=filas,
+                desde=start,
+                hasta=end
+            )
+
+        except ValueError as e:
+            messagebox.showerror("Período inválido", str(e))
+        except Exception as e:
+            messagebox.showerror(
+                "Error al exportar",
+                f"No se pudo exportar a Excel:\n{str(e)}"
+            )
+
+    def show_forecast(self) -> None:
+        """Calcula el pronóstico de demanda y lo muestra en la vista."""
+        try:
+            self._forecast = self.forecast_service.forecast()
+        except Exception as e:
+            messagebox.showerror(
+                "Error", f"No se pudo calcular el pronóstico:\n{str(e)}")
+            return
+        self.report_form.update_forecast_data(self._forecast)
+
+    def export_forecast_to_excel(self) -> None:
+        """Exporta la reposición sugerida a Excel en segundo plano."""
+        try:
+            if not self._forecast:
+                self._forecast = self.forecast_service.forecast()
+
+            if not self._forecast:
+                messagebox.showwarning(
+                    "Sin datos", "No hay productos para pronosticar.")
+                return
+
+            self._submit_export(
+                'export_forecast_to_excel',
+                "Reposición Excel",
+                "Exportación exitosa",
+                "No se pudo exportar a Excel",
+                filas=self._forecast
+            )
+
+        except Exception as e:
+            messagebox.showerror(
+                "Error al exportar",
+                f"No se pudo exportar a Excel:\n{str(e)}"
+            )
+
+    @staticmethod
+    def _parse_date(text: str) -> date:
+        """
+        Convierte un texto DD/MM/AAAA o AAAA-MM-DD en fecha.
+
+        Args:
+            text: Fecha ingresada por el usuario
+
+        Returns:
+            date: Fecha convertida
+        """
+        for fmt in ("%d/%m/%Y", "%Y-%m-%d"):
+            try:
+                return datetime.strptime(text.strip(), fmt).date()
+            except ValueError:
+                continue
+        raise ValueError(
+            f"Fecha inválida: '{text}'. Use el formato DD/MM/AAAA")
 
     def _get_sale_details(self, sale_id: int) -> list[dict[str, Any]]:
         """
@@ -116,15 +239,21 @@ class ReportController:
         Returns:
             list: Lista de detalles de productos de la venta
         """
+        # La venta puede estar en un mes archivado
         query = """
             SELECT p.name as producto, sd.quantity as cantidad,
                    sd.unit_price as precio, (sd.quantity * sd.unit_price) as subtotal
-            FROM sale_details sd
+            FROM (
+                SELECT id, product_id, quantity, unit_price
+                FROM sale_details WHERE sale_id = %s
+                UNION ALL
+                SELECT id, product_id, quantity, unit_price
+                FROM sale_details_archive WHERE sale_id = %s
+            ) sd
             JOIN products p ON sd.product_id = p.id
-            WHERE sd.sale_id = %s
             ORDER BY sd.id
         """
-        result = self.db.execute_query(query, (sale_id,))
+        result = self.db.execute_query(query, (sale_id, sale_id))
         return result if result else []
 
     def _on_sale_double_click(self, event: Any) -> None:
@@ -158,7 +287,7 @@ class ReportController:
                 "Sin detalles", "No se encontraron detalles para esta venta.")
 
     def export_sales_to_excel(self) -> None:
-        """Exporta el historial de ventas a Excel."""
+        """Exporta el historial de ventas a Excel en segundo plano."""
         try:
             ventas = self._get_ultimas_ventas()
             productos_vendidos = self._get_productos_mas_vendidos()
@@ -168,14 +297,14 @@ class ReportController:
                     "Sin datos", "No hay ventas para exportar.")
                 return
 
-            filename = self.export_service.export_sales_to_excel(
-                ventas, productos_vendidos)
-
-            if messagebox.askyesno(
+            self._submit_export(
+                'export_sales_to_excel',
+                "Ventas Excel",
                 "Exportación exitosa",
-                f"Archivo generado:\n{filename}\n\n¿Desea abrirlo?"
-            ):
-                os.startfile(filename)
+                "No se pudo exportar a Excel",
+                ventas=ventas,
+                productos_vendidos=productos_vendidos
+            )
 
         except Exception as e:
             messagebox.showerror(
@@ -184,23 +313,46 @@ class ReportController:
             )
 
     def export_inventory_to_excel(self) -> None:
-        """Exporta el inventario de productos a Excel."""
+        """Exporta el inventario de productos a Excel en segundo plano."""
         try:
-            query = "SELECT * FROM products ORDER BY name"
-            productos = self.db.execute_query(query)
+            productos = self.report_service.get_inventory()
 
             if not productos:
                 messagebox.showwarning(
                     "Sin datos", "No hay productos para exportar.")
                 return
 
-            filename = self.export_service.export_inventory_to_excel(productos)
+            self._submit_export(
+                'export_inventory_to_excel',
+                "Inventario Excel",
+                "Exportación exitosa",
+                "No se pudo exportar a Excel",
+                productos=productos
+            )
+
+        except Exception as e:
+            messagebox.showerror(
+                "Error al exportar",
+                f"No se pudo exportar a Excel:\n{str(e)}"
+            )
 
-            if messagebox.askyesno(
+    def export_low_stock_to_excel(self) -> None:
+        """Exporta la lista de productos con stock bajo a Excel."""
+        try:
+            productos = LowStockMonitor.instance().alerts()
+
+            if not productos:
+                messagebox.showinfo(
+                    "Sin datos", "No hay productos con stock bajo.")
+                return
+
+            self._submit_export(
+                'export_low_stock_to_excel',
+                "Stock bajo Excel",
                 "Exportación exitosa",
-                f"Archivo generado:\n{filename}\n\n¿Desea abrirlo?"
-            ):
-                os.startfile(filename)
+                "No se pudo exportar a Excel",
+                productos=productos
+            )
 
         except Exception as e:
             messagebox.showerror(
@@ -209,7 +361,7 @@ class ReportController:
             )
 
     def export_sales_report_to_pdf(self) -> None:
-        """Exporta un reporte completo de ventas a PDF."""
+        """Exporta un reporte completo de ventas a PDF en segundo plano."""
         try:
             total_ventas = self._get_total_ventas()
             ultima_venta = self._get_ultima_venta()
@@ -221,15 +373,16 @@ class ReportController:
                     "Sin datos", "No hay ventas para generar el reporte.")
                 return
 
-            filename = self.export_service.export_sales_report_to_pdf(
-                total_ventas, ultima_venta, ventas, productos_vendidos
-            )
-
-            if messagebox.askyesno(
+            self._submit_export(
+                'export_sales_report_to_pdf',
+                "Reporte PDF",
                 "Reporte generado",
-                f"Archivo generado:\n{filename}\n\n¿Desea abrirlo?"
-            ):
-                os.startfile(filename)
+                "No se pudo generar el PDF",
+                total_ventas=total_ventas,
+                ultima_venta=ultima_venta,
+                ventas=ventas,
+                productos_vendidos=productos_vendidos
+            )
 
         except Exception as e:
             messagebox.showerror(
@@ -247,7 +400,7 @@ class ReportController:
         details: list[dict[str, Any]]
     ) -> None:
         """
-        Exporta un ticket individual de venta a PDF.
+        Exporta un ticket individual de venta a PDF en segundo plano.
 
         Args:
             sale_id: ID de la venta
@@ -258,15 +411,18 @@ class ReportController:
             details: Detalles de productos vendidos
         """
         try:
-            filename = self.export_service.export_sale_ticket_to_pdf(
-                sale_id, sale_date, sale_total, sale_paid, sale_change, details
-            )
-
-            if messagebox.askyesno(
+            self._submit_export(
+                'export_sale_ticket_to_pdf',
+                f"Ticket venta {sale_id}",
                 "Ticket generado",
-                f"Archivo generado:\n{filename}\n\n¿Desea abrirlo?"
-            ):
-                os.startfile(filename)
+                "No se pudo generar el ticket",
+                sale_id=sale_id,
+                sale_date=sale_date,
+                sale_total=sale_total,
+                sale_paid=sale_paid,
+                sale_change=sale_change,
+                details=details
+            )
 
         except Exception as e:
             messagebox.showerror(
@@ -274,6 +430,95 @@ class ReportController:
                 f"No se pudo generar el ticket:\n{str(e)}"
             )
 
+    def _submit_export(
+        self,
+        method_name: str,
+        description: str,
+        success_title: str,
+        error_message: str,
+        **kwargs: Any
+    ) -> ExportJob:
+        """
+        Encola una exportación y comienza a seguir su progreso.
+
+        Args:
+            method_name: Método de ExportService a ejecutar
+            description: Descripción que se muestra en la vista
+            success_title: Título del aviso al finalizar
+            error_message: Mensaje a mostrar si falla
+            **kwargs: Argumentos del método de exportación
+
+        Returns:
+            ExportJob: Trabajo encolado
+        """
+        def on_done(job: ExportJob) -> None:
+            if job.status == DONE:
+                if messagebox.askyesno(
+                    success_title,
+                    f"Archivo generado:\n{job.result}\n\n¿Desea abrirlo?"
+                ):
+                    os.startfile(job.result)
+            elif job.status == FAILED:
+                messagebox.showerror(
+                    "Error al exportar",
+                    f"{error_message}:\n{str(job.error)}"
+                )
+
+        job = self.export_jobs.submit_export(
+            method_name,
+            description=description,
+            on_done=on_done,
+            on_progress=self._on_export_progress,
+            **kwargs
+        )
+        self._update_export_status()
+        self._schedule_export_poll()
+        return job
+
+    def cancel_export(self, job_id: int) -> None:
+        """
+        Cancela una exportación que todavía está en espera.
+
+        Las que ya se están generando terminan normalmente.
+
+        Args:
+            job_id: ID del trabajo de exportación
+        """
+        if self.export_jobs.cancel(job_id):
+            self._update_export_status()
+        else:
+            messagebox.showinfo(
+                "Exportación en curso",
+                "La exportación ya se está generando y no se puede cancelar.\n"
+                "Solo se cancelan las exportaciones en espera."
+            )
+
+    def _on_export_progress(self, job: ExportJob) -> None:
+        """Refleja el progreso de una exportación en la vista."""
+        self._update_export_status()
+
+    def _update_export_status(self) -> None:
+        """Actualiza el indicador de exportaciones de la vista."""
+        activos = self.export_jobs.active_jobs()
+        if hasattr(self.report_form, 'set_export_status'):
+            self.report_form.set_export_status(activos)
+
+    def _schedule_export_poll(self) -> None:
+        """Programa la revisión periódica de la cola mientras haya trabajos."""
+        if not self._export_poll_scheduled:
+            self._export_poll_scheduled = True
+            self.report_form.after(
+                self.EXPORT_POLL_INTERVAL_MS, self._poll_export_jobs)
+
+    def _poll_export_jobs(self) -> None:
+        """Procesa los trabajos terminados en el hilo de la interfaz."""
+        self._export_poll_scheduled = False
+        finished = self.export_jobs.poll()
+        if finished:
+            self._update_export_status()
+        if self.export_jobs.active_jobs():
+            self._schedule_export_poll()
+
     def cancel_sale(self, sale_id: int) -> None:
         """
         Anula una venta y reintegra el stock.
@@ -286,7 +531,16 @@ class ReportController:
         result = self.db.execute_query(query, (sale_id,))
 
         if not result:
-            messagebox.showerror("Error", "Venta no encontrada")
+            # Las ventas de meses archivados ya no se pueden anular
+            archived = self.db.execute_query(
+                "SELECT id FROM sales_archive WHERE id = %s", (sale_id,))
+            if archived:
+                messagebox.showwarning(
+                    "Venta archivada",
+                    f"La venta N° {sale_id} está archivada y no se puede anular"
+                )
+            else:
+                messagebox.showerror("Error", "Venta no encontrada")
             return
 
         if result[0]['status'] == 'cancelled':
@@ -4,20 +4,33 @@ from typing import Any
 from tkinter import messagebox
 import datetime
 import os
+import socket
+import time
+import uuid
 
 from ..models.database import Database
+from ..models.money import Money
 from ..models.product import Product
+from ..models.stock_movement import MOV_VENTA
 from ..services.export_service import ExportService
+from ..services.metrics import (
+    CHECKOUT_SECONDS, SALE_DB_QUERIES, SALES, SCANS, thread_db_queries)
+from ..services.print_spooler import FAILED as PRINT_FAILED
+from ..services.ticket_renderer import TicketRenderer
+from config import TICKET_CONFIG
 
 
 class SaleController:
     """Controlador para gestionar ventas."""
 
+    PRINT_POLL_INTERVAL_MS = 500
+
     def __init__(
         self,
         sale_form: Any,
         product_list: Any = None,
-        report_controller: Any = None
+        report_controller: Any = None,
+        print_spooler: Any = None
     ) -> None:
         """
         Inicializa el controlador de ventas.
@@ -26,14 +39,27 @@ class SaleController:
             sale_form: Formulario de ventas (vista)
             product_list: Lista de productos (vista)
             report_controller: Controlador de reportes
+            print_spooler: Cola de impresión asíncrona (opcional). Sin ella
+                los tickets se imprimen de forma sincrónica.
         """
         self.sale_form = sale_form
         self.product_list = product_list
         self.report_controller = report_controller
+        self.print_spooler = print_spooler
         self.db = Database()
         self.export_service = ExportService()
         self.items = []
+        # Total de la canasta, actualizado en cada alta, edición o baja
+        self.total = Money()
+        # Cantidades de la canasta por código de barras, reservadas en la
+        # base (stock_reservations) para que las otras cajas no las vendan
         self.temp_stock = {}
+        self.basket_id = f"{socket.gethostname()[:40]}-{uuid.uuid4().hex[:12]}"
+        # Momento del primer artículo de la venta en curso (métricas de cobro)
+        self._checkout_started = None
+        self.ticket_format = TICKET_CONFIG['format']
+        self.ticket_device = TICKET_CONFIG['device']
+        self._print_poll_scheduled = False
         self._connect_events()
 
     def _connect_events(self):
@@ -83,21 +109,50 @@ class SaleController:
             self.product_list.refresh()
 
     def _get_available_stock(self, barcode: str) -> int:
-        """Obtiene el stock disponible considerando el stock temporal.
+        """Obtiene el stock disponible descontando las reservas.
 
         Args:
             barcode: El código de barras del producto.
 
         Returns:
-            El stock disponible real.
+            Las unidades que todavía se pueden agregar a esta canasta.
         """
         product = self.db.get_product_by_barcode(barcode)
         if not product:
             return 0
 
-        # Obtener el stock temporal reservado
-        temp_reserved = self.temp_stock.get(barcode, 0)
-        return product.stock - temp_reserved
+        try:
+            # Stock menos lo reservado por las canastas de otras cajas
+            available = self.db.get_available_stock(product.id, self.basket_id)
+        except Exception as e:
+            print(f"Error al consultar las reservas de stock: {e}")
+            available = product.stock
+        return available - self.temp_stock.get(barcode, 0)
+
+    def _reserve(self, product: Product, quantity: int) -> bool:
+        """Reserva en la base la cantidad total de un producto en la canasta.
+
+        Si la base no responde, se controla solo contra el stock leído.
+
+        Args:
+            product: Producto a reservar.
+            quantity: Cantidad total en la canasta (0 libera la reserva).
+
+        Returns:
+            True si la reserva quedó registrada.
+        """
+        try:
+            return self.db.reserve_stock(product.id, self.basket_id, quantity)
+        except Exception as e:
+            print(f"Error al reservar stock: {e}")
+            return quantity <= product.stock
+
+    def release_reservations(self) -> None:
+        """Libera las reservas de stock de la canasta (venta o cierre)."""
+        try:
+            self.db.release_reservations(self.basket_id)
+        except Exception as e:
+            print(f"Error al liberar las reservas de stock: {e}")
 
     def edit_item(self) -> None:
         """Edita la cantidad del item seleccionado."""
@@ -160,29 +215,24 @@ class SaleController:
                 messagebox.showerror("Error", "Producto no encontrado")
                 return
 
-            # Liberar el stock temporal actual
-            if barcode in self.temp_stock:
-                self.temp_stock[barcode] -= old_qty
-                if self.temp_stock[barcode] <= 0:
-                    del self.temp_stock[barcode]
-
-            # Verificar si hay suficiente stock disponible para la nueva cantidad
-            available_stock = product.stock
+            # Reservar la nueva cantidad en lugar de la anterior
+            reserved = self.temp_stock.get(barcode, 0) - old_qty + new_qty
 
-            if available_stock >= new_qty:
+            if self._reserve(product, reserved):
                 try:
                     # Actualizar el stock temporal con la nueva cantidad
-                    self.temp_stock[barcode] = self.temp_stock.get(
-                        barcode, 0) + new_qty
+                    self.temp_stock[barcode] = reserved
 
                     # Actualizar la cantidad en la lista de items
                     item_updated = False
 
                     for item in self.items:
                         if str(item['barcode']) == barcode:
-                            # Actualizar cantidad y subtotal
+                            # Actualizar cantidad, subtotal y total
+                            subtotal = item['price'] * new_qty
+                            self.total += subtotal - item['subtotal']
                             item['qty'] = new_qty
-                            item['subtotal'] = new_qty * float(item['price'])
+                            item['subtotal'] = subtotal
                             item_updated = True
                             break
 
@@ -211,6 +261,7 @@ class SaleController:
                     messagebox.showerror(
                         "Error", f"Error al actualizar la cantidad: {str(e)}")
             else:
+                available_stock = self._get_available_stock(barcode) + old_qty
                 messagebox.showerror(
                     "Error",
                     f"No hay suficiente stock disponible\nStock disponible: {available_stock}"
@@ -228,7 +279,8 @@ class SaleController:
 
         item = selected_items[0]
         values = self.sale_form.tree.item(item)['values']
-        barcode = values[0]
+        # ttk devuelve los códigos numéricos como int
+        barcode = str(values[0])
         qty = int(values[2])
 
         if messagebox.askyesno("Confirmar", "¿Desea eliminar este producto de la venta?"):
@@ -239,13 +291,22 @@ class SaleController:
                 self.temp_stock[barcode] -= qty
                 if self.temp_stock[barcode] <= 0:
                     del self.temp_stock[barcode]
+                # Liberar en la base lo que ya no está en la canasta
+                product = self.db.get_product_by_barcode(barcode)
+                if product:
+                    self._reserve(product, self.temp_stock.get(barcode, 0))
 
             # print(f"Buscando para eliminar: '{barcode}' (tipo: {type(barcode)})")
             # for item in self.items:
             #     print(f"  Item en lista: '{item['barcode']}' (tipo: {type(item['barcode'])})")
 
-            self.items = [
-                item for item in self.items if str(item['barcode']) != str(barcode)]
+            remaining = []
+            for item in self.items:
+                if str(item['barcode']) == barcode:
+                    self.total -= item['subtotal']
+                else:
+                    remaining.append(item)
+            self.items = remaining
 
             # print(f"Items después de eliminar: {len(self.items)}")
 
@@ -263,19 +324,23 @@ class SaleController:
             return
 
         data = self.sale_form.varios_data
+        price = Money.of(data['price'])
+        subtotal = price * data['qty']
 
         # Agregar a la lista de items
         new_item = {
             'barcode': 'VARIOS',  # Mostrar "VARIOS" en vez del código generado
             'name': data['name'],  # Nombre real que puso el usuario
             'qty': data['qty'],
-            'price': float(data['price']),
-            'subtotal': data['qty'] * float(data['price']),
+            'price': price,
+            'subtotal': subtotal,
             'is_varios': True,  # Flag para identificarlo
             'varios_name': data['name']  # Guardar el nombre original
         }
 
+        self._start_checkout()
         self.items.append(new_item)
+        self.total += subtotal
         self._update_table()
 
         # Limpiar datos temporales
@@ -286,6 +351,20 @@ class SaleController:
             f"Artículo '{data['name']}' agregado al carrito"
         )
 
+    def replay_scans(self, scans: list) -> None:
+        """Agrega los escaneos hechos antes de que la caja estuviera lista.
+
+        Args:
+            scans: Pares (código de barras, cantidad) en el orden escaneado
+        """
+        for barcode, qty in scans:
+            self.sale_form.clear_fields()
+            self.sale_form.barcode_entry.insert(0, barcode)
+            self.sale_form.qty_entry.insert(0, qty)
+            self.add_item()
+        if scans:
+            self.sale_form.clear_fields()
+
     def add_item(self):
         # Obtener y limpiar los valores
         barcode = self.sale_form.barcode_entry.get().strip()
@@ -315,31 +394,27 @@ class SaleController:
             self.sale_form.barcode_entry.focus()
             return
 
-        # Verificar stock disponible
-        available_stock = self._get_available_stock(barcode)
-        if available_stock < qty:
+        # Reservar la cantidad total del producto en la canasta; falla si
+        # las otras cajas ya reservaron el stock
+        if not self._reserve(product, self.temp_stock.get(barcode, 0) + qty):
             messagebox.showerror(
                 "Error",
-                f"No hay suficiente stock disponible\nStock disponible: {available_stock}"
+                f"No hay suficiente stock disponible\nStock disponible: {self._get_available_stock(barcode)}"
             )
             return
 
         # Ver si ya está en la lista
         for item in self.items:
             if item['barcode'] == barcode:
-                # Verificar si hay suficiente stock para la cantidad adicional
-                if available_stock < qty:
-                    messagebox.showerror(
-                        "Error",
-                        f"No hay suficiente stock disponible\nStock disponible: {available_stock}"
-                    )
-                    return
                 # Actualizar stock temporal
                 self.temp_stock[barcode] = self.temp_stock.get(
                     barcode, 0) + qty
-                # Actualizar cantidad y subtotal
+                # Actualizar cantidad, subtotal y total
+                subtotal = item['price'] * qty
                 item['qty'] = int(item['qty']) + qty
-                item['subtotal'] = item['qty'] * float(item['price'])
+                item['subtotal'] += subtotal
+                self.total += subtotal
+                SCANS.inc()
                 self._update_table()
                 self._clear_form()
                 return
@@ -348,17 +423,26 @@ class SaleController:
         # Actualizar stock temporal
         self.temp_stock[barcode] = self.temp_stock.get(barcode, 0) + qty
         # Agregar nuevo item
+        price = Money.of(product.price)
         new_item = {
             'barcode': product.barcode,
             'name': product.name,
             'qty': qty,
-            'price': float(product.price),
-            'subtotal': qty * float(product.price)
+            'price': price,
+            'subtotal': price * qty
         }
+        self._start_checkout()
         self.items.append(new_item)
+        self.total += new_item['subtotal']
+        SCANS.inc()
         self._update_table()
         self._clear_form()
 
+    def _start_checkout(self) -> None:
+        """Marca el inicio del cobro al agregar el primer artículo."""
+        if not self.items:
+            self._checkout_started = time.monotonic()
+
     def _update_table(self):
         """Actualiza la tabla con los items actuales."""
 
@@ -368,20 +452,12 @@ class SaleController:
 
         # Insertar los items actualizados
         for i, item in enumerate(self.items):
-            # Asegurarse de que los valores sean del tipo correcto
-            qty = int(item['qty'])
-            price = float(item['price'])
-            subtotal = qty * price
-
-            # Actualizar el subtotal en el item
-            item['subtotal'] = subtotal
-
             values = (
                 item['barcode'],
                 item['name'],
-                str(qty),
-                f"${price:.2f}",
-                f"${subtotal:.2f}"
+                str(item['qty']),
+                f"${item['price']:.2f}",
+                f"${item['subtotal']:.2f}"
             )
             # Insertar con tags para alternar colores
             self.sale_form.tree.insert('', 'end', values=values, tags=(
@@ -391,9 +467,9 @@ class SaleController:
         self.sale_form.tree.tag_configure('evenrow', background='#ecf0f1')
         self.sale_form.tree.tag_configure('oddrow', background='white')
 
-        # Actualizar el total
-        total = sum(float(item['subtotal']) for item in self.items)
-        self.sale_form.total_label.config(text=f"Total: ${total:.2f}")
+        # Mostrar el total (ya calculado al modificar la canasta)
+        self.sale_form.total = self.total
+        self.sale_form.total_label.config(text=f"Total: ${self.total:.2f}")
 
         # Actualizar el estado de los botones
         self.sale_form.set_action_buttons_state("disabled")
@@ -418,74 +494,110 @@ class SaleController:
             messagebox.showerror("Error", "No hay productos en la venta")
             return False
 
+        queries_before = thread_db_queries()
         try:
+            # Renovar las reservas: si alguna venció y otra caja vendió ese
+            # stock mientras tanto, la venta no se registra
+            for barcode, qty in self.temp_stock.items():
+                product = self.db.get_product_by_barcode(barcode)
+                if product and not self._reserve(product, qty):
+                    messagebox.showerror(
+                        "Error",
+                        f"No hay suficiente stock de {product.name}\n"
+                        f"Stock disponible: {self._get_available_stock(barcode) + qty}")
+                    return False
+
             # Obtener datos de pago
-            paid = getattr(self.sale_form, 'paid', 0.0)
-            change = getattr(self.sale_form, 'change', 0.0)
-            total = sum(float(item['subtotal']) for item in self.items)
+            paid = Money.of(self.sale_form.paid)
+            change = Money.of(self.sale_form.change)
+            total = self.total
             date = datetime.datetime.now().isoformat(sep=' ', timespec='seconds')
+            # Detalles del ticket tomados de la canasta en memoria
+            ticket_details = TicketRenderer.details_from_items(self.items)
 
-            # Registrar la venta en la base de datos
-            sale_id = self.db.add_sale(
-                date=date, total=total, paid=paid, change=change)
-
-            # Registrar los detalles de la venta
-            for item in self.items:
-                # Si es un artículo "varios", crear producto temporal único
-                if item.get('is_varios', False):
-                    # Crear producto con el nombre real del artículo varios
-                    from ..models.product import Product
-                    import random
-
-                    # Generar código corto único (máximo 13 caracteres)
-                    # Formato: VAR-XXXXXX (10 caracteres total)
-                    varios_barcode = f"VAR-{random.randint(100000, 999999)}"
-
-                    # Asegurar que sea único
-                    while self.db.get_product_by_barcode(varios_barcode):
+            # Cabecera, descuento de stock y detalles en una sola
+            # transacción: si algo falla no queda una venta a medias
+            try:
+                sale_id = self.db.add_sale(
+                    date=date, total=total.to_decimal(), paid=paid.to_decimal(),
+                    change=change.to_decimal(), commit=False)
+
+                # Descontar el stock (solo productos normales). Antes que los
+                # detalles, para tomar los bloqueos en el orden de
+                # Database.next_version; si otra caja vendió lo que no estaba
+                # reservado, la venta no se registra
+                for barcode, qty in self.temp_stock.items():
+                    product = self.db.get_product_by_barcode(barcode)
+                    if product and not self.db.deduct_stock(
+                            product.id, qty, MOV_VENTA, reference=sale_id,
+                            basket_id=self.basket_id):
+                        self.db.rollback()
+                        messagebox.showerror(
+                            "Error", f"No hay suficiente stock de {product.name}")
+                        return False
+
+                # Registrar los detalles de la venta (un solo envío)
+                detail_rows = []
+                for item in self.items:
+                    unit_price = Money.of(item['price']).to_decimal()
+                    # Si es un artículo "varios", crear producto temporal único
+                    if item.get('is_varios', False):
+                        # Crear producto con el nombre real del artículo varios
+                        from ..models.product import Product
+                        import random
+
+                        # Generar código corto único (máximo 13 caracteres)
+                        # Formato: VAR-XXXXXX (10 caracteres total)
                         varios_barcode = f"VAR-{random.randint(100000, 999999)}"
 
-                    # Crear el producto temporal con el nombre real
-                    varios_product = Product(
-                        barcode=varios_barcode,
-                        # Nombre real
-                        name=item.get('varios_name', item['name']),
-                        price=float(item['price']),
-                        stock=0  # Sin stock porque no se controla
-                    )
-                    self.db.add_product(varios_product)
-
-                    # Obtener el producto recién creado
-                    varios_product = self.db.get_product_by_barcode(
-                        varios_barcode)
-
-                    # Agregar detalle de venta
-                    self.db.add_sale_detail(
-                        sale_id=sale_id,
-                        product_id=varios_product.id,
-                        quantity=int(item['qty']),
-                        unit_price=float(item['price'])
-                    )
-                else:
-                    # Producto normal
-                    product = self.db.get_product_by_barcode(item['barcode'])
-                    if product:
-                        self.db.add_sale_detail(
-                            sale_id=sale_id,
-                            product_id=product.id,
-                            quantity=int(item['qty']),
-                            unit_price=float(item['price'])
+                        # Asegurar que sea único
+                        while self.db.get_product_by_barcode(varios_barcode):
+                            varios_barcode = f"VAR-{random.randint(100000, 999999)}"
+
+                        # Crear el producto temporal con el nombre real
+                        varios_product = Product(
+                            barcode=varios_barcode,
+                            # Nombre real
+                            name=item.get('varios_name', item['name']),
+                            price=unit_price,
+                            stock=0  # Sin stock porque no se controla
                         )
-
-            # Actualizar el stock en la base de datos (solo productos normales)
-            for barcode, qty in self.temp_stock.items():
-                product = self.db.get_product_by_barcode(barcode)
-                if product:
-                    product.stock -= qty
-                    self.db.update_product(product)
+                        self.db.add_product(varios_product, commit=False)
+
+                        # Obtener el producto recién creado
+                        varios_product = self.db.get_product_by_barcode(
+                            varios_barcode)
+
+                        # Agregar detalle de venta
+                        detail_rows.append(
+                            (varios_product.id, int(item['qty']), unit_price))
+                    else:
+                        # Producto normal
+                        product = self.db.get_product_by_barcode(item['barcode'])
+                        if product:
+                            detail_rows.append(
+                                (product.id, int(item['qty']), unit_price))
+
+                self.db.add_sale_details(sale_id, detail_rows)
+
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+
+            # El stock ya se descontó: las reservas dejan de hacer falta
+            self.release_reservations()
+
+            # Venta registrada: tiempo de cobro y consultas usadas
+            SALES.inc()
+            SALE_DB_QUERIES.observe(thread_db_queries() - queries_before)
+            if self._checkout_started is not None:
+                CHECKOUT_SECONDS.observe(time.monotonic() - self._checkout_started)
+                self._checkout_started = None
 
             # Limpiar la venta
             self.items = []
+            self.total = Money()
             self.temp_stock = {}
             self._update_table()
             self._clear_form()
@@ -503,9 +615,11 @@ class SaleController:
             # Preguntar si desea generar el ticket
             if messagebox.askyesno(
                 "Ticket de Venta",
-                "¿Desea generar el ticket de venta en PDF?"
+                "¿Desea generar el ticket de venta?"
             ):
-                self._generate_sale_ticket(sale_id, date, total, paid, change)
+                self._generate_sale_ticket(
+                    sale_id, date, total, paid, change,
+                    details=ticket_details)
 
             return True
         except Exception as e:
@@ -513,16 +627,35 @@ class SaleController:
                 "Error", f"Error al confirmar la venta: {str(e)}")
             return False
 
+    def _schedule_print_poll(self) -> None:
+        """Programa la revisión de la cola de impresión mientras haya tickets."""
+        if not self._print_poll_scheduled:
+            self._print_poll_scheduled = True
+            self.sale_form.after(
+                self.PRINT_POLL_INTERVAL_MS, self._poll_print_jobs)
+
+    def _poll_print_jobs(self) -> None:
+        """Informa los tickets que no se pudieron imprimir (hilo de Tk)."""
+        self._print_poll_scheduled = False
+        for job in self.print_spooler.poll():
+            if job.status == PRINT_FAILED:
+                messagebox.showerror(
+                    "Error de Impresión",
+                    f"No se pudo imprimir el ticket:\n{job.filename}\n\n{job.error}")
+        if self.print_spooler.pending():
+            self._schedule_print_poll()
+
     def _generate_sale_ticket(
         self,
         sale_id: int,
         sale_date: str,
-        sale_total: float,
-        sale_paid: float,
-        sale_change: float
+        sale_total: Money,
+        sale_paid: Money,
+        sale_change: Money,
+        details: list[dict[str, Any]] | None = None
     ) -> None:
         """
-        Genera el ticket de venta en PDF.
+        Genera el ticket de venta (PDF o ESC/POS según la configuración).
 
         Args:
             sale_id: ID de la venta
@@ -530,19 +663,22 @@ class SaleController:
             sale_total: Total de la venta
             sale_paid: Monto pagado
             sale_change: Cambio entregado
+            details: Detalles ya conocidos (canasta de confirm_sale). Si no
+                se indican, se consultan en la base de datos.
         """
         try:
-            # Obtener los detalles de la venta desde la base de datos
-            query = """
-                SELECT p.name as producto, sd.quantity as cantidad,
-                       sd.unit_price as precio, 
-                       (sd.quantity * sd.unit_price) as subtotal
-                FROM sale_details sd
-                JOIN products p ON sd.product_id = p.id
-                WHERE sd.sale_id = %s
-                ORDER BY sd.id
-            """
-            details = self.db.execute_query(query, (sale_id,))
+            if details is None:
+                # Obtener los detalles de la venta desde la base de datos
+                query = """
+                    SELECT p.name as producto, sd.quantity as cantidad,
+                           sd.unit_price as precio, 
+                           (sd.quantity * sd.unit_price) as subtotal
+                    FROM sale_details sd
+                    JOIN products p ON sd.product_id = p.id
+                    WHERE sd.sale_id = %s
+                    ORDER BY sd.id
+                """
+                details = self.db.execute_query(query, (sale_id,))
 
             if not details:
                 messagebox.showwarning(
@@ -551,6 +687,21 @@ class SaleController:
                 )
                 return
 
+            if self.ticket_format == 'escpos':
+                # Impresora térmica: se envía directo, sin diálogo
+                target = self.export_service.export_sale_ticket_to_escpos(
+                    sale_id=sale_id,
+                    sale_date=sale_date,
+                    sale_total=sale_total,
+                    sale_paid=sale_paid,
+                    sale_change=sale_change,
+                    details=details,
+                    device=self.ticket_device
+                )
+                messagebox.showinfo(
+                    "Ticket", f"✓ Ticket enviado a:\n{target}")
+                return
+
             # Generar el ticket
             filename = self.export_service.export_sale_ticket_to_pdf(
                 sale_id=sale_id,
@@ -573,7 +724,15 @@ class SaleController:
             )
 
             if result is True:  # Sí = Imprimir
-                if self.export_service.print_pdf(filename):
+                if self.print_spooler:
+                    # No bloquea: el ticket se imprime en segundo plano
+                    self.print_spooler.submit(filename)
+                    self._schedule_print_poll()
+                    messagebox.showinfo(
+                        "Imprimiendo",
+                        "✓ Ticket enviado a la cola de impresión."
+                    )
+                elif self.export_service.print_pdf(filename):
                     messagebox.showinfo(
                         "Imprimiendo",
                         "✓ Ticket enviado a la impresora predeterminada.\n\n" +
@@ -0,0 +1,153 @@
+"""Pool de conexiones a MySQL para procesos con varios hilos."""
+
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Iterator, Optional
+import queue
+import threading
+
+import pymysql
+
+from .database import Database
+
+
+class ConnectionPool:
+    """Conexiones reutilizables compartidas entre hilos.
+
+    Cada hilo toma una conexión, la usa y la devuelve. Al devolverla se
+    cierra la transacción abierta, así la próxima lectura ve los datos
+    confirmados por otros procesos. Las conexiones que fallan se descartan
+    y se vuelven a abrir cuando hagan falta.
+    """
+
+    def __init__(
+        self,
+        size: int = 4,
+        factory: Optional[Callable[[], Any]] = None,
+        timeout: float = 10.0
+    ) -> None:
+        """
+        Inicializa el pool (las conexiones se abren a medida que se piden).
+
+        Args:
+            size: Cantidad máxima de conexiones abiertas
+            factory: Función que abre una conexión (por defecto
+                Database.create_connection)
+            timeout: Segundos de espera por una conexión libre
+        """
+        self.size = size
+        self.factory = factory or Database.create_connection
+        self.timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._created = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """
+        Presta una conexión mientras dura el bloque `with`.
+
+        Yields:
+            pymysql.connections.Connection: Conexión del pool
+        """
+        connection = self._acquire()
+        healthy = True
+        try:
+            yield connection
+        except (pymysql.err.OperationalError, pymysql.err.InterfaceError):
+            healthy = False
+            raise
+        finally:
+            if healthy:
+                try:
+                    # Terminar la transacción (de lectura o la que dejó un error)
+                    connection.rollback()
+                except Exception:
+                    healthy = False
+            if healthy and not self._closed:
+                self._idle.put(connection)
+            else:
+                self._discard(connection)
+
+    def execute_query(self, query: str, params: Any = None) -> list[dict[str, Any]]:
+        """
+        Ejecuta una consulta SELECT con una conexión del pool.
+
+        Misma interfaz que Database.execute_query, para usar los servicios
+        de consulta (ej: ReportService) desde varios hilos.
+
+        Args:
+            query: Consulta SELECT
+            params: Parámetros de la consulta
+
+        Returns:
+            list: Filas como diccionarios ([] si hubo un error)
+        """
+        try:
+            with self.connection() as connection:
+                cursor = connection.cursor()
+                try:
+                    if params:
+                        cursor.execute(query, params)
+                    else:
+                        cursor.execute(query)
+                    return cursor.fetchall()
+                finally:
+                    cursor.close()
+        except Exception as e:
+            print(f"Error en consulta: {e}")
+            return []
+
+    # Las conexiones del pool son a la base principal: las consultas de
+    # solo lectura de los servicios de reportes se hacen igual que el resto
+    execute_read_query = execute_query
+
+    def get_archive_cutoff(self) -> Optional[datetime]:
+        """Igual que Database.get_archive_cutoff, con una conexión del pool."""
+        return Database.archive_cutoff_from(
+            self.execute_query(Database.ARCHIVE_CUTOFF_QUERY))
+
+    def close(self) -> None:
+        """Cierra las conexiones libres; las prestadas se cierran al devolverse."""
+        self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def _acquire(self) -> Any:
+        """Toma una conexión libre, abre una nueva o espera a que se libere."""
+        if self._closed:
+            raise RuntimeError("El pool de conexiones está cerrado")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+        if can_create:
+            try:
+                return self.factory()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError("No hay conexiones libres en el pool") from None
+
+    def _discard(self, connection: Any) -> None:
+        """Cierra una conexión y libera su lugar en el pool."""
+        with self._lock:
+            self._created -= 1
+        try:
+            connection.close()
+        except Exception:
+            pass
@@ -1,11 +1,65 @@
+from datetime import datetime, time as dtime
+import time
+
 import pymysql
 from .product import Product
-from config import MYSQL_CONFIG
+from .stock_movement import MOV_AJUSTE, MOV_ALTA, MOV_ANULACION
+from config import MYSQL_CONFIG, REPLICA_CONFIG, RESERVATION_CONFIG
+
+
+def _count_round_trip():
+    """Avisa a Database.query_counter de una ida y vuelta a MySQL."""
+    counter = Database.query_counter
+    if counter is not None:
+        counter()
+
+
+class CountingConnection(pymysql.connections.Connection):
+    """Conexión que cuenta cada commit y rollback enviados al servidor."""
+
+    def commit(self):
+        _count_round_trip()
+        return super().commit()
+
+    def rollback(self):
+        _count_round_trip()
+        return super().rollback()
+
+
+class CountingDictCursor(pymysql.cursors.DictCursor):
+    """DictCursor que cuenta cada consulta enviada al servidor."""
+
+    def _query(self, q):
+        _count_round_trip()
+        return super()._query(q)
+
+
+class CountingSSCursor(pymysql.cursors.SSCursor):
+    """SSCursor que cuenta cada consulta enviada al servidor."""
+
+    def _query(self, q):
+        _count_round_trip()
+        return super()._query(q)
 
 
 class Database:
     _instance = None
     _connection = None
+    # Objeto avisado de cada cambio de stock (ej: LowStockMonitor). Debe
+    # tener apply_delta(product_id, delta), track(product) y untrack(product_id)
+    stock_monitor = None
+    # Avisos a stock_monitor de la transacción en curso (método, argumentos):
+    # se envían recién cuando commit() la confirma
+    _pending_notices = None
+    # Función sin argumentos llamada por cada ida y vuelta a MySQL (consulta,
+    # commit o rollback), ej: metrics.count_db_query. None = no se cuenta
+    query_counter = None
+    # Réplica de solo lectura (ver execute_read_query). Se guardan por
+    # instancia: el singleton y cada instancia de with_connection tienen la
+    # suya, porque una conexión no se comparte entre hilos
+    _replica_connection = None
+    _replica_checked_at = None
+    _replica_ok = False
 
     def __new__(cls):
         """Implementa el patrón Singleton para asegurar una única instancia."""
@@ -16,15 +70,7 @@ class Database:
     def __init__(self):
         """Inicializa la conexión solo si no existe."""
         if Database._connection is None:
-            Database._connection = pymysql.connect(
-                host=MYSQL_CONFIG['host'],
-                port=MYSQL_CONFIG['port'],
-                user=MYSQL_CONFIG['user'],
-                password=MYSQL_CONFIG['password'],
-                database=MYSQL_CONFIG['database'],
-                cursorclass=pymysql.cursors.DictCursor,
-                autocommit=False  # Control manual de transacciones
-            )
+            Database._connection = Database.create_connection()
             self.connection = Database._connection
             self.cursor = self.connection.cursor()
             self.create_tables()
@@ -32,6 +78,68 @@ class Database:
             self.connection = Database._connection
             self.cursor = self.connection.cursor()
 
+    @classmethod
+    def with_connection(cls, connection):
+        """
+        Crea una instancia que trabaja sobre otra conexión (no la compartida).
+
+        Permite usar las consultas de esta clase desde otros hilos, por
+        ejemplo con una conexión de un ConnectionPool.
+
+        Args:
+            connection: Conexión abierta
+
+        Returns:
+            Database: Instancia independiente del singleton
+        """
+        db = object.__new__(cls)
+        db.connection = connection
+        db.cursor = connection.cursor()
+        return db
+
+    @staticmethod
+    def create_connection():
+        """
+        Abre una conexión nueva con la configuración de la aplicación.
+
+        Se usa para la conexión compartida y para tareas en segundo plano
+        que no deben usar la conexión del hilo de la interfaz.
+
+        Returns:
+            pymysql.connections.Connection: Conexión abierta
+        """
+        return CountingConnection(
+            host=MYSQL_CONFIG['host'],
+            port=MYSQL_CONFIG['port'],
+            user=MYSQL_CONFIG['user'],
+            password=MYSQL_CONFIG['password'],
+            database=MYSQL_CONFIG['database'],
+            cursorclass=CountingDictCursor,
+            autocommit=False  # Control manual de transacciones
+        )
+
+    @staticmethod
+    def create_replica_connection():
+        """
+        Abre una conexión a la réplica de solo lectura (REPLICA_CONFIG).
+
+        Usa autocommit para que cada consulta vea lo último replicado en
+        lugar de la foto de una transacción abierta.
+
+        Returns:
+            pymysql.connections.Connection: Conexión abierta
+        """
+        return CountingConnection(
+            host=REPLICA_CONFIG['host'],
+            port=REPLICA_CONFIG['port'],
+            user=REPLICA_CONFIG['user'],
+            password=REPLICA_CONFIG['password'],
+            database=REPLICA_CONFIG['database'],
+            cursorclass=CountingDictCursor,
+            connect_timeout=REPLICA_CONFIG['connect_timeout'],
+            autocommit=True
+        )
+
     def create_tables(self):
         self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS products (
@@ -67,68 +175,556 @@ class Database:
                 FOREIGN KEY (product_id) REFERENCES products(id)
             )
         ''')
+
+        # Libro de movimientos de stock (solo se agregan filas) y fotos
+        # periódicas del stock para calcular el stock a una fecha
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stock_movements (
+                id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                product_id INT NOT NULL,
+                date DATETIME(6) NOT NULL,
+                quantity INT NOT NULL,
+                type VARCHAR(20) NOT NULL,
+                reference VARCHAR(64) NULL,
+                INDEX idx_stock_movements_product_date (product_id, date),
+                INDEX idx_stock_movements_date (date)
+            )
+        ''')
+
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stock_snapshots (
+                snapshot_date DATETIME(6) NOT NULL,
+                product_id INT NOT NULL,
+                stock INT NOT NULL,
+                PRIMARY KEY (snapshot_date, product_id)
+            )
+        ''')
+
+        # Stock mínimo por producto para las alertas de reposición
+        self._ensure_column('products', 'reorder_level', 'INT NOT NULL DEFAULT 0')
+
+        # Aviso de cambios entre terminales: contador por tabla, versión de
+        # la última modificación de cada producto y productos eliminados
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS data_versions (
+                table_name VARCHAR(32) PRIMARY KEY,
+                version BIGINT UNSIGNED NOT NULL DEFAULT 0
+            )
+        ''')
+        self.cursor.execute('''
+            INSERT IGNORE INTO data_versions (table_name, version)
+            VALUES ('products', 0)
+        ''')
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS deleted_products (
+                product_id INT PRIMARY KEY,
+                row_version BIGINT UNSIGNED NOT NULL,
+                INDEX idx_deleted_products_version (row_version)
+            )
+        ''')
+        self._ensure_column(
+            'products', 'row_version', 'BIGINT UNSIGNED NOT NULL DEFAULT 0')
+        self._ensure_index('products', 'idx_products_row_version', 'row_version')
+
+        # Índices para los reportes por rango de fechas
+        self._ensure_index('sales', 'idx_sales_status_date', 'status, date')
+        self._ensure_index(
+            'sale_details', 'idx_sale_details_sale_product',
+            'sale_id, product_id, quantity, unit_price')
+
+        # Historial archivado (ver ArchiveService): meses cerrados movidos
+        # fuera de sales/sale_details, con agregados precalculados por hora
+        # y por producto y mes para los reportes
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sales_archive (
+                id INT PRIMARY KEY,
+                date DATETIME NOT NULL,
+                total DECIMAL(10,2) NOT NULL,
+                paid DECIMAL(10,2) NOT NULL,
+                `change` DECIMAL(10,2) NOT NULL,
+                status VARCHAR(20) DEFAULT 'active',
+                cancelled_at DATETIME NULL,
+                cancellation_reason TEXT NULL,
+                INDEX idx_sales_archive_status_date (status, date)
+            )
+        ''')
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sale_details_archive (
+                id INT PRIMARY KEY,
+                sale_id INT NOT NULL,
+                product_id INT NOT NULL,
+                quantity INT NOT NULL,
+                unit_price DECIMAL(10,2) NOT NULL,
+                INDEX idx_sale_details_archive_sale (sale_id, product_id, quantity, unit_price)
+            )
+        ''')
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sales_hourly (
+                hour DATETIME PRIMARY KEY,
+                cantidad_ventas INT NOT NULL,
+                total DECIMAL(14,2) NOT NULL
+            )
+        ''')
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS product_sales_monthly (
+                month DATE NOT NULL,
+                product_id INT NOT NULL,
+                cantidad_vendida INT NOT NULL,
+                monto_total DECIMAL(14,2) NOT NULL,
+                PRIMARY KEY (month, product_id)
+            )
+        ''')
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS archived_months (
+                month DATE PRIMARY KEY,
+                ventas INT NOT NULL,
+                detalles INT NOT NULL,
+                archived_at DATETIME NOT NULL
+            )
+        ''')
+
+        # Reservas de stock de las canastas abiertas en cada caja. Una fila
+        # por canasta y producto; las vencidas no cuentan y se purgan solas
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stock_reservations (
+                basket_id VARCHAR(64) NOT NULL,
+                product_id INT NOT NULL,
+                quantity INT NOT NULL,
+                expires_at DATETIME NOT NULL,
+                PRIMARY KEY (basket_id, product_id),
+                INDEX idx_stock_reservations_product (product_id, expires_at, quantity),
+                INDEX idx_stock_reservations_expires (expires_at)
+            )
+        ''')
         self.connection.commit()
 
-    @staticmethod
-    def from_db_dict(data):
-        return Product(
-            id=data.get('id'),
-            barcode=data.get('barcode'),
-            name=data.get('name'),
-            price=float(data.get('price')),
-            stock=int(data.get('stock', 0))
-        )
+    def _ensure_index(self, table: str, name: str, columns: str) -> None:
+        """
+        Crea un índice si todavía no existe.
 
-    def add_product(self, product):
+        Args:
+            table: Tabla a indexar
+            name: Nombre del índice
+            columns: Columnas del índice separadas por coma
+        """
         self.cursor.execute('''
-            INSERT INTO products (barcode, name, price, stock)
-            VALUES (%s, %s, %s, %s)
-        ''', (product.barcode, product.name, product.price, product.stock))
+            SELECT COUNT(*) AS existe
+            FROM information_schema.statistics
+            WHERE table_schema = DATABASE()
+              AND table_name = %s AND index_name = %s
+        ''', (table, name))
+        if not self.cursor.fetchone()['existe']:
+            self.cursor.execute(f'CREATE INDEX {name} ON {table} ({columns})')
+
+    def _ensure_column(self, table: str, column: str, definition: str) -> None:
+        """
+        Agrega una columna si todavía no existe (migración de bases viejas).
+
+        Args:
+            table: Tabla a modificar
+            column: Nombre de la columna
+            definition: Tipo y opciones de la columna
+        """
+        self.cursor.execute('''
+            SELECT COUNT(*) AS existe
+            FROM information_schema.columns
+            WHERE table_schema = DATABASE()
+              AND table_name = %s AND column_name = %s
+        ''', (table, column))
+        if not self.cursor.fetchone()['existe']:
+            self.cursor.execute(
+                f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
+    @staticmethod
+    def next_version(cursor, table='products'):
+        """
+        Incrementa el contador de cambios de una tabla (sin confirmar).
+
+        La fila de `data_versions` queda bloqueada hasta el commit, así que
+        las versiones se confirman en orden y una terminal que leyó la
+        versión N ya puede ver todos los cambios hasta N. Debe llamarse
+        antes de bloquear filas de la tabla para que todas las escrituras
+        tomen los bloqueos en el mismo orden.
+
+        Args:
+            cursor: Cursor de la transacción que modifica la tabla
+            table: Tabla modificada
+
+        Returns:
+            int: Versión asignada a los cambios de esta transacción
+        """
+        cursor.execute('''
+            UPDATE data_versions SET version = LAST_INSERT_ID(version + 1)
+            WHERE table_name = %s
+        ''', (table,))
+        cursor.execute('SELECT LAST_INSERT_ID() AS version')
+        return int(cursor.fetchone()['version'])
+
+    def get_data_version(self, table='products'):
+        """
+        Obtiene la versión actual de una tabla.
+
+        Cierra la transacción de lectura anterior para ver los cambios
+        confirmados por otras terminales.
+
+        Args:
+            table: Tabla a consultar
+
+        Returns:
+            int: Versión actual (0 si nunca se modificó)
+        """
         self.connection.commit()
+        self.cursor.execute(
+            'SELECT version FROM data_versions WHERE table_name = %s', (table,))
+        row = self.cursor.fetchone()
+        return int(row['version']) if row else 0
+
+    def get_products_changed_since(self, version):
+        """
+        Obtiene los productos modificados y eliminados desde una versión.
+
+        Si no hubo cambios solo se ejecuta la consulta de la versión (una
+        lectura por clave primaria).
+
+        Args:
+            version: Última versión conocida por la terminal
+
+        Returns:
+            tuple: (versión actual, productos modificados, IDs eliminados)
+        """
+        current = self.get_data_version('products')
+        if current == version:
+            return current, [], []
+
+        changed = self._fetch_products('WHERE row_version > %s', (version,))
+        self.cursor.execute(
+            'SELECT product_id FROM deleted_products WHERE row_version > %s',
+            (version,))
+        deleted = [row['product_id'] for row in self.cursor.fetchall()]
+        return current, changed, deleted
+
+    def _fetch_products(self, where='', params=None):
+        """
+        Lee productos con un cursor de tuplas y los convierte con Product.from_row.
+
+        Evita crear un diccionario por fila (DictCursor) antes de cada
+        producto, lo que importa al cargar el catálogo completo.
+
+        Args:
+            where: Condición opcional (ej: 'WHERE id=%s')
+            params: Parámetros de la condición
+
+        Returns:
+            list: Productos encontrados
+        """
+        cursor = self.connection.cursor(pymysql.cursors.Cursor)
+        try:
+            cursor.execute(
+                f"SELECT {', '.join(Product.COLUMNS)} FROM products {where}",
+                params)
+            return [Product.from_row(row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    def add_product(self, product, commit=True):
+        version = self.next_version(self.cursor)
+        self.cursor.execute('''
+            INSERT INTO products (barcode, name, price, stock, reorder_level,
+                                  row_version)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        ''', (product.barcode, product.name, product.price, product.stock,
+              product.reorder_level, version))
+        product_id = self.cursor.lastrowid
+        if product.stock:
+            self.record_movement(product_id, product.stock, MOV_ALTA)
+        self._notify_after_commit('track', product, product_id)
+        if commit:
+            self.commit()
 
     def get_all_products(self):
-        self.cursor.execute('SELECT * FROM products')
-        rows = self.cursor.fetchall()
-        return [Product.from_db_dict(row) for row in rows]
+        return self._fetch_products()
+
+    def update_product(self, product, movement_type=MOV_AJUSTE, reference=None):
+        """
+        Actualiza un producto y registra la variación de stock, si la hay.
 
-    def update_product(self, product):
+        Args:
+            product: Producto con los datos nuevos
+            movement_type: Tipo del movimiento de stock a registrar
+            reference: Referencia del movimiento (ej: ID de venta)
+        """
+        version = self.next_version(self.cursor)
+        self.cursor.execute(
+            'SELECT stock FROM products WHERE id=%s FOR UPDATE', (product.id,))
+        row = self.cursor.fetchone()
         self.cursor.execute('''
             UPDATE products 
-            SET barcode=%s, name=%s, price=%s, stock=%s
+            SET barcode=%s, name=%s, price=%s, stock=%s, reorder_level=%s,
+                row_version=%s
             WHERE id=%s
-        ''', (product.barcode, product.name, product.price, product.stock, product.id))
+        ''', (product.barcode, product.name, product.price, product.stock,
+              product.reorder_level, version, product.id))
+        if row and int(product.stock) != row['stock']:
+            self.record_movement(
+                product.id, int(product.stock) - row['stock'],
+                movement_type, reference)
+        self.connection.commit()
+        if self.stock_monitor is not None:
+            self.stock_monitor.track(product)
+
+    def adjust_stock(self, product_id, delta, movement_type, reference=None, commit=True):
+        """
+        Suma (o resta) una cantidad al stock y registra el movimiento.
+
+        A diferencia de update_product no pisa el valor leído antes, así
+        que dos terminales pueden descontar stock del mismo producto.
+
+        Args:
+            product_id: ID del producto
+            delta: Variación con signo (negativa para salidas)
+            movement_type: Tipo de movimiento (ver models.stock_movement)
+            reference: Referencia del movimiento (ej: ID de venta)
+            commit: Si es False la transacción queda abierta
+        """
+        version = self.next_version(self.cursor)
+        self.cursor.execute(
+            'UPDATE products SET stock = stock + %s, row_version = %s WHERE id=%s',
+            (delta, version, product_id))
+        self.record_movement(product_id, delta, movement_type, reference)
+        self._notify_after_commit('apply_delta', product_id, delta)
+        if commit:
+            self.commit()
+
+    def deduct_stock(self, product_id, quantity, movement_type, reference=None,
+                     basket_id=None):
+        """
+        Descuenta stock solo si alcanza lo que no reservaron otras canastas
+        (sin confirmar la transacción).
+
+        Args:
+            product_id: ID del producto
+            quantity: Unidades a descontar
+            movement_type: Tipo de movimiento (ver models.stock_movement)
+            reference: Referencia del movimiento (ej: ID de venta)
+            basket_id: Canasta propia, cuyas reservas no se descuentan
+
+        Returns:
+            bool: False si el stock no alcanza (no se descontó nada)
+        """
+        version = self.next_version(self.cursor)
+        self.cursor.execute('''
+            UPDATE products SET stock = stock - %s, row_version = %s
+            WHERE id = %s AND stock - (
+                SELECT COALESCE(SUM(r.quantity), 0) FROM stock_reservations r
+                WHERE r.product_id = %s AND r.expires_at > NOW()
+                  AND r.basket_id <> %s) >= %s
+        ''', (quantity, version, product_id, product_id, basket_id or '',
+              quantity))
+        if self.cursor.rowcount == 0:
+            return False
+        self.record_movement(product_id, -quantity, movement_type, reference)
+        self._notify_after_commit('apply_delta', product_id, -quantity)
+        return True
+
+    def _notify_after_commit(self, method, *args):
+        """Guarda un aviso para stock_monitor hasta el próximo commit()."""
+        if self.stock_monitor is None:
+            return
+        if self._pending_notices is None:
+            self._pending_notices = []
+        self._pending_notices.append((method, args))
+
+    def commit(self):
+        """
+        Confirma la transacción en curso y recién entonces avisa a
+        stock_monitor los cambios de stock que incluía.
+        """
         self.connection.commit()
+        notices, self._pending_notices = self._pending_notices or [], None
+        if self.stock_monitor is not None:
+            for method, args in notices:
+                getattr(self.stock_monitor, method)(*args)
+
+    def rollback(self):
+        """Deshace la transacción en curso y descarta sus avisos de stock."""
+        self._pending_notices = None
+        self.connection.rollback()
+
+    def reserve_stock(self, product_id, basket_id, quantity,
+                      ttl=RESERVATION_CONFIG['ttl_seconds']):
+        """
+        Fija la cantidad reservada de un producto para una canasta.
+
+        Solo bloquea la fila del producto durante esta transacción corta,
+        no mientras dure la canasta: dos cajas que reservan la última unidad
+        se ordenan por ese bloqueo y la segunda ve la reserva de la primera.
+        También renueva el vencimiento de toda la canasta.
+
+        Las lecturas son con bloqueo, así que ven lo último confirmado sin
+        cerrar antes la transacción del que llama. Confirma su propia
+        transacción: no debe llamarse con escrituras pendientes.
+
+        Args:
+            product_id: ID del producto
+            basket_id: Identificador de la canasta
+            quantity: Cantidad total reservada (0 libera la reserva)
+            ttl: Segundos de vigencia de las reservas de la canasta
+
+        Returns:
+            bool: False si el stock no reservado por otras canastas no alcanza
+        """
+        try:
+            self.cursor.execute(
+                'SELECT stock FROM products WHERE id = %s FOR UPDATE', (product_id,))
+            row = self.cursor.fetchone()
+            if quantity > 0:
+                # Lectura con bloqueo: ve las reservas confirmadas después de
+                # tomar el bloqueo del producto, no la foto de la transacción
+                available = (int(row['stock']) - self._reserved_by_others(
+                    product_id, basket_id, lock=True)) if row else 0
+                if available < quantity:
+                    self.connection.rollback()
+                    return False
+                self.cursor.execute('''
+                    INSERT INTO stock_reservations
+                        (basket_id, product_id, quantity, expires_at)
+                    VALUES (%s, %s, %s, NOW() + INTERVAL %s SECOND)
+                    ON DUPLICATE KEY UPDATE
+                        quantity = VALUES(quantity), expires_at = VALUES(expires_at)
+                ''', (basket_id, product_id, quantity, ttl))
+            else:
+                self.cursor.execute(
+                    'DELETE FROM stock_reservations WHERE basket_id = %s AND product_id = %s',
+                    (basket_id, product_id))
+            self.cursor.execute('''
+                UPDATE stock_reservations SET expires_at = NOW() + INTERVAL %s SECOND
+                WHERE basket_id = %s
+            ''', (ttl, basket_id))
+            self.connection.commit()
+            return True
+        except Exception:
+            self.connection.rollback()
+            raise
+
+    def get_available_stock(self, product_id, basket_id=None):
+        """
+        Stock de un producto menos lo reservado por otras canastas vigentes.
+
+        Se lee con una conexión propia y corta: así se ve lo último
+        confirmado sin cerrar la transacción de la conexión compartida.
+
+        Args:
+            product_id: ID del producto
+            basket_id: Canasta propia, cuyas reservas no se descuentan
+
+        Returns:
+            int: Unidades disponibles (0 si el producto no existe)
+        """
+        connection = self.create_connection()
+        try:
+            db = Database.with_connection(connection)
+            db.cursor.execute(
+                'SELECT stock FROM products WHERE id = %s', (product_id,))
+            row = db.cursor.fetchone()
+            if not row:
+                return 0
+            return int(row['stock']) - db._reserved_by_others(product_id, basket_id)
+        finally:
+            connection.close()
+
+    def _reserved_by_others(self, product_id, basket_id, lock=False):
+        """Unidades reservadas por las demás canastas vigentes."""
+        self.cursor.execute(f'''
+            SELECT COALESCE(SUM(quantity), 0) AS reservado
+            FROM stock_reservations
+            WHERE product_id = %s AND expires_at > NOW() AND basket_id <> %s
+            {'LOCK IN SHARE MODE' if lock else ''}
+        ''', (product_id, basket_id or ''))
+        return int(self.cursor.fetchone()['reservado'])
+
+    def release_reservations(self, basket_id):
+        """
+        Libera las reservas de una canasta y purga las vencidas de todas.
+
+        Args:
+            basket_id: Identificador de la canasta
+        """
+        self.cursor.execute(
+            'DELETE FROM stock_reservations WHERE basket_id = %s OR expires_at < NOW()',
+            (basket_id,))
+        self.connection.commit()
+
+    def record_movement(self, product_id, quantity, movement_type, reference=None):
+        """
+        Agrega un movimiento al libro de stock (sin confirmar la transacción).
+
+        Args:
+            product_id: ID del producto
+            quantity: Variación con signo
+            movement_type: Tipo de movimiento
+            reference: Referencia opcional
+        """
+        self.cursor.execute('''
+            INSERT INTO stock_movements (product_id, date, quantity, type, reference)
+            VALUES (%s, NOW(6), %s, %s, %s)
+        ''', (product_id, quantity, movement_type,
+              None if reference is None else str(reference)))
 
     def delete_product(self, product_id):
+        version = self.next_version(self.cursor)
         self.cursor.execute('DELETE FROM products WHERE id=%s', (product_id,))
+        self.cursor.execute('''
+            REPLACE INTO deleted_products (product_id, row_version)
+            VALUES (%s, %s)
+        ''', (product_id, version))
         self.connection.commit()
+        if self.stock_monitor is not None:
+            self.stock_monitor.untrack(product_id)
 
     def get_product_by_id(self, product_id):
-        self.cursor.execute(
-            'SELECT * FROM products WHERE id=%s', (product_id,))
-        row = self.cursor.fetchone()
-        return Product.from_db_dict(row) if row else None
+        products = self._fetch_products('WHERE id=%s', (product_id,))
+        return products[0] if products else None
 
     def get_product_by_barcode(self, barcode):
-        self.cursor.execute(
-            'SELECT * FROM products WHERE barcode=%s', (barcode,))
-        row = self.cursor.fetchone()
-        return Product.from_db_dict(row) if row else None
+        products = self._fetch_products('WHERE barcode=%s', (barcode,))
+        return products[0] if products else None
 
-    def add_sale(self, date: str, total: float, paid: float, change: float) -> int:
+    def add_sale(self, date: str, total: float, paid: float, change: float,
+                 commit: bool = True) -> int:
         self.cursor.execute(
             '''INSERT INTO sales (date, total, paid, `change`) VALUES (%s, %s, %s, %s)''',
             (date, total, paid, change)
         )
-        self.connection.commit()
-        return self.cursor.lastrowid
+        sale_id = self.cursor.lastrowid
+        if commit:
+            self.commit()
+        return sale_id
 
-    def add_sale_detail(self, sale_id: int, product_id: int, quantity: int, unit_price: float) -> None:
+    def add_sale_detail(self, sale_id: int, product_id: int, quantity: int, unit_price: float,
+                        commit: bool = True) -> None:
         self.cursor.execute(
             '''INSERT INTO sale_details (sale_id, product_id, quantity, unit_price) VALUES (%s, %s, %s, %s)''',
             (sale_id, product_id, quantity, unit_price)
         )
-        self.connection.commit()
+        if commit:
+            self.commit()
+
+    def add_sale_details(self, sale_id: int, rows: list[tuple]) -> None:
+        """
+        Agrega todos los renglones de una venta en un solo envío (sin
+        confirmar la transacción).
+
+        Args:
+            sale_id: ID de la venta
+            rows: Tuplas (product_id, cantidad, precio unitario Decimal)
+        """
+        if not rows:
+            return
+        self.cursor.executemany(
+            '''INSERT INTO sale_details (sale_id, product_id, quantity, unit_price) VALUES (%s, %s, %s, %s)''',
+            [(sale_id, product_id, quantity, unit_price)
+             for product_id, quantity, unit_price in rows]
+        )
 
     def execute_query(self, query, params=None):
         """Ejecuta una consulta SELECT y retorna los resultados como lista de diccionarios"""
@@ -146,6 +742,177 @@ class Database:
             print(f"Error en consulta: {e}")
             return []
 
+    def stream_query(self, query, params=None, batch_size=1000):
+        """
+        Ejecuta una consulta con un cursor del lado del servidor.
+
+        Las filas se leen en lotes a medida que se consumen, sin cargar el
+        resultado completo en memoria. El iterador debe consumirse por
+        completo antes de ejecutar otra consulta en la misma conexión.
+
+        Args:
+            query: Consulta SELECT
+            params: Parámetros de la consulta
+            batch_size: Filas por lectura
+
+        Returns:
+            tuple: (cursor.description, iterador de filas como tuplas)
+        """
+        return self._stream(self.connection, query, params, batch_size)
+
+    # Inicio del primer mes que sigue en sales (los anteriores se archivaron)
+    ARCHIVE_CUTOFF_QUERY = (
+        "SELECT DATE_ADD(MAX(month), INTERVAL 1 MONTH) AS cutoff FROM archived_months")
+
+    def get_archive_cutoff(self):
+        """
+        Fecha desde la que las ventas están en `sales` y no en el archivo.
+
+        Returns:
+            datetime: Inicio del primer mes sin archivar, o None si no hay
+                meses archivados
+        """
+        return Database.archive_cutoff_from(
+            self.execute_read_query(Database.ARCHIVE_CUTOFF_QUERY))
+
+    @staticmethod
+    def archive_cutoff_from(rows):
+        """Convierte el resultado de ARCHIVE_CUTOFF_QUERY en datetime."""
+        if not rows or rows[0]['cutoff'] is None:
+            return None
+        return datetime.combine(rows[0]['cutoff'], dtime.min)
+
+    def execute_read_query(self, query, params=None):
+        """
+        Ejecuta una consulta de solo lectura (reportes, exportaciones, análisis).
+
+        Si hay una réplica configurada y su retraso no supera
+        REPLICA_CONFIG['max_lag_seconds'], la consulta se hace en la réplica;
+        si no, o si la réplica falla, en la base principal. Solo para
+        consultas que toleran datos con ese retraso.
+
+        Args:
+            query: Consulta SELECT
+            params: Parámetros de la consulta
+
+        Returns:
+            list: Filas como diccionarios ([] si hubo un error)
+        """
+        replica = self._read_replica()
+        if replica is not None:
+            try:
+                cursor = replica.cursor()
+                try:
+                    cursor.execute(query, params or None)
+                    return cursor.fetchall()
+                finally:
+                    cursor.close()
+            except Exception as e:
+                self._replica_failed(e)
+        return self.execute_query(query, params)
+
+    def stream_read_query(self, query, params=None, batch_size=1000):
+        """
+        Como stream_query, pero en la réplica si está disponible (ver
+        execute_read_query).
+
+        Args:
+            query: Consulta SELECT
+            params: Parámetros de la consulta
+            batch_size: Filas por lectura
+
+        Returns:
+            tuple: (cursor.description, iterador de filas como tuplas)
+        """
+        replica = self._read_replica()
+        if replica is not None:
+            try:
+                return self._stream(replica, query, params, batch_size)
+            except Exception as e:
+                self._replica_failed(e)
+        return self.stream_query(query, params, batch_size)
+
+    def replica_lag(self):
+        """
+        Retraso actual de la réplica en segundos.
+
+        Returns:
+            float: Segundos de retraso, o None si no hay réplica configurada,
+                no responde o no está replicando
+        """
+        if not REPLICA_CONFIG['host']:
+            return None
+        try:
+            if self._replica_connection is None:
+                self._replica_connection = Database.create_replica_connection()
+            cursor = self._replica_connection.cursor()
+            try:
+                try:
+                    cursor.execute("SHOW REPLICA STATUS")
+                except pymysql.err.ProgrammingError:
+                    # MySQL anterior a 8.0.22
+                    cursor.execute("SHOW SLAVE STATUS")
+                status = cursor.fetchone()
+            finally:
+                cursor.close()
+        except Exception as e:
+            self._replica_failed(e)
+            return None
+        if not status:
+            # El servidor no está configurado como réplica
+            return None
+        lag = status.get('Seconds_Behind_Source', status.get('Seconds_Behind_Master'))
+        # NULL: la replicación está detenida
+        return None if lag is None else float(lag)
+
+    def _read_replica(self):
+        """Conexión a la réplica si está al día, o None para usar la principal."""
+        if not REPLICA_CONFIG['host']:
+            return None
+        now = time.monotonic()
+        if (self._replica_checked_at is None
+                or now - self._replica_checked_at >= REPLICA_CONFIG['check_interval']):
+            self._replica_checked_at = now
+            lag = self.replica_lag()
+            ok = lag is not None and lag <= REPLICA_CONFIG['max_lag_seconds']
+            if ok != self._replica_ok:
+                print("Consultas de reportes en la réplica" if ok else
+                      f"Réplica no disponible o atrasada (retraso: {lag}), "
+                      "se usa la base principal")
+            self._replica_ok = ok
+        return self._replica_connection if self._replica_ok else None
+
+    def _replica_failed(self, error):
+        """Descarta la conexión a la réplica hasta el próximo control."""
+        print(f"Error en la réplica, se usa la base principal: {error}")
+        self._replica_ok = False
+        self._replica_checked_at = time.monotonic()
+        if self._replica_connection is not None:
+            try:
+                self._replica_connection.close()
+            except Exception:
+                pass
+            self._replica_connection = None
+
+    @staticmethod
+    def _stream(connection, query, params, batch_size):
+        """Consulta con cursor del lado del servidor en la conexión indicada."""
+        cursor = connection.cursor(CountingSSCursor)
+        cursor.execute(query, params)
+        description = cursor.description
+
+        def rows():
+            try:
+                while True:
+                    batch = cursor.fetchmany(batch_size)
+                    if not batch:
+                        break
+                    yield from batch
+            finally:
+                cursor.close()
+
+        return description, rows()
+
     def cancel_sale(self, sale_id: int, reason: str = "Sin especificar") -> bool:
         """
         Anula una venta y reintegra el stock.
@@ -160,16 +927,20 @@ class Database:
         try:
             from datetime import datetime
 
-            # Verificar que la venta existe y está activa
-            query = "SELECT status FROM sales WHERE id = %s"
+            # Verificar que la venta existe y está activa. La fila queda
+            # bloqueada hasta el commit: si dos terminales anulan la misma
+            # venta, la segunda espera y ve el estado ya anulado
+            query = "SELECT status FROM sales WHERE id = %s FOR UPDATE"
             result = self.execute_query(query, (sale_id,))
 
             if not result:
                 print(f"Venta {sale_id} no encontrada")
+                self.rollback()
                 return False
 
             if result[0]['status'] == 'cancelled':
                 print(f"Venta {sale_id} ya está anulada")
+                self.rollback()
                 return False
 
             # Obtener detalles de la venta para reintegrar stock
@@ -180,12 +951,15 @@ class Database:
             """
             details = self.execute_query(query, (sale_id,))
 
-            # Reintegrar stock de cada producto (excepto VARIOS)
+            # Reintegrar stock de cada producto (excepto VARIOS). Se suma la
+            # cantidad sobre el stock actual (no se pisa con un valor leído
+            # antes) y todo se confirma junto con la anulación
             for detail in details:
                 product = self.get_product_by_id(detail['product_id'])
                 if product and not product.barcode.startswith('VAR'):
-                    product.stock += detail['quantity']
-                    self.update_product(product)
+                    self.adjust_stock(
+                        detail['product_id'], detail['quantity'], MOV_ANULACION,
+                        reference=sale_id, commit=False)
 
             # Marcar venta como anulada
             now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -197,13 +971,13 @@ class Database:
                 WHERE id = %s
             """
             self.cursor.execute(update_query, (now, reason, sale_id))
-            self.connection.commit()
+            self.commit()
 
             return True
 
         except Exception as e:
             print(f"Error al anular venta: {e}")
-            self.connection.rollback()
+            self.rollback()
             return False
 
     def __del__(self):
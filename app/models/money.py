@@ -0,0 +1,142 @@
+"""Importes de dinero exactos en centavos enteros."""
+
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import total_ordering
+from typing import Any
+
+CENT = Decimal('0.01')
+
+
+@total_ordering
+class Money:
+    """Importe en centavos enteros.
+
+    Sumas, restas y productos por cantidades son aritmética de enteros:
+    no hay deriva de redondeo ni conversiones a float/str/Decimal en cada
+    operación. Se convierte a Decimal solo al escribir en la base
+    (DECIMAL(10,2)) y se formatea como un Decimal (f"${importe:,.2f}").
+    """
+
+    __slots__ = ('cents',)
+
+    def __init__(self, cents: int = 0) -> None:
+        """
+        Inicializa el importe.
+
+        Args:
+            cents: Cantidad de centavos
+        """
+        self.cents = cents
+
+    @classmethod
+    def of(cls, value: Any) -> 'Money':
+        """
+        Convierte un valor a Money redondeando al centavo.
+
+        Args:
+            value: Money, int, Decimal, float o texto ("12.50", "$ 12,50")
+
+        Returns:
+            Money: Importe equivalente
+
+        Raises:
+            ValueError: Si el valor no es un importe válido
+        """
+        if isinstance(value, Money):
+            return value
+        if isinstance(value, int):
+            return cls(value * 100)
+        if isinstance(value, str):
+            value = value.replace('$', '').strip()
+            if ',' in value and '.' not in value:
+                value = value.replace(',', '.')
+        elif isinstance(value, float):
+            # repr da el decimal más corto: 0.1 -> "0.1", no 0.1000000000000000055
+            value = repr(value)
+        try:
+            amount = Decimal(value)
+        except (InvalidOperation, TypeError):
+            raise ValueError(f"Importe inválido: {value!r}") from None
+        if not amount.is_finite():
+            raise ValueError(f"Importe inválido: {value!r}")
+        return cls(int(amount.quantize(CENT, rounding=ROUND_HALF_UP).scaleb(2)))
+
+    def to_decimal(self) -> Decimal:
+        """
+        Importe como Decimal con dos decimales (para la base de datos).
+
+        Returns:
+            Decimal: Importe exacto
+        """
+        return Decimal(self.cents).scaleb(-2)
+
+    @staticmethod
+    def _coerce(other: Any) -> 'Money':
+        # Los float no se aceptan implícitamente: deben pasar por Money.of
+        if isinstance(other, Money):
+            return other
+        if isinstance(other, (int, Decimal)) and not isinstance(other, bool):
+            return Money.of(other)
+        return NotImplemented
+
+    def __add__(self, other: Any) -> 'Money':
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return other
+        return Money(self.cents + other.cents)
+
+    # sum() empieza en 0
+    __radd__ = __add__
+
+    def __sub__(self, other: Any) -> 'Money':
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return other
+        return Money(self.cents - other.cents)
+
+    def __rsub__(self, other: Any) -> 'Money':
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return other
+        return Money(other.cents - self.cents)
+
+    def __mul__(self, quantity: Any) -> 'Money':
+        if not isinstance(quantity, int) or isinstance(quantity, bool):
+            return NotImplemented
+        return Money(self.cents * quantity)
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> 'Money':
+        return Money(-self.cents)
+
+    def __eq__(self, other: Any) -> bool:
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return other
+        return self.cents == other.cents
+
+    def __lt__(self, other: Any) -> bool:
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return other
+        return self.cents < other.cents
+
+    def __hash__(self) -> int:
+        # Igual que el Decimal equivalente, porque se comparan como iguales
+        return hash(self.to_decimal())
+
+    def __bool__(self) -> bool:
+        return self.cents != 0
+
+    def __float__(self) -> float:
+        return self.cents / 100
+
+    def __str__(self) -> str:
+        return str(self.to_decimal())
+
+    def __repr__(self) -> str:
+        return f"Money('{self}')"
+
+    def __format__(self, spec: str) -> str:
+        return format(self.to_decimal(), spec)
@@ -1,22 +1,56 @@
+from decimal import Decimal
+
+
 class Product:
-    def __init__(self, barcode, name, price, stock=0, id=None):
+    # Sin __dict__ por instancia: el catálogo completo ocupa mucho menos
+    __slots__ = ('id', 'barcode', 'name', 'price', 'stock', 'reorder_level')
+
+    # Columnas en el orden que espera from_row
+    COLUMNS = __slots__
+
+    def __init__(self, barcode, name, price, stock=0, id=None, reorder_level=0):
         self.id = id
         self.barcode = barcode
         self.name = name
-        self.price = price
+        # Precio exacto (DECIMAL(10,2) en la base)
+        self.price = price if isinstance(price, Decimal) else Decimal(str(price))
         self.stock = stock
+        self.reorder_level = reorder_level
+
+    def __repr__(self):
+        return (f"Product(id={self.id!r}, barcode={self.barcode!r}, "
+                f"name={self.name!r}, price={self.price!r}, stock={self.stock!r})")
+
+    @property
+    def is_low_stock(self):
+        """True si el producto tiene stock mínimo y está en o por debajo."""
+        return self.reorder_level > 0 and self.stock <= self.reorder_level
 
     def to_tuple(self):
         return (self.barcode, self.name, self.price, self.stock)
 
+    @classmethod
+    def from_row(cls, row):
+        """Crea un producto desde una tupla con las columnas de COLUMNS.
+
+        Es el camino rápido para cargar el catálogo: no pasa por __init__ ni
+        por un diccionario intermedio (pymysql ya devuelve el precio como
+        Decimal).
+        """
+        product = cls.__new__(cls)
+        (product.id, product.barcode, product.name, product.price,
+         product.stock, product.reorder_level) = row
+        return product
+
     @staticmethod
     def from_db_dict(dict_data):
         return Product(
             id=dict_data['id'],
             barcode=dict_data['barcode'],
             name=dict_data['name'],
-            price=float(dict_data['price']),
-            stock=dict_data['stock']
+            price=dict_data['price'],
+            stock=int(dict_data.get('stock') or 0),
+            reorder_level=dict_data.get('reorder_level') or 0
         )
 
     @staticmethod
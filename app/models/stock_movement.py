@@ -0,0 +1,17 @@
+"""Tipos de movimiento del libro de stock (`stock_movements`).
+
+Cada movimiento guarda la variación con signo (negativa para las salidas),
+de modo que el stock de un producto en una fecha es la suma de sus
+movimientos hasta ese momento.
+"""
+
+MOV_ALTA = 'alta'              # Stock inicial al crear el producto
+MOV_VENTA = 'venta'            # Salida por venta confirmada
+MOV_ANULACION = 'anulacion'    # Reintegro por venta anulada
+MOV_AJUSTE = 'ajuste'          # Edición manual del producto
+MOV_IMPORTACION = 'importacion'  # Importación masiva desde archivo
+MOV_CONTEO = 'conteo'          # Diferencia detectada en un conteo de stock
+
+MOVEMENT_TYPES = (
+    MOV_ALTA, MOV_VENTA, MOV_ANULACION, MOV_AJUSTE, MOV_IMPORTACION, MOV_CONTEO
+)
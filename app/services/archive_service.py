@@ -0,0 +1,211 @@
+"""Archivo del historial de ventas por mes.
+
+Los meses cerrados se mueven de `sales`/`sale_details` a `sales_archive`/
+`sale_details_archive` (mismas columnas, sin claves foráneas) y se guardan
+agregados precalculados:
+
+- `sales_hourly`: cantidad y total de las ventas activas por hora
+- `product_sales_monthly`: unidades y monto vendido por producto y mes
+
+Los meses se archivan en orden y de a uno por transacción, así `sales`
+siempre contiene todo lo posterior al último mes archivado
+(`Database.get_archive_cutoff`) y ReportService puede elegir qué tablas
+consultar según el rango pedido.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, time as dtime, timedelta
+from typing import Any, Optional
+
+from ..models.database import Database
+from config import ARCHIVE_CONFIG
+
+
+@dataclass
+class ArchivedMonth:
+    """Resultado del archivo de un mes."""
+
+    month: date
+    ventas: int
+    detalles: int
+
+
+def month_start(day: date) -> date:
+    """Primer día del mes de una fecha."""
+    return day.replace(day=1)
+
+
+def next_month(day: date) -> date:
+    """Primer día del mes siguiente."""
+    return (month_start(day) + timedelta(days=32)).replace(day=1)
+
+
+class ArchiveService:
+    """Mueve los meses cerrados de ventas a las tablas de archivo."""
+
+    def __init__(
+        self,
+        connection: Any = None,
+        keep_months: int = ARCHIVE_CONFIG['keep_months']
+    ) -> None:
+        """
+        Inicializa el servicio.
+
+        Args:
+            connection: Conexión pymysql (por defecto la de Database())
+            keep_months: Meses cerrados que se conservan en `sales` además
+                del mes actual (las anulaciones solo trabajan sobre las
+                tablas de ventas; reportes, pronóstico y exportaciones
+                también leen el archivo)
+        """
+        if keep_months < 1:
+            raise ValueError("Se debe conservar al menos un mes cerrado")
+        self.connection = connection if connection is not None else Database().connection
+        self.keep_months = keep_months
+
+    def archive_limit(self, today: Optional[date] = None) -> date:
+        """
+        Primer mes que no se archiva.
+
+        Args:
+            today: Fecha de referencia (por defecto hoy)
+
+        Returns:
+            date: Primer día del mes límite
+        """
+        month = month_start(today or date.today())
+        for _ in range(self.keep_months):
+            month = month_start(month - timedelta(days=1))
+        return month
+
+    def pending_months(self, today: Optional[date] = None) -> list[date]:
+        """
+        Meses con ventas en `sales` anteriores al límite de archivo.
+
+        Args:
+            today: Fecha de referencia (por defecto hoy)
+
+        Returns:
+            list: Primer día de cada mes a archivar, del más viejo al más nuevo
+        """
+        cursor = self.connection.cursor()
+        try:
+            # Los IDs crecen con la fecha: la primera venta sale por la clave
+            cursor.execute("SELECT date FROM sales ORDER BY id LIMIT 1")
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+        if not row:
+            return []
+
+        limit = self.archive_limit(today)
+        months = []
+        month = month_start(row['date'].date())
+        while month < limit:
+            months.append(month)
+            month = next_month(month)
+        return months
+
+    def archive_month(self, month: date, today: Optional[date] = None) -> ArchivedMonth:
+        """
+        Archiva las ventas de un mes en una transacción.
+
+        Args:
+            month: Cualquier día del mes a archivar
+            today: Fecha de referencia (por defecto hoy)
+
+        Returns:
+            ArchivedMonth: Ventas y detalles movidos
+        """
+        month = month_start(month)
+        if month >= self.archive_limit(today):
+            raise ValueError(f"El mes {month:%m/%Y} todavía no se puede archivar")
+        start = datetime.combine(month, dtime.min)
+        end = datetime.combine(next_month(month), dtime.min)
+        in_month = "s.date >= %s AND s.date < %s"
+
+        cursor = self.connection.cursor()
+        try:
+            # Agregados primero, calculados sobre las filas que se mueven.
+            # ON DUPLICATE suma por si el mes ya tenía una parte archivada
+            cursor.execute(f"""
+                INSERT INTO sales_hourly (hour, cantidad_ventas, total)
+                SELECT DATE(s.date) + INTERVAL HOUR(s.date) HOUR AS hora,
+                       COUNT(*), SUM(s.total)
+                FROM sales s
+                WHERE s.status = 'active' AND {in_month}
+                GROUP BY hora
+                ON DUPLICATE KEY UPDATE
+                    cantidad_ventas = cantidad_ventas + VALUES(cantidad_ventas),
+                    total = total + VALUES(total)
+            """, (start, end))
+            cursor.execute(f"""
+                INSERT INTO product_sales_monthly
+                    (month, product_id, cantidad_vendida, monto_total)
+                SELECT %s, sd.product_id, SUM(sd.quantity),
+                       SUM(sd.quantity * sd.unit_price)
+                FROM sales s
+                JOIN sale_details sd ON sd.sale_id = s.id
+                WHERE s.status = 'active' AND {in_month}
+                GROUP BY sd.product_id
+                ON DUPLICATE KEY UPDATE
+                    cantidad_vendida = cantidad_vendida + VALUES(cantidad_vendida),
+                    monto_total = monto_total + VALUES(monto_total)
+            """, (month, start, end))
+
+            cursor.execute(f"""
+                INSERT INTO sale_details_archive
+                    (id, sale_id, product_id, quantity, unit_price)
+                SELECT sd.id, sd.sale_id, sd.product_id, sd.quantity, sd.unit_price
+                FROM sales s
+                JOIN sale_details sd ON sd.sale_id = s.id
+                WHERE {in_month}
+            """, (start, end))
+            detalles = cursor.rowcount
+            cursor.execute(f"""
+                INSERT INTO sales_archive
+                    (id, date, total, paid, `change`, status,
+                     cancelled_at, cancellation_reason)
+                SELECT s.id, s.date, s.total, s.paid, s.`change`, s.status,
+                       s.cancelled_at, s.cancellation_reason
+                FROM sales s
+                WHERE {in_month}
+            """, (start, end))
+            ventas = cursor.rowcount
+
+            cursor.execute(f"""
+                DELETE sd FROM sale_details sd
+                JOIN sales s ON sd.sale_id = s.id
+                WHERE {in_month}
+            """, (start, end))
+            cursor.execute(
+                f"DELETE s FROM sales s WHERE {in_month}", (start, end))
+
+            cursor.execute("""
+                INSERT INTO archived_months (month, ventas, detalles, archived_at)
+                VALUES (%s, %s, %s, NOW())
+                ON DUPLICATE KEY UPDATE
+                    ventas = ventas + VALUES(ventas),
+                    detalles = detalles + VALUES(detalles),
+                    archived_at = VALUES(archived_at)
+            """, (month, ventas, detalles))
+            self.connection.commit()
+            return ArchivedMonth(month, ventas, detalles)
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def archive_closed_months(self, today: Optional[date] = None) -> list[ArchivedMonth]:
+        """
+        Archiva todos los meses pendientes, del más viejo al más nuevo.
+
+        Args:
+            today: Fecha de referencia (por defecto hoy)
+
+        Returns:
+            list: Un resultado por mes archivado
+        """
+        return [self.archive_month(month, today)
+                for month in self.pending_months(today)]
@@ -0,0 +1,234 @@
+"""Actualizaciones masivas de precios y stock.
+
+Cada operación es una sola sentencia `UPDATE` sobre el conjunto de
+productos afectado (en lugar de un `update_product` por fila), ejecutada
+en una transacción. Los artículos VARIOS (código `VAR-...`) nunca se
+modifican.
+"""
+
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from ..models.database import Database
+from ..models.stock_movement import MOV_CONTEO
+from .import_service import ProductImportService
+
+STOCK_COUNT_COLUMNS = frozenset({'barcode', 'stock'})
+
+
+def _like_escape(text: str) -> str:
+    """Escapa los comodines de LIKE para buscar el texto tal cual."""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+@dataclass
+class StockCountResult:
+    """Resumen de la carga de un conteo de stock."""
+
+    total: int = 0
+    updated: int = 0
+    unknown: list[str] = field(default_factory=list)
+    errors: list[tuple[int, str, dict[str, Any]]] = field(default_factory=list)
+    error_file: Optional[str] = None
+
+
+class BulkUpdateService:
+    """Cambios de precio por porcentaje y cargas de conteo de stock."""
+
+    def __init__(self, connection: Any = None, error_dir: Optional[Path] = None) -> None:
+        """
+        Inicializa el servicio.
+
+        Args:
+            connection: Conexión pymysql (por defecto la de Database())
+            error_dir: Carpeta del CSV de errores (por defecto reportes)
+        """
+        self.connection = connection if connection is not None else Database().connection
+        self.error_dir = error_dir
+
+    @staticmethod
+    def _product_filter(
+        name_contains: Optional[str], barcode_prefix: Optional[str]
+    ) -> tuple[str, tuple]:
+        """Arma la condición WHERE de los productos afectados."""
+        conditions = ["barcode NOT LIKE 'VAR-%%'"]
+        params: tuple = ()
+        if name_contains:
+            conditions.append("name LIKE %s")
+            params += (f"%{_like_escape(name_contains)}%",)
+        if barcode_prefix:
+            conditions.append("barcode LIKE %s")
+            params += (f"{_like_escape(barcode_prefix)}%",)
+        return "WHERE " + " AND ".join(conditions), params
+
+    def count_products(
+        self,
+        name_contains: Optional[str] = None,
+        barcode_prefix: Optional[str] = None
+    ) -> int:
+        """
+        Cuenta los productos que afectaría un cambio de precio.
+
+        Args:
+            name_contains: Texto que debe contener el nombre
+            barcode_prefix: Prefijo del código de barras
+
+        Returns:
+            int: Cantidad de productos
+        """
+        where, params = self._product_filter(name_contains, barcode_prefix)
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(
+                f"SELECT COUNT(*) AS cantidad FROM products {where}", params)
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+        return int(row['cantidad']) if row else 0
+
+    def change_prices(
+        self,
+        percentage: Decimal,
+        name_contains: Optional[str] = None,
+        barcode_prefix: Optional[str] = None
+    ) -> int:
+        """
+        Aplica un aumento o descuento porcentual a los productos filtrados.
+
+        Args:
+            percentage: Porcentaje a aplicar (10 = +10 %, -5 = -5 %)
+            name_contains: Texto que debe contener el nombre
+            barcode_prefix: Prefijo del código de barras
+
+        Returns:
+            int: Cantidad de productos actualizados
+        """
+        percentage = Decimal(str(percentage))
+        if percentage <= -100:
+            raise ValueError("El porcentaje debe ser mayor a -100")
+
+        factor = 1 + percentage / 100
+        where, params = self._product_filter(name_contains, barcode_prefix)
+        cursor = self.connection.cursor()
+        try:
+            version = Database.next_version(cursor)
+            cursor.execute(
+                "UPDATE products SET price = ROUND(price * %s, 2), "
+                f"row_version = %s {where}",
+                (factor, version) + params
+            )
+            updated = cursor.rowcount
+            self.connection.commit()
+            return updated
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def apply_stock_count(self, counts: dict[str, int]) -> tuple[int, list[str]]:
+        """
+        Reemplaza el stock de los productos contados.
+
+        Los conteos se cargan en una tabla temporal, las diferencias se
+        registran en el libro de stock y se aplican con un único
+        UPDATE ... JOIN. La versión se toma recién antes de tocar
+        `products`, para no bloquear `data_versions` (y con ella las ventas
+        de las cajas) mientras se cargan y comparan los conteos.
+
+        Args:
+            counts: Stock contado por código de barras
+
+        Returns:
+            tuple: (productos actualizados, códigos que no existen)
+        """
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                CREATE TEMPORARY TABLE IF NOT EXISTS stock_count (
+                    barcode VARCHAR(13) PRIMARY KEY,
+                    stock INT NOT NULL
+                )
+            """)
+            cursor.execute("DELETE FROM stock_count")
+            cursor.executemany(
+                "INSERT INTO stock_count (barcode, stock) VALUES (%s, %s)",
+                list(counts.items())
+            )
+            cursor.execute("""
+                SELECT c.barcode
+                FROM stock_count c
+                LEFT JOIN products p ON p.barcode = c.barcode
+                WHERE p.id IS NULL
+                ORDER BY c.barcode
+            """)
+            unknown = [row['barcode'] for row in cursor.fetchall()]
+
+            # Desde acá se bloquean filas de products: primero la versión
+            version = Database.next_version(cursor)
+            # Registrar la diferencia contada antes de pisar el stock
+            cursor.execute("""
+                INSERT INTO stock_movements (product_id, date, quantity, type, reference)
+                SELECT p.id, NOW(6), c.stock - p.stock, %s, NULL
+                FROM products p
+                JOIN stock_count c ON c.barcode = p.barcode
+                WHERE c.stock <> p.stock AND p.barcode NOT LIKE 'VAR-%%'
+            """, (MOV_CONTEO,))
+            cursor.execute("""
+                UPDATE products p
+                JOIN stock_count c ON c.barcode = p.barcode
+                SET p.stock = c.stock, p.row_version = %s
+                WHERE p.barcode NOT LIKE 'VAR-%%'
+            """, (version,))
+            updated = cursor.rowcount
+            cursor.execute("DROP TEMPORARY TABLE IF EXISTS stock_count")
+            self.connection.commit()
+            return updated, unknown
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def import_stock_count(
+        self,
+        path: str,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> StockCountResult:
+        """
+        Carga un conteo de stock desde un CSV o Excel (código, stock).
+
+        Si un código aparece en varias filas (ej: contado en dos
+        góndolas) las cantidades se suman.
+
+        Args:
+            path: Ruta del archivo
+            progress: Función que recibe la cantidad de filas leídas
+
+        Returns:
+            StockCountResult: Resumen del conteo aplicado
+        """
+        reader = ProductImportService(self.connection, error_dir=self.error_dir)
+        result = StockCountResult()
+        counts: dict[str, int] = {}
+        for line, raw in reader.read_rows(path, STOCK_COUNT_COLUMNS):
+            result.total += 1
+            try:
+                barcode = reader.parse_barcode(raw.get('barcode'))
+                stock = reader.parse_stock(raw.get('stock'))
+            except ValueError as e:
+                result.errors.append((line, str(e), raw))
+                continue
+            counts[barcode] = counts.get(barcode, 0) + stock
+            if progress and result.total % 1000 == 0:
+                progress(result.total)
+
+        if counts:
+            result.updated, result.unknown = self.apply_stock_count(counts)
+        if progress:
+            progress(result.total)
+        if result.errors:
+            result.error_file = reader.write_errors(result.errors)
+        return result
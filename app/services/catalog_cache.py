@@ -0,0 +1,103 @@
+"""Catálogo de productos en memoria compartido entre hilos."""
+
+from typing import Any, Optional
+import threading
+import time
+
+from ..models.database import Database
+from ..models.product import Product
+
+
+class CatalogCache:
+    """Productos indexados por código de barras.
+
+    Se carga completo una vez y después se mantiene al día con el aviso de
+    cambios de `products` (`Database.get_products_changed_since`): como
+    máximo cada `max_age` segundos se consulta la versión de la tabla y solo
+    si cambió se leen los productos modificados o eliminados.
+    """
+
+    def __init__(self, pool: Any, max_age: float = 1.0) -> None:
+        """
+        Inicializa el catálogo vacío.
+
+        Args:
+            pool: ConnectionPool de donde tomar conexiones
+            max_age: Segundos entre consultas de la versión
+        """
+        self.pool = pool
+        self.max_age = max_age
+        self.version: Optional[int] = None
+        self._by_barcode: dict[str, Product] = {}
+        self._by_id: dict[int, Product] = {}
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, barcode: str) -> Optional[Product]:
+        """
+        Busca un producto por código de barras.
+
+        Args:
+            barcode: Código de barras
+
+        Returns:
+            Product: Producto o None si no existe
+        """
+        self.refresh()
+        with self._lock:
+            return self._by_barcode.get(barcode)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._by_barcode)
+
+    def invalidate(self) -> None:
+        """Fuerza la consulta de la versión en la próxima búsqueda."""
+        with self._lock:
+            self._checked_at = 0.0
+
+    def refresh(self, force: bool = False) -> None:
+        """
+        Trae los cambios si pasó más de `max_age` desde la última consulta.
+
+        Args:
+            force: Consultar aunque no haya pasado el tiempo
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._checked_at < self.max_age:
+                return
+            # Un solo hilo consulta la base; los demás siguen usando el
+            # catálogo actual hasta que termine
+            self._checked_at = now
+            version = self.version
+
+        with self.pool.connection() as connection:
+            db = Database.with_connection(connection)
+            if version is None:
+                # Versión antes que productos, en la misma transacción
+                current = db.get_data_version()
+                changed, deleted = db.get_all_products(), []
+            else:
+                current, changed, deleted = db.get_products_changed_since(version)
+                if current < version:
+                    # La base se restauró: volver a cargar todo
+                    current = db.get_data_version()
+                    changed, deleted, version = db.get_all_products(), [], None
+
+        with self._lock:
+            if version is None:
+                self._by_barcode, self._by_id = {}, {}
+            for product_id in deleted:
+                self._remove(product_id)
+            for product in changed:
+                self._remove(product.id)
+                self._by_id[product.id] = product
+                self._by_barcode[product.barcode] = product
+            self.version = current
+
+    def _remove(self, product_id: int) -> None:
+        """Quita un producto de los dos índices."""
+        old = self._by_id.pop(product_id, None)
+        if old is not None and self._by_barcode.get(old.barcode) is old:
+            del self._by_barcode[old.barcode]
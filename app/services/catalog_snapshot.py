@@ -0,0 +1,182 @@
+"""Copia local del catálogo para arrancar la caja sin esperar a MySQL.
+
+Al cerrar, la terminal guarda el catálogo que tiene en memoria en un archivo
+binario columnar etiquetado con la versión de `products` que refleja. Al
+iniciar se muestra esa copia enseguida y en segundo plano se piden solo los
+cambios posteriores a esa versión.
+
+Formato (little endian):
+
+- cabecera `<4sHQI`: marca, formato, versión de datos y cantidad de productos
+- origen: base de datos de la que salió la copia (largo `<H` + UTF-8)
+- columnas `id`, `stock`, `reorder_level` y precio en centavos (int64 cada una)
+- códigos y nombres: dos bloques UTF-8 separados por NUL (largo `<I` + bytes)
+- CRC32 de todo lo anterior (`<I`)
+
+Un archivo de otro formato, de otra base o dañado se ignora (se carga
+todo desde la base como siempre).
+"""
+
+from array import array
+from decimal import Decimal
+from pathlib import Path
+from typing import Optional, Union
+import os
+import struct
+import sys
+import zlib
+
+from ..models.product import Product
+from config import CATALOG_SNAPSHOT_CONFIG, MYSQL_CONFIG
+
+MAGIC = b'ACAT'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHQI')
+SHORT_LENGTH = struct.Struct('<H')
+LENGTH = struct.Struct('<I')
+SEPARATOR = '\x00'
+
+
+def database_source() -> str:
+    """
+    Identifica la base configurada (las versiones solo valen dentro de ella).
+
+    Returns:
+        str: "host:puerto/base"
+    """
+    return (f"{MYSQL_CONFIG['host']}:{MYSQL_CONFIG['port']}/"
+            f"{MYSQL_CONFIG['database']}")
+
+
+def _column(values: list[int]) -> bytes:
+    """Empaqueta una columna de enteros como int64 little endian."""
+    column = array('q', values)
+    if sys.byteorder != 'little':
+        column.byteswap()
+    return column.tobytes()
+
+
+class CatalogSnapshot:
+    """Lee y escribe la copia local del catálogo."""
+
+    def __init__(
+        self,
+        path: Union[str, Path] = CATALOG_SNAPSHOT_CONFIG['path'],
+        source: Optional[str] = None
+    ) -> None:
+        """
+        Inicializa la copia local.
+
+        Args:
+            path: Archivo de la copia
+            source: Base de origen (por defecto la de MYSQL_CONFIG)
+        """
+        self.path = Path(path)
+        self.source = source if source is not None else database_source()
+
+    def save(self, version: int, products: list[Product]) -> bool:
+        """
+        Guarda el catálogo de forma atómica (archivo temporal + reemplazo).
+
+        Args:
+            version: Versión de `products` que reflejan los productos
+            products: Catálogo completo
+
+        Returns:
+            bool: True si se guardó
+        """
+        try:
+            source = self.source.encode('utf-8')
+            barcodes = SEPARATOR.join(p.barcode for p in products).encode('utf-8')
+            names = SEPARATOR.join(p.name for p in products).encode('utf-8')
+            parts = [
+                HEADER.pack(MAGIC, FORMAT_VERSION, version, len(products)),
+                SHORT_LENGTH.pack(len(source)), source,
+                _column([p.id for p in products]),
+                _column([int(p.stock) for p in products]),
+                _column([int(p.reorder_level or 0) for p in products]),
+                _column([int(p.price * 100) for p in products]),
+                LENGTH.pack(len(barcodes)), barcodes,
+                LENGTH.pack(len(names)), names,
+            ]
+            data = b''.join(parts)
+            data += LENGTH.pack(zlib.crc32(data))
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix('.tmp')
+            tmp.write_bytes(data)
+            os.replace(tmp, self.path)
+            return True
+        except (OSError, TypeError, ValueError, struct.error) as e:
+            print(f"Error al guardar la copia local del catálogo: {e}")
+            return False
+
+    def load(self) -> Optional[tuple[int, list[Product]]]:
+        """
+        Lee la copia local.
+
+        Returns:
+            tuple: (versión, productos), o None si no hay una copia válida
+        """
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"Error al leer la copia local del catálogo: {e}")
+            return None
+
+        try:
+            return self._decode(data)
+        except (ValueError, IndexError, struct.error, UnicodeDecodeError) as e:
+            print(f"Copia local del catálogo ignorada: {e}")
+            return None
+
+    def _decode(self, data: bytes) -> Optional[tuple[int, list[Product]]]:
+        """Decodifica el contenido del archivo (ValueError si está dañado)."""
+        if len(data) < HEADER.size + LENGTH.size:
+            raise ValueError("archivo incompleto")
+        body, (crc,) = data[:-LENGTH.size], LENGTH.unpack(data[-LENGTH.size:])
+        magic, file_format, version, count = HEADER.unpack_from(body)
+        if magic != MAGIC or file_format != FORMAT_VERSION:
+            return None
+        if zlib.crc32(body) != crc:
+            raise ValueError("CRC incorrecto")
+
+        offset = HEADER.size
+        (length,) = SHORT_LENGTH.unpack_from(body, offset)
+        offset += SHORT_LENGTH.size
+        if body[offset:offset + length].decode('utf-8') != self.source:
+            return None
+        offset += length
+
+        columns = []
+        for _ in range(4):
+            column = array('q')
+            column.frombytes(body[offset:offset + count * column.itemsize])
+            if sys.byteorder != 'little':
+                column.byteswap()
+            columns.append(column)
+            offset += count * column.itemsize
+        ids, stocks, reorder_levels, cents = columns
+
+        texts = []
+        for _ in range(2):
+            (length,) = LENGTH.unpack_from(body, offset)
+            offset += LENGTH.size
+            block = body[offset:offset + length].decode('utf-8')
+            texts.append(block.split(SEPARATOR) if count else [])
+            offset += length
+        barcodes, names = texts
+        if offset != len(body) or len(barcodes) != count or len(names) != count:
+            raise ValueError("columnas de distinto largo")
+
+        # Los precios se repiten mucho: un Decimal por precio distinto
+        prices = {c: Decimal(c).scaleb(-2) for c in set(cents)}
+        from_row = Product.from_row
+        products = [
+            from_row((id_, barcode, name, prices[price], stock, reorder_level))
+            for id_, barcode, name, price, stock, reorder_level
+            in zip(ids, barcodes, names, cents, stocks, reorder_levels)
+        ]
+        return version, products
@@ -0,0 +1,154 @@
+"""Caché de gráficos PNG para los reportes PDF."""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+import hashlib
+import json
+import os
+import threading
+
+from .metrics import record_cache
+
+
+class ChartCache:
+    """Caché LRU de imágenes en memoria con persistencia en disco.
+
+    Las imágenes se identifican por un hash de los datos graficados y del
+    tamaño, de modo que un reporte con los mismos datos reutiliza el PNG
+    sin volver a ejecutar matplotlib.
+    """
+
+    _shared: dict[str, 'ChartCache'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, directory: Path, max_entries: int = 32) -> None:
+        """
+        Inicializa la caché.
+
+        Args:
+            directory: Carpeta donde se guardan los PNG
+            max_entries: Máximo de imágenes en memoria y en disco
+        """
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_directory(cls, directory: Path, max_entries: int = 32) -> 'ChartCache':
+        """
+        Retorna la caché compartida del proceso para una carpeta.
+
+        Args:
+            directory: Carpeta de la caché
+            max_entries: Máximo de imágenes (solo al crearla)
+
+        Returns:
+            ChartCache: Instancia compartida
+        """
+        key = str(Path(directory).resolve())
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(directory, max_entries)
+            return cls._shared[key]
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Calcula la clave de un gráfico a partir de sus datos y tamaño.
+
+        Args:
+            *parts: Valores serializables a JSON que definen el gráfico
+
+        Returns:
+            str: Hash hexadecimal
+        """
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Busca una imagen en memoria y luego en disco.
+
+        Args:
+            key: Clave del gráfico
+
+        Returns:
+            bytes: PNG cacheado o None
+        """
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                record_cache('graficos', True)
+                return data
+
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            record_cache('graficos', False)
+            return None
+
+        # Marcar como usado recientemente
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+            self._remember(key, data)
+        record_cache('graficos', True)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """
+        Guarda una imagen en memoria y en disco.
+
+        Args:
+            key: Clave del gráfico
+            data: Contenido PNG
+        """
+        with self._lock:
+            self._remember(key, data)
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = self._path(key).with_suffix('.tmp')
+            tmp.write_bytes(data)
+            os.replace(tmp, self._path(key))
+            self._prune_disk()
+        except OSError as e:
+            print(f"Error al guardar gráfico en caché: {e}")
+
+    def clear(self) -> None:
+        """Vacía la caché en memoria y en disco."""
+        with self._lock:
+            self._memory.clear()
+        if self.directory.exists():
+            for file in self.directory.glob('*.png'):
+                file.unlink(missing_ok=True)
+
+    def _remember(self, key: str, data: bytes) -> None:
+        """Agrega a la caché en memoria respetando el límite."""
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _prune_disk(self) -> None:
+        """Elimina los archivos menos usados si se supera el límite."""
+        files = sorted(
+            self.directory.glob('*.png'), key=lambda f: f.stat().st_mtime)
+        for file in files[:max(len(files) - self.max_entries, 0)]:
+            file.unlink(missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        """Ruta del archivo de una clave."""
+        return self.directory / f"{key}.png"
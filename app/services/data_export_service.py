@@ -0,0 +1,264 @@
+"""Exportación de datos crudos para sistemas contables.
+
+A diferencia de ExportService (reportes con formato), acá se vuelcan las
+tablas `sales`, `sale_details` y `products` tal cual están. Las ventas
+incluyen los meses movidos a `sales_archive`/`sale_details_archive`: se
+leen primero las filas archivadas y después las de `sales` (los IDs de
+las ventas archivadas son menores, así que el orden por ID se mantiene):
+
+- CSV: las filas se escriben a medida que llegan de un cursor del lado del
+  servidor, sin cargar la tabla en memoria.
+- NPZ: formato columnar comprimido de NumPy (un arreglo tipado por
+  columna). Los DECIMAL se guardan como enteros en centavos (`<col>_cents`)
+  y las fechas como datetime64. Los arreglos enteros no admiten NULL: se
+  escribe -1 en las columnas enteras y 0 en los centavos, y si la columna
+  tiene algún NULL se agrega `<col>_null` (bool) con las filas que lo eran.
+  Las fechas NULL quedan como NaT y los textos como ''.
+
+El modo incremental exporta solo las ventas con ID mayor al de la última
+exportación (el estado se guarda en `.export_state.json`). El corte deja
+afuera las ventas de los últimos `settle_seconds`: una venta se confirma
+en varias transacciones (cabecera y detalles) y los IDs autoincrementales
+pueden confirmarse fuera de orden, así que lo más reciente puede estar
+incompleto. Esas ventas entran en la exportación siguiente.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Iterable, Optional
+import csv
+import json
+
+import numpy as np
+from pymysql.constants import FIELD_TYPE
+
+from ..models.database import Database
+from config import DATA_EXPORT_CONFIG
+
+TABLES = {
+    'sales': (
+        "SELECT id, date, total, paid, `change`, status, cancelled_at, "
+        "cancellation_reason FROM {table}",
+        'id'
+    ),
+    'sale_details': (
+        "SELECT id, sale_id, product_id, quantity, unit_price FROM {table}",
+        'sale_id'
+    ),
+    'products': (
+        "SELECT id, barcode, name, price, stock FROM {table}",
+        None  # Siempre completo: no depende de las ventas
+    ),
+}
+
+# Tabla de archivo que se lee antes de cada tabla de ventas
+ARCHIVE_TABLES = {
+    'sales': 'sales_archive',
+    'sale_details': 'sale_details_archive',
+}
+
+DECIMAL_TYPES = {FIELD_TYPE.DECIMAL, FIELD_TYPE.NEWDECIMAL}
+INTEGER_TYPES = {FIELD_TYPE.TINY, FIELD_TYPE.SHORT, FIELD_TYPE.LONG,
+                 FIELD_TYPE.LONGLONG, FIELD_TYPE.INT24}
+DATETIME_TYPES = {FIELD_TYPE.DATETIME, FIELD_TYPE.TIMESTAMP, FIELD_TYPE.DATE}
+
+
+class DataExportService:
+    """Exporta tablas completas o incrementales en CSV o NPZ."""
+
+    STATE_FILE = ".export_state.json"
+
+    def __init__(
+        self,
+        db: Any = None,
+        output_dir: Optional[Path] = None,
+        settle_seconds: int = DATA_EXPORT_CONFIG['settle_seconds']
+    ) -> None:
+        """
+        Inicializa el servicio.
+
+        Args:
+            db: Objeto con `execute_read_query` y `stream_read_query` (por defecto Database())
+            output_dir: Carpeta de salida (por defecto reportes/datos)
+            settle_seconds: Antigüedad mínima de las ventas del corte incremental
+        """
+        self.db = db if db is not None else Database()
+        self.output_dir = Path(output_dir or Path("reportes") / "datos")
+        self.settle_seconds = settle_seconds
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+    def export(
+        self,
+        tables: Iterable[str],
+        fmt: str = 'csv',
+        incremental: bool = False
+    ) -> list[str]:
+        """
+        Exporta varias tablas con un mismo corte de ventas.
+
+        Args:
+            tables: Nombres de tablas ('sales', 'sale_details', 'products')
+            fmt: 'csv' o 'npz'
+            incremental: Si es True exporta solo ventas nuevas
+
+        Returns:
+            list: Rutas de los archivos generados
+        """
+        if fmt not in ('csv', 'npz'):
+            raise ValueError(f"Formato desconocido: {fmt}")
+        tables = list(tables)
+        for table in tables:
+            if table not in TABLES:
+                raise ValueError(f"Tabla desconocida: {table}")
+
+        # Corte fijo: ventas y detalles quedan alineados aunque entren
+        # ventas nuevas durante la exportación
+        state = self._load_state()
+        upper = self._max_sale_id(settled=incremental)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        files = []
+        for table in tables:
+            query, key = TABLES[table]
+            params: tuple = ()
+            cutoff = upper
+            if key is not None:
+                lower = state.get(table, 0) if incremental else 0
+                # Con la espera el corte podría quedar antes del anterior
+                cutoff = max(upper, lower)
+                query += f" WHERE {key} > %s AND {key} <= %s"
+                params = (lower, cutoff)
+            query += " ORDER BY id"
+
+            suffix = "_incremental" if incremental and key else ""
+            filename = self.output_dir / f"{table}{suffix}_{timestamp}.{fmt}"
+            description, rows = self._stream(table, query, params or None)
+            if fmt == 'csv':
+                self._write_csv(filename, description, rows)
+            else:
+                self._write_npz(filename, description, rows)
+            files.append(str(filename))
+
+            if key is not None:
+                state[table] = cutoff
+
+        if incremental:
+            self._save_state(state)
+        return files
+
+    def _stream(
+        self, table: str, query: str, params: Optional[tuple]
+    ) -> tuple[Any, Iterable[tuple]]:
+        """
+        Lee una tabla y, si tiene, su tabla de archivo antes.
+
+        La segunda consulta se ejecuta recién al terminar de consumir la
+        primera (los cursores del lado del servidor no se pueden intercalar).
+
+        Args:
+            table: Nombre de la tabla
+            query: Consulta con `{table}` en lugar del nombre
+            params: Parámetros de la consulta
+
+        Returns:
+            tuple: (descripción de columnas, iterador de filas)
+        """
+        archive = ARCHIVE_TABLES.get(table)
+        if archive is None:
+            return self.db.stream_read_query(query.format(table=table), params)
+
+        description, archived = self.db.stream_read_query(
+            query.format(table=archive), params)
+
+        def rows() -> Iterable[tuple]:
+            yield from archived
+            _, current = self.db.stream_read_query(query.format(table=table), params)
+            yield from current
+
+        return description, rows()
+
+    def _write_csv(self, filename: Path, description: Any, rows: Iterable[tuple]) -> None:
+        """Escribe las filas en CSV a medida que se leen."""
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow([column[0] for column in description])
+            for row in rows:
+                writer.writerow(
+                    ['' if value is None else value for value in row])
+
+    def _write_npz(self, filename: Path, description: Any, rows: Iterable[tuple]) -> None:
+        """Escribe las filas en formato columnar comprimido."""
+        names = [column[0] for column in description]
+        types = [column[1] for column in description]
+        columns: list[list] = [[] for _ in names]
+        for row in rows:
+            for values, value in zip(columns, row):
+                values.append(value)
+
+        arrays = {}
+        for name, type_code, values in zip(names, types, columns):
+            if type_code in DECIMAL_TYPES | INTEGER_TYPES and None in values:
+                arrays[f"{name}_null"] = np.array(
+                    [v is None for v in values], dtype=bool)
+            if type_code in DECIMAL_TYPES:
+                arrays[f"{name}_cents"] = np.array(
+                    [int(Decimal(v) * 100) if v is not None else 0
+                     for v in values], dtype=np.int64)
+            elif type_code in INTEGER_TYPES:
+                arrays[name] = np.array(
+                    [v if v is not None else -1 for v in values],
+                    dtype=np.int64)
+            elif type_code in DATETIME_TYPES:
+                arrays[name] = np.array(
+                    [np.datetime64(v, 's') if v is not None else np.datetime64('NaT')
+                     for v in values], dtype='datetime64[s]')
+            else:
+                arrays[name] = np.array(
+                    ['' if v is None else str(v) for v in values], dtype=str)
+
+        with open(filename, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+
+    def _max_sale_id(self, settled: bool = False) -> int:
+        """
+        Obtiene el mayor ID de venta al momento de exportar.
+
+        Se consideran `sales` y `sales_archive`: si todas las ventas ya se
+        archivaron, `sales` está vacía y el corte igual cubre el archivo.
+
+        Args:
+            settled: Si es True solo cuentan las ventas con más de
+                `settle_seconds` (corte incremental)
+
+        Returns:
+            int: ID de corte (0 si no hay ventas)
+        """
+        if settled:
+            condition = " WHERE date <= NOW() - INTERVAL %s SECOND"
+            params = (self.settle_seconds, self.settle_seconds)
+        else:
+            condition, params = "", None
+        query = (
+            f"SELECT GREATEST("
+            f"(SELECT COALESCE(MAX(id), 0) FROM sales{condition}), "
+            f"(SELECT COALESCE(MAX(id), 0) FROM sales_archive{condition})"
+            f") AS max_id")
+        if params:
+            result = self.db.execute_read_query(query, params)
+        else:
+            result = self.db.execute_read_query(query)
+        return int(result[0]['max_id']) if result else 0
+
+    def _load_state(self) -> dict[str, int]:
+        """Lee el último ID exportado de cada tabla."""
+        path = self.output_dir / self.STATE_FILE
+        try:
+            return json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, state: dict[str, int]) -> None:
+        """Guarda el último ID exportado de cada tabla."""
+        path = self.output_dir / self.STATE_FILE
+        path.write_text(json.dumps(state), encoding='utf-8')
@@ -0,0 +1,303 @@
+"""Cola de trabajos de exportación en segundo plano.
+
+Los reportes (PDF/XLSX) se generan en un pool de procesos para que el
+trabajo de reportlab/openpyxl no compita por el GIL con el hilo de Tk.
+Las consultas a la base de datos se hacen antes, en el proceso principal;
+al pool solo viajan los datos ya obtenidos.
+"""
+
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+import itertools
+import multiprocessing
+import queue
+import threading
+import time
+
+from .metrics import EXPORT_SECONDS
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+# Estado global del proceso trabajador
+_progress_queue = None
+_current_job_id = None
+
+
+def _init_worker(progress_queue: Any) -> None:
+    """Inicializa un proceso del pool con la cola de progreso compartida."""
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def report_progress(fraction: float, message: str = "") -> None:
+    """
+    Informa el avance del trabajo en curso desde el proceso trabajador.
+
+    Args:
+        fraction: Avance entre 0.0 y 1.0
+        message: Texto descriptivo del paso actual
+    """
+    if _progress_queue is not None and _current_job_id is not None:
+        _progress_queue.put((_current_job_id, fraction, message))
+
+
+def _run_job(job_id: int, func: Callable, args: tuple, kwargs: dict) -> Any:
+    """Ejecuta una función dentro del proceso trabajador."""
+    global _current_job_id
+    _current_job_id = job_id
+    try:
+        report_progress(0.0, "En proceso")
+        result = func(*args, **kwargs)
+        report_progress(1.0, "Finalizado")
+        return result
+    finally:
+        _current_job_id = None
+
+
+def run_export(method_name: str, **kwargs: Any) -> str:
+    """
+    Ejecuta un método de ExportService en el proceso trabajador.
+
+    Args:
+        method_name: Nombre del método de ExportService a invocar
+        **kwargs: Argumentos del método
+
+    Returns:
+        str: Ruta del archivo generado
+    """
+    from .export_service import ExportService
+
+    report_progress(0.1, "Generando archivo")
+    return getattr(ExportService(), method_name)(**kwargs)
+
+
+@dataclass
+class ExportJob:
+    """Trabajo de exportación encolado."""
+
+    id: int
+    description: str
+    status: str = PENDING
+    progress: float = 0.0
+    message: str = ""
+    result: Any = None
+    error: Optional[BaseException] = None
+    on_done: Optional[Callable[['ExportJob'], None]] = None
+    on_progress: Optional[Callable[['ExportJob'], None]] = None
+    # Nombre del método exportado (para las métricas) y momento del envío
+    name: str = ""
+    submitted_at: float = field(default_factory=time.monotonic)
+    future: Optional[Future] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        """Indica si el trabajo ya no se va a ejecutar más."""
+        return self.status in (DONE, FAILED, CANCELLED)
+
+
+class ExportJobQueue:
+    """Cola de trabajos de exportación ejecutados en un pool de procesos.
+
+    Los callbacks (`on_progress`, `on_done`) se invocan únicamente desde
+    `poll()`, de modo que la vista puede llamarlo con `after()` y manipular
+    widgets sin problemas de hilos. Una vez entregado por `poll()`, el
+    trabajo se quita de `jobs`.
+    """
+
+    def __init__(self, max_workers: int = 1) -> None:
+        """
+        Inicializa la cola. El pool se crea recién con el primer trabajo.
+
+        Args:
+            max_workers: Cantidad máxima de procesos trabajadores
+        """
+        self.max_workers = max_workers
+        self.jobs: dict[int, ExportJob] = {}
+        self._ids = itertools.count(1)
+        self._executor = None
+        self._progress = None
+        self._completed: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Crea el pool de procesos de forma diferida."""
+        if self._executor is None:
+            context = multiprocessing.get_context()
+            self._progress = context.Queue()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self._progress,)
+            )
+        return self._executor
+
+    def submit(
+        self,
+        func: Callable,
+        *args: Any,
+        description: str = "",
+        on_done: Optional[Callable[[ExportJob], None]] = None,
+        on_progress: Optional[Callable[[ExportJob], None]] = None,
+        **kwargs: Any
+    ) -> ExportJob:
+        """
+        Encola una función (debe poder serializarse con pickle).
+
+        Args:
+            func: Función a ejecutar en el pool
+            *args: Argumentos posicionales de la función
+            description: Descripción legible del trabajo
+            on_done: Callback al finalizar (éxito, error o cancelación)
+            on_progress: Callback ante cada actualización de progreso
+            **kwargs: Argumentos con nombre de la función
+
+        Returns:
+            ExportJob: Trabajo creado
+        """
+        with self._lock:
+            job = ExportJob(
+                id=next(self._ids),
+                description=description,
+                on_done=on_done,
+                on_progress=on_progress,
+                name=getattr(func, '__name__', '')
+            )
+            self.jobs[job.id] = job
+
+        job.future = self._get_executor().submit(
+            _run_job, job.id, func, args, kwargs)
+        job.future.add_done_callback(lambda _f, j=job: self._completed.put(j))
+        return job
+
+    def submit_export(
+        self,
+        method_name: str,
+        description: str = "",
+        on_done: Optional[Callable[[ExportJob], None]] = None,
+        on_progress: Optional[Callable[[ExportJob], None]] = None,
+        **kwargs: Any
+    ) -> ExportJob:
+        """
+        Encola un método de ExportService.
+
+        Args:
+            method_name: Nombre del método (ej: 'export_sales_to_excel')
+            description: Descripción legible del trabajo
+            on_done: Callback al finalizar
+            on_progress: Callback de progreso
+            **kwargs: Argumentos del método
+
+        Returns:
+            ExportJob: Trabajo creado
+        """
+        job = self.submit(
+            run_export, method_name,
+            description=description,
+            on_done=on_done,
+            on_progress=on_progress,
+            **kwargs
+        )
+        job.name = method_name
+        return job
+
+    def cancel(self, job_id: int) -> bool:
+        """
+        Cancela un trabajo que todavía no empezó.
+
+        Un trabajo que ya está corriendo en el pool no se puede detener:
+        termina y genera su archivo normalmente.
+
+        Args:
+            job_id: ID del trabajo
+
+        Returns:
+            bool: True si el trabajo se canceló, False si no existe, ya
+                terminó o ya está en ejecución
+        """
+        job = self.jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+
+        if job.future is not None and job.future.cancel():
+            job.status = CANCELLED
+            return True
+        return False
+
+    def active_jobs(self) -> list[ExportJob]:
+        """Retorna los trabajos pendientes o en ejecución."""
+        return [job for job in self.jobs.values() if not job.finished]
+
+    def poll(self) -> list[ExportJob]:
+        """
+        Procesa el progreso y las finalizaciones pendientes.
+
+        Debe llamarse desde el hilo de la interfaz. Los trabajos
+        finalizados se quitan de `jobs` al entregarse.
+
+        Returns:
+            list: Trabajos que finalizaron en esta llamada
+        """
+        self._drain_progress()
+
+        finished = []
+        while True:
+            try:
+                job = self._completed.get_nowait()
+            except queue.Empty:
+                break
+            self._resolve(job)
+            with self._lock:
+                self.jobs.pop(job.id, None)
+            EXPORT_SECONDS.observe(
+                time.monotonic() - job.submitted_at,
+                export=job.name, status=job.status)
+            finished.append(job)
+            if job.on_done:
+                job.on_done(job)
+        return finished
+
+    def _drain_progress(self) -> None:
+        """Aplica las actualizaciones de progreso enviadas por los trabajadores."""
+        if self._progress is None:
+            return
+        while True:
+            try:
+                job_id, fraction, message = self._progress.get_nowait()
+            except (queue.Empty, OSError, EOFError):
+                break
+            job = self.jobs.get(job_id)
+            if job is None or job.finished:
+                continue
+            job.status = RUNNING
+            job.progress = fraction
+            job.message = message
+            if job.on_progress:
+                job.on_progress(job)
+
+    def _resolve(self, job: ExportJob) -> None:
+        """Determina el estado final de un trabajo a partir de su future."""
+        try:
+            result = job.future.result()
+        except CancelledError:
+            job.status = CANCELLED
+            return
+        except Exception as e:
+            job.status = FAILED
+            job.error = e
+            return
+
+        job.status = DONE
+        job.progress = 1.0
+        job.result = result
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Detiene el pool de procesos."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
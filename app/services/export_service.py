@@ -1,8 +1,9 @@
 """Servicio de exportación de reportes a PDF y Excel."""
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
+import csv
 import os
 import platform
 
@@ -22,18 +23,28 @@ from reportlab.platypus import (
     Image as RLImage
 )
 from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.figure import Figure
 import io
 
+from ..models.money import Money
+from .chart_cache import ChartCache
+from .ticket_renderer import TicketRenderer
+
 
 class ExportService:
     """Servicio para exportar reportes a diferentes formatos."""
 
+    CHART_FIGSIZE = (6, 3.5)
+    CHART_DPI = 100
+
     def __init__(self) -> None:
         """Inicializa el servicio de exportación."""
         self.output_dir = Path("reportes")
         self.output_dir.mkdir(exist_ok=True)
+        self.ticket_renderer = TicketRenderer()
+        self.chart_cache = ChartCache.for_directory(
+            self.output_dir / ".chart_cache")
 
     def export_sales_to_excel(
         self,
@@ -87,9 +98,9 @@ class ExportService:
             ws_ventas.append([
                 venta['id'],
                 fecha_str,
-                float(venta['total']),
-                float(venta['paid']),
-                float(venta['change']),
+                Money.of(venta['total']).to_decimal(),
+                Money.of(venta['paid']).to_decimal(),
+                Money.of(venta['change']).to_decimal(),
                 estado_texto
             ])
 
@@ -138,7 +149,7 @@ class ExportService:
             ws_productos.append([
                 producto['producto'],
                 int(producto['cantidad_vendida']),
-                float(producto['monto_total'])
+                Money.of(producto['monto_total']).to_decimal()
             ])
 
         # Formatear
@@ -208,7 +219,7 @@ class ExportService:
                 producto['id'],
                 producto['barcode'],
                 producto['name'],
-                float(producto['price']),
+                Money.of(producto['price']).to_decimal(),
                 producto['stock']
             ])
 
@@ -251,6 +262,309 @@ class ExportService:
         wb.save(filename)
         return str(filename)
 
+    def export_low_stock_to_excel(self, productos: list[dict[str, Any]]) -> str:
+        """
+        Exporta los productos con stock bajo (lista de reposición) a Excel.
+
+        Args:
+            productos: Filas con barcode, name, stock, reorder_level y faltante
+
+        Returns:
+            str: Ruta del archivo generado
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = self.output_dir / f"stock_bajo_{timestamp}.xlsx"
+
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Stock bajo"
+
+        ws.append(["Código de Barras", "Nombre", "Stock", "Stock Mínimo",
+                   "Faltante"])
+
+        header_fill = PatternFill(
+            start_color="C62828", end_color="C62828", fill_type="solid")
+        header_font = Font(bold=True, color="FFFFFF", size=12)
+        header_alignment = Alignment(horizontal="center", vertical="center")
+
+        for cell in ws[1]:
+            cell.fill = header_fill
+            cell.font = header_font
+            cell.alignment = header_alignment
+
+        for producto in productos:
+            ws.append([
+                producto['barcode'],
+                producto['name'],
+                producto['stock'],
+                producto['reorder_level'],
+                producto['faltante']
+            ])
+
+        for row in ws.iter_rows(min_row=2, min_col=3, max_col=5):
+            for cell in row:
+                cell.alignment = Alignment(horizontal="center")
+
+        ws.column_dimensions['A'].width = 18
+        ws.column_dimensions['B'].width = 35
+        ws.column_dimensions['C'].width = 10
+        ws.column_dimensions['D'].width = 15
+        ws.column_dimensions['E'].width = 12
+
+        wb.save(filename)
+        return str(filename)
+
+    def export_low_stock_to_csv(self, productos: list[dict[str, Any]]) -> str:
+        """
+        Exporta los productos con stock bajo a CSV.
+
+        Args:
+            productos: Filas con barcode, name, stock, reorder_level y faltante
+
+        Returns:
+            str: Ruta del archivo generado
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = self.output_dir / f"stock_bajo_{timestamp}.csv"
+
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["barcode", "name", "stock", "reorder_level", "faltante"])
+            for producto in productos:
+                writer.writerow([
+                    producto['barcode'],
+                    producto['name'],
+                    producto['stock'],
+                    producto['reorder_level'],
+                    producto['faltante']
+                ])
+        return str(filename)
+
+    FORECAST_HEADERS = ["Código de Barras", "Nombre", "Stock", "Prom. 7 días",
+                        "Prom. 28 días", "Demanda diaria", "Días de cobertura",
+                        "Sugerido"]
+    FORECAST_KEYS = ["barcode", "name", "stock", "promedio_7", "promedio_28",
+                     "demanda_diaria", "dias_cobertura", "sugerido"]
+
+    def export_forecast_to_excel(self, filas: list[dict[str, Any]]) -> str:
+        """
+        Exporta el pronóstico de demanda y la reposición sugerida a Excel.
+
+        Args:
+            filas: Filas generadas por ForecastService.forecast
+
+        Returns:
+            str: Ruta del archivo generado
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = self.output_dir / f"reposicion_{timestamp}.xlsx"
+
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Reposición"
+        ws.append(self.FORECAST_HEADERS)
+
+        header_fill = PatternFill(
+            start_color="1565C0", end_color="1565C0", fill_type="solid")
+        header_font = Font(bold=True, color="FFFFFF", size=12)
+        for cell in ws[1]:
+            cell.fill = header_fill
+            cell.font = header_font
+            cell.alignment = Alignment(horizontal="center", vertical="center")
+
+        for fila in filas:
+            ws.append([fila[key] for key in self.FORECAST_KEYS])
+
+        for row in ws.iter_rows(min_row=2, min_col=4, max_col=7):
+            for cell in row:
+                cell.number_format = '0.0'
+
+        # Resaltar los productos que hay que pedir
+        for row in ws.iter_rows(min_row=2, min_col=8, max_col=8):
+            for cell in row:
+                if cell.value:
+                    cell.font = Font(bold=True, color="CC0000")
+
+        for column, width in zip("ABCDEFGH", (18, 35, 10, 12, 13, 15, 17, 11)):
+            ws.column_dimensions[column].width = width
+
+        wb.save(filename)
+        return str(filename)
+
+    def export_forecast_to_csv(self, filas: list[dict[str, Any]]) -> str:
+        """
+        Exporta el pronóstico de demanda y la reposición sugerida a CSV.
+
+        Args:
+            filas: Filas generadas por ForecastService.forecast
+
+        Returns:
+            str: Ruta del archivo generado
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = self.output_dir / f"reposicion_{timestamp}.csv"
+
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.FORECAST_KEYS)
+            for fila in filas:
+                writer.writerow(
+                    ['' if fila[key] is None else fila[key]
+                     for key in self.FORECAST_KEYS])
+        return str(filename)
+
+    ABC_HEADERS = ["Clase", "Código de Barras", "Producto", "Cantidad",
+                   "Monto", "Participación %", "Acumulado %"]
+    ABC_KEYS = ["clase", "barcode", "producto", "cantidad_vendida",
+                "monto_total", "participacion", "participacion_acumulada"]
+    ABC_COLORS = {'A': "C8E6C9", 'B': "FFF9C4", 'C': "FFCDD2"}
+
+    def export_abc_to_excel(
+        self,
+        filas: list[dict[str, Any]],
+        desde: datetime,
+        hasta: datetime
+    ) -> str:
+        """
+        Exporta el análisis ABC del catálogo a Excel.
+
+        Args:
+            filas: Filas generadas por ReportService.get_abc_analysis
+            desde: Inicio del período
+            hasta: Fin del período (exclusivo)
+
+        Returns:
+            str: Ruta del archivo generado
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = self.output_dir / f"analisis_abc_{timestamp}.xlsx"
+
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "ABC"
+        ws.append(self.ABC_HEADERS)
+
+        header_fill = PatternFill(
+            start_color="1565C0", end_color="1565C0", fill_type="solid")
+        header_font = Font(bold=True, color="FFFFFF", size=12)
+        for cell in ws[1]:
+            cell.fill = header_fill
+            cell.font = header_font
+            cell.alignment = Alignment(horizontal="center", vertical="center")
+
+        fills = {clase: PatternFill(start_color=color, end_color=color,
+                                    fill_type="solid")
+                 for clase, color in self.ABC_COLORS.items()}
+        for fila in filas:
+            ws.append([fila[key] for key in self.ABC_KEYS])
+            ws.cell(row=ws.max_row, column=1).fill = fills[fila['clase']]
+
+        for row in ws.iter_rows(min_row=2, min_col=5, max_col=5):
+            for cell in row:
+                cell.number_format = '"$"#,##0.00'
+
+        for column, width in zip("ABCDEFG", (8, 18, 35, 11, 15, 16, 14)):
+            ws.column_dimensions[column].width = width
+
+        # Hoja de resumen por clase
+        ws_resumen = wb.create_sheet("Resumen")
+        ultimo_dia = hasta - timedelta(days=1)
+        ws_resumen.append(
+            [f"Período: {desde:%d/%m/%Y} - {ultimo_dia:%d/%m/%Y}"])
+        ws_resumen.append(["Clase", "Productos", "Monto", "Participación %"])
+        for cell in ws_resumen[2]:
+            cell.fill = header_fill
+            cell.font = header_font
+        for clase in "ABC":
+            productos = [f for f in filas if f['clase'] == clase]
+            ws_resumen.append([
+                clase,
+                len(productos),
+                sum(f['monto_total'] for f in productos),
+                round(sum(f['participacion'] for f in productos), 2)
+            ])
+            ws_resumen.cell(row=ws_resumen.max_row, column=1).fill = fills[clase]
+            ws_resumen.cell(row=ws_resumen.max_row,
+                            column=3).number_format = '"$"#,##0.00'
+        for column, width in zip("ABCD", (10, 12, 15, 16)):
+            ws_resumen.column_dimensions[column].width = width
+
+        wb.save(filename)
+        return str(filename)
+
+    def export_abc_to_csv(self, filas: list[dict[str, Any]]) -> str:
+        """
+        Exporta el análisis ABC del catálogo a CSV.
+
+        Args:
+            filas: Filas generadas por ReportService.get_abc_analysis
+
+        Returns:
+            str: Ruta del archivo generado
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = self.output_dir / f"analisis_abc_{timestamp}.csv"
+
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.ABC_KEYS)
+            for fila in filas:
+                writer.writerow([fila[key] for key in self.ABC_KEYS])
+        return str(filename)
+
+    def export_sales_to_csv(self, ventas: list[dict[str, Any]]) -> str:
+        """
+        Exporta el historial de ventas a CSV.
+
+        Args:
+            ventas: Lista de ventas con sus datos
+
+        Returns:
+            str: Ruta del archivo generado
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = self.output_dir / f"ventas_{timestamp}.csv"
+
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "fecha", "total", "pagado", "cambio", "estado"])
+            for venta in ventas:
+                writer.writerow([
+                    venta['id'],
+                    str(venta['date'])[:19],
+                    venta['total'],
+                    venta['paid'],
+                    venta['change'],
+                    venta.get('status', 'active')
+                ])
+        return str(filename)
+
+    def export_inventory_to_csv(self, productos: list[dict[str, Any]]) -> str:
+        """
+        Exporta el inventario de productos a CSV.
+
+        Args:
+            productos: Lista de productos con sus datos
+
+        Returns:
+            str: Ruta del archivo generado
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = self.output_dir / f"inventario_{timestamp}.csv"
+
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "barcode", "name", "price", "stock"])
+            for producto in productos:
+                writer.writerow([
+                    producto['id'],
+                    producto['barcode'],
+                    producto['name'],
+                    producto['price'],
+                    producto['stock']
+                ])
+        return str(filename)
+
     def export_sales_report_to_pdf(
         self,
         total_ventas: float,
@@ -357,7 +671,7 @@ class ExportService:
                 prod_data.append([
                     prod['producto'][:30],
                     str(int(prod['cantidad_vendida'])),
-                    f"${float(prod['monto_total']):,.2f}"
+                    f"${Money.of(prod['monto_total']):,.2f}"
                 ])
 
             prod_table = Table(
@@ -393,7 +707,7 @@ class ExportService:
             ventas_data.append([
                 str(venta['id']),
                 fecha_str,
-                f"${float(venta['total']):,.2f}"
+                f"${Money.of(venta['total']):,.2f}"
             ])
 
         ventas_table = Table(
@@ -448,107 +762,47 @@ class ExportService:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = self.output_dir / f"ticket_venta_{sale_id}_{timestamp}.pdf"
 
-        # Usar tamaño más pequeño para ticket
-        doc = SimpleDocTemplate(
-            str(filename),
-            pagesize=(4 * inch, 11 * inch),  # Tamaño tipo ticket
-            rightMargin=20,
-            leftMargin=20,
-            topMargin=30,
-            bottomMargin=30
-        )
-
-        story = []
-        styles = getSampleStyleSheet()
-
-        # Estilos personalizados para ticket
-        ticket_title_style = ParagraphStyle(
-            'TicketTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor=colors.HexColor('#2c3e50'),
-            spaceAfter=10,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
+        return self.ticket_renderer.render_pdf(
+            str(filename), sale_id, sale_date, sale_total,
+            sale_paid, sale_change, details
         )
 
-        ticket_normal = ParagraphStyle(
-            'TicketNormal',
-            parent=styles['Normal'],
-            fontSize=9,
-            alignment=TA_CENTER
-        )
+    def export_sale_ticket_to_escpos(
+        self,
+        sale_id: int,
+        sale_date: str,
+        sale_total: float,
+        sale_paid: float,
+        sale_change: float,
+        details: list[dict[str, Any]],
+        device: str | None = None
+    ) -> str:
+        """
+        Exporta un ticket de venta como flujo ESC/POS.
 
-        # Encabezado
-        story.append(Paragraph("TICKET DE VENTA", ticket_title_style))
-        story.append(Paragraph("App-Stock", ticket_normal))
-        story.append(Spacer(1, 0.1 * inch))
-        story.append(Paragraph("=" * 40, ticket_normal))
-        story.append(Spacer(1, 0.1 * inch))
-
-        # Información de la venta
-        story.append(Paragraph(f"<b>Venta N°:</b> {sale_id}", ticket_normal))
-        story.append(Paragraph(f"<b>Fecha:</b> {sale_date}", ticket_normal))
-        story.append(Spacer(1, 0.1 * inch))
-        story.append(Paragraph("-" * 40, ticket_normal))
-        story.append(Spacer(1, 0.1 * inch))
-
-        # Tabla de productos
-        products_data = [['Producto', 'Cant', 'Precio', 'Subtotal']]
-        for detail in details:
-            products_data.append([
-                detail['producto'][:15],
-                str(detail['cantidad']),
-                f"${detail['precio']:.2f}",
-                f"${detail['subtotal']:.2f}"
-            ])
+        Args:
+            sale_id: ID de la venta
+            sale_date: Fecha de la venta
+            sale_total: Total de la venta
+            sale_paid: Monto pagado
+            sale_change: Cambio entregado
+            details: Detalles de los productos vendidos
+            device: Ruta del dispositivo de la impresora térmica. Si no se
+                indica, se guarda un archivo .bin en la carpeta de reportes.
 
-        products_table = Table(
-            products_data,
-            colWidths=[1.5 * inch, 0.5 * inch, 0.8 * inch, 0.8 * inch]
+        Returns:
+            str: Ruta del archivo o dispositivo escrito
+        """
+        if device is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            device = str(
+                self.output_dir / f"ticket_venta_{sale_id}_{timestamp}.bin")
+
+        self.ticket_renderer.write_escpos(
+            device, sale_id, sale_date, sale_total,
+            sale_paid, sale_change, details
         )
-        products_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('LINEBELOW', (0, 0), (-1, 0), 1, colors.black),
-            ('LINEABOVE', (0, 0), (-1, 0), 1, colors.black),
-        ]))
-
-        story.append(products_table)
-        story.append(Spacer(1, 0.1 * inch))
-        story.append(Paragraph("=" * 40, ticket_normal))
-        story.append(Spacer(1, 0.1 * inch))
-
-        # Totales
-        totals_data = [
-            ['TOTAL:', f'${sale_total:.2f}'],
-            ['Pagado:', f'${sale_paid:.2f}'],
-            ['Cambio:', f'${sale_change:.2f}']
-        ]
-
-        totals_table = Table(totals_data, colWidths=[2 * inch, 1.5 * inch])
-        totals_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-        ]))
-
-        story.append(totals_table)
-        story.append(Spacer(1, 0.2 * inch))
-
-        # Pie de página
-        story.append(Paragraph("=" * 40, ticket_normal))
-        story.append(Paragraph("¡Gracias por su compra!", ticket_normal))
-        story.append(Paragraph(
-            f"Generado: {datetime.now().strftime('%d/%m/%Y %H:%M')}",
-            ticket_normal
-        ))
-
-        doc.build(story)
-        return str(filename)
+        return device
 
     def _create_products_chart(
         self, productos_vendidos: list[dict[str, Any]]
@@ -556,6 +810,9 @@ class ExportService:
         """
         Crea un gráfico de barras de productos más vendidos.
 
+        Si ya se generó un gráfico con los mismos datos y tamaño se
+        reutiliza la imagen cacheada sin invocar a matplotlib.
+
         Args:
             productos_vendidos: Lista de productos con cantidades vendidas
 
@@ -564,48 +821,76 @@ class ExportService:
         """
         try:
             top_productos = productos_vendidos[:5]
+            if not top_productos:
+                return None
+
             nombres = [p['producto'][:20] for p in top_productos]
             cantidades = [int(p['cantidad_vendida']) for p in top_productos]
 
-            fig = Figure(figsize=(6, 3.5), dpi=100)
-            ax = fig.add_subplot(111)
+            key = self.chart_cache.make_key(
+                'top_productos', nombres, cantidades,
+                self.CHART_FIGSIZE, self.CHART_DPI)
+            cached = self.chart_cache.get(key)
+            if cached is not None:
+                return io.BytesIO(cached)
 
-            colores = ['#1e88e5', '#26a69a', '#66bb6a', '#ffa726', '#ef5350']
+            png = self._render_products_chart(nombres, cantidades)
+            self.chart_cache.put(key, png)
+            return io.BytesIO(png)
 
-            bars = ax.bar(nombres, cantidades, color=colores[:len(nombres)],
-                          width=0.65, edgecolor='white', linewidth=1.5, alpha=0.9)
+        except Exception as e:
+            print(f"Error al crear gráfico: {e}")
+            return None
 
-            ax.yaxis.grid(True, linestyle='--', alpha=0.3, color='gray')
-            ax.set_axisbelow(True)
+    def _render_products_chart(
+        self, nombres: list[str], cantidades: list[int]
+    ) -> bytes:
+        """
+        Dibuja el gráfico de barras con el backend Agg (sin pyplot).
 
-            ax.set_ylabel('Unidades Vendidas', fontsize=10, weight='bold')
-            ax.set_xlabel('Productos', fontsize=10, weight='bold')
-            ax.set_title('Top 5 Productos Más Vendidos',
-                         fontsize=12, weight='bold', pad=10)
+        Args:
+            nombres: Nombres de los productos
+            cantidades: Unidades vendidas de cada producto
 
-            plt.setp(ax.xaxis.get_majorticklabels(),
-                     rotation=35, ha='right', fontsize=9)
+        Returns:
+            bytes: Imagen PNG
+        """
+        fig = Figure(figsize=self.CHART_FIGSIZE, dpi=self.CHART_DPI)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
 
-            for bar, cantidad in zip(bars, cantidades):
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width() / 2, height,
-                        f'{cantidad}',
-                        ha='center', va='bottom', fontsize=10, weight='bold')
+        colores = ['#1e88e5', '#26a69a', '#66bb6a', '#ffa726', '#ef5350']
 
-            ax.set_ylim(0, max(cantidades) * 1.15)
+        bars = ax.bar(nombres, cantidades, color=colores[:len(nombres)],
+                      width=0.65, edgecolor='white', linewidth=1.5, alpha=0.9)
 
-            fig.tight_layout()
+        ax.yaxis.grid(True, linestyle='--', alpha=0.3, color='gray')
+        ax.set_axisbelow(True)
 
-            buffer = io.BytesIO()
-            fig.savefig(buffer, format='png', bbox_inches='tight', dpi=100)
-            buffer.seek(0)
-            plt.close(fig)
+        ax.set_ylabel('Unidades Vendidas', fontsize=10, weight='bold')
+        ax.set_xlabel('Productos', fontsize=10, weight='bold')
+        ax.set_title('Top 5 Productos Más Vendidos',
+                     fontsize=12, weight='bold', pad=10)
 
-            return buffer
+        for label in ax.get_xticklabels():
+            label.set_rotation(35)
+            label.set_horizontalalignment('right')
+            label.set_fontsize(9)
 
-        except Exception as e:
-            print(f"Error al crear gráfico: {e}")
-            return None
+        for bar, cantidad in zip(bars, cantidades):
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width() / 2, height,
+                    f'{cantidad}',
+                    ha='center', va='bottom', fontsize=10, weight='bold')
+
+        ax.set_ylim(0, max(cantidades) * 1.15)
+
+        fig.tight_layout()
+
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', bbox_inches='tight',
+                    dpi=self.CHART_DPI)
+        return buffer.getvalue()
 
     def print_pdf(self, filename: str) -> bool:
         """
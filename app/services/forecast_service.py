@@ -0,0 +1,222 @@
+"""Pronóstico de demanda y sugerencias de reposición.
+
+Las ventas diarias de todo el catálogo se leen con una sola consulta y se
+cargan en una matriz productos × días de NumPy. Promedios móviles,
+estacionalidad por día de la semana, días de cobertura y cantidades
+sugeridas se calculan para todos los productos a la vez, sin recorrer los
+productos en Python.
+"""
+
+from datetime import date, datetime, time as dtime, timedelta
+from typing import Any, Optional
+
+import numpy as np
+
+from ..models.database import Database
+
+
+def compute_forecast(
+    quantities: np.ndarray,
+    first_day: date,
+    stock: np.ndarray,
+    reorder_levels: np.ndarray,
+    lead_time_days: int = 7,
+    review_days: int = 7,
+    service_z: float = 1.65
+) -> dict[str, np.ndarray]:
+    """
+    Calcula el pronóstico de todos los productos a la vez.
+
+    Args:
+        quantities: Unidades vendidas por producto (filas) y día (columnas)
+        first_day: Fecha de la primera columna
+        stock: Stock actual por producto
+        reorder_levels: Stock mínimo por producto
+        lead_time_days: Días que tarda en llegar un pedido
+        review_days: Días hasta la próxima revisión de pedidos
+        service_z: Factor de stock de seguridad (1.65 ≈ 95 %)
+
+    Returns:
+        dict: Arreglos promedio_7, promedio_28, demanda_diaria, estacionalidad
+            (productos × 7, lunes a domingo), demanda_periodo,
+            stock_seguridad, dias_cobertura y sugerido
+    """
+    quantities = np.asarray(quantities, dtype=np.float64)
+    stock = np.asarray(stock, dtype=np.float64)
+    n_products, n_days = quantities.shape
+
+    # Promedios móviles de las últimas 1 y 4 semanas
+    avg_7 = quantities[:, -7:].mean(axis=1) if n_days else np.zeros(n_products)
+    avg_28 = quantities[:, -28:].mean(axis=1) if n_days else np.zeros(n_products)
+    level = 0.5 * avg_7 + 0.5 * avg_28
+
+    # Estacionalidad: promedio de cada día de la semana / promedio general
+    weekdays = (np.arange(n_days) + first_day.weekday()) % 7
+    onehot = np.zeros((n_days, 7))
+    onehot[np.arange(n_days), weekdays] = 1.0
+    days_per_weekday = onehot.sum(axis=0)
+    weekday_mean = np.divide(
+        quantities @ onehot, days_per_weekday,
+        out=np.zeros((n_products, 7)), where=days_per_weekday > 0)
+    overall = quantities.mean(axis=1, keepdims=True) if n_days else np.zeros((n_products, 1))
+    seasonality = np.divide(
+        weekday_mean, overall, out=np.ones((n_products, 7)), where=overall > 0)
+
+    # Demanda esperada hasta que llegue el pedido de la próxima revisión
+    horizon = lead_time_days + review_days
+    first_future = first_day + timedelta(days=n_days)
+    future_weekdays = (np.arange(horizon) + first_future.weekday()) % 7
+    period_demand = level * seasonality[:, future_weekdays].sum(axis=1)
+
+    deviation = quantities.std(axis=1) if n_days else np.zeros(n_products)
+    safety_stock = service_z * deviation * np.sqrt(lead_time_days)
+
+    days_of_cover = np.divide(
+        stock, level, out=np.full(n_products, np.inf), where=level > 0)
+
+    needed = np.maximum(period_demand + safety_stock - stock,
+                        np.asarray(reorder_levels, dtype=np.float64) - stock)
+    suggested = np.ceil(np.maximum(needed, 0.0)).astype(np.int64)
+
+    return {
+        'promedio_7': avg_7,
+        'promedio_28': avg_28,
+        'demanda_diaria': level,
+        'estacionalidad': seasonality,
+        'demanda_periodo': period_demand,
+        'stock_seguridad': safety_stock,
+        'dias_cobertura': days_of_cover,
+        'sugerido': suggested,
+    }
+
+
+class ForecastService:
+    """Pronóstico de demanda de todo el catálogo."""
+
+    def __init__(
+        self,
+        db: Any = None,
+        history_days: int = 56,
+        lead_time_days: int = 7,
+        review_days: int = 7,
+        service_z: float = 1.65
+    ) -> None:
+        """
+        Inicializa el servicio.
+
+        Args:
+            db: Objeto con `execute_read_query` y `stream_read_query` (por defecto Database())
+            history_days: Días de historia a analizar
+            lead_time_days: Días que tarda en llegar un pedido
+            review_days: Días hasta la próxima revisión de pedidos
+            service_z: Factor de stock de seguridad
+        """
+        self.db = db if db is not None else Database()
+        self.history_days = history_days
+        self.lead_time_days = lead_time_days
+        self.review_days = review_days
+        self.service_z = service_z
+
+    def load_daily_sales(
+        self, product_ids: np.ndarray, end: date
+    ) -> tuple[date, np.ndarray]:
+        """
+        Lee las ventas diarias del período en una matriz productos × días.
+
+        Args:
+            product_ids: IDs de los productos (orden de las filas)
+            end: Día siguiente al último día incluido
+
+        Returns:
+            tuple: (primer día, matriz de unidades vendidas)
+        """
+        start = end - timedelta(days=self.history_days)
+        quantities = np.zeros((len(product_ids), self.history_days))
+
+        # La historia puede empezar en un mes ya archivado: se leen las dos
+        # tablas (sin ventas archivadas en el rango la segunda no aporta filas)
+        bounds = (datetime.combine(start, dtime.min), datetime.combine(end, dtime.min))
+        _, rows = self.db.stream_read_query("""
+            SELECT product_id, dia, SUM(unidades) AS unidades
+            FROM (
+                SELECT sd.product_id, DATE(s.date) AS dia, sd.quantity AS unidades
+                FROM sales s
+                JOIN sale_details sd ON sd.sale_id = s.id
+                WHERE s.status = 'active' AND s.date >= %s AND s.date < %s
+                UNION ALL
+                SELECT sd.product_id, DATE(s.date), sd.quantity
+                FROM sales_archive s
+                JOIN sale_details_archive sd ON sd.sale_id = s.id
+                WHERE s.status = 'active' AND s.date >= %s AND s.date < %s
+            ) ventas
+            GROUP BY product_id, dia
+        """, bounds + bounds)
+        ids, days, units = [], [], []
+        for product_id, day, quantity in rows:
+            ids.append(product_id)
+            days.append(day)
+            units.append(quantity)
+        if not ids:
+            return start, quantities
+
+        # Ubicar cada fila del resultado en la matriz sin recorrer productos
+        order = np.argsort(product_ids)
+        ids = np.asarray(ids)
+        positions = np.searchsorted(product_ids, ids, sorter=order)
+        positions = np.clip(positions, 0, len(product_ids) - 1)
+        rows_index = order[positions]
+        known = product_ids[rows_index] == ids  # Descarta productos VARIOS
+        columns = (np.asarray(days, dtype='datetime64[D]')
+                   - np.datetime64(start, 'D')).astype(np.int64)
+        quantities[rows_index[known], columns[known]] = np.asarray(
+            units, dtype=np.float64)[known]
+        return start, quantities
+
+    def forecast(self, reference: Optional[date] = None) -> list[dict[str, Any]]:
+        """
+        Calcula el pronóstico y la sugerencia de reposición de cada producto.
+
+        Args:
+            reference: Día del cálculo (por defecto hoy; se usa la historia
+                hasta el día anterior)
+
+        Returns:
+            list: Filas con id, barcode, name, stock, promedio_7, promedio_28,
+                demanda_diaria, dias_cobertura (None si no tiene ventas) y
+                sugerido, ordenadas de menor a mayor cobertura
+        """
+        reference = reference or date.today()
+        products = self.db.execute_read_query("""
+            SELECT id, barcode, name, stock, reorder_level
+            FROM products
+            WHERE barcode NOT LIKE 'VAR-%'
+        """)
+        if not products:
+            return []
+
+        product_ids = np.array([p['id'] for p in products], dtype=np.int64)
+        stock = np.array([p['stock'] for p in products], dtype=np.float64)
+        reorder = np.array([p.get('reorder_level') or 0 for p in products],
+                           dtype=np.float64)
+        first_day, quantities = self.load_daily_sales(product_ids, reference)
+        result = compute_forecast(
+            quantities, first_day, stock, reorder,
+            self.lead_time_days, self.review_days, self.service_z)
+
+        cover = result['dias_cobertura']
+        rows = []
+        for i in np.lexsort((-result['sugerido'], cover)):
+            product = products[i]
+            rows.append({
+                'id': product['id'],
+                'barcode': product['barcode'],
+                'name': product['name'],
+                'stock': int(product['stock']),
+                'promedio_7': round(float(result['promedio_7'][i]), 2),
+                'promedio_28': round(float(result['promedio_28'][i]), 2),
+                'demanda_diaria': round(float(result['demanda_diaria'][i]), 2),
+                'dias_cobertura': (round(float(cover[i]), 1)
+                                   if np.isfinite(cover[i]) else None),
+                'sugerido': int(result['sugerido'][i]),
+            })
+        return rows
@@ -0,0 +1,428 @@
+"""Importación masiva de productos desde CSV o Excel.
+
+El archivo se lee fila por fila (módulo csv u openpyxl en modo
+`read_only`), de modo que un catálogo de decenas de miles de productos no
+se carga completo en memoria. Las filas válidas se envían en lotes con
+`executemany` y un `INSERT ... ON DUPLICATE KEY UPDATE` (el código de
+barras es UNIQUE), todo dentro de una única transacción: si algo falla
+no queda un catálogo a medio importar. Si el archivo no tiene columna de
+stock (por ejemplo una lista de precios de un proveedor) solo se
+actualizan nombre y precio y el stock de los productos existentes no se
+toca.
+
+La versión de `products` para el aviso de cambios se toma recién al final,
+en una última etapa corta antes del commit: la fila de `data_versions`
+queda bloqueada hasta el commit y las ventas de las otras cajas la
+necesitan.
+
+Las filas inválidas o con código repetido en el archivo no se importan y
+se listan en un CSV de errores junto al número de fila original.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+import csv
+import unicodedata
+
+from ..models.database import Database
+from ..models.stock_movement import MOV_IMPORTACION
+
+UPSERT_QUERY = """
+    INSERT INTO products (barcode, name, price, stock)
+    VALUES (%s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        name = VALUES(name),
+        price = VALUES(price),
+        stock = VALUES(stock)
+"""
+
+# Archivo sin columna de stock: los productos nuevos quedan con stock 0
+PRICE_UPSERT_QUERY = """
+    INSERT INTO products (barcode, name, price)
+    VALUES (%s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        name = VALUES(name),
+        price = VALUES(price)
+"""
+
+MOVEMENT_QUERY = """
+    INSERT INTO stock_movements (product_id, date, quantity, type, reference)
+    VALUES (%s, NOW(6), %s, %s, %s)
+"""
+
+# Encabezados aceptados para cada campo (sin tildes y en minúsculas)
+COLUMN_ALIASES = {
+    'barcode': ('barcode', 'codigo', 'codigo de barras', 'codigo_barras', 'ean'),
+    'name': ('name', 'nombre', 'producto', 'descripcion'),
+    'price': ('price', 'precio'),
+    'stock': ('stock', 'cantidad', 'existencia'),
+}
+
+REQUIRED_COLUMNS = frozenset({'barcode', 'name', 'price'})
+
+MAX_BARCODE_LENGTH = 13
+MAX_NAME_LENGTH = 255
+
+
+@dataclass
+class ImportResult:
+    """Resumen de una importación."""
+
+    total: int = 0
+    imported: int = 0
+    errors: list[tuple[int, str, dict[str, Any]]] = field(default_factory=list)
+    error_file: Optional[str] = None
+
+    @property
+    def rejected(self) -> int:
+        """Cantidad de filas que no se importaron."""
+        return len(self.errors)
+
+
+class ImportFileError(ValueError):
+    """Error de formato del archivo (no de una fila en particular)."""
+
+
+def _normalize(text: Any) -> str:
+    """Pasa un encabezado a minúsculas y sin tildes."""
+    text = unicodedata.normalize('NFKD', str(text or '').strip().lower())
+    return ''.join(c for c in text if not unicodedata.combining(c))
+
+
+class ProductImportService:
+    """Importa productos por lotes dentro de una transacción."""
+
+    def __init__(
+        self,
+        connection: Any = None,
+        batch_size: int = 500,
+        error_dir: Optional[Path] = None
+    ) -> None:
+        """
+        Inicializa el servicio.
+
+        Args:
+            connection: Conexión pymysql (por defecto la de Database()).
+                Para importar desde un hilo en segundo plano conviene pasar
+                una conexión propia (Database.create_connection()).
+            batch_size: Filas por llamado a executemany
+            error_dir: Carpeta del CSV de errores (por defecto reportes)
+        """
+        self.connection = connection if connection is not None else Database().connection
+        self.batch_size = batch_size
+        self.error_dir = Path(error_dir or "reportes")
+
+    def import_file(
+        self,
+        path: str,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> ImportResult:
+        """
+        Importa un archivo .csv o .xlsx.
+
+        Args:
+            path: Ruta del archivo
+            progress: Función que recibe la cantidad de filas procesadas
+                luego de cada lote
+
+        Returns:
+            ImportResult: Resumen con filas importadas y rechazadas
+        """
+        result = ImportResult()
+        reference = Path(path).name[:64]
+        seen: dict[str, int] = {}
+        batch: list[tuple] = []
+        cursor = self.connection.cursor()
+        try:
+            for line, raw in self.read_rows(path):
+                result.total += 1
+                try:
+                    row = self.validate_row(raw)
+                except ValueError as e:
+                    result.errors.append((line, str(e), raw))
+                    continue
+
+                first = seen.get(row[0])
+                if first is not None:
+                    result.errors.append(
+                        (line, f"Código repetido (fila {first})", raw))
+                    continue
+                seen[row[0]] = line
+
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    self._write_batch(cursor, batch, reference)
+                    result.imported += len(batch)
+                    batch = []
+                    if progress:
+                        progress(result.total)
+
+            if batch:
+                self._write_batch(cursor, batch, reference)
+                result.imported += len(batch)
+            if result.imported:
+                self._mark_version(cursor, list(seen))
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+        if progress:
+            progress(result.total)
+        if result.errors:
+            result.error_file = self.write_errors(result.errors)
+        return result
+
+    def _mark_version(self, cursor: Any, barcodes: list[str]) -> None:
+        """
+        Marca los productos importados con una versión nueva (etapa final).
+
+        Las otras terminales vuelven a leer los productos marcados. Se hace
+        justo antes del commit para bloquear `data_versions` lo menos posible.
+        """
+        version = Database.next_version(cursor)
+        for start in range(0, len(barcodes), self.batch_size):
+            chunk = barcodes[start:start + self.batch_size]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(
+                f"UPDATE products SET row_version = %s WHERE barcode IN ({placeholders})",
+                [version] + chunk)
+
+    @staticmethod
+    def _write_batch(cursor: Any, batch: list[tuple], reference: str) -> None:
+        """
+        Inserta o actualiza un lote y registra la variación de stock.
+
+        Se leen los stocks actuales del lote con una sola consulta para
+        escribir los movimientos también por lote. Las filas sin stock
+        (archivo sin esa columna) no modifican el stock ni generan
+        movimientos.
+        """
+        placeholders = ', '.join(['%s'] * len(batch))
+        barcodes = [row[0] for row in batch]
+        select = f"SELECT id, barcode, stock FROM products WHERE barcode IN ({placeholders})"
+        cursor.execute(select, barcodes)
+        previous = {r['barcode']: (r['id'], r['stock']) for r in cursor.fetchall()}
+
+        with_stock = [row for row in batch if row[3] is not None]
+        without_stock = [row[:3] for row in batch if row[3] is None]
+        if with_stock:
+            cursor.executemany(UPSERT_QUERY, with_stock)
+        if without_stock:
+            cursor.executemany(PRICE_UPSERT_QUERY, without_stock)
+
+        new_barcodes = [row[0] for row in with_stock if row[0] not in previous]
+        ids = {barcode: product_id for barcode, (product_id, _) in previous.items()}
+        if new_barcodes:
+            placeholders = ', '.join(['%s'] * len(new_barcodes))
+            cursor.execute(
+                f"SELECT id, barcode FROM products WHERE barcode IN ({placeholders})",
+                new_barcodes)
+            ids.update({r['barcode']: r['id'] for r in cursor.fetchall()})
+
+        movements = []
+        for barcode, _, _, stock in with_stock:
+            old_stock = previous.get(barcode, (None, 0))[1]
+            if stock != old_stock and barcode in ids:
+                movements.append(
+                    (ids[barcode], stock - old_stock, MOV_IMPORTACION, reference))
+        if movements:
+            cursor.executemany(MOVEMENT_QUERY, movements)
+
+    @staticmethod
+    def validate_row(raw: dict[str, Any]) -> tuple[str, str, Decimal, Optional[int]]:
+        """
+        Valida y convierte una fila del archivo.
+
+        Args:
+            raw: Valores de la fila por campo (barcode, name, price y, si
+                el archivo tiene esa columna, stock)
+
+        Returns:
+            tuple: (barcode, name, price, stock) listos para insertar; stock
+                es None si el archivo no tiene columna de stock
+
+        Raises:
+            ValueError: Si algún valor es inválido
+        """
+        barcode = ProductImportService.parse_barcode(raw.get('barcode'))
+
+        name = str(raw.get('name') or '').strip()
+        if not name:
+            raise ValueError("Falta el nombre")
+        if len(name) > MAX_NAME_LENGTH:
+            raise ValueError(
+                f"Nombre de más de {MAX_NAME_LENGTH} caracteres")
+
+        price_text = str(raw.get('price') if raw.get('price') is not None else '')
+        try:
+            price = Decimal(price_text.strip().replace(',', '.'))
+        except InvalidOperation:
+            raise ValueError(f"Precio inválido: '{price_text}'") from None
+        if not price.is_finite() or price < 0:
+            raise ValueError(f"Precio inválido: '{price_text}'")
+        price = price.quantize(Decimal('0.01'))
+
+        stock = (ProductImportService.parse_stock(raw['stock'])
+                 if 'stock' in raw else None)
+
+        return barcode, name, price, stock
+
+    @staticmethod
+    def parse_barcode(value: Any) -> str:
+        """
+        Valida un código de barras leído del archivo.
+
+        Args:
+            value: Valor de la celda
+
+        Returns:
+            str: Código de barras normalizado
+
+        Raises:
+            ValueError: Si falta o es demasiado largo
+        """
+        barcode = str(value or '').strip()
+        # Excel guarda los códigos numéricos como float (779123.0)
+        if barcode.endswith('.0') and barcode[:-2].isdigit():
+            barcode = barcode[:-2]
+        if not barcode:
+            raise ValueError("Falta el código de barras")
+        if len(barcode) > MAX_BARCODE_LENGTH:
+            raise ValueError(
+                f"Código de barras de más de {MAX_BARCODE_LENGTH} caracteres")
+        return barcode
+
+    @staticmethod
+    def parse_stock(value: Any) -> int:
+        """
+        Valida una cantidad de stock (vacío equivale a 0).
+
+        Args:
+            value: Valor de la celda
+
+        Returns:
+            int: Cantidad entera no negativa
+
+        Raises:
+            ValueError: Si no es un entero no negativo
+        """
+        if value is None or str(value).strip() == '':
+            return 0
+        try:
+            stock = Decimal(str(value).strip())
+        except InvalidOperation:
+            raise ValueError(f"Stock inválido: '{value}'") from None
+        if (not stock.is_finite() or stock < 0
+                or stock != stock.to_integral_value()):
+            raise ValueError(f"Stock inválido: '{value}'")
+        return int(stock)
+
+    def read_rows(
+        self, path: Path, required: frozenset[str] = REQUIRED_COLUMNS
+    ) -> Iterator[tuple[int, dict[str, Any]]]:
+        """
+        Lee el archivo según su extensión.
+
+        Args:
+            path: Ruta del archivo .csv o .xlsx
+            required: Campos que deben estar en el encabezado
+
+        Returns:
+            Iterator: Pares (número de fila, valores por campo)
+        """
+        path = Path(path)
+        suffix = path.suffix.lower()
+        if suffix == '.csv':
+            return self._read_csv(path, required)
+        if suffix in ('.xlsx', '.xlsm'):
+            return self._read_xlsx(path, required)
+        raise ImportFileError(f"Formato no soportado: {path.suffix}")
+
+    @staticmethod
+    def _map_header(
+        header: list[Any], required: frozenset[str] = REQUIRED_COLUMNS
+    ) -> dict[int, str]:
+        """Relaciona cada columna del archivo con un campo del producto."""
+        mapping = {}
+        for index, title in enumerate(header):
+            name = _normalize(title)
+            for column, aliases in COLUMN_ALIASES.items():
+                if name in aliases and column not in mapping.values():
+                    mapping[index] = column
+                    break
+
+        missing = required - set(mapping.values())
+        if missing:
+            raise ImportFileError(
+                "Faltan columnas obligatorias: " + ", ".join(sorted(missing)))
+        return mapping
+
+    def _read_csv(
+        self, path: Path, required: frozenset[str]
+    ) -> Iterator[tuple[int, dict[str, Any]]]:
+        """Lee un CSV (separado por coma o punto y coma) fila por fila."""
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            sample = f.read(4096)
+            f.seek(0)
+            try:
+                dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+            except csv.Error:
+                dialect = csv.excel
+            reader = csv.reader(f, dialect)
+            header = next(reader, None)
+            if header is None:
+                return
+            mapping = self._map_header(header, required)
+            for line, values in enumerate(reader, start=2):
+                if not any(value.strip() for value in values):
+                    continue
+                yield line, {
+                    column: values[index] if index < len(values) else None
+                    for index, column in mapping.items()
+                }
+
+    def _read_xlsx(
+        self, path: Path, required: frozenset[str]
+    ) -> Iterator[tuple[int, dict[str, Any]]]:
+        """Lee la primera hoja de un Excel en modo solo lectura."""
+        from openpyxl import load_workbook
+
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            mapping = self._map_header(list(header), required)
+            for line, values in enumerate(rows, start=2):
+                if all(value is None or str(value).strip() == ''
+                       for value in values):
+                    continue
+                yield line, {
+                    column: values[index] if index < len(values) else None
+                    for index, column in mapping.items()
+                }
+        finally:
+            wb.close()
+
+    def write_errors(self, errors: list[tuple[int, str, dict[str, Any]]]) -> str:
+        """Guarda las filas rechazadas en un CSV."""
+        self.error_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = self.error_dir / f"errores_importacion_{timestamp}.csv"
+        with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Fila', 'Error', 'Código', 'Nombre', 'Precio', 'Stock'])
+            for line, error, raw in errors:
+                writer.writerow([
+                    line, error,
+                    *('' if raw.get(column) is None else raw.get(column)
+                      for column in ('barcode', 'name', 'price', 'stock'))
+                ])
+        return str(filename)
@@ -0,0 +1,196 @@
+"""Stock a una fecha y mermas a partir del libro de movimientos.
+
+El stock de un producto en un momento dado se calcula desde la foto más
+cercana (`stock_snapshots`, o el stock actual si es más cercano) sumando o
+restando solo los movimientos entre la foto y ese momento, en lugar de
+recorrer el historial completo.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from ..models.database import Database
+from ..models.stock_movement import MOV_AJUSTE, MOV_CONTEO
+
+
+class InventoryService:
+    """Consultas sobre `stock_movements` y `stock_snapshots`."""
+
+    def __init__(self, db: Any = None) -> None:
+        """
+        Inicializa el servicio.
+
+        Args:
+            db: Objeto con `execute_query`, `cursor` y `connection`
+                (por defecto Database())
+        """
+        self.db = db if db is not None else Database()
+
+    def _db_now(self) -> datetime:
+        """Hora del servidor (la misma que usan los movimientos)."""
+        result = self.db.execute_query("SELECT NOW(6) AS ahora")
+        return result[0]['ahora'] if result else datetime.now()
+
+    def take_snapshot(self) -> datetime:
+        """
+        Guarda una foto del stock actual de todos los productos.
+
+        Returns:
+            datetime: Fecha de la foto
+        """
+        now = self._db_now()
+        self.db.cursor.execute("""
+            INSERT INTO stock_snapshots (snapshot_date, product_id, stock)
+            SELECT %s, id, stock FROM products
+            WHERE barcode NOT LIKE 'VAR-%%'
+        """, (now,))
+        self.db.connection.commit()
+        return now
+
+    def last_snapshot_date(self) -> Optional[datetime]:
+        """Fecha de la última foto guardada (None si no hay)."""
+        result = self.db.execute_query(
+            "SELECT MAX(snapshot_date) AS fecha FROM stock_snapshots")
+        return result[0]['fecha'] if result else None
+
+    def ensure_snapshot(self, interval_days: int = 7) -> Optional[datetime]:
+        """
+        Toma una foto si la última tiene más de `interval_days` días.
+
+        Args:
+            interval_days: Días entre fotos
+
+        Returns:
+            datetime: Fecha de la foto nueva o None si no hizo falta
+        """
+        last = self.last_snapshot_date()
+        if last is not None and datetime.now() - last < timedelta(days=interval_days):
+            return None
+        return self.take_snapshot()
+
+    def _nearest_snapshots(self, when: datetime) -> tuple[Optional[datetime], Optional[datetime]]:
+        """Fotos inmediatamente anterior y posterior a una fecha."""
+        result = self.db.execute_query("""
+            SELECT
+                (SELECT MAX(snapshot_date) FROM stock_snapshots
+                 WHERE snapshot_date <= %s) AS anterior,
+                (SELECT MIN(snapshot_date) FROM stock_snapshots
+                 WHERE snapshot_date > %s) AS posterior
+        """, (when, when))
+        if not result:
+            return None, None
+        return result[0]['anterior'], result[0]['posterior']
+
+    def get_stock_at(self, when: datetime) -> list[dict[str, Any]]:
+        """
+        Calcula el stock de cada producto en un momento dado.
+
+        Args:
+            when: Fecha y hora de la consulta
+
+        Returns:
+            list: Filas con id, barcode, name y stock
+        """
+        now = self._db_now()
+        before, after = self._nearest_snapshots(when)
+
+        # Elegir la base más cercana: foto anterior, foto posterior o el
+        # stock actual (que funciona como una foto tomada "ahora")
+        candidates = [(now, None)]
+        if before is not None:
+            candidates.append((before, before))
+        if after is not None:
+            candidates.append((after, after))
+        base_date, snapshot = min(
+            candidates, key=lambda c: abs((c[0] - when).total_seconds()))
+
+        if snapshot is None:
+            base = "p.stock"
+            join = ""
+            params: tuple = ()
+        else:
+            base = "COALESCE(s.stock, 0)"
+            join = ("LEFT JOIN stock_snapshots s "
+                    "ON s.product_id = p.id AND s.snapshot_date = %s")
+            params = (snapshot,)
+
+        if base_date <= when:
+            # Sumar los movimientos posteriores a la base
+            sign = "+"
+            movement_range = (base_date, when)
+        else:
+            # Descontar los movimientos entre la fecha pedida y la base
+            sign = "-"
+            movement_range = (when, base_date)
+
+        query = f"""
+            SELECT p.id, p.barcode, p.name,
+                   {base} {sign} COALESCE(m.delta, 0) AS stock
+            FROM products p
+            {join}
+            LEFT JOIN (
+                SELECT product_id, SUM(quantity) AS delta
+                FROM stock_movements
+                WHERE date > %s AND date <= %s
+                GROUP BY product_id
+            ) m ON m.product_id = p.id
+            WHERE p.barcode NOT LIKE 'VAR-%%'
+            ORDER BY p.name
+        """
+        result = self.db.execute_query(query, params + movement_range)
+        return result if result else []
+
+    def get_movements(
+        self, product_id: int, start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> list[dict[str, Any]]:
+        """
+        Obtiene los movimientos de un producto.
+
+        Args:
+            product_id: ID del producto
+            start: Inicio inclusivo (None = sin límite)
+            end: Fin exclusivo (None = sin límite)
+
+        Returns:
+            list: Movimientos ordenados por fecha
+        """
+        query = """
+            SELECT date, quantity, type, reference
+            FROM stock_movements
+            WHERE product_id = %s
+        """
+        params: tuple = (product_id,)
+        if start is not None:
+            query += " AND date >= %s"
+            params += (start,)
+        if end is not None:
+            query += " AND date < %s"
+            params += (end,)
+        result = self.db.execute_query(query + " ORDER BY date, id", params)
+        return result if result else []
+
+    def get_shrinkage(self, start: datetime, end: datetime) -> list[dict[str, Any]]:
+        """
+        Reporte de mermas: faltantes detectados en conteos y ajustes manuales.
+
+        Args:
+            start: Inicio inclusivo
+            end: Fin exclusivo
+
+        Returns:
+            list: Filas con producto, unidades_faltantes, unidades_sobrantes
+                y valor_faltante (a precio actual), de mayor a menor valor
+        """
+        result = self.db.execute_query("""
+            SELECT p.barcode, p.name AS producto,
+                   -SUM(LEAST(m.quantity, 0)) AS unidades_faltantes,
+                   SUM(GREATEST(m.quantity, 0)) AS unidades_sobrantes,
+                   -SUM(LEAST(m.quantity, 0)) * p.price AS valor_faltante
+            FROM stock_movements m
+            JOIN products p ON p.id = m.product_id
+            WHERE m.type IN (%s, %s) AND m.date >= %s AND m.date < %s
+            GROUP BY p.id, p.barcode, p.name, p.price
+            ORDER BY valor_faltante DESC
+        """, (MOV_CONTEO, MOV_AJUSTE, start, end))
+        return result if result else []
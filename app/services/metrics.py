@@ -0,0 +1,423 @@
+"""Métricas operativas en el formato de texto de Prometheus.
+
+Contadores e histogramas en memoria del proceso, con las métricas de la caja
+ya definidas (escaneos, ventas, tiempo de cobro, consultas a la base por
+venta, duración de exportaciones y aciertos de caché). `MetricsExporter` las
+publica periódicamente en un archivo (para el textfile collector de
+node_exporter) y/o en un puerto local (`GET /metrics`); la API local las
+sirve en su propio `/metrics`.
+
+Las tasas (escaneos por minuto, porcentaje de aciertos) se calculan en
+Prometheus a partir de los contadores, por ejemplo
+`rate(appstock_scans_total[5m]) * 60`.
+"""
+
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional, Union
+import math
+import os
+import threading
+
+from config import METRICS_CONFIG
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_value(value: float) -> str:
+    """Número en el formato de Prometheus."""
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    """Etiquetas `{a="x",b="y"}` con los valores escapados."""
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        value = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+class _Metric:
+    """Base de las métricas: nombre, ayuda y valores por etiquetas."""
+
+    kind = ''
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        """Valores de las etiquetas en el orden declarado."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} espera las etiquetas {list(self.labelnames)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        """Líneas de la métrica en formato de texto."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_value(key, value))
+        return lines
+
+    def _render_value(self, key: tuple[str, ...], value: Any) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Contador que solo crece."""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """
+        Incrementa el contador.
+
+        Args:
+            amount: Cantidad a sumar (no negativa)
+            **labels: Valores de las etiquetas declaradas
+        """
+        if amount < 0:
+            raise ValueError("Un contador no puede disminuir")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """
+        Valor actual del contador.
+
+        Args:
+            **labels: Valores de las etiquetas declaradas
+
+        Returns:
+            float: Valor acumulado (0 si nunca se incrementó)
+        """
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _render_value(self, key: tuple[str, ...], value: float) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Histogram(_Metric):
+    """Histograma de observaciones en intervalos fijos."""
+
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """
+        Registra una observación.
+
+        Args:
+            value: Valor observado (segundos, cantidad de consultas, etc.)
+            **labels: Valores de las etiquetas declaradas
+        """
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Conteo por intervalo (el último es +Inf), suma y cantidad
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][bisect_left(self.buckets, value)] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, **labels: Any) -> int:
+        """
+        Cantidad de observaciones.
+
+        Args:
+            **labels: Valores de las etiquetas declaradas
+
+        Returns:
+            int: Observaciones registradas
+        """
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[2] if state else 0
+
+    def _render_value(self, key: tuple[str, ...], state: list) -> list[str]:
+        counts, total, count = state
+        names = self.labelnames + ('le',)
+        lines = []
+        cumulative = 0
+        for bound, n in zip(self.buckets + (math.inf,), counts):
+            cumulative += n
+            labels = _format_labels(names, key + (_format_value(bound),))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Conjunto de métricas de un proceso."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        """
+        Crea (o retorna) un contador.
+
+        Args:
+            name: Nombre de la métrica (ej: "appstock_sales_total")
+            help_text: Descripción
+            labelnames: Nombres de las etiquetas
+
+        Returns:
+            Counter: Contador registrado
+        """
+        return self._register(Counter(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """
+        Crea (o retorna) un histograma.
+
+        Args:
+            name: Nombre de la métrica
+            help_text: Descripción
+            labelnames: Nombres de las etiquetas
+            buckets: Límites superiores de los intervalos
+
+        Returns:
+            Histogram: Histograma registrado
+        """
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self) -> str:
+        """
+        Todas las métricas en el formato de texto de Prometheus.
+
+        Returns:
+            str: Texto de exposición
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: Union[str, Path]) -> None:
+        """
+        Escribe las métricas en un archivo de forma atómica.
+
+        node_exporter nunca ve un archivo a medio escribir porque se
+        reemplaza con uno temporal completo.
+
+        Args:
+            path: Archivo .prom de destino
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(self.render(), encoding='utf-8')
+        os.replace(tmp, path)
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f"La métrica {metric.name} ya existe con otro tipo")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+
+REGISTRY = MetricsRegistry()
+
+SCANS = REGISTRY.counter(
+    'appstock_scans_total', "Productos agregados a una venta por código de barras")
+SALES = REGISTRY.counter(
+    'appstock_sales_total', "Ventas confirmadas")
+CHECKOUT_SECONDS = REGISTRY.histogram(
+    'appstock_checkout_seconds',
+    "Tiempo desde el primer escaneo hasta registrar la venta",
+    buckets=(5, 10, 20, 30, 45, 60, 90, 120, 180, 300, 600))
+SALE_DB_QUERIES = REGISTRY.histogram(
+    'appstock_sale_db_queries',
+    "Idas y vueltas a la base (consultas y commits) por venta confirmada",
+    buckets=(5, 10, 20, 30, 50, 75, 100, 150, 250))
+DB_QUERIES = REGISTRY.counter(
+    'appstock_db_queries_total', "Consultas, commits y rollbacks enviados a MySQL")
+EXPORT_SECONDS = REGISTRY.histogram(
+    'appstock_export_seconds', "Duración de las exportaciones en segundo plano",
+    ('export', 'status'), buckets=(0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300))
+CACHE_REQUESTS = REGISTRY.counter(
+    'appstock_cache_requests_total', "Consultas a las cachés por resultado",
+    ('cache', 'result'))
+
+_local = threading.local()
+
+
+def count_db_query() -> None:
+    """
+    Registra una ida y vuelta a MySQL.
+
+    main.py la asigna a Database.query_counter, que la llama en cada
+    consulta, commit o rollback.
+    """
+    DB_QUERIES.inc()
+    _local.queries = getattr(_local, 'queries', 0) + 1
+
+
+def thread_db_queries() -> int:
+    """
+    Consultas enviadas desde el hilo actual.
+
+    Returns:
+        int: Contador del hilo (la diferencia entre dos lecturas da las
+            consultas de una operación)
+    """
+    return getattr(_local, 'queries', 0)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """
+    Registra un acierto o un fallo de caché.
+
+    Args:
+        cache: Nombre de la caché (ej: "reportes")
+        hit: True si el valor estaba en la caché
+    """
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Responde `GET /metrics` con el texto del registro."""
+
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self) -> None:
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Las consultas periódicas de Prometheus no se registran."""
+
+
+class MetricsExporter:
+    """Publica las métricas en un archivo y/o en un puerto local."""
+
+    def __init__(
+        self,
+        registry: MetricsRegistry = REGISTRY,
+        path: Optional[Union[str, Path]] = METRICS_CONFIG['file'],
+        port: int = METRICS_CONFIG['port'],
+        host: str = METRICS_CONFIG['host'],
+        interval: float = METRICS_CONFIG['interval']
+    ) -> None:
+        """
+        Inicializa el exportador detenido.
+
+        Args:
+            registry: Registro a publicar
+            path: Archivo .prom (None = no se escribe archivo)
+            port: Puerto HTTP (0 = sin servidor)
+            host: Interfaz del servidor HTTP
+            interval: Segundos entre escrituras del archivo
+        """
+        self.registry = registry
+        self.path = Path(path) if path else None
+        self.port = port
+        self.host = host
+        self.interval = interval
+        self.server: Optional[ThreadingHTTPServer] = None
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def enabled(self) -> bool:
+        """Indica si hay algún destino configurado."""
+        return self.path is not None or self.port > 0
+
+    def start(self) -> None:
+        """Arranca la escritura periódica y el servidor HTTP configurados."""
+        if self.path is not None:
+            thread = threading.Thread(
+                target=self._write_loop, name="metrics-file", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        if self.port > 0:
+            handler = type('MetricsHandler', (_MetricsHandler,), {'registry': self.registry})
+            try:
+                self.server = ThreadingHTTPServer((self.host, self.port), handler)
+            except OSError as e:
+                print(f"Error al abrir el puerto de métricas {self.port}: {e}")
+                return
+            self.server.daemon_threads = True
+            thread = threading.Thread(
+                target=self.server.serve_forever, name="metrics-http", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """
+        Detiene el exportador y escribe el archivo una última vez.
+
+        Args:
+            timeout: Segundos máximos de espera por los hilos
+        """
+        self._stop.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        if self.path is not None:
+            self._write()
+
+    def _write_loop(self) -> None:
+        while not self._stop.is_set():
+            self._write()
+            self._stop.wait(self.interval)
+
+    def _write(self) -> None:
+        try:
+            self.registry.write_textfile(self.path)
+        except OSError as e:
+            print(f"Error al escribir las métricas en {self.path}: {e}")
@@ -0,0 +1,250 @@
+"""Cola de impresión asíncrona para los tickets de venta."""
+
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+import itertools
+import queue
+import subprocess
+import threading
+import time
+
+QUEUED = 'queued'
+PRINTING = 'printing'
+PRINTED = 'printed'
+FAILED = 'failed'
+
+
+@dataclass
+class PrintJob:
+    """Trabajo de impresión encolado."""
+
+    id: int
+    filename: str
+    status: str = QUEUED
+    attempts: int = 0
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+
+
+class PrintSpooler:
+    """Envía archivos a imprimir desde un hilo trabajador.
+
+    Los trabajos que se acumulan mientras la impresora está ocupada se
+    agrupan y se envían en un solo llamado al comando de impresión. Si el
+    envío falla se reintentan solo los trabajos que no se imprimieron; al
+    agotar los reintentos el trabajo queda como fallido. Los trabajos
+    terminados se quitan de `jobs` cuando `poll()` los entrega.
+    """
+
+    def __init__(
+        self,
+        command: Optional[list[str]] = None,
+        print_func: Optional[Callable[[str], bool]] = None,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        batch_size: int = 10,
+        batch_window: float = 0.2,
+        timeout: float = 30.0,
+        start: bool = True
+    ) -> None:
+        """
+        Inicializa la cola de impresión.
+
+        Args:
+            command: Comando base de impresión (ej: ['lp']). Los archivos se
+                agregan al final. Si es None se usa print_func por archivo.
+            print_func: Función que imprime un archivo y retorna True si tuvo
+                éxito (por defecto ExportService.print_pdf)
+            max_retries: Reintentos ante un fallo
+            retry_delay: Segundos de espera entre reintentos
+            batch_size: Máximo de archivos por envío
+            batch_window: Segundos que se esperan para agrupar trabajos
+            timeout: Tiempo máximo de cada llamado al comando
+            start: Si es True inicia el hilo trabajador inmediatamente
+        """
+        if command is None and print_func is None:
+            from .export_service import ExportService
+            print_func = ExportService().print_pdf
+
+        self.command = command
+        self.print_func = print_func
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.timeout = timeout
+        self.jobs: dict[int, PrintJob] = {}
+        self._ids = itertools.count(1)
+        self._queue: queue.Queue = queue.Queue()
+        self._finished: queue.Queue = queue.Queue()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if start:
+            self.start()
+
+    def start(self) -> None:
+        """Inicia el hilo trabajador."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._worker, name="print-spooler", daemon=True)
+            self._thread.start()
+
+    def stop(self, wait: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Detiene el hilo trabajador luego de vaciar la cola.
+
+        Args:
+            wait: Si es True espera a que el hilo termine
+            timeout: Tiempo máximo de espera
+        """
+        self._stop.set()
+        self._queue.put(None)
+        if wait and self._thread is not None:
+            self._thread.join(timeout)
+
+    def submit(self, filename: str) -> PrintJob:
+        """
+        Encola un archivo para imprimir. No bloquea.
+
+        Args:
+            filename: Ruta del archivo a imprimir
+
+        Returns:
+            PrintJob: Trabajo creado
+        """
+        job = PrintJob(id=next(self._ids), filename=str(filename))
+        self.jobs[job.id] = job
+        self._queue.put(job)
+        return job
+
+    def status(self, job_id: int) -> Optional[str]:
+        """
+        Retorna el estado de un trabajo.
+
+        Args:
+            job_id: ID del trabajo
+
+        Returns:
+            str: Estado del trabajo o None si no existe
+        """
+        job = self.jobs.get(job_id)
+        return job.status if job else None
+
+    def poll(self) -> list[PrintJob]:
+        """
+        Retorna los trabajos que terminaron (impresos o fallidos) desde la
+        llamada anterior y los quita de `jobs`.
+
+        Returns:
+            list: Trabajos terminados
+        """
+        finished = []
+        while True:
+            try:
+                job = self._finished.get_nowait()
+            except queue.Empty:
+                return finished
+            self.jobs.pop(job.id, None)
+            finished.append(job)
+
+    def pending(self) -> int:
+        """Retorna la cantidad de trabajos que aún no se imprimieron."""
+        return sum(
+            1 for job in self.jobs.values() if job.status in (QUEUED, PRINTING)
+        )
+
+    def _worker(self) -> None:
+        """Bucle del hilo trabajador."""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                # La señal de parada llega detrás de los trabajos ya encolados
+                if self._stop.is_set():
+                    return
+                continue
+
+            batch = [job] + self._collect_batch()
+            if self.command:
+                self._print_batch(batch)
+            else:
+                # Sin comando se imprime archivo por archivo
+                for item in batch:
+                    self._print_batch([item])
+            for item in batch:
+                self._finished.put(item)
+
+    def _collect_batch(self) -> list[PrintJob]:
+        """Agrupa los trabajos que llegan dentro de la ventana de espera."""
+        batch = []
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) + 1 < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                job = self._queue.get(timeout=max(remaining, 0))
+            except queue.Empty:
+                break
+            if job is None:
+                # Reencolar la señal de parada para procesarla luego
+                self._queue.put(None)
+                break
+            batch.append(job)
+        return batch
+
+    def _print_batch(self, batch: list[PrintJob]) -> None:
+        """
+        Envía un grupo de trabajos, reintentando ante fallos.
+
+        Los reintentos van archivo por archivo y solo con los trabajos que
+        no se imprimieron, así un ticket que falla no hace reimprimir a los
+        que ya salieron.
+        """
+        for job in batch:
+            job.status = PRINTING
+
+        pending = batch
+        error = None
+        for attempt in range(self.max_retries + 1):
+            for job in pending:
+                job.attempts = attempt + 1
+            groups = [pending] if attempt == 0 else [[job] for job in pending]
+            for group in groups:
+                try:
+                    self._send(group)
+                except Exception as e:
+                    error = str(e)
+
+            pending = [job for job in pending if job.status != PRINTED]
+            if not pending:
+                return
+            if attempt < self.max_retries:
+                time.sleep(self.retry_delay)
+
+        print(f"Error al imprimir {len(pending)} ticket(s): {error}")
+        for job in pending:
+            job.status = FAILED
+            job.error = error
+
+    def _send(self, jobs: list[PrintJob]) -> None:
+        """
+        Envía los archivos a la impresora y marca como impreso cada trabajo
+        confirmado. Lanza una excepción ante el primer fallo.
+        """
+        if self.command:
+            # Un solo llamado: el comando encola todos los archivos o ninguno
+            subprocess.run(
+                self.command + [job.filename for job in jobs],
+                check=True,
+                timeout=self.timeout,
+                capture_output=True
+            )
+            for job in jobs:
+                job.status = PRINTED
+                job.error = None
+            return
+
+        for job in jobs:
+            if not self.print_func(job.filename):
+                raise RuntimeError(f"No se pudo imprimir {job.filename}")
+            job.status = PRINTED
+            job.error = None
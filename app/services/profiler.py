@@ -0,0 +1,183 @@
+"""Perfilado a pedido de los callbacks de los controladores.
+
+Los métodos de entrada de los controladores (los públicos y los `_on_*`)
+se envuelven una sola vez al iniciar la aplicación. Mientras el perfilador
+está desarmado el envoltorio solo consulta un contador; al armarlo
+(`PROFILE_CALLS` en el entorno o Ctrl+Alt+P en la ventana principal) las
+próximas N invocaciones corren bajo cProfile y tracemalloc y dejan en la
+carpeta de diagnóstico:
+
+- `<hora>_<n>_<Clase.metodo>.pstats`: estadísticas para `pstats`/snakeviz
+- `<hora>_<n>_<Clase.metodo>.tracemalloc`: asignaciones vivas al terminar
+- `<hora>_<n>_<Clase.metodo>.txt`: resumen legible de ambos
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+import cProfile
+import functools
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+
+from config import PROFILER_CONFIG
+
+# Capturas que arma el atajo de teclado si PROFILE_CALLS no indica otra cantidad
+DEFAULT_CALLS = 5
+# Métodos que corren solos cada pocos segundos y gastarían las capturas
+PERIODIC = frozenset({'sync_products'})
+TRACEBACK_FRAMES = 25
+
+
+def entry_points(cls: type) -> list[str]:
+    """
+    Métodos de entrada de un controlador.
+
+    Args:
+        cls: Clase del controlador
+
+    Returns:
+        list: Nombres de los métodos públicos y de los manejadores `_on_*`
+    """
+    return [
+        name for name, value in vars(cls).items()
+        if callable(value) and not isinstance(value, (staticmethod, classmethod, type))
+        and not name.startswith('__')
+        and (not name.startswith('_') or name.startswith('_on_'))
+        and name not in PERIODIC
+    ]
+
+
+class CallbackProfiler:
+    """Captura cProfile y tracemalloc de las próximas N invocaciones."""
+
+    def __init__(
+        self,
+        output_dir: Union[str, Path] = PROFILER_CONFIG['dir'],
+        memory: bool = PROFILER_CONFIG['memory'],
+        min_ms: float = PROFILER_CONFIG['min_ms']
+    ) -> None:
+        """
+        Inicializa el perfilador desarmado.
+
+        Args:
+            output_dir: Carpeta donde se escriben las capturas
+            memory: Si es True también se toma una foto de tracemalloc
+            min_ms: Las invocaciones más rápidas se descartan sin contar
+        """
+        self.output_dir = Path(output_dir)
+        self.memory = memory
+        self.min_ms = min_ms
+        self.remaining = 0
+        self.captures: list[Path] = []
+        self._sequence = 0
+        self._busy = False
+        self._thread_id = threading.get_ident()
+        self._originals: list[tuple[type, str, Any]] = []
+
+    def arm(self, calls: int = DEFAULT_CALLS) -> None:
+        """
+        Perfila las próximas invocaciones de los métodos instrumentados.
+
+        Args:
+            calls: Cantidad de invocaciones a capturar
+        """
+        self.remaining = max(0, calls)
+        print(f"Perfilando las próximas {self.remaining} acciones en {self.output_dir}")
+
+    def instrument_class(self, cls: type, names: Optional[list[str]] = None) -> None:
+        """
+        Envuelve los métodos de entrada de una clase.
+
+        Debe llamarse antes de crear las instancias: los comandos de Tk
+        guardan el método enlazado al conectar los eventos.
+
+        Args:
+            cls: Clase del controlador
+            names: Métodos a envolver (por defecto `entry_points(cls)`)
+        """
+        for name in names if names is not None else entry_points(cls):
+            func = vars(cls)[name]
+            self._originals.append((cls, name, func))
+            setattr(cls, name, self._wrap(f"{cls.__name__}.{name}", func))
+
+    def restore(self) -> None:
+        """Restaura los métodos originales de las clases instrumentadas."""
+        while self._originals:
+            cls, name, func = self._originals.pop()
+            setattr(cls, name, func)
+
+    def run(self, name: str, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        Ejecuta una función bajo el perfilador y guarda la captura.
+
+        Args:
+            name: Nombre de la captura (ej: "SaleController.confirm_sale")
+            func: Función a ejecutar
+            *args: Argumentos posicionales
+            **kwargs: Argumentos con nombre
+
+        Returns:
+            Any: Resultado de la función
+        """
+        trace_memory = self.memory and not tracemalloc.is_tracing()
+        if trace_memory:
+            tracemalloc.start(TRACEBACK_FRAMES)
+        profile = cProfile.Profile()
+        self._busy = True
+        start = time.perf_counter()
+        try:
+            return profile.runcall(func, *args, **kwargs)
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            snapshot = tracemalloc.take_snapshot() if self.memory and tracemalloc.is_tracing() else None
+            if trace_memory:
+                tracemalloc.stop()
+            self._busy = False
+            if ms >= self.min_ms and self.remaining:
+                self.remaining -= 1
+                self._save(name, ms, profile, snapshot)
+                if not self.remaining:
+                    print(f"Perfilado terminado: {len(self.captures)} capturas en {self.output_dir}")
+
+    def _wrap(self, name: str, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def profiled(*args: Any, **kwargs: Any) -> Any:
+            # Desarmado, en otro hilo o dentro de otra captura: llamada directa
+            if (not self.remaining or self._busy
+                    or threading.get_ident() != self._thread_id):
+                return func(*args, **kwargs)
+            return self.run(name, func, *args, **kwargs)
+        return profiled
+
+    def _save(
+        self,
+        name: str,
+        ms: float,
+        profile: cProfile.Profile,
+        snapshot: Optional[tracemalloc.Snapshot]
+    ) -> None:
+        """Escribe los archivos de una captura."""
+        self._sequence += 1
+        base = self.output_dir / (
+            f"{datetime.now():%Y%m%d_%H%M%S}_{self._sequence:02d}_{name}")
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            profile.dump_stats(f"{base}.pstats")
+
+            summary = io.StringIO()
+            summary.write(f"{name}: {ms:.1f} ms\n\n")
+            stats = pstats.Stats(profile, stream=summary)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(30)
+            if snapshot is not None:
+                snapshot.dump(f"{base}.tracemalloc")
+                summary.write("\nMemoria asignada y no liberada por línea:\n")
+                for stat in snapshot.statistics('lineno')[:20]:
+                    summary.write(f"{stat}\n")
+            Path(f"{base}.txt").write_text(summary.getvalue(), encoding='utf-8')
+            self.captures.append(Path(f"{base}.pstats"))
+        except OSError as e:
+            print(f"Error al guardar el perfil de {name}: {e}")
@@ -0,0 +1,642 @@
+"""Consultas de reportes calculadas en la base de datos."""
+
+from collections import OrderedDict
+from datetime import date, datetime, time as dtime, timedelta
+from typing import Any, Callable, Optional
+import threading
+import time
+
+import numpy as np
+
+from ..models.database import Database
+from .metrics import record_cache
+
+PERIODO_DIA = 'dia'
+PERIODO_SEMANA = 'semana'
+PERIODO_MES = 'mes'
+PERIODO_PERSONALIZADO = 'personalizado'
+
+# Participación acumulada de la facturación donde terminan las clases A y B
+ABC_LIMITE_A = 0.80
+ABC_LIMITE_B = 0.95
+
+# Dónde se leen las ventas de cada tramo de un rango (ver _segments)
+FUENTE_VENTAS = 'ventas'      # sales / sale_details
+FUENTE_ARCHIVO = 'archivo'    # sales_archive / sale_details_archive
+FUENTE_HORAS = 'horas'        # agregados de sales_hourly
+FUENTE_MESES = 'meses'        # agregados de product_sales_monthly
+
+# Unidades y monto por producto en cada fuente (subconsulta de los reportes
+# por producto)
+PRODUCT_SALES = {
+    FUENTE_VENTAS: ("""
+        SELECT sd.product_id, SUM(sd.quantity) AS cantidad_vendida,
+               SUM(sd.quantity * sd.unit_price) AS monto_total
+        FROM sales s
+        JOIN sale_details sd ON sd.sale_id = s.id
+        WHERE s.status = 'active' AND {rango}
+        GROUP BY sd.product_id""", 's.date'),
+    FUENTE_ARCHIVO: ("""
+        SELECT sd.product_id, SUM(sd.quantity) AS cantidad_vendida,
+               SUM(sd.quantity * sd.unit_price) AS monto_total
+        FROM sales_archive s
+        JOIN sale_details_archive sd ON sd.sale_id = s.id
+        WHERE s.status = 'active' AND {rango}
+        GROUP BY sd.product_id""", 's.date'),
+    FUENTE_MESES: ("""
+        SELECT product_id, SUM(cantidad_vendida) AS cantidad_vendida,
+               SUM(monto_total) AS monto_total
+        FROM product_sales_monthly
+        WHERE {rango}
+        GROUP BY product_id""", 'month'),
+}
+PRODUCT_SALES_UNION = """
+    SELECT product_id, SUM(cantidad_vendida) AS cantidad_vendida,
+           SUM(monto_total) AS monto_total
+    FROM ({union}) u
+    GROUP BY product_id"""
+
+
+class ReportService:
+    """Agregaciones de ventas por rango de fechas.
+
+    Todas las sumas y agrupaciones se resuelven en SQL (apoyadas en el índice
+    de `sales(status, date)`), de modo que a Python solo llegan los totales.
+    Los resultados se cachean por tipo de consulta y rango.
+
+    Si hay meses archivados (ArchiveService), cada consulta une solo las
+    tablas que toca el rango: `sales` después del último mes archivado y,
+    antes, los agregados por hora o por producto y mes (o el archivo
+    detallado para los tramos que no cubren).
+    """
+
+    def __init__(
+        self,
+        db: Any = None,
+        open_range_ttl: float = 30.0,
+        max_entries: int = 256
+    ) -> None:
+        """
+        Inicializa el servicio.
+
+        Args:
+            db: Objeto con `execute_read_query` (por defecto Database())
+            open_range_ttl: Segundos de validez en caché de los rangos que
+                incluyen el momento actual (pueden recibir ventas nuevas)
+            max_entries: Máximo de resultados en caché; se descartan los
+                usados hace más tiempo (rangos personalizados, límites...)
+        """
+        self.db = db if db is not None else Database()
+        self.open_range_ttl = open_range_ttl
+        self.max_entries = max_entries
+        self._cache: OrderedDict[tuple, tuple[Optional[float], Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def period_range(
+        period: str, reference: Optional[date] = None
+    ) -> tuple[datetime, datetime]:
+        """
+        Calcula el rango [desde, hasta) de un período predefinido.
+
+        Args:
+            period: 'dia', 'semana' (lunes a domingo) o 'mes'
+            reference: Fecha de referencia (por defecto hoy)
+
+        Returns:
+            tuple: Inicio inclusivo y fin exclusivo del período
+        """
+        day = reference or date.today()
+        if period == PERIODO_DIA:
+            start = day
+            end = day + timedelta(days=1)
+        elif period == PERIODO_SEMANA:
+            start = day - timedelta(days=day.weekday())
+            end = start + timedelta(days=7)
+        elif period == PERIODO_MES:
+            start = day.replace(day=1)
+            end = (start + timedelta(days=32)).replace(day=1)
+        else:
+            raise ValueError(f"Período desconocido: {period}")
+        return (datetime.combine(start, dtime.min),
+                datetime.combine(end, dtime.min))
+
+    @staticmethod
+    def custom_range(start: date, end: date) -> tuple[datetime, datetime]:
+        """
+        Convierte un rango de fechas inclusivo en [desde, hasta).
+
+        Args:
+            start: Primer día del rango
+            end: Último día del rango (inclusive)
+
+        Returns:
+            tuple: Inicio inclusivo y fin exclusivo
+        """
+        if end < start:
+            raise ValueError("La fecha final es anterior a la inicial")
+        return (datetime.combine(start, dtime.min),
+                datetime.combine(end + timedelta(days=1), dtime.min))
+
+    def invalidate(self) -> None:
+        """Descarta los resultados cacheados (ej: tras una venta o anulación)."""
+        with self._lock:
+            self._cache.clear()
+
+    def get_total_sales(self) -> float:
+        """
+        Suma todas las ventas activas (excluye anuladas).
+
+        Returns:
+            float: Total acumulado de ventas activas
+        """
+        query, params = self._segment_query(None, None, {
+            FUENTE_VENTAS: ("SELECT COALESCE(SUM(total), 0) AS total FROM sales "
+                            "WHERE status = 'active' AND {rango}", 'date'),
+            FUENTE_HORAS: ("SELECT COALESCE(SUM(total), 0) AS total "
+                           "FROM sales_hourly WHERE {rango}", 'hour'),
+        }, "SELECT SUM(total) AS total FROM ({union}) t", FUENTE_HORAS)
+        result = self.db.execute_read_query(query, params or None)
+        return float(result[0]['total'] or 0) if result else 0.0
+
+    def get_last_sale_total(self) -> float:
+        """
+        Obtiene el monto de la última venta activa.
+
+        Returns:
+            float: Monto de la última venta activa
+        """
+        query = "SELECT total FROM sales WHERE status = 'active' ORDER BY date DESC LIMIT 1"
+        result = self.db.execute_read_query(query)
+        return float(result[0]['total']) if result else 0.0
+
+    def get_sales(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> list[dict[str, Any]]:
+        """
+        Obtiene las ventas (activas y anuladas) ordenadas por fecha descendente.
+
+        Args:
+            start: Inicio inclusivo (None = sin límite)
+            end: Fin exclusivo (None = sin límite)
+
+        Returns:
+            list: Lista de ventas con sus datos
+        """
+        columns = "SELECT id, date, total, paid, `change`, status"
+        query, params = self._segment_query(start, end, {
+            FUENTE_VENTAS: (columns + " FROM sales WHERE {rango}", 'date'),
+            FUENTE_ARCHIVO: (columns + " FROM sales_archive WHERE {rango}", 'date'),
+        }, "{union}")
+        result = self.db.execute_read_query(
+            query + " ORDER BY date DESC", params or None)
+        return result if result else []
+
+    def get_top_products(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 10
+    ) -> list[dict[str, Any]]:
+        """
+        Obtiene los productos más vendidos por unidades (ventas activas).
+
+        Args:
+            start: Inicio inclusivo (None = sin límite)
+            end: Fin exclusivo (None = sin límite)
+            limit: Cantidad de productos
+
+        Returns:
+            list: Filas con producto, cantidad_vendida y monto_total
+        """
+        ventas, params = self._segment_query(
+            start, end, PRODUCT_SALES, PRODUCT_SALES_UNION, FUENTE_MESES)
+        query = f"""
+            SELECT p.name AS producto, v.cantidad_vendida, v.monto_total
+            FROM ({ventas}) v
+            JOIN products p ON v.product_id = p.id
+            ORDER BY v.cantidad_vendida DESC
+            LIMIT %s
+        """
+        result = self.db.execute_read_query(query, params + (limit,))
+        return result if result else []
+
+    def get_inventory(self) -> list[dict[str, Any]]:
+        """
+        Obtiene todos los productos ordenados por nombre.
+
+        Returns:
+            list: Filas de la tabla products
+        """
+        result = self.db.execute_read_query("SELECT * FROM products ORDER BY name")
+        return result if result else []
+
+    @staticmethod
+    def _range_condition(
+        column: str, start: Optional[datetime], end: Optional[datetime]
+    ) -> tuple[str, tuple]:
+        """Arma la condición de un rango de fechas opcional."""
+        conditions = []
+        params: tuple = ()
+        if start is not None:
+            conditions.append(f"{column} >= %s")
+            params += (start,)
+        if end is not None:
+            conditions.append(f"{column} < %s")
+            params += (end,)
+        return " AND ".join(conditions) or "TRUE", params
+
+    def _segments(
+        self,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        aggregate: Optional[str] = None
+    ) -> list[tuple[str, Optional[datetime], Optional[datetime]]]:
+        """
+        Divide un rango según dónde están guardadas sus ventas.
+
+        Lo posterior al último mes archivado se lee de `sales`. Lo anterior,
+        de los agregados indicados si cubren el tramo (por hora: tramos que
+        empiezan y terminan en hora exacta; por mes: meses completos) y del
+        archivo detallado en los bordes que no cubren.
+
+        Args:
+            start: Inicio inclusivo (None = sin límite)
+            end: Fin exclusivo (None = sin límite)
+            aggregate: FUENTE_HORAS, FUENTE_MESES o None (solo detalle)
+
+        Returns:
+            list: Tramos (fuente, desde, hasta)
+        """
+        cutoff = self.db.get_archive_cutoff()
+        if cutoff is None or (start is not None and start >= cutoff):
+            return [(FUENTE_VENTAS, start, end)]
+
+        segments = []
+        archived_end = cutoff if end is None or end > cutoff else end
+        if aggregate == FUENTE_HORAS:
+            aligned = all(
+                bound is None or bound == bound.replace(minute=0, second=0, microsecond=0)
+                for bound in (start, archived_end))
+            segments.append(
+                (FUENTE_HORAS if aligned else FUENTE_ARCHIVO, start, archived_end))
+        elif aggregate == FUENTE_MESES:
+            first = start if start is None else self._month_ceil(start)
+            last = self._month_floor(archived_end)
+            if first is not None and first > last:
+                segments.append((FUENTE_ARCHIVO, start, archived_end))
+            else:
+                if start is not None and start < first:
+                    segments.append((FUENTE_ARCHIVO, start, first))
+                if first is None or first < last:
+                    segments.append((FUENTE_MESES, first, last))
+                if last < archived_end:
+                    segments.append((FUENTE_ARCHIVO, last, archived_end))
+        else:
+            segments.append((FUENTE_ARCHIVO, start, archived_end))
+
+        if end is None or end > cutoff:
+            segments.append((FUENTE_VENTAS, cutoff, end))
+        return segments
+
+    @staticmethod
+    def _month_floor(moment: datetime) -> datetime:
+        """Inicio del mes de un momento."""
+        return datetime.combine(moment.date().replace(day=1), dtime.min)
+
+    @classmethod
+    def _month_ceil(cls, moment: datetime) -> datetime:
+        """Inicio del primer mes que empieza en o después de un momento."""
+        floor = cls._month_floor(moment)
+        if floor == moment:
+            return floor
+        return datetime.combine(
+            (floor.date() + timedelta(days=32)).replace(day=1), dtime.min)
+
+    def _segment_query(
+        self,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        pieces: dict[str, tuple[str, str]],
+        union: str,
+        aggregate: Optional[str] = None
+    ) -> tuple[str, tuple]:
+        """
+        Arma una consulta sobre las tablas que toca el rango.
+
+        Args:
+            start: Inicio inclusivo (None = sin límite)
+            end: Fin exclusivo (None = sin límite)
+            pieces: Por fuente, (SELECT con el marcador {rango}, columna de fecha)
+            union: Consulta que combina varios tramos ({union} = los SELECT
+                unidos con UNION ALL); con un solo tramo se usa el SELECT solo
+            aggregate: Agregado a usar para lo archivado (ver _segments)
+
+        Returns:
+            tuple: (consulta, parámetros)
+        """
+        selects = []
+        params: tuple = ()
+        for source, seg_start, seg_end in self._segments(start, end, aggregate):
+            template, column = pieces[source]
+            condition, seg_params = self._range_condition(column, seg_start, seg_end)
+            selects.append(template.format(rango=condition))
+            params += seg_params
+        if len(selects) == 1:
+            return selects[0], params
+        return union.format(union="\n UNION ALL \n".join(selects)), params
+
+    def get_period_summary(self, start: datetime, end: datetime) -> dict[str, Any]:
+        """
+        Obtiene total, cantidad de ventas y ticket promedio del rango.
+
+        Args:
+            start: Inicio inclusivo
+            end: Fin exclusivo
+
+        Returns:
+            dict: total, cantidad_ventas y ticket_promedio
+        """
+        def query() -> dict[str, Any]:
+            result = self.db.execute_read_query(*self._segment_query(start, end, {
+                FUENTE_VENTAS: ("""
+                    SELECT COALESCE(SUM(total), 0) AS total,
+                           COUNT(*) AS cantidad_ventas
+                    FROM sales
+                    WHERE status = 'active' AND {rango}""", 'date'),
+                FUENTE_ARCHIVO: ("""
+                    SELECT COALESCE(SUM(total), 0) AS total,
+                           COUNT(*) AS cantidad_ventas
+                    FROM sales_archive
+                    WHERE status = 'active' AND {rango}""", 'date'),
+                FUENTE_HORAS: ("""
+                    SELECT COALESCE(SUM(total), 0) AS total,
+                           COALESCE(SUM(cantidad_ventas), 0) AS cantidad_ventas
+                    FROM sales_hourly
+                    WHERE {rango}""", 'hour'),
+            }, """
+                SELECT SUM(total) AS total, SUM(cantidad_ventas) AS cantidad_ventas
+                FROM ({union}) t""", FUENTE_HORAS))
+            total = float(result[0]['total']) if result else 0.0
+            cantidad = int(result[0]['cantidad_ventas']) if result else 0
+            return {
+                'total': total,
+                'cantidad_ventas': cantidad,
+                'ticket_promedio': total / cantidad if cantidad else 0.0
+            }
+
+        return self._cached(('resumen', start, end), end, query)
+
+    def get_sales_by_hour(self, start: datetime, end: datetime) -> list[dict[str, Any]]:
+        """
+        Agrupa las ventas del rango por hora del día.
+
+        Args:
+            start: Inicio inclusivo
+            end: Fin exclusivo
+
+        Returns:
+            list: Filas con hora, cantidad_ventas y total
+        """
+        return self._cached(('por_hora', start, end), end,
+                            lambda: self._grouped_sales(start, end, 'HOUR', 'hora'))
+
+    def get_sales_by_day(self, start: datetime, end: datetime) -> list[dict[str, Any]]:
+        """
+        Agrupa las ventas del rango por día.
+
+        Args:
+            start: Inicio inclusivo
+            end: Fin exclusivo
+
+        Returns:
+            list: Filas con dia, cantidad_ventas y total
+        """
+        return self._cached(('por_dia', start, end), end,
+                            lambda: self._grouped_sales(start, end, 'DATE', 'dia'))
+
+    def _grouped_sales(
+        self, start: datetime, end: datetime, function: str, alias: str
+    ) -> list[dict[str, Any]]:
+        """
+        Cantidad y total de ventas activas agrupados por una función de la fecha.
+
+        Args:
+            start: Inicio inclusivo
+            end: Fin exclusivo
+            function: HOUR o DATE
+            alias: Nombre de la columna agrupada
+
+        Returns:
+            list: Filas con la columna agrupada, cantidad_ventas y total
+        """
+        detail = f"""
+            SELECT {function}(date) AS {alias},
+                   COUNT(*) AS cantidad_ventas,
+                   SUM(total) AS total
+            FROM {{tabla}}
+            WHERE status = 'active' AND {{rango}}
+            GROUP BY {function}(date)"""
+        query, params = self._segment_query(start, end, {
+            FUENTE_VENTAS: (detail.replace('{tabla}', 'sales'), 'date'),
+            FUENTE_ARCHIVO: (detail.replace('{tabla}', 'sales_archive'), 'date'),
+            FUENTE_HORAS: (f"""
+                SELECT {function}(hour) AS {alias},
+                       CAST(SUM(cantidad_ventas) AS SIGNED) AS cantidad_ventas,
+                       SUM(total) AS total
+                FROM sales_hourly
+                WHERE {{rango}}
+                GROUP BY {function}(hour)""", 'hour'),
+        }, f"""
+            SELECT {alias}, CAST(SUM(cantidad_ventas) AS SIGNED) AS cantidad_ventas,
+                   SUM(total) AS total
+            FROM ({{union}}) t
+            GROUP BY {alias}""", FUENTE_HORAS)
+        return self.db.execute_read_query(query + f" ORDER BY {alias}", params)
+
+    def get_product_revenue(
+        self, start: datetime, end: datetime, limit: Optional[int] = None
+    ) -> list[dict[str, Any]]:
+        """
+        Obtiene unidades y monto vendido por producto en el rango.
+
+        Args:
+            start: Inicio inclusivo
+            end: Fin exclusivo
+            limit: Cantidad máxima de productos (None = todos)
+
+        Returns:
+            list: Filas con producto, cantidad_vendida y monto_total
+        """
+        def query() -> list[dict[str, Any]]:
+            ventas, params = self._segment_query(
+                start, end, PRODUCT_SALES, PRODUCT_SALES_UNION, FUENTE_MESES)
+            sql = f"""
+                SELECT p.name AS producto, v.cantidad_vendida, v.monto_total
+                FROM ({ventas}) v
+                JOIN products p ON v.product_id = p.id
+                ORDER BY v.monto_total DESC
+            """
+            if limit is not None:
+                sql += " LIMIT %s"
+                params += (limit,)
+            return self.db.execute_read_query(sql, params)
+
+        return self._cached(('por_producto', start, end, limit), end, query)
+
+    def get_abc_analysis(
+        self,
+        start: datetime,
+        end: datetime,
+        limit_a: float = ABC_LIMITE_A,
+        limit_b: float = ABC_LIMITE_B
+    ) -> list[dict[str, Any]]:
+        """
+        Clasifica todo el catálogo en A, B y C según su facturación en el rango.
+
+        Una sola consulta agrega la facturación de cada producto (los que no
+        vendieron quedan con 0); las participaciones y su acumulado se
+        calculan con NumPy sobre el catálogo completo.
+
+        Args:
+            start: Inicio inclusivo
+            end: Fin exclusivo
+            limit_a: Participación acumulada donde termina la clase A
+            limit_b: Participación acumulada donde termina la clase B
+
+        Returns:
+            list: Filas con id, barcode, producto, cantidad_vendida,
+                monto_total, participacion, participacion_acumulada (en %)
+                y clase, de mayor a menor facturación
+        """
+        def query() -> list[dict[str, Any]]:
+            ventas, params = self._segment_query(
+                start, end, PRODUCT_SALES, PRODUCT_SALES_UNION, FUENTE_MESES)
+            rows = self.db.execute_read_query(f"""
+                SELECT p.id, p.barcode, p.name AS producto,
+                       COALESCE(v.cantidad_vendida, 0) AS cantidad_vendida,
+                       COALESCE(v.monto_total, 0) AS monto_total
+                FROM products p
+                LEFT JOIN ({ventas}) v ON v.product_id = p.id
+                WHERE p.barcode NOT LIKE 'VAR-%%'
+                ORDER BY p.name
+            """, params)
+            return self.classify_abc(rows or [], limit_a, limit_b)
+
+        return self._cached(('abc', start, end, limit_a, limit_b), end, query)
+
+    @staticmethod
+    def classify_abc(
+        rows: list[dict[str, Any]],
+        limit_a: float = ABC_LIMITE_A,
+        limit_b: float = ABC_LIMITE_B
+    ) -> list[dict[str, Any]]:
+        """
+        Asigna la clase ABC a filas con `monto_total`.
+
+        Un producto pertenece a la clase en la que empieza su participación:
+        el que cruza el 80 % sigue siendo A. Los productos sin ventas son C.
+
+        Args:
+            rows: Filas con al menos monto_total
+            limit_a: Participación acumulada donde termina la clase A
+            limit_b: Participación acumulada donde termina la clase B
+
+        Returns:
+            list: Copia de las filas con participacion,
+                participacion_acumulada y clase, de mayor a menor monto
+        """
+        if not rows:
+            return []
+
+        revenue = np.array([float(row['monto_total']) for row in rows])
+        order = np.argsort(-revenue, kind='stable')
+        revenue = revenue[order]
+        total = revenue.sum()
+        share = revenue / total if total > 0 else np.zeros_like(revenue)
+        cumulative = np.cumsum(share)
+        previous = cumulative - share
+        classes = np.where(
+            revenue <= 0, 'C',
+            np.where(previous < limit_a, 'A',
+                     np.where(previous < limit_b, 'B', 'C')))
+
+        return [
+            dict(rows[i],
+                 monto_total=float(revenue[pos]),
+                 participacion=round(float(share[pos]) * 100, 2),
+                 participacion_acumulada=round(float(cumulative[pos]) * 100, 2),
+                 clase=str(classes[pos]))
+            for pos, i in enumerate(order)
+        ]
+
+    @staticmethod
+    def abc_summary(rows: list[dict[str, Any]]) -> dict[str, dict[str, float]]:
+        """
+        Resume un análisis ABC por clase.
+
+        Args:
+            rows: Filas generadas por get_abc_analysis
+
+        Returns:
+            dict: Por clase, productos, monto_total y participacion (en %)
+        """
+        summary = {clase: {'productos': 0, 'monto_total': 0.0, 'participacion': 0.0}
+                   for clase in 'ABC'}
+        for row in rows:
+            data = summary[row['clase']]
+            data['productos'] += 1
+            data['monto_total'] += row['monto_total']
+            data['participacion'] += row['participacion']
+        for data in summary.values():
+            data['participacion'] = round(data['participacion'], 2)
+        return summary
+
+    def get_period_report(self, start: datetime, end: datetime) -> dict[str, Any]:
+        """
+        Arma el reporte completo de un rango.
+
+        Args:
+            start: Inicio inclusivo
+            end: Fin exclusivo
+
+        Returns:
+            dict: desde, hasta, resumen, por_hora, por_dia, por_producto y abc
+        """
+        return {
+            'desde': start,
+            'hasta': end,
+            'resumen': self.get_period_summary(start, end),
+            'por_hora': self.get_sales_by_hour(start, end),
+            'por_dia': self.get_sales_by_day(start, end),
+            'por_producto': self.get_product_revenue(start, end),
+            'abc': self.get_abc_analysis(start, end)
+        }
+
+    def _cached(self, key: tuple, end: datetime, loader: Callable[[], Any]) -> Any:
+        """
+        Retorna el resultado cacheado de una consulta o la ejecuta.
+
+        Los rangos cerrados (que terminan antes de ahora) se guardan hasta la
+        próxima invalidación; los abiertos vencen a los `open_range_ttl`
+        segundos. Como máximo se guardan `max_entries` resultados (LRU).
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires is None or expires > now:
+                    self._cache.move_to_end(key)
+                    record_cache('reportes', True)
+                    return value
+
+        record_cache('reportes', False)
+        value = loader()
+        expires = None if end <= datetime.now() else now + self.open_range_ttl
+        with self._lock:
+            self._cache[key] = (expires, value)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return value
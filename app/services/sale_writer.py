@@ -0,0 +1,218 @@
+"""Registro de ventas agrupadas en transacciones (group commit).
+
+Las ventas que llegan casi al mismo tiempo (varios escáneres o clientes de
+la API) se escriben juntas en una sola transacción: un commit por lote en
+lugar de uno por venta y por detalle. Cada venta usa un SAVEPOINT, así una
+venta sin stock suficiente se rechaza sin afectar a las demás del lote.
+"""
+
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Optional
+import queue
+import threading
+import time
+
+import pymysql
+
+from ..models.database import Database
+from ..models.money import Money
+from ..models.stock_movement import MOV_VENTA
+from .import_service import MOVEMENT_QUERY
+
+
+class InsufficientStockError(ValueError):
+    """El stock de un producto no alcanza para la venta."""
+
+
+@dataclass
+class SaleItem:
+    """Renglón de una venta (precio tomado del catálogo)."""
+
+    product_id: int
+    barcode: str
+    quantity: int
+    unit_price: Money
+
+
+@dataclass
+class SaleRequest:
+    """Venta pendiente de escribir."""
+
+    items: list[SaleItem]
+    paid: Money
+    date: datetime = field(default_factory=datetime.now)
+    future: Future = field(default_factory=Future)
+
+    @property
+    def total(self) -> Money:
+        """Total de la venta."""
+        return sum((i.unit_price * i.quantity for i in self.items), Money())
+
+    @property
+    def change(self) -> Money:
+        """Vuelto a entregar."""
+        return self.paid - self.total
+
+
+class SaleWriter:
+    """Hilo que escribe las ventas encoladas en lotes."""
+
+    def __init__(
+        self,
+        pool: Any,
+        batch_window: float = 0.02,
+        max_batch: int = 50,
+        on_commit: Optional[Callable[[list[SaleRequest]], None]] = None
+    ) -> None:
+        """
+        Inicializa el escritor y arranca su hilo.
+
+        Args:
+            pool: ConnectionPool de donde tomar la conexión de escritura
+            batch_window: Segundos que se esperan otras ventas para el lote
+            max_batch: Ventas máximas por transacción
+            on_commit: Función llamada con las ventas confirmadas de cada lote
+        """
+        self.pool = pool
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.on_commit = on_commit
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="sale-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, items: list[SaleItem], paid: Optional[Money] = None) -> Future:
+        """
+        Encola una venta.
+
+        Args:
+            items: Renglones de la venta
+            paid: Monto pagado (por defecto el total)
+
+        Returns:
+            Future: Se completa con el ID de la venta, o con
+                InsufficientStockError si no alcanzó el stock
+        """
+        if not items:
+            raise ValueError("La venta no tiene productos")
+        request = SaleRequest(items=items, paid=Money())
+        request.paid = request.total if paid is None else Money.of(paid)
+        if request.change < 0:
+            raise ValueError("El monto pagado es menor al total")
+        self._queue.put(request)
+        return request.future
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Escribe lo pendiente y detiene el hilo."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        """Arma lotes con las ventas que llegan dentro de la ventana."""
+        stopping = False
+        while not stopping:
+            request = self._queue.get()
+            if request is None:
+                break
+            batch = [request]
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+            self._write(batch)
+
+    def _write(self, batch: list[SaleRequest]) -> None:
+        """Escribe un lote en una transacción y completa los Future."""
+        results: list[tuple[SaleRequest, Any]] = []
+        try:
+            with self.pool.connection() as connection:
+                cursor = connection.cursor()
+                try:
+                    version = Database.next_version(cursor)
+                    for request in batch:
+                        cursor.execute("SAVEPOINT venta")
+                        try:
+                            sale_id = self._write_sale(cursor, request, version)
+                        except (InsufficientStockError,
+                                pymysql.err.IntegrityError) as e:
+                            # Ej: sin stock, o un producto borrado mientras tanto
+                            cursor.execute("ROLLBACK TO SAVEPOINT venta")
+                            results.append((request, e))
+                            continue
+                        cursor.execute("RELEASE SAVEPOINT venta")
+                        results.append((request, sale_id))
+                    connection.commit()
+                finally:
+                    cursor.close()
+        except Exception as e:
+            print(f"Error al registrar ventas: {e}")
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        committed = []
+        for request, result in results:
+            if isinstance(result, Exception):
+                request.future.set_exception(result)
+            else:
+                request.future.set_result(result)
+                committed.append(request)
+        if committed and self.on_commit:
+            try:
+                self.on_commit(committed)
+            except Exception as e:
+                print(f"Error al avisar ventas registradas: {e}")
+
+    @staticmethod
+    def _write_sale(cursor: Any, request: SaleRequest, version: int) -> int:
+        """Escribe una venta, sus detalles y el descuento de stock."""
+        cursor.execute(
+            "INSERT INTO sales (date, total, paid, `change`) VALUES (%s, %s, %s, %s)",
+            (request.date.strftime('%Y-%m-%d %H:%M:%S'),
+             request.total.to_decimal(), request.paid.to_decimal(),
+             request.change.to_decimal())
+        )
+        sale_id = cursor.lastrowid
+        cursor.executemany(
+            "INSERT INTO sale_details (sale_id, product_id, quantity, unit_price) "
+            "VALUES (%s, %s, %s, %s)",
+            [(sale_id, i.product_id, i.quantity, i.unit_price.to_decimal())
+             for i in request.items]
+        )
+
+        quantities: dict[int, int] = {}
+        barcodes: dict[int, str] = {}
+        for item in request.items:
+            quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+            barcodes[item.product_id] = item.barcode
+        for product_id, quantity in quantities.items():
+            # El descuento solo se aplica si alcanza el stock que no está
+            # reservado por las canastas abiertas en las cajas
+            cursor.execute(
+                "UPDATE products SET stock = stock - %s, row_version = %s "
+                "WHERE id = %s AND stock - (SELECT COALESCE(SUM(r.quantity), 0) "
+                "FROM stock_reservations r "
+                "WHERE r.product_id = %s AND r.expires_at > NOW()) >= %s",
+                (quantity, version, product_id, product_id, quantity)
+            )
+            if cursor.rowcount == 0:
+                raise InsufficientStockError(
+                    f"Stock insuficiente para {barcodes[product_id]}")
+
+        cursor.executemany(MOVEMENT_QUERY, [
+            (product_id, -quantity, MOV_VENTA, str(sale_id))
+            for product_id, quantity in quantities.items()
+        ])
+        return sale_id
@@ -0,0 +1,103 @@
+"""Inicio escalonado: conexión y catálogo en segundo plano.
+
+La ventana se dibuja enseguida y un hilo trabajador abre la conexión
+compartida (`Database()`, que también crea las tablas), lee el catálogo y
+hace las tareas de inicio. El hilo de Tk consulta `poll()` y recibe, en
+este orden:
+
+- `('catalog', (versión, productos))`: catálogo para mostrar (de la copia
+  local si hay una válida, que se publica antes de conectar)
+- `('ready', None)`: la conexión compartida ya se puede usar desde Tk
+- `('error', excepción)`: no se pudo conectar; se reintenta con `start()`
+
+Hasta recibir `ready` el hilo de Tk no debe usar `Database()`: la conexión
+todavía es del hilo trabajador.
+"""
+
+from typing import Any, Optional
+import queue
+import threading
+
+from ..models.database import Database
+from .catalog_snapshot import CatalogSnapshot
+from .inventory_service import InventoryService
+from config import CATALOG_SNAPSHOT_CONFIG, INVENTORY_CONFIG
+
+CATALOG = 'catalog'
+READY = 'ready'
+ERROR = 'error'
+
+
+class StartupLoader:
+    """Conecta con la base y precarga el catálogo en un hilo trabajador."""
+
+    def __init__(self, snapshot: Optional[CatalogSnapshot] = None) -> None:
+        """
+        Inicializa el cargador.
+
+        Args:
+            snapshot: Copia local del catálogo (por defecto la configurada
+                en CATALOG_SNAPSHOT_CONFIG; sin ruta no se usa)
+        """
+        if snapshot is None and CATALOG_SNAPSHOT_CONFIG['path']:
+            snapshot = CatalogSnapshot()
+        self.snapshot = snapshot
+        self.catalog: Optional[tuple[int, list]] = None
+        self.ready = False
+        self._events: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Lanza (o reintenta) la conexión en un hilo trabajador."""
+        if self.ready or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="startup-loader", daemon=True)
+        self._thread.start()
+
+    def poll(self) -> list[tuple[str, Any]]:
+        """
+        Retorna los avisos pendientes del hilo trabajador (hilo de Tk).
+
+        Returns:
+            list: Avisos (tipo, valor) en el orden en que se produjeron
+        """
+        events = []
+        while True:
+            try:
+                kind, value = self._events.get_nowait()
+            except queue.Empty:
+                return events
+            if kind == CATALOG:
+                self.catalog = value
+            elif kind == READY:
+                self.ready = True
+            events.append((kind, value))
+
+    def _run(self) -> None:
+        """Carga en el hilo trabajador (ver el docstring del módulo)."""
+        from_snapshot = self.catalog is not None
+        try:
+            if not from_snapshot and self.snapshot is not None:
+                cached = self.snapshot.load()
+                if cached is not None:
+                    from_snapshot = True
+                    self._events.put((CATALOG, cached))
+
+            db = Database()
+            if not from_snapshot:
+                # Misma secuencia que ProductController.load_products
+                version = db.get_data_version()
+                self._events.put((CATALOG, (version, db.get_all_products())))
+
+            try:
+                InventoryService(db).ensure_snapshot(
+                    INVENTORY_CONFIG['snapshot_interval_days'])
+            except Exception as e:
+                print(f"Error al guardar la foto de stock: {e}")
+
+            # Devolver la conexión sin una transacción de lectura abierta
+            db.connection.commit()
+            self._events.put((READY, None))
+        except Exception as e:
+            self._events.put((ERROR, e))
@@ -0,0 +1,192 @@
+"""Alertas de stock bajo mantenidas de forma incremental."""
+
+from typing import Any, Callable, Optional
+import threading
+
+
+class LowStockMonitor:
+    """Conjunto de productos en o por debajo de su stock mínimo.
+
+    Al iniciar se leen solo los productos que tienen stock mínimo
+    (`reorder_level > 0`). Después cada venta, anulación o edición avisa
+    la variación a través de `Database.stock_monitor` y el conjunto de
+    alertas se actualiza en memoria, sin volver a recorrer la tabla.
+    """
+
+    _instance: Optional['LowStockMonitor'] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        """Inicializa el monitor vacío."""
+        # product_id -> datos del producto con stock mínimo
+        self._tracked: dict[int, dict[str, Any]] = {}
+        self._alerts: set[int] = set()
+        self._listeners: list[Callable[['LowStockMonitor'], None]] = []
+        self._lock = threading.RLock()
+
+    @classmethod
+    def instance(cls) -> 'LowStockMonitor':
+        """
+        Retorna el monitor compartido del proceso.
+
+        Returns:
+            LowStockMonitor: Instancia compartida
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def load(self, db: Any) -> None:
+        """
+        Carga los productos con stock mínimo desde la base de datos.
+
+        Args:
+            db: Objeto con `execute_query`
+        """
+        rows = db.execute_query("""
+            SELECT id, barcode, name, stock, reorder_level
+            FROM products
+            WHERE reorder_level > 0
+        """)
+        with self._lock:
+            self._tracked = {
+                row['id']: {
+                    'id': row['id'],
+                    'barcode': row['barcode'],
+                    'name': row['name'],
+                    'stock': int(row['stock']),
+                    'reorder_level': int(row['reorder_level'])
+                }
+                for row in rows or []
+            }
+            self._alerts = {
+                product_id for product_id, data in self._tracked.items()
+                if data['stock'] <= data['reorder_level']
+            }
+        self._notify()
+
+    def apply_delta(self, product_id: int, delta: int) -> None:
+        """
+        Aplica una variación de stock (ej: -2 por una venta).
+
+        Args:
+            product_id: ID del producto
+            delta: Variación con signo
+        """
+        with self._lock:
+            data = self._tracked.get(product_id)
+            if data is None:
+                return
+            data['stock'] += int(delta)
+            if not self._update_alert(product_id, data):
+                return
+        self._notify()
+
+    def track(self, product: Any, product_id: Optional[int] = None) -> None:
+        """
+        Actualiza los datos de un producto luego de guardarlo.
+
+        Args:
+            product: Producto con barcode, name, stock y reorder_level
+            product_id: ID (si el producto todavía no lo tiene asignado)
+        """
+        product_id = product_id if product_id is not None else product.id
+        if product_id is None:
+            return
+
+        with self._lock:
+            if int(product.reorder_level or 0) <= 0:
+                removed = self._tracked.pop(product_id, None) is not None
+                changed = product_id in self._alerts
+                self._alerts.discard(product_id)
+                if not (removed or changed):
+                    return
+            else:
+                data = {
+                    'id': product_id,
+                    'barcode': product.barcode,
+                    'name': product.name,
+                    'stock': int(product.stock),
+                    'reorder_level': int(product.reorder_level)
+                }
+                self._tracked[product_id] = data
+                if not self._update_alert(product_id, data):
+                    return
+        self._notify()
+
+    def untrack(self, product_id: int) -> None:
+        """
+        Deja de seguir un producto (ej: al eliminarlo).
+
+        Args:
+            product_id: ID del producto
+        """
+        with self._lock:
+            self._tracked.pop(product_id, None)
+            if product_id not in self._alerts:
+                return
+            self._alerts.discard(product_id)
+        self._notify()
+
+    def alerts(self) -> list[dict[str, Any]]:
+        """
+        Productos en alerta, del más al menos urgente.
+
+        Returns:
+            list: Filas con id, barcode, name, stock, reorder_level y faltante
+                (unidades para volver al stock mínimo)
+        """
+        with self._lock:
+            rows = [
+                dict(self._tracked[product_id],
+                     faltante=self._tracked[product_id]['reorder_level']
+                     - self._tracked[product_id]['stock'])
+                for product_id in self._alerts
+            ]
+        return sorted(rows, key=lambda r: (-r['faltante'], r['name']))
+
+    def alert_barcodes(self) -> set[str]:
+        """Códigos de barras de los productos en alerta."""
+        with self._lock:
+            return {self._tracked[product_id]['barcode']
+                    for product_id in self._alerts}
+
+    def count(self) -> int:
+        """Cantidad de productos en alerta."""
+        with self._lock:
+            return len(self._alerts)
+
+    def add_listener(self, callback: Callable[['LowStockMonitor'], None]) -> None:
+        """
+        Registra una función a llamar cuando cambia el conjunto de alertas.
+
+        Args:
+            callback: Función que recibe el monitor
+        """
+        self._listeners.append(callback)
+
+    def _update_alert(self, product_id: int, data: dict[str, Any]) -> bool:
+        """
+        Agrega o quita un producto de las alertas.
+
+        Returns:
+            bool: True si hay que avisar (entró o salió de las alertas, o
+                sigue en alerta con otro stock)
+        """
+        low = data['stock'] <= data['reorder_level']
+        if low == (product_id in self._alerts):
+            return low
+        if low:
+            self._alerts.add(product_id)
+        else:
+            self._alerts.discard(product_id)
+        return True
+
+    def _notify(self) -> None:
+        """Avisa a los interesados que cambiaron las alertas."""
+        for callback in list(self._listeners):
+            try:
+                callback(self)
+            except Exception as e:
+                print(f"Error al notificar alertas de stock: {e}")
@@ -0,0 +1,323 @@
+"""Renderizado rápido de tickets de venta.
+
+A diferencia de los reportes, el ticket tiene un diseño fijo: las
+posiciones, fuentes y textos se calculan una sola vez y cada ticket se
+dibuja directamente sobre el canvas de reportlab (sin el motor de layout
+de platypus). También puede generarse como texto plano o como flujo de
+bytes ESC/POS para impresoras térmicas.
+"""
+
+from datetime import datetime
+from typing import Any, BinaryIO, Union
+import os
+
+from reportlab.lib.units import inch
+from reportlab.pdfgen import canvas
+
+# Comandos ESC/POS
+ESC_INIT = b'\x1b@'
+ESC_ALIGN_LEFT = b'\x1ba\x00'
+ESC_ALIGN_CENTER = b'\x1ba\x01'
+ESC_BOLD_ON = b'\x1bE\x01'
+ESC_BOLD_OFF = b'\x1bE\x00'
+ESC_DOUBLE_ON = b'\x1d!\x11'
+ESC_DOUBLE_OFF = b'\x1d!\x00'
+ESC_FEED = b'\x1bd\x04'
+ESC_CUT = b'\x1dV\x01'
+
+
+class TicketRenderer:
+    """Genera tickets de venta en PDF, texto plano o ESC/POS."""
+
+    # Diseño del PDF (puntos)
+    PAGE_WIDTH = 4 * inch
+    MARGIN_X = 20
+    MARGIN_TOP = 30
+    MARGIN_BOTTOM = 30
+    LINE_HEIGHT = 12
+    COLUMNS_X = (20, 132, 168, 226)  # Producto, Cant, Precio, Subtotal
+    COLUMN_RIGHT = PAGE_WIDTH - MARGIN_X
+
+    # Diseño de texto (caracteres por línea de una impresora de 58/80 mm)
+    TEXT_WIDTH = 40
+    TEXT_ENCODING = 'cp850'
+
+    def __init__(self, store_name: str = "App-Stock") -> None:
+        """
+        Inicializa el renderizador.
+
+        Args:
+            store_name: Nombre que se imprime en el encabezado
+        """
+        self.store_name = store_name
+        self._separator = "=" * self.TEXT_WIDTH
+        self._thin_separator = "-" * self.TEXT_WIDTH
+        self._escpos_header = (
+            ESC_INIT + ESC_ALIGN_CENTER + ESC_BOLD_ON + ESC_DOUBLE_ON
+            + b"TICKET DE VENTA\n" + ESC_DOUBLE_OFF + ESC_BOLD_OFF
+            + self._encode(f"{store_name}\n")
+        )
+        self._escpos_footer = (
+            ESC_ALIGN_CENTER + self._encode("¡Gracias por su compra!\n")
+            + ESC_FEED + ESC_CUT
+        )
+
+    @staticmethod
+    def details_from_items(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Convierte los items de la canasta al formato de detalle del ticket.
+
+        Args:
+            items: Items de SaleController (barcode, name, qty, price, subtotal)
+
+        Returns:
+            list: Detalles con las claves producto, cantidad, precio y subtotal
+        """
+        return [
+            {
+                'producto': item['name'],
+                'cantidad': int(item['qty']),
+                'precio': item['price'],
+                'subtotal': item['subtotal']
+            }
+            for item in items
+        ]
+
+    def render_pdf(
+        self,
+        filename: str,
+        sale_id: int,
+        sale_date: str,
+        sale_total: float,
+        sale_paid: float,
+        sale_change: float,
+        details: list[dict[str, Any]]
+    ) -> str:
+        """
+        Dibuja el ticket en un PDF de largo variable.
+
+        Args:
+            filename: Ruta del archivo a generar
+            sale_id: ID de la venta
+            sale_date: Fecha de la venta
+            sale_total: Total de la venta
+            sale_paid: Monto pagado
+            sale_change: Cambio entregado
+            details: Detalles de los productos vendidos
+
+        Returns:
+            str: Ruta del archivo generado
+        """
+        lh = self.LINE_HEIGHT
+        # Encabezado (7 líneas) + tabla + totales (5) + pie (4)
+        height = (self.MARGIN_TOP + self.MARGIN_BOTTOM
+                  + lh * (len(details) + 18))
+
+        c = canvas.Canvas(
+            str(filename),
+            pagesize=(self.PAGE_WIDTH, height),
+            pageCompression=0
+        )
+        center = self.PAGE_WIDTH / 2
+        right = self.COLUMN_RIGHT
+        y = height - self.MARGIN_TOP
+
+        c.setFont('Helvetica-Bold', 16)
+        c.drawCentredString(center, y, "TICKET DE VENTA")
+        y -= lh * 1.6
+        c.setFont('Helvetica', 9)
+        c.drawCentredString(center, y, self.store_name)
+        y -= lh
+        c.drawCentredString(center, y, self._separator)
+        y -= lh * 1.5
+        c.drawCentredString(center, y, f"Venta N°: {sale_id}")
+        y -= lh
+        c.drawCentredString(center, y, f"Fecha: {sale_date}")
+        y -= lh
+        c.drawCentredString(center, y, self._thin_separator)
+        y -= lh * 1.5
+
+        # Tabla de productos
+        x_prod, x_cant, x_precio, _ = self.COLUMNS_X
+        c.setFont('Helvetica-Bold', 8)
+        c.line(self.MARGIN_X, y + lh - 2, right, y + lh - 2)
+        c.drawString(x_prod, y, "Producto")
+        c.drawRightString(x_cant + 24, y, "Cant")
+        c.drawRightString(x_precio + 44, y, "Precio")
+        c.drawRightString(right, y, "Subtotal")
+        c.line(self.MARGIN_X, y - 3, right, y - 3)
+        y -= lh + 2
+
+        c.setFont('Helvetica', 8)
+        for detail in details:
+            c.drawString(x_prod, y, str(detail['producto'])[:15])
+            c.drawRightString(x_cant + 24, y, str(detail['cantidad']))
+            c.drawRightString(x_precio + 44, y, f"${detail['precio']:.2f}")
+            c.drawRightString(right, y, f"${detail['subtotal']:.2f}")
+            y -= lh
+
+        c.setFont('Helvetica', 9)
+        c.drawCentredString(center, y, self._separator)
+        y -= lh * 1.5
+
+        # Totales
+        for label, value, font in (
+            ("TOTAL:", sale_total, 'Helvetica-Bold'),
+            ("Pagado:", sale_paid, 'Helvetica'),
+            ("Cambio:", sale_change, 'Helvetica'),
+        ):
+            c.setFont(font, 10)
+            c.drawString(self.MARGIN_X, y, label)
+            c.drawRightString(right, y, f"${value:.2f}")
+            y -= lh
+
+        y -= lh
+        c.setFont('Helvetica', 9)
+        c.drawCentredString(center, y, self._separator)
+        y -= lh
+        c.drawCentredString(center, y, "¡Gracias por su compra!")
+        y -= lh
+        c.drawCentredString(
+            center, y,
+            f"Generado: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
+
+        c.showPage()
+        c.save()
+        return str(filename)
+
+    def render_text(
+        self,
+        sale_id: int,
+        sale_date: str,
+        sale_total: float,
+        sale_paid: float,
+        sale_change: float,
+        details: list[dict[str, Any]]
+    ) -> str:
+        """
+        Genera el ticket como texto plano de ancho fijo.
+
+        Args:
+            sale_id: ID de la venta
+            sale_date: Fecha de la venta
+            sale_total: Total de la venta
+            sale_paid: Monto pagado
+            sale_change: Cambio entregado
+            details: Detalles de los productos vendidos
+
+        Returns:
+            str: Texto del ticket
+        """
+        return "\n".join(
+            [
+                "TICKET DE VENTA".center(self.TEXT_WIDTH),
+                self.store_name.center(self.TEXT_WIDTH),
+                self._separator
+            ]
+            + self._body_lines(sale_id, sale_date, sale_total,
+                               sale_paid, sale_change, details)
+            + [
+                self._separator,
+                "¡Gracias por su compra!".center(self.TEXT_WIDTH),
+                ""
+            ]
+        )
+
+    def render_escpos(
+        self,
+        sale_id: int,
+        sale_date: str,
+        sale_total: float,
+        sale_paid: float,
+        sale_change: float,
+        details: list[dict[str, Any]]
+    ) -> bytes:
+        """
+        Genera el ticket como flujo de bytes ESC/POS.
+
+        Args:
+            sale_id: ID de la venta
+            sale_date: Fecha de la venta
+            sale_total: Total de la venta
+            sale_paid: Monto pagado
+            sale_change: Cambio entregado
+            details: Detalles de los productos vendidos
+
+        Returns:
+            bytes: Datos listos para enviar a la impresora térmica
+        """
+        body = "\n".join(
+            [self._separator]
+            + self._body_lines(sale_id, sale_date, sale_total,
+                               sale_paid, sale_change, details)
+            + [self._separator, ""]
+        )
+        return (
+            self._escpos_header + ESC_ALIGN_LEFT + self._encode(body)
+            + self._escpos_footer
+        )
+
+    def write_escpos(
+        self,
+        target: Union[str, BinaryIO],
+        sale_id: int,
+        sale_date: str,
+        sale_total: float,
+        sale_paid: float,
+        sale_change: float,
+        details: list[dict[str, Any]]
+    ) -> None:
+        """
+        Escribe el ticket ESC/POS en un archivo, dispositivo o stream.
+
+        Args:
+            target: Ruta (ej: /dev/usb/lp0, COM3, archivo) o stream binario
+            sale_id: ID de la venta
+            sale_date: Fecha de la venta
+            sale_total: Total de la venta
+            sale_paid: Monto pagado
+            sale_change: Cambio entregado
+            details: Detalles de los productos vendidos
+        """
+        data = self.render_escpos(sale_id, sale_date, sale_total,
+                                  sale_paid, sale_change, details)
+        if isinstance(target, (str, os.PathLike)):
+            with open(target, 'wb') as device:
+                device.write(data)
+        else:
+            target.write(data)
+
+    def _body_lines(
+        self,
+        sale_id: int,
+        sale_date: str,
+        sale_total: float,
+        sale_paid: float,
+        sale_change: float,
+        details: list[dict[str, Any]]
+    ) -> list[str]:
+        """Arma las líneas comunes a los formatos de texto."""
+        width = self.TEXT_WIDTH
+        lines = [
+            f"Venta N°: {sale_id}",
+            f"Fecha: {sale_date}",
+            self._thin_separator
+        ]
+        for detail in details:
+            lines.append(str(detail['producto'])[:width])
+            cantidad = f"{detail['cantidad']} x ${detail['precio']:.2f}"
+            subtotal = f"${detail['subtotal']:.2f}"
+            lines.append(f"  {cantidad}".ljust(width - len(subtotal)) + subtotal)
+        lines.append(self._thin_separator)
+        for label, value in (
+            ("TOTAL:", sale_total),
+            ("Pagado:", sale_paid),
+            ("Cambio:", sale_change),
+        ):
+            amount = f"${value:.2f}"
+            lines.append(label.ljust(width - len(amount)) + amount)
+        return lines
+
+    def _encode(self, text: str) -> bytes:
+        """Codifica texto con la página de códigos de la impresora."""
+        return text.encode(self.TEXT_ENCODING, errors='replace')
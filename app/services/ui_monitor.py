@@ -0,0 +1,340 @@
+"""Medición de bloqueos del bucle de eventos de Tk.
+
+Dos mediciones complementarias:
+
+- La duración de cada callback de Tk (comandos de botones, `bind`, trazas de
+  variables y `after`), tomada al reemplazar `tkinter.CallWrapper`, la clase
+  por la que pasan todas las llamadas de Tcl a Python. Los métodos que no se
+  llaman desde Tk (por ejemplo `refresh` después de una venta) se miden con
+  `UiMonitor.instrument`.
+- El retraso de un `after()` periódico: si el tick llega tarde, el bucle
+  estuvo ocupado aunque ningún callback medido lo explique (redibujos,
+  geometría, diálogos modales).
+
+Cada nombre tiene su histograma de latencias y los bloqueos que superan el
+umbral se informan con el nombre del callback responsable.
+"""
+
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+import os
+import threading
+import time
+import tkinter
+
+from config import UI_MONITOR_CONFIG
+
+# Límites superiores (ms) de los intervalos del histograma
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+TICK = 'Bucle de eventos (retraso del tick)'
+
+
+class LatencyHistogram:
+    """Histograma de latencias en intervalos fijos de milisegundos."""
+
+    __slots__ = ('buckets', 'counts', 'count', 'total_ms', 'max_ms')
+
+    def __init__(self, buckets: tuple[float, ...] = BUCKETS_MS) -> None:
+        """
+        Inicializa el histograma vacío.
+
+        Args:
+            buckets: Límites superiores de los intervalos, en orden creciente
+        """
+        self.buckets = buckets
+        # El último intervalo cuenta lo que supera al mayor límite
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms: float) -> None:
+        """
+        Registra una medición.
+
+        Args:
+            ms: Duración en milisegundos
+        """
+        self.counts[bisect_left(self.buckets, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, p: float) -> float:
+        """
+        Cota superior del percentil pedido.
+
+        Args:
+            p: Percentil entre 0 y 100
+
+        Returns:
+            float: Límite del intervalo que contiene el percentil (el máximo
+                medido si cae en el último intervalo)
+        """
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                return min(self.buckets[i], self.max_ms) if i < len(self.buckets) else self.max_ms
+        return self.max_ms
+
+
+@dataclass
+class Stall:
+    """Bloqueo del bucle de eventos."""
+
+    name: str
+    duration_ms: float
+    at: float
+
+
+def callback_name(func: Callable) -> str:
+    """
+    Nombre legible de un callback de Tk.
+
+    Args:
+        func: Función registrada en Tk
+
+    Returns:
+        str: Nombre calificado (ej: "SaleController.confirm_sale")
+    """
+    qualname = getattr(func, '__qualname__', None) or type(func).__name__
+    # after() registra un cierre `callit` que llama a la función pedida
+    if qualname.endswith('after.<locals>.callit'):
+        for cell in func.__closure__ or ():
+            target = cell.cell_contents
+            if callable(target) and not isinstance(target, tkinter.Misc):
+                return callback_name(target)
+    if '<lambda>' in qualname and hasattr(func, '__code__'):
+        code = func.__code__
+        qualname += f" ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return qualname
+
+
+class UiMonitor:
+    """Histogramas de latencia de la interfaz y registro de bloqueos."""
+
+    def __init__(
+        self,
+        stall_ms: float = UI_MONITOR_CONFIG['stall_ms'],
+        tick_ms: int = UI_MONITOR_CONFIG['tick_ms'],
+        clock: Callable[[], float] = time.perf_counter,
+        log: Callable[[str], Any] = print,
+        max_stalls: int = 100
+    ) -> None:
+        """
+        Inicializa el monitor.
+
+        Args:
+            stall_ms: Duración a partir de la cual se informa un bloqueo
+            tick_ms: Intervalo del tick que mide el retraso del bucle
+            clock: Reloj en segundos (time.perf_counter)
+            log: Función que recibe los avisos de bloqueo
+            max_stalls: Bloqueos recientes que se conservan
+        """
+        self.stall_ms = stall_ms
+        self.tick_ms = tick_ms
+        self.clock = clock
+        self.log = log
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self.stalls: deque[Stall] = deque(maxlen=max_stalls)
+        self._thread_id = threading.get_ident()
+        # Callbacks en curso y mediciones anidadas del callback exterior
+        self._depth = 0
+        self._inner: list[tuple[str, float]] = []
+        self._stall_since_tick = False
+        self._root: Optional[tkinter.Misc] = None
+        self._tick_id: Optional[str] = None
+        self._expected: Optional[float] = None
+        self._original_wrapper: Optional[type] = None
+
+    def measure(self, name: str, func: Callable, *args: Any) -> Any:
+        """
+        Ejecuta una función midiendo su duración.
+
+        Si la función corre dentro de otra medición solo se registra en el
+        histograma; el bloqueo lo informa la medición exterior, nombrando
+        el método medido más lento que corrió adentro.
+
+        Args:
+            name: Nombre del histograma
+            func: Función a ejecutar
+            *args: Argumentos de la función
+
+        Returns:
+            Any: Resultado de la función
+        """
+        if threading.get_ident() != self._thread_id:
+            # Solo interesa el hilo de la interfaz
+            return func(*args)
+
+        self._depth += 1
+        start = self.clock()
+        try:
+            return func(*args)
+        finally:
+            ms = (self.clock() - start) * 1000
+            self._depth -= 1
+            self._record(name, ms)
+            if self._depth:
+                self._inner.append((name, ms))
+            else:
+                inner, self._inner = self._inner, []
+                if ms >= self.stall_ms:
+                    self._stall(name, ms, inner)
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        """
+        Envuelve una función para medirla con `measure`.
+
+        Args:
+            name: Nombre del histograma
+            func: Función a envolver
+
+        Returns:
+            Callable: Función medida
+        """
+        def measured(*args: Any, **kwargs: Any) -> Any:
+            return self.measure(name, lambda: func(*args, **kwargs))
+        measured.__name__ = getattr(func, '__name__', name)
+        measured.__wrapped__ = func
+        return measured
+
+    def instrument(self, obj: Any, *names: str) -> None:
+        """
+        Mide métodos de un objeto que se llaman directamente desde el código.
+
+        Reemplaza los atributos de la instancia, así que alcanza a quienes
+        buscan el método al llamarlo (`self.x.refresh()`, lambdas de `bind`);
+        los comandos ya registrados en Tk se miden por el callback de Tk.
+
+        Args:
+            obj: Controlador o vista
+            *names: Nombres de los métodos a medir
+        """
+        for name in names:
+            method = getattr(obj, name)
+            setattr(obj, name, self.wrap(f"{type(obj).__name__}.{name}", method))
+
+    def install(self, root: tkinter.Misc) -> None:
+        """
+        Empieza a medir los callbacks de Tk y el retraso del bucle.
+
+        Debe llamarse antes de crear los widgets: los callbacks registrados
+        antes quedan sin medir.
+
+        Args:
+            root: Ventana principal
+        """
+        if self._original_wrapper is None:
+            self._original_wrapper = tkinter.CallWrapper
+            tkinter.CallWrapper = _timed_wrapper(self, self._original_wrapper)
+        self._root = root
+        self._schedule_tick()
+
+    def uninstall(self) -> None:
+        """Deja de medir y restaura `tkinter.CallWrapper`."""
+        if self._original_wrapper is not None:
+            tkinter.CallWrapper = self._original_wrapper
+            self._original_wrapper = None
+        if self._root is not None and self._tick_id is not None:
+            try:
+                self._root.after_cancel(self._tick_id)
+            except tkinter.TclError:
+                pass
+        self._root = None
+        self._tick_id = None
+        self._expected = None
+
+    def summary(self) -> list[dict[str, Any]]:
+        """
+        Resumen de los histogramas, de la mayor latencia a la menor.
+
+        Returns:
+            list: Diccionarios con nombre, llamadas, promedio, p50, p95 y máximo (ms)
+        """
+        rows = [{
+            'nombre': name,
+            'llamadas': h.count,
+            'promedio_ms': h.total_ms / h.count,
+            'p50_ms': h.percentile(50),
+            'p95_ms': h.percentile(95),
+            'max_ms': h.max_ms,
+        } for name, h in self.histograms.items() if h.count]
+        rows.sort(key=lambda row: row['max_ms'], reverse=True)
+        return rows
+
+    def format_report(self, limit: int = 20) -> str:
+        """
+        Resumen de latencias como tabla de texto.
+
+        Args:
+            limit: Cantidad máxima de filas
+
+        Returns:
+            str: Tabla con los callbacks más lentos primero
+        """
+        lines = [f"{'Callback':<60} {'Llamadas':>8} {'p50':>7} {'p95':>7} {'Máx':>8}"]
+        for row in self.summary()[:limit]:
+            lines.append(
+                f"{row['nombre'][:60]:<60} {row['llamadas']:>8} "
+                f"{row['p50_ms']:>5.0f}ms {row['p95_ms']:>5.0f}ms {row['max_ms']:>6.0f}ms")
+        lines.append(f"Bloqueos de {self.stall_ms:.0f} ms o más: {len(self.stalls)}")
+        return "\n".join(lines)
+
+    def _record(self, name: str, ms: float) -> None:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        histogram.record(ms)
+
+    def _stall(self, name: str, ms: float, inner: list[tuple[str, float]]) -> None:
+        """Registra e informa un bloqueo con el callback responsable."""
+        label = name
+        if inner:
+            slowest, _ = max(inner, key=lambda item: item[1])
+            label = f"{slowest} (desde {name})"
+        self.stalls.append(Stall(label, ms, time.time()))
+        self._stall_since_tick = True
+        self.log(f"Interfaz bloqueada {ms:.0f} ms en {label}")
+
+    def _schedule_tick(self) -> None:
+        self._expected = self.clock() + self.tick_ms / 1000
+        self._tick_id = self._root.after(self.tick_ms, self._tick)
+
+    def _tick(self) -> None:
+        """Mide cuánto tarde llegó el tick y programa el siguiente."""
+        if self._root is None:
+            return
+        late = max(0.0, (self.clock() - self._expected) * 1000)
+        self._record(TICK, late)
+        # Si un callback ya explicó la demora no se informa dos veces
+        if late >= self.stall_ms and not self._stall_since_tick:
+            self.stalls.append(Stall(TICK, late, time.time()))
+            self.log(f"Interfaz bloqueada {late:.0f} ms fuera de los callbacks medidos")
+        self._stall_since_tick = False
+        self._schedule_tick()
+
+
+def _timed_wrapper(monitor: UiMonitor, base: type) -> type:
+    """Subclase de CallWrapper que mide cada callback con el monitor."""
+
+    class TimedCallWrapper(base):
+        def __init__(self, func: Callable, subst: Any, widget: Any) -> None:
+            super().__init__(func, subst, widget)
+            self.name = callback_name(func)
+            # El tick del monitor se mide como retraso, no como callback
+            self.timed = self.name != 'UiMonitor._tick'
+
+        def __call__(self, *args: Any) -> Any:
+            if not self.timed:
+                return super().__call__(*args)
+            return monitor.measure(self.name, super().__call__, *args)
+
+    return TimedCallWrapper
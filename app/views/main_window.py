@@ -5,6 +5,8 @@ from .product_form import ProductForm
 from .product_list import ProductList
 from .sale_form import SaleForm
 from .report_form import ReportForm
+from ..services.ui_monitor import UiMonitor
+from config import UI_MONITOR_CONFIG
 
 
 class MainWindow(ttk.Window):
@@ -13,9 +15,35 @@ class MainWindow(ttk.Window):
                          themename="flatly",
                          size=(1400, 750))
         self.resizable(True, True)
+        # Se instala antes de crear los widgets para medir todos sus callbacks
+        self.ui_monitor = None
+        if UI_MONITOR_CONFIG['enabled']:
+            self.ui_monitor = UiMonitor()
+            self.ui_monitor.install(self)
         self._setup_custom_styles()
         self._create_widgets()
 
+    def set_profiler(self, profiler, calls: int) -> None:
+        """
+        Conecta el atajo oculto Ctrl+Alt+P que arma el perfilador.
+
+        Args:
+            profiler: CallbackProfiler con los controladores instrumentados
+            calls: Acciones a capturar cada vez que se usa el atajo
+        """
+        self.bind_all('<Control-Alt-p>', lambda e: profiler.arm(calls))
+
+    def set_status(self, text: str, style: str = "warning") -> None:
+        """
+        Muestra el estado de la caja en el menú lateral.
+
+        Args:
+            text: Texto a mostrar (vacío lo oculta)
+            style: Color de ttkbootstrap ("warning", "success", "danger"...)
+        """
+        self.status_label.configure(
+            text=text, bootstyle=f"inverse-{style}" if text else "inverse-primary")
+
     def _setup_custom_styles(self) -> None:
         """Configura estilos personalizados para los botones del menú."""
         style = ttk.Style()
@@ -62,6 +90,13 @@ class MainWindow(ttk.Window):
         ttk.Frame(menu_container, bootstyle="primary").pack(
             expand=True, fill=Y)
 
+        # Estado de la conexión con la base (inicio escalonado)
+        self.status_label = ttk.Label(menu_container, text="",
+                                      bootstyle="inverse-primary",
+                                      font=("Segoe UI", 10),
+                                      wraplength=160, padding=(10, 6))
+        self.status_label.pack(pady=(0, 20), padx=20, fill=X)
+
         # Frame principal con fondo blanco puro
         self.frame_contenido = tk.Frame(self, bg="white")
         self.frame_contenido.pack(side=LEFT, expand=True, fill=BOTH)
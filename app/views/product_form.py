@@ -39,9 +39,14 @@ class ProductForm(ttk.Frame):
         self.stock_entry = ttk.Entry(self)
         self.stock_entry.grid(row=4, column=1, padx=(20, 0), sticky='ew')
 
+        ttk.Label(self, text="Stock mínimo",
+                  font=("Segoe UI", 11)).grid(row=5, column=0, pady=10, sticky='w')
+        self.reorder_entry = ttk.Entry(self)
+        self.reorder_entry.grid(row=5, column=1, padx=(20, 0), sticky='ew')
+
         # Frame para los botones
         frame_botones = ttk.Frame(self)
-        frame_botones.grid(row=5, column=1, pady=20, sticky='e')
+        frame_botones.grid(row=6, column=1, pady=20, sticky='e')
 
         self.edit_button = ttk.Button(frame_botones, text="Editar",
                                       bootstyle="warning", width=15, state="enabled")
@@ -61,12 +66,33 @@ class ProductForm(ttk.Frame):
         self.cancel_button.pack(side='left', padx=5)
         self.cancel_button.pack_forget()  # Inicialmente oculto
 
+        # Importación masiva
+        frame_importar = ttk.Frame(self)
+        frame_importar.grid(row=7, column=0, columnspan=2, sticky='ew')
+
+        self.import_button = ttk.Button(frame_importar, text="Importar CSV/Excel",
+                                        bootstyle="info-outline", width=20)
+        self.import_button.pack(side='left')
+
+        self.stock_count_button = ttk.Button(frame_importar, text="Cargar conteo",
+                                             bootstyle="info-outline", width=15)
+        self.stock_count_button.pack(side='left', padx=5)
+
+        self.price_change_button = ttk.Button(frame_importar, text="Ajustar precios",
+                                              bootstyle="warning-outline", width=15)
+        self.price_change_button.pack(side='left')
+
+        self.import_status_label = ttk.Label(frame_importar, text="",
+                                             font=("Segoe UI", 10))
+        self.import_status_label.pack(side='left', padx=10)
+
     def get_product_data(self):
         return {
             'barcode': self.barcode_entry.get(),
             'name': self.name_entry.get(),
             'price': self.price_entry.get(),
-            'stock': self.stock_entry.get()
+            'stock': self.stock_entry.get(),
+            'reorder_level': self.reorder_entry.get()
         }
 
     def clear_fields(self):
@@ -74,6 +100,7 @@ class ProductForm(ttk.Frame):
         self.name_entry.delete(0, 'end')
         self.price_entry.delete(0, 'end')
         self.stock_entry.delete(0, 'end')
+        self.reorder_entry.delete(0, 'end')
         self.set_editing_mode(False)
         self.set_action_buttons_state("disabled")
         # Asegurar que esté habilitado al limpiar
@@ -100,6 +127,19 @@ class ProductForm(ttk.Frame):
         self.edit_button.configure(state=button_state)
         self.delete_button.configure(state=button_state)
 
+    def set_import_status(self, text: str, running: bool = False) -> None:
+        """Muestra el avance de una importación.
+
+        Args:
+            text: Mensaje a mostrar
+            running: Si es True deshabilita el botón de importar
+        """
+        self.import_status_label.config(text=text)
+        button_state = "disabled" if running else "normal"
+        self.import_button.configure(state=button_state)
+        self.stock_count_button.configure(state=button_state)
+        self.price_change_button.configure(state=button_state)
+
     def cancel_edit(self):
         self.clear_fields()
         self.set_action_buttons_state("disabled")
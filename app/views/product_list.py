@@ -7,6 +7,7 @@ class ProductList(ttk.Frame):
         super().__init__(parent, **kwargs)
         self.pack(fill=BOTH, expand=True)
         self.all_products = []  # Lista completa de productos
+        self.product_controller = None
         self._create_widgets()
 
     def _create_widgets(self):
@@ -40,6 +41,18 @@ class ProductList(ttk.Frame):
                                     font=("Segoe UI", 9), foreground="gray")
         self.info_label.pack(side='left', padx=(10, 0))
 
+        # Filtro y contador de productos con stock bajo
+        self.low_stock_var = ttk.BooleanVar(value=False)
+        self.low_stock_check = ttk.Checkbutton(
+            search_frame, text="Solo stock bajo",
+            variable=self.low_stock_var, command=self._on_search,
+            bootstyle="danger-round-toggle")
+        self.low_stock_check.pack(side='right', padx=(10, 0))
+
+        self.low_stock_badge = ttk.Label(search_frame, text="",
+                                         bootstyle="inverse-danger",
+                                         font=("Segoe UI", 9, "bold"))
+
         # Configurar estilo
         style = ttk.Style()
         style.configure(
@@ -99,16 +112,18 @@ class ProductList(ttk.Frame):
     def _on_search(self, *args):
         """Se ejecuta cada vez que el usuario escribe en el buscador"""
         search_term = self.search_var.get().lower().strip()
+        low_stock_only = self.low_stock_var.get()
 
-        if not search_term:
+        if not search_term and not low_stock_only:
             # Si no hay búsqueda, mostrar todos
             self._display_products(self.all_products)
             self.info_label.configure(text="")
         else:
             # Filtrar productos
             filtered = [p for p in self.all_products
-                        if search_term in p.barcode.lower() or
-                        search_term in p.name.lower()]
+                        if (search_term in p.barcode.lower() or
+                            search_term in p.name.lower())
+                        and (not low_stock_only or p.is_low_stock)]
             self._display_products(filtered)
 
             # Actualizar info
@@ -133,28 +148,106 @@ class ProductList(ttk.Frame):
             precio_formateado = f"${product.price:.2f}"
             stock_formateado = f"{int(product.stock)}"
 
-            self.tabla.insert("", END, values=(
+            tags = ('evenrow' if i % 2 == 0 else 'oddrow',)
+            if product.is_low_stock:
+                tags += ('lowstock',)
+
+            self.tabla.insert("", END, iid=self._item_id(product), values=(
                 product.barcode,
                 product.name,
                 precio_formateado,
                 stock_formateado
-            ), tags=('evenrow' if i % 2 == 0 else 'oddrow',))
+            ), tags=tags)
 
         # Colores alternados
         self.tabla.tag_configure('evenrow', background='#ecf0f1')
         self.tabla.tag_configure('oddrow', background='white')
+        # Stock bajo en rojo (el tag se configura último para que prevalezca)
+        self.tabla.tag_configure('lowstock', foreground='#c0392b')
 
     def load_products(self, products):
         """Carga la lista completa de productos"""
         self.all_products = products
+        if self.search_var.get().strip() or self.low_stock_var.get():
+            self._on_search()
+            return
         self._display_products(products)
 
         # Actualizar info
         if products:
             self.info_label.configure(text=f"Total: {len(products)} productos")
 
+    @staticmethod
+    def _item_id(product):
+        """ID de la fila del Treeview para un producto"""
+        return None if product.id is None else str(product.id)
+
+    def apply_changes(self, changed, deleted_ids):
+        """Aplica a la lista los productos modificados y eliminados en otra terminal.
+
+        Si solo cambiaron productos que ya se están mostrando, sus filas se
+        actualizan en el lugar (se conserva la selección y el scroll); si
+        hay altas, bajas o filtros activos se vuelve a armar la vista.
+
+        Args:
+            changed: Productos nuevos o modificados
+            deleted_ids: IDs de los productos eliminados
+        """
+        index = {product.id: i for i, product in enumerate(self.all_products)}
+        added = False
+        for product in changed:
+            position = index.get(product.id)
+            if position is None:
+                index[product.id] = len(self.all_products)
+                self.all_products.append(product)
+                added = True
+            else:
+                self.all_products[position] = product
+
+        deleted = set(deleted_ids) & index.keys()
+        if deleted:
+            self.all_products = [p for p in self.all_products
+                                 if p.id not in deleted]
+
+        filtering = self.search_var.get().strip() or self.low_stock_var.get()
+        if added or deleted or filtering:
+            self.load_products(self.all_products)
+            return
+
+        for product in changed:
+            item = self._item_id(product)
+            if not self.tabla.exists(item):
+                continue
+            tags = tuple(t for t in self.tabla.item(item, 'tags')
+                         if t != 'lowstock')
+            if product.is_low_stock:
+                tags += ('lowstock',)
+            self.tabla.item(item, values=(
+                product.barcode,
+                product.name,
+                f"${product.price:.2f}",
+                f"{int(product.stock)}"
+            ), tags=tags)
+
+    def set_low_stock_count(self, count: int) -> None:
+        """Muestra u oculta el contador de productos con stock bajo.
+
+        Args:
+            count: Cantidad de productos en alerta
+        """
+        if count:
+            self.low_stock_badge.configure(text=f" ⚠ {count} con stock bajo ")
+            self.low_stock_badge.pack(side='right', padx=(10, 0))
+        else:
+            self.low_stock_badge.pack_forget()
+
     def refresh(self) -> None:
         """Actualiza la lista de productos desde la base de datos"""
+        if self.product_controller:
+            # Traer solo lo que cambió desde la última carga
+            self.product_controller.sync_products()
+            return
+
         from ..models.database import Database
         db = Database()
         products = db.get_all_products()
@@ -1,6 +1,7 @@
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 import tkinter as tk
+from datetime import timedelta
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
@@ -56,6 +57,35 @@ class ReportForm(ttk.Frame):
             width=18
         ).pack(side=LEFT, padx=5)
 
+        # Botón: Exportar productos con stock bajo
+        ttk.Button(
+            export_buttons_frame,
+            text="⚠ Stock bajo",
+            bootstyle="danger",
+            command=self._on_export_low_stock,
+            width=14
+        ).pack(side=LEFT, padx=5)
+
+        # Estado de las exportaciones en segundo plano
+        export_status_frame = ttk.Frame(self)
+        export_status_frame.pack(fill=X, pady=(0, 10))
+
+        self.export_status_label = ttk.Label(
+            export_status_frame,
+            text="",
+            font=("Segoe UI", 10),
+            foreground="gray"
+        )
+        self.export_status_label.pack(side=RIGHT)
+
+        self.cancel_export_button = ttk.Button(
+            export_status_frame,
+            text="Cancelar exportación",
+            bootstyle="secondary-outline",
+            command=self._on_cancel_export
+        )
+        self._export_job_ids = []
+
         # Container para las cards superiores
         top_cards = ttk.Frame(self)
         top_cards.pack(fill=X, pady=(0, 20))
@@ -96,6 +126,12 @@ class ReportForm(ttk.Frame):
         )
         self.label_ultima_venta.pack(anchor=W, pady=(10, 0))
 
+        # Reporte por período
+        self._create_period_section()
+
+        # Pronóstico de demanda y reposición sugerida
+        self._create_forecast_section()
+
         # Container para gráfico y tabla
         bottom_container = ttk.Frame(self)
         bottom_container.pack(fill=BOTH, expand=True)
@@ -173,6 +209,247 @@ class ReportForm(ttk.Frame):
         self.tabla_ventas.pack(side=LEFT, fill=BOTH, expand=True)
         scrollbar.pack(side=RIGHT, fill=Y)
 
+    def _create_period_section(self):
+        """Crea la sección de reportes por período"""
+        card_periodo = ttk.Frame(self, bootstyle="light", padding=15)
+        card_periodo.pack(fill=X, pady=(0, 20))
+
+        # Controles de selección del período
+        controls = ttk.Frame(card_periodo)
+        controls.pack(fill=X)
+
+        ttk.Label(
+            controls,
+            text="Reporte por período",
+            font=("Segoe UI", 14, "bold")
+        ).pack(side=LEFT, padx=(0, 15))
+
+        self._periodos = {
+            "Hoy": "dia",
+            "Esta semana": "semana",
+            "Este mes": "mes",
+            "Personalizado": "personalizado"
+        }
+        self.periodo_var = tk.StringVar(value="Hoy")
+        periodo_combo = ttk.Combobox(
+            controls,
+            textvariable=self.periodo_var,
+            values=list(self._periodos),
+            state="readonly",
+            width=14
+        )
+        periodo_combo.pack(side=LEFT)
+        periodo_combo.bind("<<ComboboxSelected>>", self._on_period_selected)
+
+        ttk.Label(controls, text="Desde:").pack(side=LEFT, padx=(15, 5))
+        self.desde_entry = ttk.Entry(controls, width=12, state="disabled")
+        self.desde_entry.pack(side=LEFT)
+
+        ttk.Label(controls, text="Hasta:").pack(side=LEFT, padx=(10, 5))
+        self.hasta_entry = ttk.Entry(controls, width=12, state="disabled")
+        self.hasta_entry.pack(side=LEFT)
+
+        ttk.Button(
+            controls,
+            text="Consultar",
+            bootstyle="primary",
+            command=self._on_period_report
+        ).pack(side=LEFT, padx=(15, 0))
+
+        ttk.Button(
+            controls,
+            text="🔠 ABC Excel",
+            bootstyle="success",
+            command=self._on_export_abc
+        ).pack(side=LEFT, padx=(10, 0))
+
+        self.label_periodo_resumen = ttk.Label(
+            controls,
+            text="",
+            font=("Segoe UI", 11, "bold"),
+            bootstyle="success"
+        )
+        self.label_periodo_resumen.pack(side=RIGHT)
+
+        # Desgloses del período
+        notebook = ttk.Notebook(card_periodo)
+        notebook.pack(fill=X, pady=(10, 0))
+
+        self.tabla_por_hora = self._create_period_table(
+            notebook, "Por hora", ("hora", "ventas", "total"),
+            ("Hora", "Ventas", "Total"))
+        self.tabla_por_dia = self._create_period_table(
+            notebook, "Por día", ("dia", "ventas", "total"),
+            ("Día", "Ventas", "Total"))
+        self.tabla_por_producto = self._create_period_table(
+            notebook, "Por producto", ("producto", "cantidad", "monto"),
+            ("Producto", "Cantidad", "Monto"))
+        self.tabla_abc = self._create_period_table(
+            notebook, "ABC",
+            ("clase", "producto", "monto", "participacion", "acumulado"),
+            ("Clase", "Producto", "Monto", "Participación", "Acumulado"))
+
+    def _create_forecast_section(self):
+        """Crea la sección de pronóstico y reposición sugerida"""
+        card_pronostico = ttk.Frame(self, bootstyle="light", padding=15)
+        card_pronostico.pack(fill=X, pady=(0, 20))
+
+        controls = ttk.Frame(card_pronostico)
+        controls.pack(fill=X)
+
+        ttk.Label(
+            controls,
+            text="Pronóstico y reposición",
+            font=("Segoe UI", 14, "bold")
+        ).pack(side=LEFT, padx=(0, 15))
+
+        ttk.Button(
+            controls,
+            text="Calcular",
+            bootstyle="primary",
+            command=self._on_forecast
+        ).pack(side=LEFT)
+
+        ttk.Button(
+            controls,
+            text="📦 Reposición Excel",
+            bootstyle="success",
+            command=self._on_export_forecast
+        ).pack(side=LEFT, padx=(10, 0))
+
+        self.label_pronostico_resumen = ttk.Label(
+            controls,
+            text="",
+            font=("Segoe UI", 11, "bold"),
+            bootstyle="warning"
+        )
+        self.label_pronostico_resumen.pack(side=RIGHT)
+
+        columns = ("producto", "stock", "demanda", "cobertura", "sugerido")
+        headings = ("Producto", "Stock", "Demanda diaria",
+                    "Días de cobertura", "Sugerido")
+        table_frame = ttk.Frame(card_pronostico)
+        table_frame.pack(fill=X, pady=(10, 0))
+
+        self.tabla_pronostico = ttk.Treeview(
+            table_frame, columns=columns, show="headings", height=6)
+        for column, heading in zip(columns, headings):
+            self.tabla_pronostico.heading(column, text=heading)
+            self.tabla_pronostico.column(column, width=150, anchor=CENTER)
+
+        scrollbar = ttk.Scrollbar(
+            table_frame, orient=VERTICAL, command=self.tabla_pronostico.yview)
+        self.tabla_pronostico.configure(yscrollcommand=scrollbar.set)
+        self.tabla_pronostico.pack(side=LEFT, fill=BOTH, expand=True)
+        scrollbar.pack(side=RIGHT, fill=Y)
+
+    def _on_forecast(self):
+        """Maneja el clic en el botón de calcular pronóstico"""
+        if self.report_controller:
+            self.report_controller.show_forecast()
+
+    def _on_export_forecast(self):
+        """Maneja el clic en el botón de exportar reposición"""
+        if self.report_controller:
+            self.report_controller.export_forecast_to_excel()
+
+    def update_forecast_data(self, filas, limite=200):
+        """Muestra los productos con menor cobertura primero"""
+        a_pedir = [fila for fila in filas if fila['sugerido'] > 0]
+        self.label_pronostico_resumen.configure(
+            text=f"{len(a_pedir)} producto(s) para reponer")
+        self._fill_table(self.tabla_pronostico, [
+            (fila['name'], fila['stock'], f"{fila['demanda_diaria']:.1f}",
+             "-" if fila['dias_cobertura'] is None
+             else f"{fila['dias_cobertura']:.1f}",
+             fila['sugerido'])
+            for fila in filas[:limite]
+        ])
+
+    def _create_period_table(self, notebook, title, columns, headings):
+        """Crea una tabla dentro de una pestaña del notebook"""
+        frame = ttk.Frame(notebook)
+        notebook.add(frame, text=title)
+
+        tabla = ttk.Treeview(frame, columns=columns,
+                             show="headings", height=5)
+        for column, heading in zip(columns, headings):
+            tabla.heading(column, text=heading)
+            tabla.column(column, width=150, anchor=CENTER)
+
+        scrollbar = ttk.Scrollbar(
+            frame, orient=VERTICAL, command=tabla.yview)
+        tabla.configure(yscrollcommand=scrollbar.set)
+        tabla.pack(side=LEFT, fill=BOTH, expand=True)
+        scrollbar.pack(side=RIGHT, fill=Y)
+        return tabla
+
+    def _on_period_selected(self, event=None):
+        """Habilita las fechas solo para el período personalizado"""
+        state = ("normal" if self.periodo_var.get() == "Personalizado"
+                 else "disabled")
+        self.desde_entry.configure(state=state)
+        self.hasta_entry.configure(state=state)
+
+    def _on_period_report(self):
+        """Maneja el clic en el botón de consultar período"""
+        if self.report_controller:
+            self.report_controller.show_period_report(
+                self._periodos[self.periodo_var.get()],
+                self.desde_entry.get(),
+                self.hasta_entry.get()
+            )
+
+    def _on_export_abc(self):
+        """Maneja el clic en el botón de exportar el análisis ABC"""
+        if self.report_controller:
+            self.report_controller.export_abc_to_excel()
+
+    def update_period_data(self, report, limite_abc=500):
+        """Muestra el reporte de un período"""
+        resumen = report['resumen']
+        desde = report['desde'].strftime('%d/%m/%Y')
+        # 'hasta' es exclusivo: mostrar el último día incluido
+        hasta = (report['hasta'] - timedelta(days=1)).strftime('%d/%m/%Y')
+        self.label_periodo_resumen.configure(
+            text=f"{desde} - {hasta}   |   Total: ${resumen['total']:,.2f}"
+                 f"   |   Ventas: {resumen['cantidad_ventas']}"
+                 f"   |   Promedio: ${resumen['ticket_promedio']:,.2f}")
+
+        self._fill_table(self.tabla_por_hora, [
+            (f"{int(fila['hora']):02d}:00", fila['cantidad_ventas'],
+             f"${float(fila['total']):,.2f}")
+            for fila in report['por_hora']
+        ])
+        self._fill_table(self.tabla_por_dia, [
+            (fila['dia'].strftime('%d/%m/%Y'), fila['cantidad_ventas'],
+             f"${float(fila['total']):,.2f}")
+            for fila in report['por_dia']
+        ])
+        self._fill_table(self.tabla_por_producto, [
+            (fila['producto'], int(fila['cantidad_vendida']),
+             f"${float(fila['monto_total']):,.2f}")
+            for fila in report['por_producto']
+        ])
+        # El catálogo completo puede ser muy grande: mostrar los primeros
+        # y dejar el detalle para la exportación
+        self._fill_table(self.tabla_abc, [
+            (fila['clase'], fila['producto'],
+             f"${fila['monto_total']:,.2f}",
+             f"{fila['participacion']:.2f} %",
+             f"{fila['participacion_acumulada']:.2f} %")
+            for fila in report['abc'][:limite_abc]
+        ])
+
+    def _fill_table(self, tabla, rows):
+        """Reemplaza el contenido de una tabla"""
+        tabla.delete(*tabla.get_children())
+        for i, values in enumerate(rows):
+            tabla.insert("", END, values=values,
+                         tags=('evenrow' if i % 2 == 0 else 'oddrow',))
+        tabla.tag_configure('evenrow', background='#ecf0f1')
+        tabla.tag_configure('oddrow', background='white')
+
     def update_data(self, total_ventas=0, ultima_venta=0, productos_vendidos=None, ultimas_ventas=None):
         """Actualiza los datos mostrados en los reportes"""
         # Actualizar cards
@@ -477,18 +754,47 @@ class ReportForm(ttk.Frame):
         if self.report_controller:
             self.report_controller.export_inventory_to_excel()
 
+    def _on_export_low_stock(self):
+        """Maneja el clic en el botón de exportar stock bajo"""
+        if self.report_controller:
+            self.report_controller.export_low_stock_to_excel()
+
+    def set_export_status(self, jobs):
+        """Muestra las exportaciones pendientes o en curso"""
+        self._export_job_ids = [job.id for job in jobs]
+        if not jobs:
+            self.export_status_label.configure(text="")
+            self.cancel_export_button.pack_forget()
+            return
+
+        partes = [
+            f"{job.description} ({int(job.progress * 100)}%)"
+            for job in jobs
+        ]
+        self.export_status_label.configure(
+            text="⏳ Exportando: " + ", ".join(partes))
+        self.cancel_export_button.pack(side=RIGHT, padx=(0, 10))
+
+    def _on_cancel_export(self):
+        """Maneja el clic en el botón de cancelar exportación"""
+        if self.report_controller and self._export_job_ids:
+            self.report_controller.cancel_export(self._export_job_ids[-1])
+
     def _on_export_ticket_pdf(self, sale_id, sale_date, sale_total, details):
         """Maneja el clic en el botón de exportar ticket de venta"""
         if self.report_controller:
             # Obtener datos completos de la venta
-            query = f"SELECT paid, `change` FROM sales WHERE id = {sale_id}"
+            query = (f"SELECT paid, `change` FROM sales WHERE id = {sale_id} "
+                     f"UNION ALL SELECT paid, `change` FROM sales_archive "
+                     f"WHERE id = {sale_id}")
             from ..models.database import Database
+            from ..models.money import Money
             db = Database()
             result = db.execute_query(query)
 
             if result:
-                sale_paid = float(result[0]['paid'])
-                sale_change = float(result[0]['change'])
+                sale_paid = Money.of(result[0]['paid'])
+                sale_change = Money.of(result[0]['change'])
                 self.report_controller.export_sale_ticket_to_pdf(
                     sale_id, sale_date, sale_total, sale_paid, sale_change, details
                 )
@@ -3,15 +3,21 @@ from ttkbootstrap.constants import *
 import tkinter as tk
 from tkinter import messagebox
 
+from ..models.money import Money
+
 
 class SaleForm(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent, padding=20)
         self._payment_dialog = None
-        self.paid = 0.0
-        self.change = 0.0
+        # Importes en centavos (el total lo actualiza SaleController)
+        self.total = Money()
+        self.paid = Money()
+        self.change = Money()
         self._original_items = []  # Cache de items originales
         self._is_filtering = False  # Flag para saber si estamos filtrando
+        # Escaneos hechos antes de conectar con la base (inicio escalonado)
+        self._queued_scans = []
         self._create_widgets()
 
     def _create_widgets(self):
@@ -74,6 +80,11 @@ class SaleForm(ttk.Frame):
                                 padx=(10, 0), pady=5)
         self.delete_button.configure(state="disabled")
 
+        # Aviso de escaneos en espera mientras se conecta la base
+        self.queue_label = ttk.Label(card, text="", bootstyle="warning",
+                                     font=("Segoe UI", 10))
+        self.queue_label.grid(row=3, column=0, columnspan=2, sticky=tk.W)
+
         card.columnconfigure(0, weight=1)
         card.columnconfigure(1, weight=1)
 
@@ -314,9 +325,8 @@ class SaleForm(ttk.Frame):
             font=("Segoe UI", 16, "bold")
         ).pack(pady=(0, 20))
 
-        # Obtener el total actual
-        total_text = self.total_label.cget("text")
-        total = float(total_text.replace("Total: $", ""))
+        # Total actual de la canasta
+        total = self.total
 
         # Mostrar el total
         ttk.Label(
@@ -349,7 +359,7 @@ class SaleForm(ttk.Frame):
 
         def calculate_change():
             try:
-                paid = float(payment_entry.get() or 0)
+                paid = Money.of(payment_entry.get() or 0)
                 change = paid - total
                 if change >= 0:
                     change_label.configure(text=f"Vuelto: ${change:.2f}")
@@ -367,7 +377,7 @@ class SaleForm(ttk.Frame):
 
         def confirm_payment():
             try:
-                paid = float(payment_entry.get() or 0)
+                paid = Money.of(payment_entry.get() or 0)
                 if paid < total:
                     messagebox.showerror(
                         "Error", "El monto pagado es insuficiente")
@@ -415,6 +425,30 @@ class SaleForm(ttk.Frame):
         if self.tree.get_children():
             self._show_payment_dialog()
 
+    def queue_scans(self) -> None:
+        """Guarda los escaneos hasta que la caja esté lista.
+
+        SaleController reemplaza estos manejadores al conectar sus eventos.
+        """
+        self.bind("<<AddItem>>", lambda e: self._queue_scan())
+        self.add_button.configure(command=self._queue_scan)
+
+    def _queue_scan(self) -> None:
+        """Guarda el código y la cantidad cargados y limpia el formulario."""
+        data = self.get_item_data()
+        if not data['barcode']:
+            return
+        self._queued_scans.append((data['barcode'], data['qty']))
+        self.clear_fields()
+        self.queue_label.configure(
+            text=f"⏳ {len(self._queued_scans)} en espera de conexión")
+
+    def take_queued_scans(self) -> list:
+        """Retorna y vacía los escaneos en espera (código, cantidad)."""
+        scans, self._queued_scans = self._queued_scans, []
+        self.queue_label.configure(text="")
+        return scans
+
     def get_item_data(self) -> dict:
         """Obtiene los datos del formulario."""
         return {
@@ -525,7 +559,7 @@ class SaleForm(ttk.Frame):
                 return
 
             try:
-                price = float(price_str)
+                price = Money.of(price_str)
                 if price <= 0:
                     raise ValueError
             except (ValueError, TypeError):
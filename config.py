@@ -1,4 +1,5 @@
 import os
+import shlex
 from dotenv import load_dotenv
 
 # Cargar variables de entorno desde .env
@@ -11,3 +12,100 @@ MYSQL_CONFIG = {
     'password': os.getenv('MYSQL_PASSWORD', ''),
     'database': os.getenv('MYSQL_DATABASE', 'app_stock')
 }
+
+# Réplica de solo lectura para reportes y exportaciones (opcional). Sin host
+# todas las consultas van a la base principal. Los datos de conexión que no
+# se indiquen se toman de MYSQL_CONFIG.
+REPLICA_CONFIG = {
+    'host': os.getenv('MYSQL_REPLICA_HOST') or None,
+    'port': int(os.getenv('MYSQL_REPLICA_PORT') or MYSQL_CONFIG['port']),
+    'user': os.getenv('MYSQL_REPLICA_USER') or MYSQL_CONFIG['user'],
+    'password': os.getenv('MYSQL_REPLICA_PASSWORD') or MYSQL_CONFIG['password'],
+    'database': os.getenv('MYSQL_REPLICA_DATABASE') or MYSQL_CONFIG['database'],
+    # Retraso máximo aceptado; con más retraso se lee de la principal
+    'max_lag_seconds': float(os.getenv('MYSQL_REPLICA_MAX_LAG', '30')),
+    # Segundos entre controles del retraso (y reintentos si no responde)
+    'check_interval': float(os.getenv('MYSQL_REPLICA_CHECK_INTERVAL', '10')),
+    'connect_timeout': int(os.getenv('MYSQL_REPLICA_CONNECT_TIMEOUT', '2'))
+}
+
+# Formato del ticket de venta: 'pdf' o 'escpos' (impresora térmica)
+TICKET_CONFIG = {
+    'format': os.getenv('TICKET_FORMAT', 'pdf'),
+    'device': os.getenv('TICKET_PRINTER_DEVICE') or None
+}
+
+# Cola de impresión: comando opcional (ej: "lp -d TICKETS") y reintentos
+PRINT_CONFIG = {
+    'command': shlex.split(os.getenv('PRINT_COMMAND', '')) or None,
+    'max_retries': int(os.getenv('PRINT_MAX_RETRIES', '3'))
+}
+
+# Libro de stock: días entre fotos automáticas del inventario
+INVENTORY_CONFIG = {
+    'snapshot_interval_days': int(os.getenv('SNAPSHOT_INTERVAL_DAYS', '7'))
+}
+
+# Aviso de cambios entre terminales: cada cuánto se consulta la versión
+SYNC_CONFIG = {
+    'poll_interval_ms': int(os.getenv('SYNC_POLL_INTERVAL_MS', '3000'))
+}
+
+# Copia local del catálogo para iniciar sin esperar la carga completa desde
+# MySQL (vacío = desactivada)
+CATALOG_SNAPSHOT_CONFIG = {
+    'path': os.getenv('CATALOG_SNAPSHOT_FILE', os.path.join('cache', 'catalogo.bin')) or None
+}
+
+# Reservas de stock de las canastas abiertas: segundos sin escanear tras los
+# que una canasta abandonada deja de reservar stock
+RESERVATION_CONFIG = {
+    'ttl_seconds': int(os.getenv('RESERVATION_TTL_SECONDS', '900'))
+}
+
+# Archivo del historial de ventas: meses cerrados que quedan en las tablas
+# de ventas (los anteriores se mueven al archivo con `python -m app.cli archive`)
+ARCHIVE_CONFIG = {
+    'keep_months': int(os.getenv('ARCHIVE_KEEP_MONTHS', '12'))
+}
+
+# Medición de bloqueos de la interfaz: callbacks que demoran más de
+# `stall_ms` se informan en la consola con su nombre
+UI_MONITOR_CONFIG = {
+    'enabled': os.getenv('UI_MONITOR', '1').lower() not in ('0', 'false', 'no'),
+    'stall_ms': float(os.getenv('UI_STALL_MS', '250')),
+    'tick_ms': int(os.getenv('UI_TICK_MS', '100'))
+}
+
+# Perfilado a pedido: PROFILE_CALLS > 0 perfila las primeras acciones al
+# iniciar (también se arma con Ctrl+Alt+P); min_ms descarta las rápidas
+PROFILER_CONFIG = {
+    'calls': int(os.getenv('PROFILE_CALLS', '0')),
+    'dir': os.getenv('PROFILE_DIR', 'diagnostics'),
+    'memory': os.getenv('PROFILE_MEMORY', '1').lower() not in ('0', 'false', 'no'),
+    'min_ms': float(os.getenv('PROFILE_MIN_MS', '0'))
+}
+
+# Métricas de Prometheus: archivo .prom (textfile collector de node_exporter)
+# y/o puerto local con GET /metrics. Vacío / 0 = desactivado
+METRICS_CONFIG = {
+    'file': os.getenv('METRICS_FILE') or None,
+    'port': int(os.getenv('METRICS_PORT', '0')),
+    'host': os.getenv('METRICS_HOST', '127.0.0.1'),
+    'interval': float(os.getenv('METRICS_INTERVAL', '15'))
+}
+
+# Exportación incremental de datos: las ventas más nuevas que estos segundos
+# quedan para la próxima exportación (pueden no estar confirmadas del todo)
+DATA_EXPORT_CONFIG = {
+    'settle_seconds': int(os.getenv('EXPORT_SETTLE_SECONDS', '300'))
+}
+
+# API HTTP local para terminales livianas y escáneres
+API_CONFIG = {
+    'host': os.getenv('API_HOST', '127.0.0.1'),
+    'port': int(os.getenv('API_PORT', '8765')),
+    'token': os.getenv('API_TOKEN') or None,
+    'pool_size': int(os.getenv('API_POOL_SIZE', '4')),
+    'batch_window_ms': int(os.getenv('API_BATCH_WINDOW_MS', '20'))
+}
@@ -1,15 +1,26 @@
+import multiprocessing
+
 from app.views.main_window import MainWindow
 from app.controllers.product_controller import ProductController
 from app.controllers.sale_controller import SaleController
 from app.controllers.report_controller import ReportController
+from app.models.database import Database
+from app.services.metrics import MetricsExporter, count_db_query
+from app.services.print_spooler import PrintSpooler
+from app.services.profiler import CallbackProfiler, DEFAULT_CALLS
+from app.services.startup import CATALOG, READY, StartupLoader
+from config import PRINT_CONFIG, PROFILER_CONFIG
 
 
-def main():
+STARTUP_POLL_INTERVAL_MS = 50
+STARTUP_RETRY_MS = 5000
+READY_MESSAGE_MS = 3000
 
-    window = MainWindow()
 
+def create_controllers(window, print_spooler, catalog):
+    """Crea los controladores una vez que la conexión compartida está lista."""
     product_controller = ProductController(
-        window.product_form, window.product_list)
+        window.product_form, window.product_list, catalog=catalog)
 
     report_controller = ReportController(
         window.report_form, window.product_list)
@@ -17,11 +28,87 @@ def main():
     sale_controller = SaleController(
         window.sale_form,
         window.product_list,
-        report_controller
+        report_controller,
+        print_spooler
+    )
+
+    # Métodos que se llaman desde el código y no solo desde Tk
+    if window.ui_monitor:
+        window.ui_monitor.instrument(
+            sale_controller, 'add_item', 'confirm_sale', 'add_varios')
+        window.ui_monitor.instrument(report_controller, 'refresh')
+        window.ui_monitor.instrument(window.product_list, 'refresh', '_on_search')
+
+    return product_controller, report_controller, sale_controller
+
+
+def main():
+
+    # Contar las idas y vueltas a MySQL antes de abrir cualquier conexión
+    Database.query_counter = count_db_query
+
+    window = MainWindow()
+
+    # Antes de crear los controladores: sus eventos guardan los métodos
+    profiler = CallbackProfiler()
+    for controller_class in (ProductController, SaleController, ReportController):
+        profiler.instrument_class(controller_class)
+    window.set_profiler(profiler, PROFILER_CONFIG['calls'] or DEFAULT_CALLS)
+    if PROFILER_CONFIG['calls']:
+        profiler.arm(PROFILER_CONFIG['calls'])
+
+    print_spooler = PrintSpooler(
+        command=PRINT_CONFIG['command'],
+        max_retries=PRINT_CONFIG['max_retries']
     )
 
+    # Inicio escalonado: la ventana se muestra ya y la conexión y el
+    # catálogo se cargan en segundo plano; los escaneos esperan en cola
+    window.sale_form.queue_scans()
+    window.set_status("Conectando con la base de datos...")
+    loader = StartupLoader()
+    loader.start()
+    controllers = []
+
+    def poll_startup():
+        for kind, value in loader.poll():
+            if kind == CATALOG:
+                window.product_list.load_products(value[1])
+            elif kind == READY:
+                controllers.extend(
+                    create_controllers(window, print_spooler, loader.catalog))
+                controllers[2].replay_scans(window.sale_form.take_queued_scans())
+                window.set_status("Caja lista", "success")
+                window.after(READY_MESSAGE_MS, lambda: window.set_status(""))
+                return
+            else:
+                print(f"Error al conectar con la base de datos: {value}")
+                window.set_status(
+                    "Sin conexión con la base de datos. Reintentando...", "danger")
+                window.after(STARTUP_RETRY_MS, loader.start)
+        window.after(STARTUP_POLL_INTERVAL_MS, poll_startup)
+
+    window.after(STARTUP_POLL_INTERVAL_MS, poll_startup)
+
+    metrics_exporter = MetricsExporter()
+    if metrics_exporter.enabled:
+        metrics_exporter.start()
+
     window.mainloop()
+    if window.ui_monitor:
+        window.ui_monitor.uninstall()
+        print(window.ui_monitor.format_report())
+    if controllers:
+        product_controller, report_controller, sale_controller = controllers
+        sale_controller.release_reservations()
+        product_controller.save_snapshot()
+        report_controller.export_jobs.shutdown()
+    print_spooler.stop(timeout=5)
+    if metrics_exporter.enabled:
+        metrics_exporter.stop()
 
 
 if __name__ == "__main__":
+    # Necesario para el pool de procesos de exportación en el ejecutable
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,312 @@
+"""Tests para la API HTTP local y sus servicios."""
+
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Iterator, Optional
+from unittest.mock import MagicMock
+import json
+import threading
+import urllib.error
+import urllib.request
+import pymysql
+import pytest
+from app.api_server import ApiServer
+from app.models.connection_pool import ConnectionPool
+from app.models.money import Money
+from app.models.product import Product
+from app.services.catalog_cache import CatalogCache
+from app.services.metrics import SCANS
+from app.services.sale_writer import (
+    InsufficientStockError, SaleItem, SaleRequest, SaleWriter)
+
+if TYPE_CHECKING:
+    from pytest_mock.plugin import MockerFixture
+
+
+class FakePool:
+    """Pool que siempre presta la misma conexión simulada."""
+
+    def __init__(self) -> None:
+        self.conn = MagicMock()
+
+    @contextmanager
+    def connection(self) -> Iterator[MagicMock]:
+        yield self.conn
+
+    def close(self) -> None:
+        pass
+
+
+PRODUCTS = {
+    '111': Product('111', 'Pan', 2.5, 10, id=1),
+    '222': Product('222', 'Leche', 1.2, 0, id=2),
+}
+
+
+@pytest.fixture
+def api() -> Iterator[tuple[ApiServer, str]]:
+    """
+    Fixture que levanta la API en un puerto libre con servicios simulados.
+
+    Yields:
+        tuple: (servidor, URL base)
+    """
+    catalog = MagicMock()
+    catalog.get.side_effect = PRODUCTS.get
+    server = ApiServer(('127.0.0.1', 0), FakePool(), catalog=catalog,
+                       writer=MagicMock(), reports=MagicMock())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def _request(
+    url: str, data: Any = None, token: Optional[str] = None
+) -> tuple[int, Any]:
+    """Hace una petición y devuelve (código, JSON)."""
+    body = None if data is None else json.dumps(data).encode()
+    request = urllib.request.Request(url, data=body)
+    if token:
+        request.add_header('Authorization', f'Bearer {token}')
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+class TestApiServer:
+    """Tests para los endpoints de la API."""
+
+    def test_product_lookup(self, api: tuple[ApiServer, str]) -> None:
+        """
+        Test que verifica la búsqueda por código desde el catálogo en memoria.
+
+        Args:
+            api: Fixture del servidor
+        """
+        _, url = api
+
+        status, product = _request(f"{url}/products/111")
+        assert status == 200
+        assert product == {'id': 1, 'barcode': '111', 'name': 'Pan',
+                           'price': 2.5, 'stock': 10}
+
+        status, error = _request(f"{url}/products/999")
+        assert status == 404
+        assert '999' in error['error']
+
+    def test_sale_submission(self, api: tuple[ApiServer, str]) -> None:
+        """
+        Test que verifica que la venta se encola con los precios del catálogo.
+
+        Args:
+            api: Fixture del servidor
+        """
+        server, url = api
+        future: Future = Future()
+        future.set_result(42)
+        server.writer.submit.return_value = future
+
+        status, sale = _request(f"{url}/sales", {
+            'items': [{'barcode': '111', 'quantity': 2}], 'paid': 10})
+
+        assert status == 201
+        assert sale == {'sale_id': 42, 'total': 5.0, 'paid': 10.0, 'change': 5.0}
+        items, paid = server.writer.submit.call_args[0]
+        assert items == [SaleItem(1, '111', 2, Money(250))]
+        assert paid == Money(1000)
+
+    def test_sale_without_stock_is_rejected(
+        self, api: tuple[ApiServer, str]
+    ) -> None:
+        """
+        Test que verifica el rechazo de una venta sin stock suficiente.
+
+        Args:
+            api: Fixture del servidor
+        """
+        server, url = api
+        future: Future = Future()
+        future.set_exception(InsufficientStockError("Stock insuficiente para 222"))
+        server.writer.submit.return_value = future
+
+        status, error = _request(f"{url}/sales", {
+            'items': [{'barcode': '222', 'quantity': 1}]})
+
+        assert status == 409
+        assert '222' in error['error']
+
+    def test_invalid_sale_body(self, api: tuple[ApiServer, str]) -> None:
+        """
+        Test que verifica la validación del cuerpo de la venta.
+
+        Args:
+            api: Fixture del servidor
+        """
+        server, url = api
+
+        assert _request(f"{url}/sales", {'items': [
+            {'barcode': '111', 'quantity': 0}]})[0] == 400
+        assert _request(f"{url}/sales", [1, 2])[0] == 400
+        server.writer.submit.assert_not_called()
+
+    def test_reports_use_period(self, api: tuple[ApiServer, str]) -> None:
+        """
+        Test que verifica los reportes por período.
+
+        Args:
+            api: Fixture del servidor
+        """
+        server, url = api
+        server.reports.get_period_summary.return_value = {
+            'total': 150.0, 'cantidad_ventas': 3, 'ticket_promedio': 50.0}
+
+        status, summary = _request(
+            f"{url}/reports/summary?from=2024-01-01&to=2024-01-31")
+
+        assert status == 200
+        assert summary['cantidad_ventas'] == 3
+        start, end = server.reports.get_period_summary.call_args[0]
+        assert (start.day, end.month) == (1, 2)
+        assert _request(f"{url}/reports/summary?period=anio")[0] == 400
+
+    def test_token_is_required(self, api: tuple[ApiServer, str]) -> None:
+        """
+        Test que verifica el token de acceso.
+
+        Args:
+            api: Fixture del servidor
+        """
+        server, url = api
+        server.token = 'secreto'
+
+        assert _request(f"{url}/products/111")[0] == 401
+        assert _request(f"{url}/products/111", token='secreto')[0] == 200
+
+    def test_metrics_endpoint(self, api: tuple[ApiServer, str]) -> None:
+        """
+        Test que verifica que /metrics responde en formato de Prometheus.
+
+        Args:
+            api: Fixture del servidor
+        """
+        _, url = api
+        before = SCANS.value()
+        _request(f"{url}/products/111")
+
+        with urllib.request.urlopen(f"{url}/metrics", timeout=5) as response:
+            assert response.headers['Content-Type'].startswith('text/plain')
+            text = response.read().decode()
+        assert SCANS.value() == before + 1
+        assert f"appstock_scans_total {before + 1}" in text
+        assert "# TYPE appstock_checkout_seconds histogram" in text
+
+
+class TestSaleWriter:
+    """Tests para el escritor de ventas por lotes."""
+
+    def test_batch_is_one_transaction_with_savepoints(self) -> None:
+        """Test que verifica que una venta sin stock no afecta al resto del lote."""
+        pool = FakePool()
+        cursor = pool.conn.cursor.return_value
+        cursor.fetchone.return_value = {'version': 7}
+        cursor.lastrowid = 100
+
+        def execute(query: str, params: Any = None) -> None:
+            if query.startswith("UPDATE products SET stock"):
+                # El producto 2 no tiene stock
+                cursor.rowcount = 0 if params[2] == 2 else 1
+
+        cursor.execute.side_effect = execute
+        writer = SaleWriter(pool)
+        ok = SaleRequest([SaleItem(1, '111', 2, Money(250))], paid=Money(500))
+        sin_stock = SaleRequest([SaleItem(2, '222', 1, Money(120))],
+                                paid=Money(120))
+
+        writer._write([ok, sin_stock])
+        writer.close()
+
+        assert ok.future.result() == 100
+        with pytest.raises(InsufficientStockError):
+            sin_stock.future.result()
+        queries = [call[0][0] for call in cursor.execute.call_args_list]
+        assert queries.count("SAVEPOINT venta") == 2
+        assert queries.count("ROLLBACK TO SAVEPOINT venta") == 1
+        pool.conn.commit.assert_called_once()
+
+    def test_paid_below_total_is_rejected(self) -> None:
+        """Test que verifica que no se encola una venta con pago insuficiente."""
+        writer = SaleWriter(FakePool())
+        try:
+            with pytest.raises(ValueError):
+                writer.submit([SaleItem(1, '111', 2, Money(250))], paid=1.0)
+        finally:
+            writer.close()
+
+
+class TestCatalogCache:
+    """Tests para el catálogo en memoria."""
+
+    def test_full_load_then_delta(self, mocker: "MockerFixture") -> None:
+        """
+        Test que verifica la carga inicial y la aplicación de cambios.
+
+        Args:
+            mocker: Fixture de pytest-mock
+        """
+        db = MagicMock()
+        db.get_data_version.return_value = 3
+        db.get_all_products.return_value = list(PRODUCTS.values())
+        mocker.patch('app.services.catalog_cache.Database.with_connection',
+                     return_value=db)
+        catalog = CatalogCache(FakePool(), max_age=0)
+
+        assert catalog.get('111').name == 'Pan'
+        assert catalog.version == 3
+
+        renamed = Product('112', 'Pan francés', 3.0, 10, id=1)
+        db.get_products_changed_since.return_value = (5, [renamed], [2])
+        catalog.refresh(force=True)
+
+        db.get_products_changed_since.assert_called_once_with(3)
+        assert catalog.get('111') is None
+        assert catalog.get('112').price == 3.0
+        assert catalog.get('222') is None
+        assert len(catalog) == 1
+
+
+class TestConnectionPool:
+    """Tests para el pool de conexiones."""
+
+    def test_connections_are_reused_and_discarded_on_failure(self) -> None:
+        """Test que verifica la reutilización y el descarte de conexiones rotas."""
+        factory = MagicMock(side_effect=lambda: MagicMock())
+        pool = ConnectionPool(size=1, factory=factory, timeout=0.1)
+
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+        assert first is second
+        first.rollback.assert_called()
+
+        with pytest.raises(pymysql.err.OperationalError):
+            with pool.connection():
+                raise pymysql.err.OperationalError(2006, "gone away")
+        first.close.assert_called_once()
+
+        with pool.connection() as third:
+            assert third is not first
+        assert factory.call_count == 2
+
+    def test_timeout_when_exhausted(self) -> None:
+        """Test que verifica la espera acotada cuando no hay conexiones libres."""
+        pool = ConnectionPool(size=1, factory=MagicMock, timeout=0.05)
+
+        with pool.connection():
+            with pytest.raises(TimeoutError):
+                with pool.connection():
+                    pass
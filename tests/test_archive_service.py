@@ -0,0 +1,97 @@
+"""Tests para el archivo mensual del historial de ventas."""
+
+from datetime import date, datetime
+from unittest.mock import MagicMock
+import pytest
+from app.services.archive_service import ArchiveService, ArchivedMonth
+
+
+@pytest.fixture
+def connection() -> MagicMock:
+    """
+    Fixture que proporciona una conexión simulada.
+
+    Returns:
+        MagicMock: Conexión con la primera venta en noviembre de 2023
+    """
+    connection = MagicMock()
+    cursor = connection.cursor.return_value
+    cursor.fetchone.return_value = {'date': datetime(2023, 11, 20, 9, 15)}
+    cursor.rowcount = 4
+    return connection
+
+
+class TestArchiveService:
+    """Tests para ArchiveService."""
+
+    def test_pending_months_keep_recent_ones(self, connection: MagicMock) -> None:
+        """
+        Test que verifica qué meses se archivan según los meses a conservar.
+
+        Args:
+            connection: Fixture de la conexión simulada
+        """
+        service = ArchiveService(connection, keep_months=2)
+
+        assert service.archive_limit(date(2024, 3, 13)) == date(2024, 1, 1)
+        assert service.pending_months(date(2024, 3, 13)) == [
+            date(2023, 11, 1), date(2023, 12, 1)]
+
+        connection.cursor.return_value.fetchone.return_value = None
+        assert service.pending_months(date(2024, 3, 13)) == []
+
+    def test_archive_month_is_one_transaction(self, connection: MagicMock) -> None:
+        """
+        Test que verifica que agregados, copia y borrado van juntos.
+
+        Args:
+            connection: Fixture de la conexión simulada
+        """
+        service = ArchiveService(connection, keep_months=1)
+
+        result = service.archive_month(date(2023, 11, 20), today=date(2024, 1, 5))
+
+        assert result == ArchivedMonth(date(2023, 11, 1), 4, 4)
+        cursor = connection.cursor.return_value
+        queries = [' '.join(call.args[0].split()) for call in cursor.execute.call_args_list]
+        assert [q.split(' (')[0].split(' SELECT')[0] for q in queries] == [
+            'INSERT INTO sales_hourly',
+            'INSERT INTO product_sales_monthly',
+            'INSERT INTO sale_details_archive',
+            'INSERT INTO sales_archive',
+            'DELETE sd FROM sale_details sd JOIN sales s ON sd.sale_id = s.id WHERE s.date >= %s AND s.date < %s',
+            'DELETE s FROM sales s WHERE s.date >= %s AND s.date < %s',
+            'INSERT INTO archived_months',
+        ]
+        assert cursor.execute.call_args_list[0].args[1] == (
+            datetime(2023, 11, 1), datetime(2023, 12, 1))
+        connection.commit.assert_called_once()
+
+    def test_recent_month_is_rejected(self, connection: MagicMock) -> None:
+        """
+        Test que verifica que no se archivan los meses a conservar.
+
+        Args:
+            connection: Fixture de la conexión simulada
+        """
+        service = ArchiveService(connection, keep_months=1)
+
+        with pytest.raises(ValueError):
+            service.archive_month(date(2023, 12, 1), today=date(2024, 1, 5))
+        connection.commit.assert_not_called()
+
+    def test_failure_rolls_back(self, connection: MagicMock) -> None:
+        """
+        Test que verifica que un error deja el mes sin archivar.
+
+        Args:
+            connection: Fixture de la conexión simulada
+        """
+        connection.cursor.return_value.execute.side_effect = [
+            None, None, RuntimeError("disco lleno")]
+        service = ArchiveService(connection, keep_months=1)
+
+        with pytest.raises(RuntimeError):
+            service.archive_month(date(2023, 11, 1), today=date(2024, 1, 5))
+        connection.rollback.assert_called_once()
+        connection.commit.assert_not_called()
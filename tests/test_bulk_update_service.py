@@ -0,0 +1,136 @@
+"""Tests para las actualizaciones masivas de precios y stock."""
+
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import MagicMock
+import pytest
+from app.services.bulk_update_service import BulkUpdateService
+
+
+@pytest.fixture
+def mock_connection() -> MagicMock:
+    """
+    Fixture que proporciona una conexión simulada.
+
+    Returns:
+        MagicMock: Mock de la conexión pymysql
+    """
+    connection = MagicMock()
+    cursor = connection.cursor.return_value
+    cursor.rowcount = 2
+    cursor.fetchall.return_value = [{'barcode': '999'}]
+    return connection
+
+
+class TestBulkUpdateService:
+    """Tests para BulkUpdateService."""
+
+    def test_change_prices_is_a_single_update(self, mock_connection: MagicMock) -> None:
+        """
+        Test que verifica que el cambio de precios es un único UPDATE filtrado.
+
+        Args:
+            mock_connection: Fixture de la conexión simulada
+        """
+        service = BulkUpdateService(mock_connection)
+
+        updated = service.change_prices(Decimal('10'), name_contains='galle')
+
+        cursor = mock_connection.cursor.return_value
+        updates = [call[0] for call in cursor.execute.call_args_list
+                   if call[0][0].startswith("UPDATE products")]
+        assert len(updates) == 1
+        query, params = updates[0]
+        assert query.startswith("UPDATE products SET price = ROUND(price * %s, 2)")
+        assert "VAR-" in query
+        assert "row_version" in query
+        assert params[0] == Decimal('1.1') and params[-1] == '%galle%'
+        assert updated == 2
+        mock_connection.commit.assert_called_once()
+
+    def test_change_prices_rejects_invalid_percentage(
+        self, mock_connection: MagicMock
+    ) -> None:
+        """
+        Test que verifica que no se permite bajar los precios un 100 % o más.
+
+        Args:
+            mock_connection: Fixture de la conexión simulada
+        """
+        with pytest.raises(ValueError):
+            BulkUpdateService(mock_connection).change_prices(Decimal('-100'))
+        mock_connection.cursor.assert_not_called()
+
+    def test_stock_count_sums_repeated_barcodes(
+        self, mock_connection: MagicMock, tmp_path: Path
+    ) -> None:
+        """
+        Test que verifica la carga de un conteo con códigos repetidos e inválidos.
+
+        Args:
+            mock_connection: Fixture de la conexión simulada
+            tmp_path: Directorio temporal de pytest
+        """
+        path = tmp_path / "conteo.csv"
+        path.write_text(
+            "codigo,stock\n111,4\n222,1\n111,3\n333,x\n999,2\n",
+            encoding='utf-8'
+        )
+        service = BulkUpdateService(mock_connection, tmp_path)
+
+        result = service.import_stock_count(str(path))
+
+        cursor = mock_connection.cursor.return_value
+        rows = cursor.executemany.call_args[0][1]
+        assert rows == [('111', 7), ('222', 1), ('999', 2)]
+        assert any("JOIN stock_count" in call[0][0]
+                   for call in cursor.execute.call_args_list)
+        assert result.updated == 2
+        assert result.unknown == ['999']
+        assert [line for line, _, _ in result.errors] == [5]
+        assert Path(result.error_file).exists()
+        mock_connection.commit.assert_called_once()
+
+    def test_stock_count_rolls_back_on_error(self, mock_connection: MagicMock) -> None:
+        """
+        Test que verifica que un error deja el stock sin cambios.
+
+        Args:
+            mock_connection: Fixture de la conexión simulada
+        """
+        mock_connection.cursor.return_value.executemany.side_effect = Exception("lock")
+
+        with pytest.raises(Exception, match="lock"):
+            BulkUpdateService(mock_connection).apply_stock_count({'111': 1})
+
+        mock_connection.rollback.assert_called_once()
+        mock_connection.commit.assert_not_called()
+
+    def test_name_filter_escapes_wildcards(self, mock_connection: MagicMock) -> None:
+        """
+        Test que verifica que "50%" se busca literal y no coincide con todo.
+
+        Args:
+            mock_connection: Fixture de la conexión simulada
+        """
+        mock_connection.cursor.return_value.fetchone.return_value = {'cantidad': 1}
+        service = BulkUpdateService(mock_connection)
+
+        service.count_products(name_contains='50%_a\\b', barcode_prefix='77_')
+
+        params = mock_connection.cursor.return_value.execute.call_args.args[1]
+        assert params == ('%50\\%\\_a\\\\b%', '77\\_%')
+
+    def test_stock_count_takes_version_last(self, mock_connection: MagicMock) -> None:
+        """
+        Test que verifica que data_versions se bloquea recién al tocar products.
+
+        Args:
+            mock_connection: Fixture de la conexión simulada
+        """
+        BulkUpdateService(mock_connection).apply_stock_count({'111': 1})
+
+        queries = [' '.join(call.args[0].split()[:2])
+                   for call in mock_connection.cursor.return_value.execute.call_args_list]
+        assert queries.index('UPDATE data_versions') > queries.index('SELECT c.barcode')
+        assert queries[queries.index('UPDATE data_versions') + 2] == 'INSERT INTO'
@@ -5,6 +5,7 @@ from unittest.mock import MagicMock
 import pytest
 from app.models.database import Database
 from app.models.product import Product
+from app.models.stock_movement import MOV_ANULACION
 
 if TYPE_CHECKING:
     from pytest_mock.plugin import MockerFixture
@@ -47,8 +48,8 @@ class TestCancelSale:
         mock_product.id = 1
         mocker.patch.object(db, 'get_product_by_id', return_value=mock_product)
 
-        # Mock de update_product
-        mock_update = mocker.patch.object(db, 'update_product')
+        # Mock de adjust_stock
+        mock_adjust = mocker.patch.object(db, 'adjust_stock')
 
         # Mock de cursor.execute y commit
         mocker.patch.object(db.cursor, 'execute')
@@ -134,8 +135,8 @@ class TestCancelSale:
             db, 'get_product_by_id', side_effect=[product1, product2]
         )
 
-        # Mock de update_product
-        mock_update = mocker.patch.object(db, 'update_product')
+        # Mock de adjust_stock
+        mock_adjust = mocker.patch.object(db, 'adjust_stock')
 
         # Mock de cursor y commit
         mocker.patch.object(db.cursor, 'execute')
@@ -144,11 +145,14 @@ class TestCancelSale:
         # Ejecutar
         result = db.cancel_sale(1, "Test")
 
-        # Verificar que se actualizó el stock
+        # Verificar que se sumó la cantidad vendida sin confirmar por producto
         assert result is True
-        assert mock_update.call_count == 2
-        assert product1.stock == 7  # 5 + 2
-        assert product2.stock == 6  # 3 + 3
+        assert [call.args for call in mock_adjust.call_args_list] == [
+            (1, 2, MOV_ANULACION), (2, 3, MOV_ANULACION)]
+        assert all(call.kwargs == {'reference': 1, 'commit': False}
+                   for call in mock_adjust.call_args_list)
+        # Un solo commit: stock y estado de la venta juntos
+        db.connection.commit.assert_called_once()
 
     def test_cancel_sale_ignores_varios_products(
         self, db: Database, mocker: "MockerFixture"
@@ -183,8 +187,8 @@ class TestCancelSale:
             db, 'get_product_by_id', side_effect=[product1, product_varios]
         )
 
-        # Mock de update_product
-        mock_update = mocker.patch.object(db, 'update_product')
+        # Mock de adjust_stock
+        mock_adjust = mocker.patch.object(db, 'adjust_stock')
 
         # Mock de cursor y commit
         mocker.patch.object(db.cursor, 'execute')
@@ -193,10 +197,10 @@ class TestCancelSale:
         # Ejecutar
         result = db.cancel_sale(1, "Test")
 
-        # Verificar que solo se actualizó el producto normal
+        # Verificar que solo se reintegró el producto normal
         assert result is True
-        assert mock_update.call_count == 1  # Solo producto1
-        assert product1.stock == 7  # 5 + 2
+        mock_adjust.assert_called_once_with(
+            1, 2, MOV_ANULACION, reference=1, commit=False)
 
     def test_cancel_sale_with_reason(
         self, db: Database, mocker: "MockerFixture"
@@ -230,3 +234,74 @@ class TestCancelSale:
         # Verificar que el motivo está en alguno de los argumentos
         calls = str(mock_execute.call_args_list)
         assert reason in calls
+
+
+class TestCancelSaleTransaction:
+    """Tests del bloqueo y los avisos de stock de la anulación."""
+
+    @pytest.fixture
+    def db(self, mocker: "MockerFixture") -> Database:
+        """
+        Fixture con una conexión simulada y un monitor de stock.
+
+        Args:
+            mocker: Fixture de pytest-mock
+
+        Returns:
+            Database: Instancia sobre la conexión simulada
+        """
+        mocker.patch.object(Database, 'stock_monitor', MagicMock())
+        connection = MagicMock()
+        connection.cursor.return_value.fetchall.side_effect = [
+            [{'status': 'active'}], [{'product_id': 1, 'quantity': 2}]]
+        db = Database.with_connection(connection)
+        product = Product(barcode='123', name='Test', price=10.0, stock=10)
+        product.id = 1
+        mocker.patch.object(db, 'get_product_by_id', return_value=product)
+        return db
+
+    def test_status_is_read_with_row_lock(self, db: Database) -> None:
+        """
+        Test que verifica que la venta se bloquea al leer su estado.
+
+        Args:
+            db: Fixture de la base de datos
+        """
+        assert db.cancel_sale(1, "Test") is True
+
+        first = db.connection.cursor.return_value.execute.call_args_list[0]
+        assert first.args[0].endswith("FOR UPDATE")
+
+    def test_monitor_is_notified_after_commit(self, db: Database) -> None:
+        """
+        Test que verifica que el monitor recibe el reintegro recién al confirmar.
+
+        Args:
+            db: Fixture de la base de datos
+        """
+        db.connection.commit.side_effect = (
+            lambda: Database.stock_monitor.apply_delta.assert_not_called())
+
+        assert db.cancel_sale(1, "Test") is True
+
+        db.connection.commit.assert_called_once()
+        Database.stock_monitor.apply_delta.assert_called_once_with(1, 2)
+
+    def test_rollback_discards_monitor_deltas(self, db: Database) -> None:
+        """
+        Test que verifica que una anulación deshecha no altera las alertas.
+
+        Args:
+            db: Fixture de la base de datos
+        """
+        def execute(query: str, params: tuple = ()) -> None:
+            if 'UPDATE sales' in query:
+                raise RuntimeError("conexión perdida")
+
+        db.cursor.execute.side_effect = execute
+
+        assert db.cancel_sale(1, "Test") is False
+
+        db.connection.rollback.assert_called_once()
+        db.connection.commit.assert_not_called()
+        Database.stock_monitor.apply_delta.assert_not_called()
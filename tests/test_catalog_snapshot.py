@@ -0,0 +1,112 @@
+"""Tests para la copia local del catálogo."""
+
+from decimal import Decimal
+from pathlib import Path
+import pytest
+from app.models.product import Product
+from app.services.catalog_snapshot import CatalogSnapshot
+
+
+@pytest.fixture
+def snapshot(tmp_path: Path) -> CatalogSnapshot:
+    """
+    Fixture que proporciona una copia local en una carpeta temporal.
+
+    Args:
+        tmp_path: Carpeta temporal de pytest
+
+    Returns:
+        CatalogSnapshot: Copia local de la base "local:3306/app_stock"
+    """
+    return CatalogSnapshot(tmp_path / 'cache' / 'catalogo.bin',
+                           source='local:3306/app_stock')
+
+
+def _catalog() -> list[Product]:
+    """Catálogo de ejemplo con precios repetidos y textos no ASCII."""
+    return [
+        Product('779000100001', 'Pan francés', Decimal('1.50'), 40, id=1, reorder_level=5),
+        Product('779000100002', 'Ñoquis 500 g', Decimal('1.50'), 0, id=2),
+        Product('X-3', 'Café', Decimal('1234.05'), -2, id=7, reorder_level=1),
+    ]
+
+
+class TestCatalogSnapshot:
+    """Tests para CatalogSnapshot."""
+
+    def test_round_trip(self, snapshot: CatalogSnapshot) -> None:
+        """
+        Test que verifica que se recupera el catálogo y su versión.
+
+        Args:
+            snapshot: Fixture de la copia local
+        """
+        assert snapshot.save(42, _catalog()) is True
+
+        version, products = snapshot.load()
+
+        assert version == 42
+        assert [(p.id, p.barcode, p.name, p.price, p.stock, p.reorder_level)
+                for p in products] == [
+            (1, '779000100001', 'Pan francés', Decimal('1.50'), 40, 5),
+            (2, '779000100002', 'Ñoquis 500 g', Decimal('1.50'), 0, 0),
+            (7, 'X-3', 'Café', Decimal('1234.05'), -2, 1),
+        ]
+        assert str(products[2].price) == '1234.05'
+        assert not snapshot.path.with_suffix('.tmp').exists()
+
+    def test_empty_catalog(self, snapshot: CatalogSnapshot) -> None:
+        """
+        Test que verifica la copia de un catálogo vacío.
+
+        Args:
+            snapshot: Fixture de la copia local
+        """
+        snapshot.save(0, [])
+
+        assert snapshot.load() == (0, [])
+
+    def test_missing_file(self, snapshot: CatalogSnapshot) -> None:
+        """
+        Test que verifica que sin archivo no hay copia.
+
+        Args:
+            snapshot: Fixture de la copia local
+        """
+        assert snapshot.load() is None
+
+    def test_other_database_is_ignored(self, snapshot: CatalogSnapshot) -> None:
+        """
+        Test que verifica que no se usa una copia de otra base.
+
+        Args:
+            snapshot: Fixture de la copia local
+        """
+        snapshot.save(42, _catalog())
+
+        other = CatalogSnapshot(snapshot.path, source='otra:3306/app_stock')
+
+        assert other.load() is None
+
+    @pytest.mark.parametrize('damage', ['truncate', 'flip', 'garbage'])
+    def test_damaged_file_is_ignored(
+        self, snapshot: CatalogSnapshot, damage: str
+    ) -> None:
+        """
+        Test que verifica que un archivo dañado se ignora sin errores.
+
+        Args:
+            snapshot: Fixture de la copia local
+            damage: Tipo de daño aplicado al archivo
+        """
+        snapshot.save(42, _catalog())
+        data = bytearray(snapshot.path.read_bytes())
+        if damage == 'truncate':
+            data = data[:len(data) // 2]
+        elif damage == 'flip':
+            data[40] ^= 0xFF
+        else:
+            data = bytearray(b'no es una copia')
+        snapshot.path.write_bytes(bytes(data))
+
+        assert snapshot.load() is None
@@ -0,0 +1,77 @@
+"""Tests para la caché de gráficos."""
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+from app.services.chart_cache import ChartCache
+from app.services.export_service import ExportService
+
+if TYPE_CHECKING:
+    from pytest_mock.plugin import MockerFixture
+
+
+class TestChartCache:
+    """Tests para ChartCache."""
+
+    def test_key_depends_on_data_and_size(self) -> None:
+        """Test que verifica que la clave cambia con los datos o el tamaño."""
+        key = ChartCache.make_key(['Pan'], [10], (6, 3.5), 100)
+
+        assert key == ChartCache.make_key(['Pan'], [10], (6, 3.5), 100)
+        assert key != ChartCache.make_key(['Pan'], [11], (6, 3.5), 100)
+        assert key != ChartCache.make_key(['Pan'], [10], (8, 4), 100)
+
+    def test_persists_to_disk(self, tmp_path: Path) -> None:
+        """
+        Test que verifica que una imagen guardada se recupera desde disco.
+
+        Args:
+            tmp_path: Directorio temporal de pytest
+        """
+        ChartCache(tmp_path).put('abc', b'png-data')
+
+        fresh = ChartCache(tmp_path)
+
+        assert fresh.get('abc') == b'png-data'
+        assert fresh.hits == 1
+        assert fresh.get('otra') is None
+        assert fresh.misses == 1
+
+    def test_bounded_size(self, tmp_path: Path) -> None:
+        """
+        Test que verifica que la caché descarta las entradas más antiguas.
+
+        Args:
+            tmp_path: Directorio temporal de pytest
+        """
+        cache = ChartCache(tmp_path, max_entries=2)
+
+        for key in ('a', 'b', 'c'):
+            cache.put(key, key.encode())
+
+        assert len(list(tmp_path.glob('*.png'))) == 2
+        assert ChartCache(tmp_path).get('c') == b'c'
+
+    def test_export_service_skips_matplotlib_on_hit(
+        self,
+        tmp_path: Path,
+        mocker: "MockerFixture"
+    ) -> None:
+        """
+        Test que verifica que el segundo gráfico idéntico no se vuelve a dibujar.
+
+        Args:
+            tmp_path: Directorio temporal de pytest
+            mocker: Fixture de pytest-mock
+        """
+        service = ExportService()
+        service.chart_cache = ChartCache(tmp_path)
+        render = mocker.spy(service, '_render_products_chart')
+        productos = [{'producto': 'Pan', 'cantidad_vendida': 40,
+                      'monto_total': 80.0}]
+
+        first = service._create_products_chart(productos)
+        second = service._create_products_chart(productos)
+
+        assert render.call_count == 1
+        assert first.getvalue() == second.getvalue()
+        assert first.getvalue().startswith(b'\x89PNG')
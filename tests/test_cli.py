@@ -0,0 +1,215 @@
+"""Tests para la línea de comandos."""
+
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import MagicMock
+import subprocess
+import sys
+import pytest
+from app import cli
+from app.services.report_service import ReportService
+
+
+@pytest.fixture
+def mock_reports() -> MagicMock:
+    """
+    Fixture que proporciona un servicio de reportes simulado.
+
+    Returns:
+        MagicMock: Mock de ReportService
+    """
+    reports = MagicMock()
+    reports.get_sales.return_value = [
+        {'id': 1, 'date': '2024-01-15 10:30:00', 'total': 150.50,
+         'paid': 200.00, 'change': 49.50, 'status': 'active'}
+    ]
+    reports.get_top_products.return_value = [
+        {'producto': 'Pan', 'cantidad_vendida': 40, 'monto_total': 80.00}
+    ]
+    reports.get_inventory.return_value = [
+        {'id': 1, 'barcode': '123', 'name': 'Pan', 'price': 2.0, 'stock': 5}
+    ]
+    return reports
+
+
+class TestCli:
+    """Tests para app.cli."""
+
+    def test_export_sales_csv_with_range(
+        self,
+        mock_reports: MagicMock,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture
+    ) -> None:
+        """
+        Test que verifica la exportación de ventas a CSV por rango.
+
+        Args:
+            mock_reports: Fixture del servicio simulado
+            tmp_path: Directorio temporal de pytest
+            capsys: Captura de la salida estándar
+        """
+        code = cli.main([
+            'export-sales', '--from', '2024-01-01', '--to', '2024-01-31',
+            '--format', 'csv', '--output-dir', str(tmp_path)
+        ], reports=mock_reports)
+
+        assert code == 0
+        start, end = mock_reports.get_sales.call_args[0]
+        assert (start.day, end.month, end.day) == (1, 2, 1)
+        filename = Path(capsys.readouterr().out.strip())
+        assert filename.parent == tmp_path
+        assert filename.read_text(encoding='utf-8').startswith('id,fecha,total')
+
+    def test_export_sales_without_data(
+        self, mock_reports: MagicMock, tmp_path: Path
+    ) -> None:
+        """
+        Test que verifica el código de salida cuando no hay ventas.
+
+        Args:
+            mock_reports: Fixture del servicio simulado
+            tmp_path: Directorio temporal de pytest
+        """
+        mock_reports.get_sales.return_value = []
+
+        code = cli.main(['export-sales', '--output-dir', str(tmp_path)],
+                        reports=mock_reports)
+
+        assert code == 1
+
+    def test_export_inventory_xlsx(
+        self,
+        mock_reports: MagicMock,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture
+    ) -> None:
+        """
+        Test que verifica la exportación del inventario a Excel.
+
+        Args:
+            mock_reports: Fixture del servicio simulado
+            tmp_path: Directorio temporal de pytest
+            capsys: Captura de la salida estándar
+        """
+        code = cli.main(['export-inventory', '--output-dir', str(tmp_path)],
+                        reports=mock_reports)
+
+        assert code == 0
+        assert capsys.readouterr().out.strip().endswith('.xlsx')
+
+    def test_import_products(
+        self,
+        mock_reports: MagicMock,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture
+    ) -> None:
+        """
+        Test que verifica la importación de productos desde la línea de comandos.
+
+        Args:
+            mock_reports: Fixture del servicio simulado
+            tmp_path: Directorio temporal de pytest
+            capsys: Captura de la salida estándar
+        """
+        path = tmp_path / "catalogo.csv"
+        path.write_text("codigo,nombre,precio\n111,Pan,2\n,Sin código,1\n",
+                        encoding='utf-8')
+
+        code = cli.main(['import-products', str(path),
+                         '--errors-dir', str(tmp_path)], reports=mock_reports)
+
+        assert code == 3
+        assert 'Importados: 1' in capsys.readouterr().out
+        mock_reports.db.connection.commit.assert_called_once()
+
+    def test_change_prices_dry_run(
+        self, mock_reports: MagicMock, capsys: pytest.CaptureFixture
+    ) -> None:
+        """
+        Test que verifica que --dry-run solo cuenta los productos afectados.
+
+        Args:
+            mock_reports: Fixture del servicio simulado
+            capsys: Captura de la salida estándar
+        """
+        cursor = mock_reports.db.connection.cursor.return_value
+        cursor.fetchone.return_value = {'cantidad': 42}
+
+        code = cli.main(['change-prices', '--percent', '10,5', '--dry-run'],
+                        reports=mock_reports)
+
+        assert code == 0
+        assert 'Productos afectados: 42' in capsys.readouterr().out
+        mock_reports.db.connection.commit.assert_not_called()
+
+    def test_abc_export(
+        self,
+        mock_reports: MagicMock,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture
+    ) -> None:
+        """
+        Test que verifica la exportación del análisis ABC de un período.
+
+        Args:
+            mock_reports: Fixture del servicio simulado
+            tmp_path: Directorio temporal de pytest
+            capsys: Captura de la salida estándar
+        """
+        mock_reports.get_abc_analysis.return_value = ReportService.classify_abc([
+            {'barcode': '111', 'producto': 'Pan', 'cantidad_vendida': 40,
+             'monto_total': 80.0},
+            {'barcode': '222', 'producto': 'Leche', 'cantidad_vendida': 0,
+             'monto_total': 0},
+        ])
+
+        code = cli.main(['abc', '--period', 'mes', '--output-dir', str(tmp_path)],
+                        reports=mock_reports)
+
+        assert code == 0
+        output = capsys.readouterr()
+        assert output.out.strip().endswith('.xlsx')
+        assert 'Clase A:      1 productos' in output.err
+
+    def test_archive_dry_run(
+        self, mock_reports: MagicMock, capsys: pytest.CaptureFixture
+    ) -> None:
+        """
+        Test que verifica que --dry-run solo lista los meses a archivar.
+
+        Args:
+            mock_reports: Fixture del servicio simulado
+            capsys: Captura de la salida estándar
+        """
+        cursor = mock_reports.db.connection.cursor.return_value
+        cursor.fetchone.return_value = {'date': datetime(2020, 1, 10)}
+
+        code = cli.main(['archive', '--keep-months', '1', '--dry-run'],
+                        reports=mock_reports)
+
+        assert code == 0
+        assert 'Meses a archivar: 01/2020, 02/2020' in capsys.readouterr().out
+        mock_reports.db.connection.commit.assert_not_called()
+
+    def test_invalid_date_is_rejected(self, mock_reports: MagicMock) -> None:
+        """
+        Test que verifica que una fecha inválida termina con error de uso.
+
+        Args:
+            mock_reports: Fixture del servicio simulado
+        """
+        with pytest.raises(SystemExit) as exc:
+            cli.main(['export-sales', '--from', '31-31-2024'],
+                     reports=mock_reports)
+        assert exc.value.code == 2
+
+    def test_does_not_import_ttkbootstrap(self) -> None:
+        """Test que verifica que la CLI no carga la interfaz gráfica."""
+        result = subprocess.run(
+            [sys.executable, '-c',
+             'import sys, app.cli; print("ttkbootstrap" in sys.modules)'],
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent.parent
+        )
+        assert result.stdout.strip() == 'False'
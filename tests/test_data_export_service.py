@@ -0,0 +1,207 @@
+"""Tests para la exportación de datos crudos."""
+
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import MagicMock
+import numpy as np
+import pytest
+from pymysql.constants import FIELD_TYPE
+from app.services.data_export_service import DataExportService
+
+SALES_DESCRIPTION = (
+    ('id', FIELD_TYPE.LONG), ('date', FIELD_TYPE.DATETIME),
+    ('total', FIELD_TYPE.NEWDECIMAL), ('status', FIELD_TYPE.VAR_STRING),
+    ('cancelled_at', FIELD_TYPE.DATETIME),
+)
+SALES_ROWS = [
+    (1, datetime(2024, 1, 15, 10, 30), Decimal('150.50'), 'active', None),
+    (2, datetime(2024, 1, 16, 9, 15), Decimal('75.25'), 'cancelled',
+     datetime(2024, 1, 16, 11, 0)),
+]
+
+
+@pytest.fixture
+def mock_db() -> MagicMock:
+    """
+    Fixture que proporciona una base de datos simulada con dos ventas.
+
+    Returns:
+        MagicMock: Mock con execute_read_query y stream_read_query
+    """
+    db = MagicMock()
+    db.execute_read_query.return_value = [{'max_id': 2}]
+    # Sin meses archivados: las tablas de archivo no devuelven filas
+    db.stream_read_query.side_effect = lambda query, params=None: (
+        SALES_DESCRIPTION, iter([] if '_archive' in query else SALES_ROWS))
+    return db
+
+
+class TestDataExportService:
+    """Tests para DataExportService."""
+
+    def test_csv_export(self, mock_db: MagicMock, tmp_path: Path) -> None:
+        """
+        Test que verifica el volcado CSV de la tabla de ventas.
+
+        Args:
+            mock_db: Fixture de la base de datos simulada
+            tmp_path: Directorio temporal de pytest
+        """
+        service = DataExportService(mock_db, tmp_path)
+
+        [filename] = service.export(['sales'], 'csv')
+
+        lines = Path(filename).read_text(encoding='utf-8').splitlines()
+        assert lines[0] == 'id,date,total,status,cancelled_at'
+        assert lines[1] == '1,2024-01-15 10:30:00,150.50,active,'
+        assert len(lines) == 3
+
+    def test_npz_export_is_typed(self, mock_db: MagicMock, tmp_path: Path) -> None:
+        """
+        Test que verifica los tipos de las columnas del formato columnar.
+
+        Args:
+            mock_db: Fixture de la base de datos simulada
+            tmp_path: Directorio temporal de pytest
+        """
+        service = DataExportService(mock_db, tmp_path)
+
+        [filename] = service.export(['sales'], 'npz')
+
+        data = np.load(filename)
+        assert data['id'].tolist() == [1, 2]
+        assert data['total_cents'].tolist() == [15050, 7525]
+        assert data['date'].dtype == np.dtype('datetime64[s]')
+        assert np.isnat(data['cancelled_at'][0])
+        assert data['status'].tolist() == ['active', 'cancelled']
+
+    def test_incremental_export_starts_after_last_sale(
+        self, mock_db: MagicMock, tmp_path: Path
+    ) -> None:
+        """
+        Test que verifica que el modo incremental continúa desde el último corte.
+
+        Args:
+            mock_db: Fixture de la base de datos simulada
+            tmp_path: Directorio temporal de pytest
+        """
+        service = DataExportService(mock_db, tmp_path)
+
+        service.export(['sales', 'sale_details'], 'csv', incremental=True)
+        first_params = [c.args[1] for c in mock_db.stream_read_query.call_args_list]
+        # Tabla de archivo y tabla actual de ventas y de detalles
+        assert first_params == [(0, 2)] * 4
+
+        mock_db.execute_read_query.return_value = [{'max_id': 5}]
+        service.export(['sales'], 'csv', incremental=True)
+
+        assert mock_db.stream_read_query.call_args.args[1] == (2, 5)
+
+    def test_incremental_cutoff_skips_recent_sales(
+        self, mock_db: MagicMock, tmp_path: Path
+    ) -> None:
+        """
+        Test que verifica que el corte incremental espera a que las ventas se asienten.
+
+        Args:
+            mock_db: Fixture de la base de datos simulada
+            tmp_path: Directorio temporal de pytest
+        """
+        service = DataExportService(mock_db, tmp_path, settle_seconds=120)
+
+        service.export(['sale_details'], 'csv', incremental=True)
+        query, params = mock_db.execute_read_query.call_args.args
+        assert query.count('INTERVAL %s SECOND') == 2
+        assert params == (120, 120)
+
+        # Un corte asentado menor al anterior no hace retroceder el estado
+        mock_db.execute_read_query.return_value = [{'max_id': 1}]
+        service.export(['sale_details'], 'csv', incremental=True)
+        assert mock_db.stream_read_query.call_args.args[1] == (2, 2)
+
+        service.export(['sales'], 'csv')
+        assert len(mock_db.execute_read_query.call_args.args) == 1
+
+    def test_npz_flags_nulls(self, mock_db: MagicMock, tmp_path: Path) -> None:
+        """
+        Test que verifica la máscara de NULL de las columnas numéricas.
+
+        Args:
+            mock_db: Fixture de la base de datos simulada
+            tmp_path: Directorio temporal de pytest
+        """
+        mock_db.stream_read_query.side_effect = lambda query, params=None: (
+            (('id', FIELD_TYPE.LONG), ('product_id', FIELD_TYPE.LONG)),
+            iter([] if '_archive' in query else [(1, None), (2, 7)]))
+
+        [filename] = DataExportService(mock_db, tmp_path).export(
+            ['sale_details'], 'npz')
+
+        data = np.load(filename)
+        assert data['product_id'].tolist() == [-1, 7]
+        assert data['product_id_null'].tolist() == [True, False]
+        assert 'id_null' not in data
+
+    def test_archived_sales_are_exported_first(
+        self, mock_db: MagicMock, tmp_path: Path
+    ) -> None:
+        """
+        Test que verifica que la exportación incluye los meses archivados.
+
+        Args:
+            mock_db: Fixture de la base de datos simulada
+            tmp_path: Directorio temporal de pytest
+        """
+        archived = (0, datetime(2023, 6, 1, 12, 0), Decimal('10.00'), 'active', None)
+        mock_db.stream_read_query.side_effect = lambda query, params=None: (
+            SALES_DESCRIPTION, iter([archived] if '_archive' in query else SALES_ROWS))
+
+        [filename] = DataExportService(mock_db, tmp_path).export(['sales'], 'csv')
+
+        lines = Path(filename).read_text(encoding='utf-8').splitlines()
+        assert [line.split(',')[0] for line in lines[1:]] == ['0', '1', '2']
+        queries = [c.args[0] for c in mock_db.stream_read_query.call_args_list]
+        assert 'FROM sales_archive' in queries[0]
+        assert 'FROM sales WHERE' in queries[1]
+
+    def test_cutoff_covers_archive_when_sales_is_empty(
+        self, mock_db: MagicMock, tmp_path: Path
+    ) -> None:
+        """
+        Test que verifica que con `sales` vacía no se pierden las ventas archivadas.
+
+        Args:
+            mock_db: Fixture de la base de datos simulada
+            tmp_path: Directorio temporal de pytest
+        """
+        # Todas las ventas están archivadas: solo el archivo tiene IDs
+        mock_db.execute_read_query.side_effect = lambda query, params=None: [
+            {'max_id': 2 if 'FROM sales_archive' in query else 0}]
+        mock_db.stream_read_query.side_effect = lambda query, params=None: (
+            SALES_DESCRIPTION, iter(SALES_ROWS if '_archive' in query else []))
+
+        [filename] = DataExportService(mock_db, tmp_path).export(['sales'], 'csv')
+
+        lines = Path(filename).read_text(encoding='utf-8').splitlines()
+        assert [line.split(',')[0] for line in lines[1:]] == ['1', '2']
+        query = mock_db.execute_read_query.call_args.args[0]
+        assert 'GREATEST' in query and 'FROM sales)' in query
+
+    def test_products_are_always_full(
+        self, mock_db: MagicMock, tmp_path: Path
+    ) -> None:
+        """
+        Test que verifica que los productos se exportan completos.
+
+        Args:
+            mock_db: Fixture de la base de datos simulada
+            tmp_path: Directorio temporal de pytest
+        """
+        service = DataExportService(mock_db, tmp_path)
+
+        service.export(['products'], 'csv', incremental=True)
+
+        query, params = mock_db.stream_read_query.call_args.args
+        assert 'WHERE' not in query
+        assert params is None
@@ -0,0 +1,119 @@
+"""Tests para la cola de exportaciones en segundo plano."""
+
+import time
+from typing import Callable
+import pytest
+from app.services.export_jobs import (
+    CANCELLED,
+    DONE,
+    FAILED,
+    ExportJob,
+    ExportJobQueue
+)
+
+
+@pytest.fixture
+def job_queue() -> ExportJobQueue:
+    """
+    Fixture que proporciona una cola de exportaciones con un solo proceso.
+
+    Returns:
+        ExportJobQueue: Cola de trabajos
+    """
+    jobs = ExportJobQueue(max_workers=1)
+    yield jobs
+    jobs.shutdown(wait=True)
+
+
+def _wait_until(condition: Callable[[], bool], jobs: ExportJobQueue,
+                timeout: float = 20.0) -> None:
+    """Llama a poll() hasta que se cumpla la condición o se agote el tiempo."""
+    limit = time.monotonic() + timeout
+    while time.monotonic() < limit:
+        jobs.poll()
+        if condition():
+            return
+        time.sleep(0.02)
+    raise AssertionError("Tiempo de espera agotado")
+
+
+class TestExportJobQueue:
+    """Tests para ExportJobQueue."""
+
+    def test_job_completes_and_notifies(self, job_queue: ExportJobQueue) -> None:
+        """
+        Test que verifica que un trabajo termina y notifica su resultado.
+
+        Args:
+            job_queue: Fixture de la cola de trabajos
+        """
+        finished: list[ExportJob] = []
+        job = job_queue.submit(pow, 2, 10, description="pow",
+                               on_done=finished.append)
+
+        _wait_until(lambda: job.finished, job_queue)
+
+        assert job.status == DONE
+        assert job.result == 1024
+        assert job.progress == 1.0
+        assert finished == [job]
+        assert job_queue.active_jobs() == []
+        assert job_queue.jobs == {}
+
+    def test_job_failure_is_reported(self, job_queue: ExportJobQueue) -> None:
+        """
+        Test que verifica que una excepción en el trabajador marca el trabajo como fallido.
+
+        Args:
+            job_queue: Fixture de la cola de trabajos
+        """
+        job = job_queue.submit(int, "no-es-numero")
+
+        _wait_until(lambda: job.finished, job_queue)
+
+        assert job.status == FAILED
+        assert isinstance(job.error, ValueError)
+
+    def test_cancel_pending_job(self, job_queue: ExportJobQueue) -> None:
+        """
+        Test que verifica que un trabajo en espera se puede cancelar.
+
+        Args:
+            job_queue: Fixture de la cola de trabajos
+        """
+        running = job_queue.submit(time.sleep, 0.5)
+        pending = job_queue.submit(pow, 3, 3)
+
+        assert job_queue.cancel(pending.id) is True
+
+        _wait_until(lambda: running.finished and pending.finished, job_queue)
+
+        assert pending.status == CANCELLED
+        assert pending.result is None
+        assert running.status == DONE
+
+    def test_running_job_is_not_cancelled(self, job_queue: ExportJobQueue) -> None:
+        """
+        Test que verifica que un trabajo en ejecución no se cancela y entrega su resultado.
+
+        Args:
+            job_queue: Fixture de la cola de trabajos
+        """
+        job = job_queue.submit(time.sleep, 0.5)
+        _wait_until(lambda: job.future.running(), job_queue)
+
+        assert job_queue.cancel(job.id) is False
+
+        _wait_until(lambda: job.finished, job_queue)
+
+        assert job.status == DONE
+        assert job.id not in job_queue.jobs
+
+    def test_cancel_unknown_job(self, job_queue: ExportJobQueue) -> None:
+        """
+        Test que verifica que cancelar un trabajo inexistente no falla.
+
+        Args:
+            job_queue: Fixture de la cola de trabajos
+        """
+        assert job_queue.cancel(999) is False
@@ -0,0 +1,91 @@
+"""Tests para el pronóstico de demanda."""
+
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import MagicMock
+import time
+import numpy as np
+import pytest
+from app.services.forecast_service import ForecastService, compute_forecast
+
+# Lunes 1 de enero de 2024
+FIRST_DAY = date(2024, 1, 1)
+
+
+class TestComputeForecast:
+    """Tests para compute_forecast."""
+
+    def test_constant_demand(self) -> None:
+        """Test que verifica promedios, cobertura y sugerido con demanda pareja."""
+        quantities = np.full((1, 28), 2.0)
+
+        result = compute_forecast(
+            quantities, FIRST_DAY, np.array([10]), np.array([0]),
+            lead_time_days=7, review_days=7)
+
+        assert result['demanda_diaria'][0] == pytest.approx(2.0)
+        assert result['estacionalidad'][0] == pytest.approx(np.ones(7))
+        assert result['dias_cobertura'][0] == pytest.approx(5.0)
+        # 14 días × 2 unidades - 10 en stock (sin variación no hay seguridad)
+        assert result['sugerido'][0] == 18
+
+    def test_weekday_seasonality(self) -> None:
+        """Test que verifica que se detecta la venta concentrada en sábados."""
+        quantities = np.zeros((1, 28))
+        quantities[0, 5::7] = 7.0  # Solo sábados
+
+        result = compute_forecast(
+            quantities, FIRST_DAY, np.array([0]), np.array([0]))
+
+        assert result['estacionalidad'][0, 5] == pytest.approx(7.0)
+        assert result['estacionalidad'][0, 0] == 0.0
+        assert result['demanda_periodo'][0] == pytest.approx(2 * 7.0)
+
+    def test_products_without_sales(self) -> None:
+        """Test que verifica la cobertura infinita y el stock mínimo sin ventas."""
+        result = compute_forecast(
+            np.zeros((2, 28)), FIRST_DAY, np.array([3, 3]), np.array([0, 5]))
+
+        assert np.isinf(result['dias_cobertura']).all()
+        assert result['sugerido'].tolist() == [0, 2]
+
+    def test_whole_catalog_is_fast(self) -> None:
+        """Test que verifica que un catálogo grande se calcula en menos de un segundo."""
+        rng = np.random.default_rng(0)
+        quantities = rng.poisson(1.5, size=(20000, 56)).astype(float)
+
+        started = time.perf_counter()
+        result = compute_forecast(
+            quantities, FIRST_DAY, rng.integers(0, 50, 20000), np.zeros(20000))
+
+        assert time.perf_counter() - started < 1.0
+        assert result['sugerido'].shape == (20000,)
+
+
+class TestForecastService:
+    """Tests para ForecastService."""
+
+    def test_forecast_rows(self) -> None:
+        """Test que verifica el armado de la matriz desde una sola consulta."""
+        reference = FIRST_DAY + timedelta(days=28)
+        db = MagicMock()
+        db.execute_read_query.return_value = [
+            {'id': 7, 'barcode': '111', 'name': 'Pan', 'stock': 4, 'reorder_level': 0},
+            {'id': 3, 'barcode': '222', 'name': 'Leche', 'stock': 50, 'reorder_level': 0},
+        ]
+        sales = [(7, FIRST_DAY + timedelta(days=d), Decimal(2)) for d in range(28)]
+        sales.append((99, FIRST_DAY, Decimal(5)))  # Producto VARIOS: se ignora
+        db.stream_read_query.return_value = (None, iter(sales))
+
+        rows = ForecastService(db, history_days=28).forecast(reference)
+
+        db.stream_read_query.assert_called_once()
+        # La historia también se lee de los meses archivados
+        query, params = db.stream_read_query.call_args.args
+        assert 'sales_archive' in query and len(params) == 4
+        assert [row['barcode'] for row in rows] == ['111', '222']
+        assert rows[0]['demanda_diaria'] == 2.0
+        assert rows[0]['dias_cobertura'] == 2.0
+        assert rows[0]['sugerido'] == 24
+        assert rows[1]['dias_cobertura'] is None
+        assert rows[1]['sugerido'] == 0
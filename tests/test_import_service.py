@@ -0,0 +1,250 @@
+"""Tests para la importación masiva de productos."""
+
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import MagicMock
+import pytest
+from openpyxl import Workbook
+from app.services.import_service import (
+    ImportFileError, MOVEMENT_QUERY, PRICE_UPSERT_QUERY, ProductImportService,
+    UPSERT_QUERY)
+
+
+@pytest.fixture
+def mock_connection() -> MagicMock:
+    """
+    Fixture que proporciona una conexión simulada.
+
+    Returns:
+        MagicMock: Mock de la conexión pymysql
+    """
+    return MagicMock()
+
+
+def _inserted_rows(connection: MagicMock) -> list[tuple]:
+    """Filas enviadas en todos los llamados a executemany."""
+    cursor = connection.cursor.return_value
+    rows = []
+    for call in cursor.executemany.call_args_list:
+        if call[0][0] in (UPSERT_QUERY, PRICE_UPSERT_QUERY):
+            rows.extend(call[0][1])
+    return rows
+
+
+class TestProductImportService:
+    """Tests para ProductImportService."""
+
+    def test_csv_import_in_batches(
+        self, mock_connection: MagicMock, tmp_path: Path
+    ) -> None:
+        """
+        Test que verifica la importación de un CSV por lotes en una transacción.
+
+        Args:
+            mock_connection: Fixture de la conexión simulada
+            tmp_path: Directorio temporal de pytest
+        """
+        path = tmp_path / "catalogo.csv"
+        path.write_text(
+            "Código;Nombre;Precio;Stock\n"
+            "111;Pan;2,50;10\n"
+            "222;Leche;1.20;\n"
+            "333;Yerba;5;3\n",
+            encoding='utf-8'
+        )
+        progress = []
+        service = ProductImportService(mock_connection, batch_size=2,
+                                       error_dir=tmp_path)
+
+        result = service.import_file(str(path), progress=progress.append)
+
+        assert result.imported == 3
+        assert result.errors == []
+        assert result.error_file is None
+        assert _inserted_rows(mock_connection) == [
+            ('111', 'Pan', Decimal('2.50'), 10),
+            ('222', 'Leche', Decimal('1.20'), 0),
+            ('333', 'Yerba', Decimal('5.00'), 3),
+        ]
+        upserts = [call for call in
+                   mock_connection.cursor.return_value.executemany.call_args_list
+                   if call[0][0] == UPSERT_QUERY]
+        assert len(upserts) == 2
+        mock_connection.commit.assert_called_once()
+        assert progress[-1] == 3
+
+    def test_stock_changes_are_recorded_as_movements(
+        self, mock_connection: MagicMock, tmp_path: Path
+    ) -> None:
+        """
+        Test que verifica que la importación registra la variación de stock.
+
+        Args:
+            mock_connection: Fixture de la conexión simulada
+            tmp_path: Directorio temporal de pytest
+        """
+        path = tmp_path / "catalogo.csv"
+        path.write_text(
+            "codigo,nombre,precio,stock\n111,Pan,2,10\n222,Leche,1,5\n333,Yerba,5,4\n",
+            encoding='utf-8'
+        )
+        cursor = mock_connection.cursor.return_value
+        cursor.fetchall.side_effect = [
+            # Stock previo de los productos existentes
+            [{'id': 1, 'barcode': '111', 'stock': 7},
+             {'id': 2, 'barcode': '222', 'stock': 5}],
+            # IDs de los productos nuevos
+            [{'id': 3, 'barcode': '333'}],
+        ]
+
+        ProductImportService(mock_connection).import_file(str(path))
+
+        movements = [call[0][1] for call in cursor.executemany.call_args_list
+                     if call[0][0] == MOVEMENT_QUERY]
+        assert movements == [[
+            (1, 3, 'importacion', 'catalogo.csv'),
+            (3, 4, 'importacion', 'catalogo.csv'),
+        ]]
+
+    def test_price_list_without_stock_keeps_stock(
+        self, mock_connection: MagicMock, tmp_path: Path
+    ) -> None:
+        """
+        Test que verifica que un archivo sin columna de stock no lo modifica.
+
+        Args:
+            mock_connection: Fixture de la conexión simulada
+            tmp_path: Directorio temporal de pytest
+        """
+        path = tmp_path / "precios.csv"
+        path.write_text("codigo,nombre,precio\n111,Pan,2\n333,Yerba,5\n",
+                        encoding='utf-8')
+        cursor = mock_connection.cursor.return_value
+        cursor.fetchall.return_value = [{'id': 1, 'barcode': '111', 'stock': 7}]
+
+        result = ProductImportService(mock_connection).import_file(str(path))
+
+        assert result.imported == 2
+        statements = [call[0][0] for call in cursor.executemany.call_args_list]
+        assert statements == [PRICE_UPSERT_QUERY]
+        assert cursor.executemany.call_args[0][1] == [
+            ('111', 'Pan', Decimal('2.00')), ('333', 'Yerba', Decimal('5.00'))]
+        assert 'stock' not in PRICE_UPSERT_QUERY
+        mock_connection.commit.assert_called_once()
+
+    def test_version_is_taken_at_the_end(
+        self, mock_connection: MagicMock, tmp_path: Path
+    ) -> None:
+        """
+        Test que verifica que data_versions se bloquea recién antes del commit.
+
+        Args:
+            mock_connection: Fixture de la conexión simulada
+            tmp_path: Directorio temporal de pytest
+        """
+        path = tmp_path / "catalogo.csv"
+        path.write_text("codigo,nombre,precio,stock\n111,Pan,2,1\n222,Leche,1,2\n"
+                        "333,Yerba,5,3\n", encoding='utf-8')
+        cursor = mock_connection.cursor.return_value
+
+        ProductImportService(mock_connection, batch_size=2).import_file(str(path))
+
+        queries = [' '.join(call[0][0].split()[:2])
+                   for call in cursor.execute.call_args_list]
+        first_version = queries.index('UPDATE data_versions')
+        assert 'SELECT id,' not in queries[first_version:]
+        assert queries[first_version:].count('UPDATE products') == 2
+
+    def test_invalid_and_duplicate_rows_are_reported(
+        self, mock_connection: MagicMock, tmp_path: Path
+    ) -> None:
+        """
+        Test que verifica que las filas inválidas y repetidas van al CSV de errores.
+
+        Args:
+            mock_connection: Fixture de la conexión simulada
+            tmp_path: Directorio temporal de pytest
+        """
+        path = tmp_path / "catalogo.csv"
+        path.write_text(
+            "barcode,name,price,stock\n"
+            "111,Pan,2.50,10\n"
+            ",Sin código,1,1\n"
+            "222,Leche,abc,1\n"
+            "111,Pan repetido,3,1\n"
+            "333,Yerba,5,-2\n",
+            encoding='utf-8'
+        )
+        service = ProductImportService(mock_connection, error_dir=tmp_path)
+
+        result = service.import_file(str(path))
+
+        assert result.total == 5
+        assert result.imported == 1
+        assert [line for line, _, _ in result.errors] == [3, 4, 5, 6]
+        assert "fila 2" in result.errors[2][1]
+        report = Path(result.error_file).read_text(encoding='utf-8-sig')
+        assert report.splitlines()[0].startswith('Fila,Error')
+        assert 'Pan repetido' in report
+
+    def test_xlsx_import(self, mock_connection: MagicMock, tmp_path: Path) -> None:
+        """
+        Test que verifica la lectura de un Excel con códigos numéricos.
+
+        Args:
+            mock_connection: Fixture de la conexión simulada
+            tmp_path: Directorio temporal de pytest
+        """
+        wb = Workbook()
+        ws = wb.active
+        ws.append(['Producto', 'Código de barras', 'Precio'])
+        ws.append(['Pan', 7790001000011, 2.5])
+        ws.append([None, None, None])
+        ws.append(['Leche', 7790001000028.0, 1])
+        path = tmp_path / "catalogo.xlsx"
+        wb.save(path)
+
+        result = ProductImportService(mock_connection).import_file(str(path))
+
+        assert result.imported == 2
+        # Sin columna de stock: solo nombre y precio
+        assert _inserted_rows(mock_connection) == [
+            ('7790001000011', 'Pan', Decimal('2.50')),
+            ('7790001000028', 'Leche', Decimal('1.00')),
+        ]
+
+    def test_rollback_on_database_error(
+        self, mock_connection: MagicMock, tmp_path: Path
+    ) -> None:
+        """
+        Test que verifica que un error de la base revierte toda la importación.
+
+        Args:
+            mock_connection: Fixture de la conexión simulada
+            tmp_path: Directorio temporal de pytest
+        """
+        path = tmp_path / "catalogo.csv"
+        path.write_text("codigo,nombre,precio\n111,Pan,2\n", encoding='utf-8')
+        mock_connection.cursor.return_value.executemany.side_effect = Exception("deadlock")
+
+        with pytest.raises(Exception, match="deadlock"):
+            ProductImportService(mock_connection).import_file(str(path))
+
+        mock_connection.rollback.assert_called_once()
+        mock_connection.commit.assert_not_called()
+
+    def test_missing_required_columns(
+        self, mock_connection: MagicMock, tmp_path: Path
+    ) -> None:
+        """
+        Test que verifica el error cuando faltan columnas obligatorias.
+
+        Args:
+            mock_connection: Fixture de la conexión simulada
+            tmp_path: Directorio temporal de pytest
+        """
+        path = tmp_path / "catalogo.csv"
+        path.write_text("codigo,nombre\n111,Pan\n", encoding='utf-8')
+
+        with pytest.raises(ImportFileError, match="price"):
+            ProductImportService(mock_connection).import_file(str(path))
@@ -0,0 +1,90 @@
+"""Tests para el libro de stock (stock a una fecha y mermas)."""
+
+from datetime import datetime
+from unittest.mock import MagicMock
+import pytest
+from app.services.inventory_service import InventoryService
+
+NOW = datetime(2024, 3, 31, 12, 0)
+
+
+def _mock_db(before, after) -> MagicMock:
+    """Base simulada con la hora del servidor y las fotos más cercanas."""
+    db = MagicMock()
+
+    def execute_query(query, params=None):
+        if 'NOW(6)' in query:
+            return [{'ahora': NOW}]
+        if 'anterior' in query:
+            return [{'anterior': before, 'posterior': after}]
+        return [{'id': 1, 'barcode': '111', 'name': 'Pan', 'stock': 8}]
+
+    db.execute_query.side_effect = execute_query
+    return db
+
+
+class TestInventoryService:
+    """Tests para InventoryService."""
+
+    def test_stock_at_uses_previous_snapshot(self) -> None:
+        """Test que verifica que se suman los movimientos desde la foto anterior."""
+        snapshot = datetime(2024, 1, 1)
+        db = _mock_db(snapshot, None)
+        when = datetime(2024, 1, 10)
+
+        rows = InventoryService(db).get_stock_at(when)
+
+        query, params = db.execute_query.call_args[0]
+        assert "COALESCE(s.stock, 0) + COALESCE(m.delta, 0)" in query
+        assert params == (snapshot, snapshot, when)
+        assert rows[0]['stock'] == 8
+
+    def test_stock_at_uses_following_snapshot(self) -> None:
+        """Test que verifica que se descuentan los movimientos hasta la foto posterior."""
+        snapshot = datetime(2024, 2, 1)
+        db = _mock_db(datetime(2023, 1, 1), snapshot)
+        when = datetime(2024, 1, 28)
+
+        InventoryService(db).get_stock_at(when)
+
+        query, params = db.execute_query.call_args[0]
+        assert "COALESCE(s.stock, 0) - COALESCE(m.delta, 0)" in query
+        assert params == (snapshot, when, snapshot)
+
+    def test_stock_at_uses_current_stock_when_closest(self) -> None:
+        """Test que verifica que el stock actual sirve de base para fechas recientes."""
+        db = _mock_db(datetime(2024, 1, 1), None)
+        when = datetime(2024, 3, 30)
+
+        InventoryService(db).get_stock_at(when)
+
+        query, params = db.execute_query.call_args[0]
+        assert "p.stock - COALESCE(m.delta, 0)" in query
+        assert "stock_snapshots s" not in query
+        assert params == (when, NOW)
+
+    @pytest.mark.parametrize("last, taken", [
+        (None, True),
+        (datetime(2000, 1, 1), True),
+        (datetime.now(), False),
+    ])
+    def test_ensure_snapshot(self, last, taken: bool) -> None:
+        """
+        Test que verifica que la foto periódica solo se toma cuando corresponde.
+
+        Args:
+            last: Fecha de la última foto
+            taken: Si se espera una foto nueva
+        """
+        db = MagicMock()
+        db.execute_query.side_effect = lambda query, params=None: (
+            [{'fecha': last}] if 'MAX(snapshot_date)' in query
+            else [{'ahora': NOW}])
+
+        result = InventoryService(db).ensure_snapshot(7)
+
+        assert (result is not None) == taken
+        assert db.cursor.execute.called == taken
+        if taken:
+            assert db.cursor.execute.call_args[0][1] == (NOW,)
+            db.connection.commit.assert_called_once()
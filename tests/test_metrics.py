@@ -0,0 +1,175 @@
+"""Tests para las métricas de Prometheus."""
+
+from decimal import Decimal
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+import pymysql
+import pytest
+from app.controllers.sale_controller import SaleController
+from app.models.database import CountingConnection, CountingDictCursor, Database
+from app.models.money import Money
+from app.models.product import Product
+from app.services import metrics
+from app.services.metrics import MetricsExporter, MetricsRegistry
+
+if TYPE_CHECKING:
+    from pytest_mock.plugin import MockerFixture
+
+
+class TestMetricsRegistry:
+    """Tests para MetricsRegistry."""
+
+    def test_render_text_format(self) -> None:
+        """Test que verifica el formato de exposición de contadores e histogramas."""
+        registry = MetricsRegistry()
+        requests = registry.counter('cache_total', "Consultas", ('cache', 'result'))
+        latency = registry.histogram('export_seconds', "Duración", buckets=(1, 5))
+        requests.inc(cache='reportes', result='hit')
+        requests.inc(2, cache='reportes', result='hit')
+        requests.inc(cache='gráficos "png"', result='miss')
+        latency.observe(0.5)
+        latency.observe(3)
+        latency.observe(7.25)
+
+        assert registry.render().splitlines() == [
+            '# HELP cache_total Consultas',
+            '# TYPE cache_total counter',
+            'cache_total{cache="gráficos \\"png\\"",result="miss"} 1',
+            'cache_total{cache="reportes",result="hit"} 3',
+            '# HELP export_seconds Duración',
+            '# TYPE export_seconds histogram',
+            'export_seconds_bucket{le="1"} 1',
+            'export_seconds_bucket{le="5"} 2',
+            'export_seconds_bucket{le="+Inf"} 3',
+            'export_seconds_sum 10.75',
+            'export_seconds_count 3',
+        ]
+        assert registry.counter('cache_total', "Otra", ('cache', 'result')) is requests
+
+    def test_invalid_use_is_rejected(self) -> None:
+        """Test que verifica las etiquetas y los tipos de métrica."""
+        registry = MetricsRegistry()
+        counter = registry.counter('ventas_total', "Ventas", ('origen',))
+
+        with pytest.raises(ValueError):
+            counter.inc()
+        with pytest.raises(ValueError):
+            counter.inc(-1, origen='caja')
+        with pytest.raises(ValueError):
+            registry.histogram('ventas_total', "Ventas")
+
+    def test_textfile_is_replaced(self, tmp_path: Path) -> None:
+        """
+        Test que verifica la escritura del archivo para node_exporter.
+
+        Args:
+            tmp_path: Carpeta temporal de pytest
+        """
+        registry = MetricsRegistry()
+        registry.counter('ventas_total', "Ventas").inc(4)
+        path = tmp_path / 'textfile' / 'app_stock.prom'
+        exporter = MetricsExporter(registry, path=path, port=0, interval=60)
+
+        exporter.start()
+        exporter.stop()
+
+        assert 'ventas_total 4' in path.read_text(encoding='utf-8')
+        assert [p.name for p in path.parent.iterdir()] == ['app_stock.prom']
+        assert not MetricsExporter(registry, path=None, port=0).enabled
+
+
+@pytest.fixture
+def sale_controller(mocker: "MockerFixture") -> SaleController:
+    """
+    Fixture que proporciona un controlador de ventas con la vista simulada.
+
+    Args:
+        mocker: Fixture de pytest-mock
+
+    Returns:
+        SaleController: Instancia del controlador de ventas
+    """
+    mocker.patch('app.controllers.sale_controller.Database')
+    mocker.patch('app.controllers.sale_controller.messagebox')
+    controller = SaleController(MagicMock())
+    controller.db.get_product_by_barcode.return_value = Product(
+        '111', 'Pan', Decimal('0.10'), 100, id=1)
+    controller.db.add_sale.side_effect = lambda **kwargs: metrics.count_db_query() or 7
+    return controller
+
+
+class TestCheckoutMetrics:
+    """Tests para las métricas de la caja."""
+
+    def test_sale_records_scans_latency_and_queries(
+        self, sale_controller: SaleController, mocker: "MockerFixture"
+    ) -> None:
+        """
+        Test que verifica escaneos, tiempo de cobro y consultas por venta.
+
+        Args:
+            sale_controller: Fixture del controlador de ventas
+            mocker: Fixture de pytest-mock
+        """
+        clock = mocker.patch('app.controllers.sale_controller.time.monotonic')
+        scans, sales = metrics.SCANS.value(), metrics.SALES.value()
+        checkouts = metrics.CHECKOUT_SECONDS.count()
+
+        clock.return_value = 100.0
+        for _ in range(3):
+            sale_controller.sale_form.barcode_entry.get.return_value = '111'
+            sale_controller.sale_form.qty_entry.get.return_value = ''
+            sale_controller.add_item()
+        sale_controller.sale_form.paid = Money(100)
+        sale_controller.sale_form.change = Money(70)
+        clock.return_value = 142.0
+
+        assert sale_controller.confirm_sale() is True
+
+        assert metrics.SCANS.value() == scans + 3
+        assert metrics.SALES.value() == sales + 1
+        assert metrics.CHECKOUT_SECONDS.count() == checkouts + 1
+        assert 'appstock_sale_db_queries_bucket{le="5"}' in metrics.REGISTRY.render()
+        assert sale_controller._checkout_started is None
+
+
+class TestRoundTripCounter:
+    """Tests para el contador de idas y vueltas inyectado en Database."""
+
+    def test_queries_and_commits_are_counted(self, mocker: "MockerFixture") -> None:
+        """
+        Test que verifica que se cuentan consultas, commits y rollbacks.
+
+        Args:
+            mocker: Fixture de pytest-mock
+        """
+        counter = MagicMock()
+        mocker.patch.object(Database, 'query_counter', counter)
+        mocker.patch.object(pymysql.connections.Connection, 'commit')
+        mocker.patch.object(pymysql.connections.Connection, 'rollback')
+        mocker.patch.object(pymysql.cursors.DictCursor, '_query')
+        connection = object.__new__(CountingConnection)
+        cursor = object.__new__(CountingDictCursor)
+
+        cursor._query("SELECT 1")
+        connection.commit()
+        connection.rollback()
+
+        assert counter.call_count == 3
+
+    def test_nothing_is_counted_without_counter(self, mocker: "MockerFixture") -> None:
+        """
+        Test que verifica que sin contador asignado no se registra nada.
+
+        Args:
+            mocker: Fixture de pytest-mock
+        """
+        mocker.patch.object(Database, 'query_counter', None)
+        commit = mocker.patch.object(pymysql.connections.Connection, 'commit')
+        total = metrics.DB_QUERIES.value()
+
+        object.__new__(CountingConnection).commit()
+
+        commit.assert_called_once()
+        assert metrics.DB_QUERIES.value() == total
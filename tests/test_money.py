@@ -0,0 +1,132 @@
+"""Tests para Money y el total de la canasta de ventas."""
+
+from decimal import Decimal
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+import pytest
+from app.controllers.sale_controller import SaleController
+from app.models.money import Money
+from app.models.product import Product
+
+if TYPE_CHECKING:
+    from pytest_mock.plugin import MockerFixture
+
+
+class TestMoney:
+    """Tests para Money."""
+
+    def test_conversions_are_exact(self) -> None:
+        """Test que verifica la conversión desde los distintos tipos."""
+        assert Money.of(Decimal('2.50')).cents == 250
+        assert Money.of(0.1).cents == 10
+        assert Money.of(3).cents == 300
+        assert Money.of('$ 12,5').cents == 1250
+        assert Money.of('1.005').cents == 101
+        assert Money(1999).to_decimal() == Decimal('19.99')
+        assert str(Money(-5)) == '-0.05'
+        with pytest.raises(ValueError):
+            Money.of('abc')
+        with pytest.raises(ValueError):
+            Money.of('NaN')
+
+    def test_arithmetic_has_no_drift(self) -> None:
+        """Test que verifica que las sumas no acumulan error de redondeo."""
+        total = sum([Money.of(0.1)] * 10)
+
+        assert total == Money(100)
+        assert total == 1
+        assert Money(150) * 3 == Money(450)
+        assert Money(1000) - Money(450) == Money(550)
+        assert Money(100) > 0 and not Money()
+        assert hash(Money(250)) == hash(Decimal('2.5'))
+        with pytest.raises(TypeError):
+            Money(100) + 0.5
+
+    def test_format_like_decimal(self) -> None:
+        """Test que verifica el formato de los importes."""
+        assert f"${Money(123456):,.2f}" == "$1,234.56"
+        assert f"{Money(5):.2f}" == "0.05"
+        assert float(Money(250)) == 2.5
+
+
+@pytest.fixture
+def sale_controller(mocker: "MockerFixture") -> SaleController:
+    """
+    Fixture que proporciona un controlador de ventas con la vista simulada.
+
+    Args:
+        mocker: Fixture de pytest-mock
+
+    Returns:
+        SaleController: Instancia del controlador de ventas
+    """
+    mocker.patch('app.controllers.sale_controller.Database')
+    mocker.patch('app.controllers.sale_controller.messagebox')
+    controller = SaleController(MagicMock())
+    controller.db.get_product_by_barcode.side_effect = lambda barcode: {
+        '111': Product('111', 'Pan', Decimal('0.10'), 100, id=1),
+        '222': Product('222', 'Leche', Decimal('1.15'), 100, id=2),
+    }.get(barcode)
+    return controller
+
+
+def _scan(controller: SaleController, barcode: str, qty: str) -> None:
+    """Simula la carga de un código y una cantidad en el formulario."""
+    controller.sale_form.barcode_entry.get.return_value = barcode
+    controller.sale_form.qty_entry.get.return_value = qty
+    controller.add_item()
+
+
+class TestSaleBasketTotal:
+    """Tests para el total incremental de la canasta."""
+
+    def test_total_follows_basket_changes(
+        self, sale_controller: SaleController
+    ) -> None:
+        """
+        Test que verifica el total al agregar, repetir y eliminar productos.
+
+        Args:
+            sale_controller: Fixture del controlador de ventas
+        """
+        _scan(sale_controller, '111', '3')
+        _scan(sale_controller, '222', '1')
+        _scan(sale_controller, '111', '')
+
+        assert sale_controller.items[0]['subtotal'] == Money(40)
+        assert sale_controller.total == Money(155)
+        sale_controller.sale_form.total_label.config.assert_called_with(
+            text="Total: $1.55")
+
+        sale_controller.sale_form.tree.selection.return_value = ['row']
+        sale_controller.sale_form.tree.item.return_value = {
+            'values': ['111', 'Pan', 4]}
+        sale_controller.delete_item()
+
+        assert [i['barcode'] for i in sale_controller.items] == ['222']
+        assert sale_controller.total == Money(115)
+
+    def test_confirm_writes_exact_decimals(
+        self, sale_controller: SaleController
+    ) -> None:
+        """
+        Test que verifica que la venta se registra con importes Decimal.
+
+        Args:
+            sale_controller: Fixture del controlador de ventas
+        """
+        _scan(sale_controller, '222', '3')
+        sale_controller.sale_form.paid = Money(500)
+        sale_controller.sale_form.change = Money(155)
+        sale_controller.db.add_sale.return_value = 9
+
+        assert sale_controller.confirm_sale() is True
+
+        sale_controller.db.add_sale.assert_called_once()
+        kwargs = sale_controller.db.add_sale.call_args.kwargs
+        assert kwargs['total'] == Decimal('3.45')
+        assert isinstance(kwargs['total'], Decimal)
+        assert kwargs['change'] == Decimal('1.55')
+        sale_id, rows = sale_controller.db.add_sale_details.call_args.args
+        assert rows[0][2] == Decimal('1.15')
+        assert sale_controller.total == Money()
@@ -0,0 +1,170 @@
+"""Tests para la cola de impresión asíncrona."""
+
+from pathlib import Path
+import sys
+import time
+from app.services.print_spooler import FAILED, PRINTED, PrintJob, PrintSpooler
+
+
+def _stand_in_command(log: Path, fail_marker: Path | None = None) -> list[str]:
+    """
+    Arma un comando de impresión de prueba que registra los archivos recibidos.
+
+    Args:
+        log: Archivo donde se registra cada llamado
+        fail_marker: Si existe, el comando lo borra y falla (un solo fallo)
+
+    Returns:
+        list: Comando a ejecutar
+    """
+    script = (
+        "import os, sys\n"
+        f"marker = {str(fail_marker)!r} if {fail_marker is not None} else None\n"
+        "if marker and os.path.exists(marker):\n"
+        "    os.remove(marker)\n"
+        "    sys.exit(1)\n"
+        f"with open({str(log)!r}, 'a') as f:\n"
+        "    f.write(' '.join(sys.argv[1:]) + '\\n')\n"
+    )
+    return [sys.executable, '-c', script]
+
+
+def _wait_for(spooler: PrintSpooler, timeout: float = 10.0) -> None:
+    """Espera a que la cola no tenga trabajos pendientes."""
+    limit = time.monotonic() + timeout
+    while spooler.pending() and time.monotonic() < limit:
+        time.sleep(0.02)
+
+
+class TestPrintSpooler:
+    """Tests para PrintSpooler."""
+
+    def test_jobs_are_batched(self, tmp_path: Path) -> None:
+        """
+        Test que verifica que los trabajos encolados se envían en un solo llamado.
+
+        Args:
+            tmp_path: Directorio temporal de pytest
+        """
+        log = tmp_path / 'calls.log'
+        spooler = PrintSpooler(command=_stand_in_command(log), start=False)
+
+        jobs = [spooler.submit(f"ticket_{i}.pdf") for i in range(3)]
+        spooler.start()
+        _wait_for(spooler)
+        spooler.stop()
+
+        assert all(job.status == PRINTED for job in jobs)
+        assert log.read_text().splitlines() == [
+            'ticket_0.pdf ticket_1.pdf ticket_2.pdf']
+
+    def test_retry_after_failure(self, tmp_path: Path) -> None:
+        """
+        Test que verifica que un fallo transitorio se reintenta.
+
+        Args:
+            tmp_path: Directorio temporal de pytest
+        """
+        log = tmp_path / 'calls.log'
+        marker = tmp_path / 'fail_once'
+        marker.touch()
+        spooler = PrintSpooler(
+            command=_stand_in_command(log, marker), retry_delay=0)
+
+        job = spooler.submit('ticket.pdf')
+        _wait_for(spooler)
+        spooler.stop()
+
+        assert job.status == PRINTED
+        assert job.attempts == 2
+        assert log.read_text().strip() == 'ticket.pdf'
+
+    def test_batch_retry_sends_each_file_once(self, tmp_path: Path) -> None:
+        """
+        Test que verifica que tras un fallo del lote cada ticket se reenvía
+        por separado y se imprime una sola vez.
+
+        Args:
+            tmp_path: Directorio temporal de pytest
+        """
+        log = tmp_path / 'calls.log'
+        marker = tmp_path / 'fail_once'
+        marker.touch()
+        spooler = PrintSpooler(
+            command=_stand_in_command(log, marker), retry_delay=0, start=False)
+        jobs = [PrintJob(id=i, filename=f"ticket_{i}.pdf") for i in range(3)]
+
+        spooler._print_batch(jobs)
+
+        assert all(job.status == PRINTED for job in jobs)
+        assert log.read_text().splitlines() == [
+            'ticket_0.pdf', 'ticket_1.pdf', 'ticket_2.pdf']
+
+    def test_retry_skips_printed_jobs(self) -> None:
+        """Test que verifica que solo se reintentan el ticket fallido y los siguientes."""
+        printed = []
+        failures = {'b.pdf': 1}
+
+        def print_func(filename: str) -> bool:
+            if failures.get(filename):
+                failures[filename] -= 1
+                return False
+            printed.append(filename)
+            return True
+
+        spooler = PrintSpooler(print_func=print_func, retry_delay=0, start=False)
+        jobs = [PrintJob(id=i, filename=name)
+                for i, name in enumerate(['a.pdf', 'b.pdf', 'c.pdf'])]
+
+        spooler._print_batch(jobs)
+
+        assert printed == ['a.pdf', 'b.pdf', 'c.pdf']
+        assert all(job.status == PRINTED for job in jobs)
+        assert [job.attempts for job in jobs] == [1, 2, 2]
+
+    def test_job_fails_after_retries(self) -> None:
+        """Test que verifica que se marca como fallido al agotar los reintentos."""
+        spooler = PrintSpooler(
+            command=[sys.executable, '-c', 'import sys; sys.exit(1)'],
+            max_retries=1,
+            retry_delay=0
+        )
+
+        job = spooler.submit('ticket.pdf')
+        _wait_for(spooler)
+        spooler.stop()
+
+        assert job.status == FAILED
+        assert job.attempts == 2
+        assert spooler.status(job.id) == FAILED
+
+    def test_print_func_per_file(self) -> None:
+        """Test que verifica el envío archivo por archivo sin comando."""
+        printed = []
+        spooler = PrintSpooler(
+            print_func=lambda f: printed.append(f) or True, start=False)
+
+        spooler.submit('a.pdf')
+        spooler.submit('b.pdf')
+        spooler.start()
+        _wait_for(spooler)
+        spooler.stop()
+
+        assert printed == ['a.pdf', 'b.pdf']
+
+    def test_poll_prunes_finished_jobs(self) -> None:
+        """Test que verifica que los trabajos informados por poll() se olvidan."""
+        spooler = PrintSpooler(
+            print_func=lambda f: f != 'malo.pdf', max_retries=0, start=False)
+        good = spooler.submit('a.pdf')
+        bad = spooler.submit('malo.pdf')
+        spooler.start()
+        _wait_for(spooler)
+        spooler.stop()
+
+        finished = spooler.poll()
+
+        assert finished == [good, bad]
+        assert [job.status for job in finished] == [PRINTED, FAILED]
+        assert spooler.jobs == {}
+        assert spooler.poll() == []
@@ -0,0 +1,40 @@
+"""Tests para el modelo Product."""
+
+from decimal import Decimal
+import pytest
+from app.models.product import Product
+
+
+class TestProduct:
+    """Tests para Product."""
+
+    def test_from_row_uses_column_order(self) -> None:
+        """Test que verifica la construcción desde una fila de cursor de tuplas."""
+        product = Product.from_row(
+            (7, '111', 'Pan', Decimal('2.50'), 10, 3))
+
+        assert (product.id, product.barcode, product.name) == (7, '111', 'Pan')
+        assert product.price == Decimal('2.50')
+        assert (product.stock, product.reorder_level) == (10, 3)
+        assert Product.COLUMNS == (
+            'id', 'barcode', 'name', 'price', 'stock', 'reorder_level')
+
+    def test_price_is_exact_decimal(self) -> None:
+        """Test que verifica que los precios se guardan como Decimal exacto."""
+        product = Product('111', 'Pan', 0.1, 1)
+
+        assert product.price == Decimal('0.1')
+        assert Product.from_db_dict(
+            {'id': 1, 'barcode': '1', 'name': 'A', 'price': Decimal('1.20'),
+             'stock': None}).stock == 0
+
+    def test_slots_keep_products_compact(self) -> None:
+        """Test que verifica que no hay __dict__ por instancia pero sigue siendo editable."""
+        product = Product('111', 'Pan', 2, 1)
+
+        assert not hasattr(product, '__dict__')
+        product.stock += 2
+        product.id = 5
+        assert (product.id, product.stock) == (5, 3)
+        with pytest.raises(AttributeError):
+            product.color = 'rojo'
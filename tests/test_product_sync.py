@@ -0,0 +1,390 @@
+"""Tests para el aviso de cambios de productos entre terminales."""
+
+from decimal import Decimal
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+import pytest
+from app.controllers.product_controller import ProductController
+from app.models.database import Database
+from app.models.product import Product
+
+if TYPE_CHECKING:
+    from pytest_mock.plugin import MockerFixture
+
+
+@pytest.fixture
+def mock_database(mocker: "MockerFixture") -> MagicMock:
+    """
+    Fixture que proporciona una base de datos simulada.
+
+    Args:
+        mocker: Fixture de pytest-mock
+
+    Returns:
+        MagicMock: Mock de la base de datos
+    """
+    mock_db = MagicMock()
+    mock_db.get_data_version.return_value = 5
+    mock_db.get_all_products.return_value = []
+    mocker.patch('app.controllers.product_controller.Database',
+                 return_value=mock_db)
+    return mock_db
+
+
+@pytest.fixture
+def mock_monitor(mocker: "MockerFixture") -> MagicMock:
+    """
+    Fixture que reemplaza el monitor de stock bajo compartido.
+
+    Args:
+        mocker: Fixture de pytest-mock
+
+    Returns:
+        MagicMock: Mock del monitor
+    """
+    monitor = MagicMock()
+    mocker.patch('app.controllers.product_controller.LowStockMonitor.instance',
+                 return_value=monitor)
+    return monitor
+
+
+@pytest.fixture
+def mock_snapshot(mocker: "MockerFixture") -> MagicMock:
+    """
+    Fixture que reemplaza la copia local del catálogo (sin copia guardada).
+
+    Args:
+        mocker: Fixture de pytest-mock
+
+    Returns:
+        MagicMock: Mock de la copia local
+    """
+    snapshot = MagicMock()
+    snapshot.load.return_value = None
+    mocker.patch('app.controllers.product_controller.CatalogSnapshot',
+                 return_value=snapshot)
+    return snapshot
+
+
+@pytest.fixture
+def product_controller(
+    mock_database: MagicMock, mock_monitor: MagicMock, mock_snapshot: MagicMock
+) -> ProductController:
+    """
+    Fixture que proporciona un controlador con vistas simuladas.
+
+    Args:
+        mock_database: Mock de la base de datos
+        mock_monitor: Mock del monitor de stock bajo
+        mock_snapshot: Mock de la copia local del catálogo
+
+    Returns:
+        ProductController: Instancia del controlador
+    """
+    return ProductController(MagicMock(), MagicMock())
+
+
+class TestProductSync:
+    """Tests para la sincronización incremental de la lista de productos."""
+
+    def test_initial_load_remembers_version(
+        self, product_controller: ProductController
+    ) -> None:
+        """
+        Test que verifica que la carga completa guarda la versión y programa el sondeo.
+
+        Args:
+            product_controller: Fixture del controlador
+        """
+        assert product_controller._data_version == 5
+        assert product_controller.product_list.product_controller is product_controller
+        product_controller.product_list.after.assert_called_once()
+
+    def test_no_changes_does_not_touch_the_list(
+        self, product_controller: ProductController, mock_database: MagicMock
+    ) -> None:
+        """
+        Test que verifica que sin cambios no se actualiza la vista.
+
+        Args:
+            product_controller: Fixture del controlador
+            mock_database: Mock de la base de datos
+        """
+        mock_database.get_products_changed_since.return_value = (5, [], [])
+
+        product_controller.sync_products()
+
+        mock_database.get_products_changed_since.assert_called_once_with(5)
+        product_controller.product_list.apply_changes.assert_not_called()
+
+    def test_changes_are_applied_as_delta(
+        self,
+        product_controller: ProductController,
+        mock_database: MagicMock,
+        mock_monitor: MagicMock
+    ) -> None:
+        """
+        Test que verifica que solo se aplican los productos cambiados.
+
+        Args:
+            product_controller: Fixture del controlador
+            mock_database: Mock de la base de datos
+            mock_monitor: Mock del monitor de stock bajo
+        """
+        changed = [Product('111', 'Pan', 2.0, 3, id=1, reorder_level=5)]
+        mock_database.get_products_changed_since.return_value = (8, changed, [4])
+
+        product_controller.sync_products()
+
+        product_controller.product_list.apply_changes.assert_called_once_with(
+            changed, [4])
+        mock_monitor.track.assert_called_once_with(changed[0])
+        mock_monitor.untrack.assert_called_once_with(4)
+        assert product_controller._data_version == 8
+        mock_database.get_all_products.assert_called_once()
+
+    def test_older_version_reloads_everything(
+        self, product_controller: ProductController, mock_database: MagicMock
+    ) -> None:
+        """
+        Test que verifica la recarga completa si la base volvió a una versión anterior.
+
+        Args:
+            product_controller: Fixture del controlador
+            mock_database: Mock de la base de datos
+        """
+        mock_database.get_products_changed_since.return_value = (2, [], [])
+        mock_database.get_data_version.return_value = 2
+
+        product_controller.sync_products()
+
+        assert mock_database.get_all_products.call_count == 2
+        assert product_controller._data_version == 2
+
+    def test_next_version_bumps_counter(self) -> None:
+        """Test que verifica el incremento atómico del contador de cambios."""
+        cursor = MagicMock()
+        cursor.fetchone.return_value = {'version': 42}
+
+        assert Database.next_version(cursor) == 42
+
+        query, params = cursor.execute.call_args_list[0][0]
+        assert 'LAST_INSERT_ID(version + 1)' in query
+        assert params == ('products',)
+
+
+class TestSnapshotStartup:
+    """Tests para el inicio desde la copia local del catálogo."""
+
+    @pytest.fixture
+    def worker_db(self, mocker: "MockerFixture") -> MagicMock:
+        """
+        Fixture que simula la base del hilo de conciliación.
+
+        Args:
+            mocker: Fixture de pytest-mock
+
+        Returns:
+            MagicMock: Mock de la base creada con with_connection
+        """
+        worker_db = MagicMock()
+        mocker.patch('app.controllers.product_controller.Database.with_connection',
+                     return_value=worker_db)
+        mocker.patch('app.controllers.product_controller.Database.create_connection')
+        # Sin hilo: el test ejecuta _run_reconcile directamente
+        mocker.patch.object(ProductController, '_start_reconcile')
+        return worker_db
+
+    def _start(
+        self, mock_snapshot: MagicMock, mock_database: MagicMock
+    ) -> ProductController:
+        """Crea el controlador con una copia local de la versión 3."""
+        cached = [Product('111', 'Pan', 2.0, 3, id=1)]
+        mock_snapshot.load.return_value = (3, cached)
+        controller = ProductController(MagicMock(), MagicMock())
+        controller.product_list.load_products.assert_called_once_with(cached)
+        assert controller._data_version == 3
+        mock_database.get_all_products.assert_not_called()
+        controller._start_reconcile.assert_called_once_with()
+        controller._run_reconcile(3)
+        return controller
+
+    def test_snapshot_is_reconciled_with_delta(
+        self,
+        mock_database: MagicMock,
+        mock_monitor: MagicMock,
+        mock_snapshot: MagicMock,
+        worker_db: MagicMock
+    ) -> None:
+        """
+        Test que verifica que se muestra la copia y luego se aplica el delta.
+
+        Args:
+            mock_database: Mock de la base de datos
+            mock_monitor: Mock del monitor de stock bajo
+            mock_snapshot: Mock de la copia local
+            worker_db: Mock de la base del hilo trabajador
+        """
+        changed = [Product('111', 'Pan', 2.5, 3, id=1)]
+        worker_db.get_products_changed_since.return_value = (6, changed, [9])
+        mock_database.get_products_changed_since.reset_mock()
+
+        controller = self._start(mock_snapshot, mock_database)
+        controller._poll_reconcile()
+
+        worker_db.get_products_changed_since.assert_called_once_with(3)
+        controller.product_list.apply_changes.assert_called_once_with(changed, [9])
+        assert controller._data_version == 6
+        mock_database.get_all_products.assert_not_called()
+        mock_database.get_products_changed_since.assert_not_called()
+
+    def test_reconcile_error_keeps_snapshot(
+        self,
+        mock_database: MagicMock,
+        mock_monitor: MagicMock,
+        mock_snapshot: MagicMock,
+        worker_db: MagicMock
+    ) -> None:
+        """
+        Test que verifica que sin conexión se sigue con la copia local.
+
+        Args:
+            mock_database: Mock de la base de datos
+            mock_monitor: Mock del monitor de stock bajo
+            mock_snapshot: Mock de la copia local
+            worker_db: Mock de la base del hilo trabajador
+        """
+        worker_db.get_products_changed_since.side_effect = OSError("sin red")
+
+        controller = self._start(mock_snapshot, mock_database)
+        controller._poll_reconcile()
+
+        assert controller._data_version == 3
+        controller.product_list.apply_changes.assert_not_called()
+        mock_database.get_all_products.assert_not_called()
+
+    def test_save_snapshot(
+        self, product_controller: ProductController, mock_snapshot: MagicMock
+    ) -> None:
+        """
+        Test que verifica que se guarda el catálogo mostrado con su versión.
+
+        Args:
+            product_controller: Fixture del controlador
+            mock_snapshot: Mock de la copia local
+        """
+        product_controller.save_snapshot()
+
+        mock_snapshot.save.assert_called_once_with(
+            5, product_controller.product_list.all_products)
+
+    def test_catalog_from_staged_startup(
+        self,
+        mock_database: MagicMock,
+        mock_monitor: MagicMock,
+        mock_snapshot: MagicMock,
+        worker_db: MagicMock
+    ) -> None:
+        """
+        Test que verifica que el catálogo ya mostrado no se vuelve a cargar.
+
+        Args:
+            mock_database: Mock de la base de datos
+            mock_monitor: Mock del monitor de stock bajo
+            mock_snapshot: Mock de la copia local
+            worker_db: Mock de la base del hilo trabajador
+        """
+        controller = ProductController(MagicMock(), MagicMock(), catalog=(9, []))
+
+        assert controller._data_version == 9
+        controller.product_list.load_products.assert_not_called()
+        mock_snapshot.load.assert_not_called()
+        mock_database.get_all_products.assert_not_called()
+        controller._start_reconcile.assert_called_once_with()
+
+
+class TestSaveProduct:
+    """Tests para el alta de productos desde el formulario."""
+
+    @pytest.mark.parametrize('text, expected', [
+        ('19.99', Decimal('19.99')), ('0,10', Decimal('0.10')), ('3', Decimal('3.00'))])
+    def test_price_is_exact_decimal(
+        self,
+        product_controller: ProductController,
+        mock_database: MagicMock,
+        mocker: "MockerFixture",
+        text: str,
+        expected: Decimal
+    ) -> None:
+        """
+        Test que verifica que el precio del formulario no pasa por float.
+
+        Args:
+            product_controller: Fixture del controlador
+            mock_database: Mock de la base de datos
+            mocker: Fixture de pytest-mock
+            text: Precio escrito en el formulario
+            expected: Precio guardado
+        """
+        mocker.patch('app.controllers.product_controller.messagebox')
+        product_controller.product_form.get_product_data.return_value = {
+            'barcode': '111', 'name': 'Pan', 'price': text, 'stock': '3',
+            'reorder_level': ''}
+
+        product_controller.save_product()
+
+        product = mock_database.add_product.call_args.args[0]
+        assert product.price == expected
+        assert str(product.price) == str(expected)
+
+    def test_invalid_price_is_rejected(
+        self,
+        product_controller: ProductController,
+        mock_database: MagicMock,
+        mocker: "MockerFixture"
+    ) -> None:
+        """
+        Test que verifica el rechazo de un precio inválido.
+
+        Args:
+            product_controller: Fixture del controlador
+            mock_database: Mock de la base de datos
+            mocker: Fixture de pytest-mock
+        """
+        messagebox = mocker.patch('app.controllers.product_controller.messagebox')
+        product_controller.product_form.get_product_data.return_value = {
+            'barcode': '111', 'name': 'Pan', 'price': 'abc', 'stock': '3',
+            'reorder_level': ''}
+
+        product_controller.save_product()
+
+        mock_database.add_product.assert_not_called()
+        assert 'precio' in messagebox.showerror.call_args.args[1]
+
+    def test_save_fetches_only_changes(
+        self,
+        product_controller: ProductController,
+        mock_database: MagicMock,
+        mocker: "MockerFixture"
+    ) -> None:
+        """
+        Test que verifica que al guardar se traen solo los cambios, sin recargar todo.
+
+        Args:
+            product_controller: Fixture del controlador
+            mock_database: Mock de la base de datos
+            mocker: Fixture de pytest-mock
+        """
+        mocker.patch('app.controllers.product_controller.messagebox')
+        product_controller.product_form.get_product_data.return_value = {
+            'barcode': '111', 'name': 'Pan', 'price': '1.50', 'stock': '3',
+            'reorder_level': ''}
+        product = Product('111', 'Pan', Decimal('1.50'), 3, id=9)
+        mock_database.get_products_changed_since.return_value = (6, [product], [])
+
+        product_controller.save_product()
+
+        mock_database.get_products_changed_since.assert_called_once_with(5)
+        mock_database.get_all_products.assert_called_once_with()
+        product_controller.product_list.apply_changes.assert_called_once_with(
+            [product], [])
@@ -0,0 +1,114 @@
+"""Tests para el perfilado a pedido de los controladores."""
+
+from pathlib import Path
+from typing import Iterator
+import pstats
+import pytest
+from app.services.profiler import CallbackProfiler, entry_points
+
+
+class FakeController:
+    """Controlador mínimo con métodos de entrada e internos."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def confirm_sale(self, total: int) -> int:
+        self.calls += 1
+        return sum(range(total))
+
+    def _on_double_click(self, event: object) -> None:
+        self.confirm_sale(10)
+
+    def _update_table(self) -> None:
+        pass
+
+    def sync_products(self) -> None:
+        pass
+
+    @staticmethod
+    def _parse(text: str) -> str:
+        return text
+
+
+@pytest.fixture
+def profiler(tmp_path: Path) -> Iterator[CallbackProfiler]:
+    """
+    Fixture que proporciona un perfilador sobre FakeController.
+
+    Args:
+        tmp_path: Carpeta temporal de pytest
+
+    Returns:
+        CallbackProfiler: Perfilador con la clase instrumentada
+    """
+    profiler = CallbackProfiler(tmp_path / 'diagnostics', memory=True, min_ms=0)
+    profiler.instrument_class(FakeController)
+    yield profiler
+    profiler.restore()
+
+
+class TestCallbackProfiler:
+    """Tests para CallbackProfiler."""
+
+    def test_entry_points(self) -> None:
+        """Test que verifica qué métodos se consideran de entrada."""
+        assert entry_points(FakeController) == ['confirm_sale', '_on_double_click']
+
+    def test_disarmed_writes_nothing(
+        self, profiler: CallbackProfiler, tmp_path: Path
+    ) -> None:
+        """
+        Test que verifica que desarmado solo se llama al método original.
+
+        Args:
+            profiler: Fixture del perfilador
+            tmp_path: Carpeta temporal de pytest
+        """
+        controller = FakeController()
+
+        assert controller.confirm_sale(4) == 6
+        assert controller.calls == 1
+        assert not (tmp_path / 'diagnostics').exists()
+
+    def test_captures_next_calls(
+        self, profiler: CallbackProfiler, tmp_path: Path
+    ) -> None:
+        """
+        Test que verifica las capturas de las próximas N invocaciones.
+
+        Args:
+            profiler: Fixture del perfilador
+            tmp_path: Carpeta temporal de pytest
+        """
+        controller = FakeController()
+        profiler.arm(2)
+
+        # La llamada anidada queda dentro de la captura exterior
+        controller._on_double_click(None)
+        assert controller.confirm_sale(100) == 4950
+        controller.confirm_sale(1)
+
+        assert profiler.remaining == 0
+        assert [p.name.split('_', 3)[3] for p in profiler.captures] == [
+            'FakeController._on_double_click.pstats',
+            'FakeController.confirm_sale.pstats',
+        ]
+        stats = pstats.Stats(str(profiler.captures[0]))
+        assert any(func[2] == 'confirm_sale' for func in stats.stats)
+
+        base = str(profiler.captures[1])[:-len('.pstats')]
+        assert Path(f"{base}.tracemalloc").exists()
+        assert 'FakeController.confirm_sale' in Path(f"{base}.txt").read_text(encoding='utf-8')
+        assert len(list((tmp_path / 'diagnostics').iterdir())) == 6
+
+    def test_restore(self, profiler: CallbackProfiler) -> None:
+        """
+        Test que verifica que se restauran los métodos originales.
+
+        Args:
+            profiler: Fixture del perfilador
+        """
+        assert hasattr(FakeController.confirm_sale, '__wrapped__')
+        profiler.restore()
+        assert not hasattr(FakeController.confirm_sale, '__wrapped__')
@@ -0,0 +1,126 @@
+"""Tests para las consultas de solo lectura en la réplica."""
+
+from typing import TYPE_CHECKING, Any
+from unittest.mock import MagicMock
+import pymysql
+import pytest
+from app.models.database import CountingSSCursor, Database
+
+if TYPE_CHECKING:
+    from pytest_mock.plugin import MockerFixture
+
+
+def _connection(status: Any = None, rows: Any = None) -> MagicMock:
+    """Conexión simulada con estado de réplica y filas de resultado."""
+    connection = MagicMock()
+    cursor = connection.cursor.return_value
+    cursor.fetchone.return_value = status
+    cursor.fetchall.return_value = rows
+    return connection
+
+
+@pytest.fixture
+def replica_config(mocker: "MockerFixture") -> dict[str, Any]:
+    """
+    Fixture que configura una réplica con 30 s de retraso máximo.
+
+    Args:
+        mocker: Fixture de pytest-mock
+
+    Returns:
+        dict: Configuración aplicada
+    """
+    config = {'host': 'replica', 'max_lag_seconds': 30, 'check_interval': 60}
+    mocker.patch.dict('app.models.database.REPLICA_CONFIG', config)
+    return config
+
+
+class TestReadReplica:
+    """Tests para la elección entre réplica y base principal."""
+
+    def test_without_replica_uses_primary(self, mocker: "MockerFixture") -> None:
+        """
+        Test que verifica que sin réplica configurada se lee de la principal.
+
+        Args:
+            mocker: Fixture de pytest-mock
+        """
+        mocker.patch.dict('app.models.database.REPLICA_CONFIG', {'host': None})
+        create = mocker.patch.object(Database, 'create_replica_connection')
+        db = Database.with_connection(_connection(rows=[{'total': 1}]))
+
+        assert db.execute_read_query("SELECT 1") == [{'total': 1}]
+        create.assert_not_called()
+
+    def test_replica_within_lag_is_used(
+        self, mocker: "MockerFixture", replica_config: dict[str, Any]
+    ) -> None:
+        """
+        Test que verifica que una réplica al día atiende las lecturas.
+
+        Args:
+            mocker: Fixture de pytest-mock
+            replica_config: Fixture de la configuración de la réplica
+        """
+        replica = _connection({'Seconds_Behind_Source': 3}, [{'origen': 'replica'}])
+        mocker.patch.object(Database, 'create_replica_connection',
+                            return_value=replica)
+        primary = _connection(rows=[{'origen': 'principal'}])
+        db = Database.with_connection(primary)
+
+        assert db.execute_read_query("SELECT 1") == [{'origen': 'replica'}]
+        assert db.replica_lag() == 3.0
+        primary.cursor.return_value.execute.assert_not_called()
+
+        db.stream_read_query("SELECT 2")
+        replica.cursor.assert_called_with(CountingSSCursor)
+
+    @pytest.mark.parametrize('status', [
+        {'Seconds_Behind_Source': 120},
+        {'Seconds_Behind_Master': None},
+        None,
+    ])
+    def test_stale_or_stopped_replica_falls_back(
+        self,
+        mocker: "MockerFixture",
+        replica_config: dict[str, Any],
+        status: Any
+    ) -> None:
+        """
+        Test que verifica que una réplica atrasada o detenida no se usa.
+
+        Args:
+            mocker: Fixture de pytest-mock
+            replica_config: Fixture de la configuración de la réplica
+            status: Resultado de SHOW REPLICA STATUS
+        """
+        replica = _connection(status, [{'origen': 'replica'}])
+        mocker.patch.object(Database, 'create_replica_connection',
+                            return_value=replica)
+        db = Database.with_connection(_connection(rows=[{'origen': 'principal'}]))
+
+        assert db.execute_read_query("SELECT 1") == [{'origen': 'principal'}]
+
+    def test_replica_error_falls_back_until_next_check(
+        self, mocker: "MockerFixture", replica_config: dict[str, Any]
+    ) -> None:
+        """
+        Test que verifica el respaldo en la principal si la réplica falla.
+
+        Args:
+            mocker: Fixture de pytest-mock
+            replica_config: Fixture de la configuración de la réplica
+        """
+        replica = _connection({'Seconds_Behind_Source': 0})
+        replica.cursor.return_value.fetchall.side_effect = (
+            pymysql.err.OperationalError(2013, "Lost connection"))
+        create = mocker.patch.object(Database, 'create_replica_connection',
+                                     return_value=replica)
+        db = Database.with_connection(_connection(rows=[{'origen': 'principal'}]))
+
+        assert db.execute_read_query("SELECT 1") == [{'origen': 'principal'}]
+        replica.close.assert_called_once()
+
+        # No se reintenta hasta el próximo control
+        assert db.execute_read_query("SELECT 1") == [{'origen': 'principal'}]
+        assert create.call_count == 1
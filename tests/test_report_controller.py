@@ -0,0 +1,57 @@
+"""Tests para la anulación de ventas desde los reportes."""
+
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+import pytest
+from app.controllers.report_controller import ReportController
+
+if TYPE_CHECKING:
+    from pytest_mock.plugin import MockerFixture
+
+
+@pytest.fixture
+def report_controller() -> ReportController:
+    """
+    Fixture que proporciona un controlador de reportes sin vista ni base.
+
+    Returns:
+        ReportController: Controlador con la base simulada
+    """
+    controller = object.__new__(ReportController)
+    controller.report_form = MagicMock()
+    controller.product_list = None
+    controller.db = MagicMock()
+    return controller
+
+
+class TestCancelSaleLookup:
+    """Tests de la búsqueda de la venta a anular."""
+
+    @pytest.mark.parametrize('archived, kind', [
+        ([{'id': 4}], 'showwarning'), ([], 'showerror')])
+    def test_missing_sale(
+        self,
+        report_controller: ReportController,
+        mocker: "MockerFixture",
+        archived: list,
+        kind: str
+    ) -> None:
+        """
+        Test que verifica el aviso de una venta archivada o inexistente.
+
+        Args:
+            report_controller: Fixture del controlador de reportes
+            mocker: Fixture de pytest-mock
+            archived: Resultado de la búsqueda en sales_archive
+            kind: Tipo de mensaje esperado
+        """
+        messagebox = mocker.patch('app.controllers.report_controller.messagebox')
+        report_controller.db.execute_query.side_effect = [[], archived]
+
+        report_controller.cancel_sale(4)
+
+        getattr(messagebox, kind).assert_called_once()
+        if archived:
+            assert 'archivada' in messagebox.showwarning.call_args.args[1]
+        messagebox.askyesno.assert_not_called()
+        report_controller.db.cancel_sale.assert_not_called()
@@ -0,0 +1,258 @@
+"""Tests para los reportes por período."""
+
+from datetime import date, datetime
+from decimal import Decimal
+from unittest.mock import MagicMock
+import pytest
+from app.services.report_service import ReportService
+
+
+@pytest.fixture
+def mock_db() -> MagicMock:
+    """
+    Fixture que proporciona una base de datos simulada.
+
+    Returns:
+        MagicMock: Mock con execute_read_query y sin meses archivados
+    """
+    db = MagicMock()
+    db.get_archive_cutoff.return_value = None
+    db.execute_read_query.return_value = [
+        {'total': 150.0, 'cantidad_ventas': 3}]
+    return db
+
+
+@pytest.fixture
+def report_service(mock_db: MagicMock) -> ReportService:
+    """
+    Fixture que proporciona el servicio de reportes.
+
+    Args:
+        mock_db: Fixture de la base de datos simulada
+
+    Returns:
+        ReportService: Instancia del servicio
+    """
+    return ReportService(mock_db)
+
+
+class TestReportService:
+    """Tests para ReportService."""
+
+    @pytest.mark.parametrize('period, expected', [
+        ('dia', (datetime(2024, 3, 13), datetime(2024, 3, 14))),
+        ('semana', (datetime(2024, 3, 11), datetime(2024, 3, 18))),
+        ('mes', (datetime(2024, 3, 1), datetime(2024, 4, 1))),
+    ])
+    def test_period_range(self, period: str, expected: tuple) -> None:
+        """
+        Test que verifica los rangos de los períodos predefinidos.
+
+        Args:
+            period: Período a calcular
+            expected: Rango esperado
+        """
+        assert ReportService.period_range(period, date(2024, 3, 13)) == expected
+
+    def test_custom_range_includes_last_day(self) -> None:
+        """Test que verifica que el rango personalizado incluye el último día."""
+        start, end = ReportService.custom_range(
+            date(2024, 1, 1), date(2024, 1, 31))
+
+        assert start == datetime(2024, 1, 1)
+        assert end == datetime(2024, 2, 1)
+
+        with pytest.raises(ValueError):
+            ReportService.custom_range(date(2024, 2, 1), date(2024, 1, 1))
+
+    def test_summary_is_computed_in_sql(
+        self, report_service: ReportService, mock_db: MagicMock
+    ) -> None:
+        """
+        Test que verifica que el resumen se pide agregado y filtrado por rango.
+
+        Args:
+            report_service: Fixture del servicio
+            mock_db: Fixture de la base de datos simulada
+        """
+        start, end = datetime(2024, 1, 1), datetime(2024, 2, 1)
+
+        summary = report_service.get_period_summary(start, end)
+
+        assert summary == {'total': 150.0, 'cantidad_ventas': 3,
+                           'ticket_promedio': 50.0}
+        query, params = mock_db.execute_read_query.call_args[0]
+        assert 'SUM(total)' in query
+        assert 'date >= %s AND date < %s' in query
+        assert params == (start, end)
+
+    def test_closed_range_is_cached_until_invalidated(
+        self, report_service: ReportService, mock_db: MagicMock
+    ) -> None:
+        """
+        Test que verifica la caché de resultados por rango.
+
+        Args:
+            report_service: Fixture del servicio
+            mock_db: Fixture de la base de datos simulada
+        """
+        start, end = datetime(2024, 1, 1), datetime(2024, 2, 1)
+
+        report_service.get_sales_by_day(start, end)
+        report_service.get_sales_by_day(start, end)
+        assert mock_db.execute_read_query.call_count == 1
+
+        report_service.get_sales_by_day(start, datetime(2024, 1, 15))
+        assert mock_db.execute_read_query.call_count == 2
+
+        report_service.invalidate()
+        report_service.get_sales_by_day(start, end)
+        assert mock_db.execute_read_query.call_count == 3
+
+    def test_cache_is_bounded_lru(self, mock_db: MagicMock) -> None:
+        """
+        Test que verifica que la caché descarta los rangos usados hace más tiempo.
+
+        Args:
+            mock_db: Fixture de la base de datos simulada
+        """
+        service = ReportService(mock_db, max_entries=2)
+        january = (datetime(2024, 1, 1), datetime(2024, 2, 1))
+        february = (datetime(2024, 2, 1), datetime(2024, 3, 1))
+        march = (datetime(2024, 3, 1), datetime(2024, 4, 1))
+
+        service.get_sales_by_day(*january)
+        service.get_sales_by_day(*february)
+        service.get_sales_by_day(*january)  # Enero pasa a ser el más reciente
+        service.get_sales_by_day(*march)    # Descarta febrero
+        assert len(service._cache) == 2
+        assert mock_db.execute_read_query.call_count == 3
+
+        service.get_sales_by_day(*january)
+        assert mock_db.execute_read_query.call_count == 3
+        service.get_sales_by_day(*february)
+        assert mock_db.execute_read_query.call_count == 4
+
+    def test_open_range_expires(self, mock_db: MagicMock) -> None:
+        """
+        Test que verifica que un rango que incluye el presente vence.
+
+        Args:
+            mock_db: Fixture de la base de datos simulada
+        """
+        service = ReportService(mock_db, open_range_ttl=0)
+        start, end = ReportService.period_range('dia')
+
+        service.get_sales_by_hour(start, end)
+        service.get_sales_by_hour(start, end)
+
+        assert mock_db.execute_read_query.call_count == 2
+
+    def test_abc_classification(self) -> None:
+        """Test que verifica participaciones, acumulado y clases ABC."""
+        rows = [
+            {'producto': 'Sin ventas', 'monto_total': Decimal('0')},
+            {'producto': 'Chico', 'monto_total': Decimal('50')},
+            {'producto': 'Grande', 'monto_total': Decimal('700')},
+            {'producto': 'Mediano', 'monto_total': Decimal('150')},
+            {'producto': 'Medio chico', 'monto_total': Decimal('100')},
+        ]
+
+        result = ReportService.classify_abc(rows)
+
+        assert [r['producto'] for r in result] == [
+            'Grande', 'Mediano', 'Medio chico', 'Chico', 'Sin ventas']
+        # El que cruza el 80 % sigue siendo A
+        assert [r['clase'] for r in result] == ['A', 'A', 'B', 'C', 'C']
+        assert [r['participacion_acumulada'] for r in result] == [
+            70.0, 85.0, 95.0, 100.0, 100.0]
+        assert ReportService.abc_summary(result)['C'] == {
+            'productos': 2, 'monto_total': 50.0, 'participacion': 5.0}
+
+    def test_abc_analysis_is_one_cached_query(
+        self, report_service: ReportService, mock_db: MagicMock
+    ) -> None:
+        """
+        Test que verifica que el análisis ABC usa una consulta cacheada por período.
+
+        Args:
+            report_service: Fixture del servicio
+            mock_db: Fixture de la base de datos simulada
+        """
+        mock_db.execute_read_query.return_value = [
+            {'id': 1, 'barcode': '111', 'producto': 'Pan',
+             'cantidad_vendida': 10, 'monto_total': Decimal('25')}]
+        start, end = datetime(2024, 1, 1), datetime(2024, 2, 1)
+
+        first = report_service.get_abc_analysis(start, end)
+        second = report_service.get_abc_analysis(start, end)
+
+        assert first is second
+        assert first[0]['clase'] == 'A'
+        mock_db.execute_read_query.assert_called_once()
+        query, params = mock_db.execute_read_query.call_args[0]
+        assert 'LEFT JOIN' in query
+        assert params == (start, end)
+
+    def test_archived_range_uses_aggregates(
+        self, report_service: ReportService, mock_db: MagicMock
+    ) -> None:
+        """
+        Test que verifica que un rango archivado lee los agregados por hora.
+
+        Args:
+            report_service: Fixture del servicio
+            mock_db: Fixture de la base de datos simulada
+        """
+        mock_db.get_archive_cutoff.return_value = datetime(2024, 3, 1)
+        start, end = datetime(2024, 1, 1), datetime(2024, 2, 1)
+
+        report_service.get_period_summary(start, end)
+
+        query, params = mock_db.execute_read_query.call_args[0]
+        assert 'FROM sales_hourly' in query
+        assert 'UNION' not in query and 'FROM sales\n' not in query
+        assert params == (start, end)
+
+    def test_range_across_cutoff_unions_only_touched_tables(
+        self, report_service: ReportService, mock_db: MagicMock
+    ) -> None:
+        """
+        Test que verifica la unión de agregados mensuales, archivo y ventas.
+
+        Args:
+            report_service: Fixture del servicio
+            mock_db: Fixture de la base de datos simulada
+        """
+        cutoff = datetime(2024, 3, 1)
+        mock_db.get_archive_cutoff.return_value = cutoff
+        start, end = datetime(2024, 1, 15), datetime(2024, 3, 10)
+
+        report_service.get_product_revenue(start, end)
+
+        query, params = mock_db.execute_read_query.call_args[0]
+        assert query.count('UNION ALL') == 2
+        assert 'FROM sales_archive' in query
+        assert 'FROM product_sales_monthly' in query
+        assert 'FROM sales s' in query
+        # Archivo hasta fin de enero, febrero agregado y marzo en vivo
+        assert params == (start, datetime(2024, 2, 1),
+                          datetime(2024, 2, 1), cutoff,
+                          cutoff, end)
+
+    def test_live_range_skips_archive(
+        self, report_service: ReportService, mock_db: MagicMock
+    ) -> None:
+        """
+        Test que verifica que un rango posterior al archivo no lo consulta.
+
+        Args:
+            report_service: Fixture del servicio
+            mock_db: Fixture de la base de datos simulada
+        """
+        mock_db.get_archive_cutoff.return_value = datetime(2024, 3, 1)
+
+        report_service.get_sales(datetime(2024, 3, 5), datetime(2024, 3, 6))
+
+        query, _ = mock_db.execute_read_query.call_args[0]
+        assert 'archive' not in query and 'UNION' not in query
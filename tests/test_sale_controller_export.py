@@ -287,7 +287,7 @@ class TestSaleControllerExport:
         sale_controller.db.get_product_by_barcode = MagicMock(
             return_value=mock_product)
         sale_controller.db.add_sale = MagicMock(return_value=1)
-        sale_controller.db.add_sale_detail = MagicMock()
+        sale_controller.db.add_sale_details = MagicMock()
         sale_controller.db.update_product = MagicMock()
 
         # Mock para que NO genere el ticket
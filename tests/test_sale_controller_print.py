@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING
 from unittest.mock import MagicMock
 import pytest
 from app.controllers.sale_controller import SaleController
+from app.services.print_spooler import FAILED, PRINTED, PrintJob
 
 if TYPE_CHECKING:
     from pytest_mock.plugin import MockerFixture
@@ -177,3 +178,75 @@ class TestTicketPrinting:
 
         # Verificar que se mostró mensaje de error
         assert mock_messagebox.showerror.called
+
+    def test_generate_ticket_uses_print_spooler(
+        self,
+        sale_controller: SaleController,
+        mocker: "MockerFixture"
+    ) -> None:
+        """
+        Test que verifica que con cola de impresión no se imprime de forma sincrónica.
+
+        Args:
+            sale_controller: Fixture del controlador de ventas
+            mocker: Fixture de pytest-mock
+        """
+        details = [
+            {'producto': 'Test', 'cantidad': 1, 'precio': 10.0, 'subtotal': 10.0}
+        ]
+        sale_controller.print_spooler = MagicMock()
+
+        test_filename = 'test_reportes/ticket_test.pdf'
+        mocker.patch.object(
+            sale_controller.export_service,
+            'export_sale_ticket_to_pdf',
+            return_value=test_filename
+        )
+        mock_print = mocker.patch.object(
+            sale_controller.export_service, 'print_pdf')
+
+        mocker.patch('app.controllers.sale_controller.messagebox')
+        mock_mb = mocker.patch('tkinter.messagebox')
+        mock_mb.askyesnocancel.return_value = True  # True = Imprimir
+
+        sale_controller._generate_sale_ticket(
+            sale_id=1,
+            sale_date='2024-09-30 12:00:00',
+            sale_total=10.00,
+            sale_paid=10.00,
+            sale_change=0.00,
+            details=details
+        )
+
+        sale_controller.print_spooler.submit.assert_called_once_with(
+            test_filename)
+        mock_print.assert_not_called()
+        # Los detalles ya conocidos no se vuelven a consultar
+        sale_controller.db.execute_query.assert_not_called()
+        sale_controller.sale_form.after.assert_called_once_with(
+            SaleController.PRINT_POLL_INTERVAL_MS, sale_controller._poll_print_jobs)
+
+    def test_failed_print_is_reported(
+        self,
+        sale_controller: SaleController,
+        mocker: "MockerFixture"
+    ) -> None:
+        """
+        Test que verifica que se avisa un ticket fallido y se deja de revisar la cola.
+
+        Args:
+            sale_controller: Fixture del controlador de ventas
+            mocker: Fixture de pytest-mock
+        """
+        failed = PrintJob(id=1, filename='ticket.pdf', status=FAILED, error='sin papel')
+        sale_controller.print_spooler = MagicMock()
+        sale_controller.print_spooler.poll.return_value = [
+            PrintJob(id=2, filename='otro.pdf', status=PRINTED), failed]
+        sale_controller.print_spooler.pending.return_value = 0
+        mock_messagebox = mocker.patch('app.controllers.sale_controller.messagebox')
+
+        sale_controller._poll_print_jobs()
+
+        mock_messagebox.showerror.assert_called_once()
+        assert 'sin papel' in mock_messagebox.showerror.call_args.args[1]
+        sale_controller.sale_form.after.assert_not_called()
@@ -0,0 +1,136 @@
+"""Tests para el inicio escalonado de la caja."""
+
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock, call
+import pytest
+from app.controllers.sale_controller import SaleController
+from app.models.product import Product
+from app.services.startup import CATALOG, ERROR, READY, StartupLoader
+
+if TYPE_CHECKING:
+    from pytest_mock.plugin import MockerFixture
+
+
+@pytest.fixture
+def mock_database(mocker: "MockerFixture") -> MagicMock:
+    """
+    Fixture que reemplaza la conexión compartida y la foto de stock.
+
+    Args:
+        mocker: Fixture de pytest-mock
+
+    Returns:
+        MagicMock: Clase Database simulada
+    """
+    database = mocker.patch('app.services.startup.Database')
+    db = database.return_value
+    db.get_data_version.return_value = 7
+    db.get_all_products.return_value = [Product('111', 'Pan', 2.0, 3, id=1)]
+    mocker.patch('app.services.startup.InventoryService')
+    return database
+
+
+def _loader(cached: object) -> StartupLoader:
+    """Cargador con una copia local simulada que devuelve `cached`."""
+    snapshot = MagicMock()
+    snapshot.load.return_value = cached
+    return StartupLoader(snapshot)
+
+
+class TestStartupLoader:
+    """Tests para StartupLoader."""
+
+    def test_snapshot_is_published_before_connecting(
+        self, mock_database: MagicMock
+    ) -> None:
+        """
+        Test que verifica que la copia local se publica sin leer el catálogo.
+
+        Args:
+            mock_database: Mock de la clase Database
+        """
+        cached = (3, [Product('222', 'Leche', 1.5, 8, id=2)])
+        loader = _loader(cached)
+
+        loader._run()
+
+        assert loader.poll() == [(CATALOG, cached), (READY, None)]
+        assert loader.ready is True
+        assert loader.catalog == cached
+        mock_database.return_value.get_all_products.assert_not_called()
+        mock_database.return_value.connection.commit.assert_called_once()
+
+    def test_full_load_without_snapshot(self, mock_database: MagicMock) -> None:
+        """
+        Test que verifica la carga completa cuando no hay copia local.
+
+        Args:
+            mock_database: Mock de la clase Database
+        """
+        loader = _loader(None)
+
+        loader._run()
+
+        events = loader.poll()
+        assert [kind for kind, _ in events] == [CATALOG, READY]
+        version, products = loader.catalog
+        assert version == 7
+        assert products[0].barcode == '111'
+
+    def test_connection_error_is_retried(self, mock_database: MagicMock) -> None:
+        """
+        Test que verifica el reintento después de un error de conexión.
+
+        Args:
+            mock_database: Mock de la clase Database
+        """
+        cached = (3, [])
+        loader = _loader(cached)
+        mock_database.side_effect = [OSError("sin red"), MagicMock()]
+
+        loader._run()
+        events = loader.poll()
+        assert [kind for kind, _ in events] == [CATALOG, ERROR]
+        assert loader.ready is False
+
+        loader._run()
+        assert loader.poll() == [(READY, None)]
+        # La copia local no se vuelve a leer ni a publicar
+        loader.snapshot.load.assert_called_once()
+
+    def test_start_does_nothing_when_ready(self, mocker: "MockerFixture") -> None:
+        """
+        Test que verifica que no se relanza el hilo una vez lista la caja.
+
+        Args:
+            mocker: Fixture de pytest-mock
+        """
+        thread = mocker.patch('app.services.startup.threading.Thread')
+        loader = _loader(None)
+        loader.ready = True
+
+        loader.start()
+
+        thread.assert_not_called()
+
+
+class TestReplayScans:
+    """Tests para los escaneos hechos antes de estar lista la caja."""
+
+    def test_queued_scans_are_added_in_order(self, mocker: "MockerFixture") -> None:
+        """
+        Test que verifica que los escaneos en espera se agregan en orden.
+
+        Args:
+            mocker: Fixture de pytest-mock
+        """
+        mocker.patch('app.controllers.sale_controller.Database')
+        controller = SaleController(MagicMock())
+        add_item = mocker.patch.object(controller, 'add_item')
+        entry = controller.sale_form.barcode_entry
+
+        controller.replay_scans([('111', ''), ('222', '3')])
+
+        assert add_item.call_count == 2
+        assert entry.insert.call_args_list == [call(0, '111'), call(0, '222')]
+        controller.sale_form.qty_entry.insert.assert_called_with(0, '3')
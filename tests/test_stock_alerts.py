@@ -0,0 +1,82 @@
+"""Tests para las alertas de stock bajo."""
+
+from unittest.mock import MagicMock
+import pytest
+from app.models.product import Product
+from app.services.stock_alerts import LowStockMonitor
+
+
+@pytest.fixture
+def monitor() -> LowStockMonitor:
+    """
+    Fixture que proporciona un monitor cargado con dos productos.
+
+    Returns:
+        LowStockMonitor: Monitor con Pan (en alerta) y Leche (con stock)
+    """
+    db = MagicMock()
+    db.execute_query.return_value = [
+        {'id': 1, 'barcode': '111', 'name': 'Pan', 'stock': 2, 'reorder_level': 5},
+        {'id': 2, 'barcode': '222', 'name': 'Leche', 'stock': 10, 'reorder_level': 4},
+    ]
+    monitor = LowStockMonitor()
+    monitor.load(db)
+    return monitor
+
+
+class TestLowStockMonitor:
+    """Tests para LowStockMonitor."""
+
+    def test_load(self, monitor: LowStockMonitor) -> None:
+        """
+        Test que verifica las alertas iniciales.
+
+        Args:
+            monitor: Fixture del monitor
+        """
+        assert monitor.count() == 1
+        assert monitor.alerts() == [{
+            'id': 1, 'barcode': '111', 'name': 'Pan', 'stock': 2,
+            'reorder_level': 5, 'faltante': 3
+        }]
+
+    def test_sale_and_cancellation_update_alerts(self, monitor: LowStockMonitor) -> None:
+        """
+        Test que verifica que las variaciones de stock entran y salen de alerta.
+
+        Args:
+            monitor: Fixture del monitor
+        """
+        counts = []
+        monitor.add_listener(lambda m: counts.append(m.count()))
+
+        monitor.apply_delta(2, -6)   # Venta: Leche queda en 4
+        assert monitor.alert_barcodes() == {'111', '222'}
+
+        monitor.apply_delta(2, 3)    # Anulación: vuelve a 7
+        monitor.apply_delta(99, -1)  # Producto sin stock mínimo: se ignora
+        assert monitor.alert_barcodes() == {'111'}
+        assert counts == [2, 1]
+
+    def test_track_and_untrack(self, monitor: LowStockMonitor) -> None:
+        """
+        Test que verifica las altas, ediciones y bajas de productos.
+
+        Args:
+            monitor: Fixture del monitor
+        """
+        monitor.track(Product('333', 'Yerba', 5.0, stock=1, reorder_level=3), 3)
+        assert monitor.count() == 2
+
+        # Quitar el stock mínimo saca el producto de las alertas
+        monitor.track(Product('111', 'Pan', 2.0, stock=2, id=1))
+        assert monitor.alert_barcodes() == {'333'}
+
+        monitor.untrack(3)
+        assert monitor.count() == 0
+
+    def test_product_is_low_stock(self) -> None:
+        """Test que verifica la propiedad is_low_stock del producto."""
+        assert Product('1', 'A', 1.0, stock=3, reorder_level=3).is_low_stock
+        assert not Product('1', 'A', 1.0, stock=4, reorder_level=3).is_low_stock
+        assert not Product('1', 'A', 1.0, stock=0).is_low_stock
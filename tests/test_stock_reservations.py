@@ -0,0 +1,338 @@
+"""Tests para las reservas de stock de las canastas abiertas."""
+
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
+from unittest.mock import MagicMock
+import pytest
+import app.controllers.sale_controller as sale_module
+from app.controllers.sale_controller import SaleController
+from app.models.database import Database
+from app.models.money import Money
+from app.models.product import Product
+from app.models.stock_movement import MOV_VENTA
+
+if TYPE_CHECKING:
+    from pytest_mock.plugin import MockerFixture
+
+
+def _database(stock: Any, reserved: int = 0) -> Database:
+    """Database sobre una conexión simulada con stock y reservas de otras cajas."""
+    connection = MagicMock()
+    cursor = connection.cursor.return_value
+    cursor.fetchone.side_effect = [
+        None if stock is None else {'stock': stock}, {'reservado': reserved}]
+    return Database.with_connection(connection)
+
+
+def _queries(db: Database) -> list[str]:
+    """Primeras palabras de las consultas ejecutadas."""
+    return [' '.join(call.args[0].split()[:3])
+            for call in db.cursor.execute.call_args_list]
+
+
+class TestReserveStock:
+    """Tests para Database.reserve_stock y get_available_stock."""
+
+    def test_reservation_within_unreserved_stock(self) -> None:
+        """Test que verifica una reserva que entra en el stock libre."""
+        db = _database(stock=5, reserved=3)
+
+        assert db.reserve_stock(1, 'caja-1', 2, ttl=60) is True
+
+        assert _queries(db) == [
+            'SELECT stock FROM',
+            'SELECT COALESCE(SUM(quantity), 0)',
+            'INSERT INTO stock_reservations',
+            'UPDATE stock_reservations SET',
+        ]
+        assert db.cursor.execute.call_args_list[1].args[1] == (1, 'caja-1')
+        assert db.cursor.execute.call_args_list[2].args[1] == ('caja-1', 1, 2, 60)
+        # Lectura con bloqueo en lugar de confirmar antes la transacción
+        assert 'LOCK IN SHARE MODE' in db.cursor.execute.call_args_list[1].args[0]
+        db.connection.commit.assert_called_once_with()
+        db.connection.rollback.assert_not_called()
+
+    @pytest.mark.parametrize('stock', [None, 4])
+    def test_reservation_over_available_is_rejected(self, stock: Any) -> None:
+        """
+        Test que verifica que no se reserva lo que ya reservaron otras cajas.
+
+        Args:
+            stock: Stock del producto (None si no existe)
+        """
+        db = _database(stock=stock, reserved=3)
+
+        assert db.reserve_stock(1, 'caja-1', 2) is False
+
+        assert not any(q.startswith(('INSERT', 'UPDATE')) for q in _queries(db))
+        db.connection.rollback.assert_called_once()
+
+    def test_zero_releases_product(self) -> None:
+        """Test que verifica que reservar 0 borra la reserva sin controlar stock."""
+        db = _database(stock=0)
+
+        assert db.reserve_stock(1, 'caja-1', 0) is True
+        assert _queries(db)[1] == 'DELETE FROM stock_reservations'
+
+    def test_available_stock_excludes_other_baskets(
+        self, mocker: "MockerFixture"
+    ) -> None:
+        """
+        Test que verifica el stock disponible descontando otras canastas, leído
+        con una conexión propia sin confirmar la transacción compartida.
+
+        Args:
+            mocker: Fixture de pytest-mock
+        """
+        shared = MagicMock()
+        db = Database.with_connection(shared)
+        for stock, reserved, expected in [(10, 4, 6), (None, 0, 0)]:
+            own = _database(stock=stock, reserved=reserved).connection
+            mocker.patch.object(Database, 'create_connection', return_value=own)
+
+            assert db.get_available_stock(1, 'caja-1') == expected
+
+            own.close.assert_called_once_with()
+        shared.commit.assert_not_called()
+        shared.cursor.return_value.execute.assert_not_called()
+
+    @pytest.mark.parametrize('rowcount', [0, 1])
+    def test_deduct_stock_is_guarded(self, rowcount: int) -> None:
+        """
+        Test que verifica que el descuento de la venta respeta las reservas ajenas.
+
+        Args:
+            rowcount: Filas actualizadas (0 = el stock libre no alcanza)
+        """
+        db = Database.with_connection(MagicMock())
+        db.cursor.fetchone.return_value = {'version': 8}
+        db.cursor.rowcount = rowcount
+
+        assert db.deduct_stock(1, 2, MOV_VENTA, reference=3,
+                               basket_id='caja-1') is bool(rowcount)
+
+        update = db.cursor.execute.call_args_list[2]
+        assert 'stock_reservations' in update.args[0]
+        assert update.args[1] == (2, 8, 1, 1, 'caja-1', 2)
+        assert len(db.cursor.execute.call_args_list) == 3 + rowcount
+        db.connection.commit.assert_not_called()
+
+    def test_sale_details_in_one_batch(self) -> None:
+        """Test que verifica que los renglones se envían juntos y sin confirmar."""
+        db = Database.with_connection(MagicMock())
+
+        db.add_sale_details(7, [(1, 2, Decimal('1.00')), (2, 1, Decimal('3.50'))])
+
+        query, rows = db.cursor.executemany.call_args.args
+        assert query.startswith('INSERT INTO sale_details')
+        assert rows == [(7, 1, 2, Decimal('1.00')), (7, 2, 1, Decimal('3.50'))]
+        db.connection.commit.assert_not_called()
+
+
+@pytest.fixture
+def sale_controller(mocker: "MockerFixture") -> SaleController:
+    """
+    Fixture que proporciona un controlador de ventas con la base simulada.
+
+    Args:
+        mocker: Fixture de pytest-mock
+
+    Returns:
+        SaleController: Instancia del controlador de ventas
+    """
+    mocker.patch('app.controllers.sale_controller.Database')
+    mocker.patch('app.controllers.sale_controller.messagebox')
+    controller = SaleController(MagicMock())
+    controller.db.get_product_by_barcode.return_value = Product(
+        '111', 'Pan', Decimal('1.00'), 5, id=1)
+    controller.db.reserve_stock.return_value = True
+    return controller
+
+
+def _scan(controller: SaleController, qty: str) -> None:
+    """Simula la carga del código 111 con una cantidad."""
+    controller.sale_form.barcode_entry.get.return_value = '111'
+    controller.sale_form.qty_entry.get.return_value = qty
+    controller.add_item()
+
+
+class TestSaleControllerReservations:
+    """Tests para las reservas desde la caja."""
+
+    def test_scan_reserves_basket_total(self, sale_controller: SaleController) -> None:
+        """
+        Test que verifica que cada escaneo reserva el total del producto.
+
+        Args:
+            sale_controller: Fixture del controlador de ventas
+        """
+        _scan(sale_controller, '2')
+        _scan(sale_controller, '1')
+
+        basket = sale_controller.basket_id
+        assert [call.args for call in sale_controller.db.reserve_stock.call_args_list] == [
+            (1, basket, 2), (1, basket, 3)]
+        assert sale_controller.temp_stock == {'111': 3}
+
+    def test_stock_reserved_elsewhere_is_rejected(
+        self, sale_controller: SaleController
+    ) -> None:
+        """
+        Test que verifica el rechazo cuando otra caja reservó el stock.
+
+        Args:
+            sale_controller: Fixture del controlador de ventas
+        """
+        sale_controller.db.reserve_stock.return_value = False
+        sale_controller.db.get_available_stock.return_value = 1
+
+        _scan(sale_controller, '2')
+
+        assert sale_controller.items == []
+        assert sale_controller.temp_stock == {}
+        assert "Stock disponible: 1" in sale_module.messagebox.showerror.call_args.args[1]
+
+    def test_delete_releases_numeric_barcode(
+        self, sale_controller: SaleController
+    ) -> None:
+        """
+        Test que verifica que al eliminar se libera la reserva aunque ttk
+        devuelva el código de barras como número.
+
+        Args:
+            sale_controller: Fixture del controlador de ventas
+        """
+        _scan(sale_controller, '2')
+        tree = sale_controller.sale_form.tree
+        tree.selection.return_value = ('I001',)
+        tree.item.return_value = {'values': [111, 'Pan', 2, '$1.00', '$2.00']}
+        sale_module.messagebox.askyesno.return_value = True
+
+        sale_controller.delete_item()
+
+        assert sale_controller.temp_stock == {}
+        assert sale_controller.items == []
+        sale_controller.db.reserve_stock.assert_called_with(
+            1, sale_controller.basket_id, 0)
+
+    def test_database_error_falls_back_to_read_stock(
+        self, sale_controller: SaleController
+    ) -> None:
+        """
+        Test que verifica que sin reservas se controla contra el stock leído.
+
+        Args:
+            sale_controller: Fixture del controlador de ventas
+        """
+        sale_controller.db.reserve_stock.side_effect = RuntimeError("sin conexión")
+
+        _scan(sale_controller, '5')
+        _scan(sale_controller, '1')
+
+        assert sale_controller.temp_stock == {'111': 5}
+
+    def test_confirm_converts_and_releases(
+        self, sale_controller: SaleController
+    ) -> None:
+        """
+        Test que verifica que al confirmar se renueva, descuenta y libera.
+
+        Args:
+            sale_controller: Fixture del controlador de ventas
+        """
+        _scan(sale_controller, '2')
+        sale_controller.sale_form.paid = Money(200)
+        sale_controller.sale_form.change = Money(0)
+        sale_controller.db.add_sale.return_value = 3
+
+        assert sale_controller.confirm_sale() is True
+
+        assert sale_controller.db.reserve_stock.call_count == 2
+        sale_controller.db.deduct_stock.assert_called_once_with(
+            1, 2, MOV_VENTA, reference=3, basket_id=sale_controller.basket_id)
+        sale_controller.db.adjust_stock.assert_not_called()
+        sale_controller.db.commit.assert_called_once()
+        sale_controller.db.release_reservations.assert_called_once_with(
+            sale_controller.basket_id)
+        assert sale_controller.temp_stock == {}
+
+    def test_confirm_writes_one_transaction(
+        self, sale_controller: SaleController
+    ) -> None:
+        """
+        Test que verifica que cabecera, stock y detalles se confirman juntos.
+
+        Args:
+            sale_controller: Fixture del controlador de ventas
+        """
+        _scan(sale_controller, '2')
+        sale_controller.sale_form.paid = Money(200)
+        sale_controller.sale_form.change = Money(0)
+        sale_controller.db.add_sale.return_value = 3
+
+        assert sale_controller.confirm_sale() is True
+
+        db = sale_controller.db
+        assert db.add_sale.call_args.kwargs['commit'] is False
+        db.add_sale_details.assert_called_once_with(3, [(1, 2, Decimal('1.00'))])
+        db.commit.assert_called_once()
+        db.rollback.assert_not_called()
+
+    def test_failed_detail_rolls_back_sale(
+        self, sale_controller: SaleController
+    ) -> None:
+        """
+        Test que verifica que un error a mitad de la venta la deshace entera.
+
+        Args:
+            sale_controller: Fixture del controlador de ventas
+        """
+        _scan(sale_controller, '2')
+        sale_controller.sale_form.paid = Money(200)
+        sale_controller.sale_form.change = Money(0)
+        sale_controller.db.add_sale_details.side_effect = RuntimeError("sin conexión")
+
+        assert sale_controller.confirm_sale() is False
+
+        sale_controller.db.rollback.assert_called_once()
+        sale_controller.db.commit.assert_not_called()
+        sale_controller.db.release_reservations.assert_not_called()
+        assert sale_controller.temp_stock == {'111': 2}
+
+    def test_guarded_deduction_blocks_sale(
+        self, sale_controller: SaleController
+    ) -> None:
+        """
+        Test que verifica que sin stock suficiente al descontar no se vende.
+
+        Args:
+            sale_controller: Fixture del controlador de ventas
+        """
+        _scan(sale_controller, '2')
+        sale_controller.sale_form.paid = Money(200)
+        sale_controller.sale_form.change = Money(0)
+        sale_controller.db.deduct_stock.return_value = False
+
+        assert sale_controller.confirm_sale() is False
+
+        sale_controller.db.rollback.assert_called_once()
+        sale_controller.db.commit.assert_not_called()
+        sale_controller.db.add_sale_details.assert_not_called()
+
+    def test_expired_reservation_taken_blocks_sale(
+        self, sale_controller: SaleController
+    ) -> None:
+        """
+        Test que verifica que no se vende lo que otra caja tomó tras el vencimiento.
+
+        Args:
+            sale_controller: Fixture del controlador de ventas
+        """
+        _scan(sale_controller, '2')
+        sale_controller.db.reserve_stock.return_value = False
+        sale_controller.db.get_available_stock.return_value = 1
+
+        assert sale_controller.confirm_sale() is False
+
+        sale_controller.db.add_sale.assert_not_called()
+        sale_controller.db.adjust_stock.assert_not_called()
@@ -0,0 +1,119 @@
+"""Tests para el renderizador de tickets."""
+
+from pathlib import Path
+import io
+import pytest
+from app.services.ticket_renderer import ESC_CUT, ESC_INIT, TicketRenderer
+
+
+@pytest.fixture
+def renderer() -> TicketRenderer:
+    """
+    Fixture que proporciona un renderizador de tickets.
+
+    Returns:
+        TicketRenderer: Instancia del renderizador
+    """
+    return TicketRenderer()
+
+
+@pytest.fixture
+def sample_details() -> list[dict[str, any]]:
+    """
+    Fixture que proporciona detalles de venta de ejemplo.
+
+    Returns:
+        list: Detalles de venta
+    """
+    return [
+        {'producto': 'Café con Leche', 'cantidad': 2,
+         'precio': 1.50, 'subtotal': 3.00},
+        {'producto': 'Pan', 'cantidad': 1, 'precio': 2.00, 'subtotal': 2.00}
+    ]
+
+
+class TestTicketRenderer:
+    """Tests para TicketRenderer."""
+
+    def test_details_from_items(self, renderer: TicketRenderer) -> None:
+        """
+        Test que verifica la conversión de la canasta al formato del ticket.
+
+        Args:
+            renderer: Fixture del renderizador
+        """
+        items = [{'barcode': '123', 'name': 'Pan', 'qty': 2,
+                  'price': 2.0, 'subtotal': 4.0}]
+
+        details = renderer.details_from_items(items)
+
+        assert details == [{'producto': 'Pan', 'cantidad': 2,
+                            'precio': 2.0, 'subtotal': 4.0}]
+
+    def test_render_pdf(
+        self,
+        renderer: TicketRenderer,
+        sample_details: list[dict[str, any]],
+        tmp_path: Path
+    ) -> None:
+        """
+        Test que verifica que se genera un PDF válido.
+
+        Args:
+            renderer: Fixture del renderizador
+            sample_details: Fixture de detalles de venta
+            tmp_path: Directorio temporal de pytest
+        """
+        filename = renderer.render_pdf(
+            str(tmp_path / 'ticket.pdf'), 1, '2024-01-15 10:30:00',
+            5.00, 10.00, 5.00, sample_details)
+
+        with open(filename, 'rb') as f:
+            assert f.read(5) == b'%PDF-'
+
+    def test_render_text(
+        self,
+        renderer: TicketRenderer,
+        sample_details: list[dict[str, any]]
+    ) -> None:
+        """
+        Test que verifica el contenido y el ancho del ticket en texto.
+
+        Args:
+            renderer: Fixture del renderizador
+            sample_details: Fixture de detalles de venta
+        """
+        text = renderer.render_text(
+            7, '2024-01-15 10:30:00', 5.00, 10.00, 5.00, sample_details)
+
+        assert 'Venta N°: 7' in text
+        assert 'Café con Leche' in text
+        assert '  2 x $1.50' in text
+        assert all(len(line) <= renderer.TEXT_WIDTH
+                   for line in text.splitlines())
+        total_line = next(line for line in text.splitlines()
+                          if line.startswith('TOTAL:'))
+        assert total_line.endswith('$5.00')
+
+    def test_write_escpos_to_stream(
+        self,
+        renderer: TicketRenderer,
+        sample_details: list[dict[str, any]]
+    ) -> None:
+        """
+        Test que verifica el flujo ESC/POS generado.
+
+        Args:
+            renderer: Fixture del renderizador
+            sample_details: Fixture de detalles de venta
+        """
+        stream = io.BytesIO()
+
+        renderer.write_escpos(
+            stream, 1, '2024-01-15 10:30:00', 5.00, 10.00, 5.00,
+            sample_details)
+
+        data = stream.getvalue()
+        assert data.startswith(ESC_INIT)
+        assert data.endswith(ESC_CUT)
+        assert 'Café con Leche'.encode('cp850') in data
@@ -0,0 +1,172 @@
+"""Tests para la medición de bloqueos de la interfaz."""
+
+from typing import Callable
+from unittest.mock import MagicMock
+import tkinter
+import pytest
+from app.services.ui_monitor import (
+    LatencyHistogram, TICK, UiMonitor, callback_name)
+
+
+class FakeClock:
+    """Reloj manual en segundos."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, ms: float) -> None:
+        self.now += ms / 1000
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """
+    Fixture que proporciona un reloj manual.
+
+    Returns:
+        FakeClock: Reloj detenido en cero
+    """
+    return FakeClock()
+
+
+@pytest.fixture
+def monitor(clock: FakeClock) -> UiMonitor:
+    """
+    Fixture que proporciona un monitor con umbral de 200 ms.
+
+    Args:
+        clock: Fixture del reloj manual
+
+    Returns:
+        UiMonitor: Monitor con el registro de avisos simulado
+    """
+    return UiMonitor(stall_ms=200, tick_ms=100, clock=clock, log=MagicMock())
+
+
+def _slow(clock: FakeClock, ms: float) -> Callable[[], str]:
+    """Función que avanza el reloj como si tardara `ms` milisegundos."""
+    def run() -> str:
+        clock.advance(ms)
+        return 'ok'
+    return run
+
+
+class TestLatencyHistogram:
+    """Tests para LatencyHistogram."""
+
+    def test_percentiles_use_bucket_bounds(self) -> None:
+        """Test que verifica el conteo por intervalos y los percentiles."""
+        histogram = LatencyHistogram()
+        for ms in [1, 2, 3, 4, 7, 8, 30, 40, 90, 3000]:
+            histogram.record(ms)
+
+        assert histogram.count == 10
+        assert histogram.max_ms == 3000
+        assert histogram.percentile(50) == 10
+        assert histogram.percentile(90) == 100
+        assert histogram.percentile(100) == 3000
+        assert LatencyHistogram().percentile(95) == 0.0
+
+
+class TestUiMonitor:
+    """Tests para UiMonitor."""
+
+    def test_stall_names_slowest_inner_method(
+        self, monitor: UiMonitor, clock: FakeClock
+    ) -> None:
+        """
+        Test que verifica que el bloqueo se atribuye al método medido más lento.
+
+        Args:
+            monitor: Fixture del monitor
+            clock: Fixture del reloj manual
+        """
+        controller = MagicMock()
+        controller.confirm_sale = _slow(clock, 450)
+        controller.refresh = _slow(clock, 50)
+        monitor.instrument(controller, 'confirm_sale', 'refresh')
+
+        def on_confirm() -> None:
+            controller.confirm_sale()
+            controller.refresh()
+
+        monitor.measure('<lambda>', on_confirm)
+
+        assert monitor.histograms['MagicMock.confirm_sale'].max_ms == 450
+        assert monitor.histograms['<lambda>'].count == 1
+        monitor.log.assert_called_once_with(
+            "Interfaz bloqueada 500 ms en MagicMock.confirm_sale (desde <lambda>)")
+
+        assert monitor.measure('fast', _slow(clock, 20)) == 'ok'
+        assert len(monitor.stalls) == 1
+
+    def test_tick_lateness_without_callback(
+        self, monitor: UiMonitor, clock: FakeClock
+    ) -> None:
+        """
+        Test que verifica el aviso cuando el tick llega tarde sin un callback lento.
+
+        Args:
+            monitor: Fixture del monitor
+            clock: Fixture del reloj manual
+        """
+        root = MagicMock()
+        monitor._root = root
+        monitor._schedule_tick()
+
+        clock.advance(100)
+        monitor._tick()
+        clock.advance(400)
+        monitor._tick()
+
+        assert monitor.histograms[TICK].count == 2
+        assert monitor.histograms[TICK].max_ms == pytest.approx(300)
+        monitor.log.assert_called_once_with(
+            "Interfaz bloqueada 300 ms fuera de los callbacks medidos")
+        assert root.after.call_count == 3
+
+        # Un callback lento ya explica la demora del siguiente tick
+        monitor.measure('lento', _slow(clock, 300))
+        clock.advance(100)
+        monitor._tick()
+        assert monitor.log.call_count == 2
+
+    def test_tk_callbacks_are_measured(
+        self, monitor: UiMonitor, clock: FakeClock
+    ) -> None:
+        """
+        Test que verifica la medición a través de tkinter.CallWrapper.
+
+        Args:
+            monitor: Fixture del monitor
+            clock: Fixture del reloj manual
+        """
+        original = tkinter.CallWrapper
+        monitor.install(MagicMock())
+        try:
+            wrapper = tkinter.CallWrapper(_slow(clock, 250), None, MagicMock())
+            assert wrapper() == 'ok'
+        finally:
+            monitor.uninstall()
+
+        assert tkinter.CallWrapper is original
+        assert monitor.stalls[0].name == wrapper.name
+        assert wrapper.name.endswith('_slow.<locals>.run')
+
+    def test_after_callback_name_is_unwrapped(self, monitor: UiMonitor) -> None:
+        """
+        Test que verifica el nombre de un callback programado con after().
+
+        Args:
+            monitor: Fixture del monitor
+        """
+        widget = MagicMock()
+        tkinter.Misc.after(widget, 100, monitor.summary)
+        callit = widget._register.call_args.args[0]
+
+        assert callback_name(callit) == 'UiMonitor.summary'
+        assert callback_name(lambda e: None).startswith(
+            'TestUiMonitor.test_after_callback_name_is_unwrapped.<locals>.<lambda> (test_ui_monitor.py:')